@@ -0,0 +1,172 @@
+"""
+Migration 006: 将HTML正文和完整Markdown移入 content_blobs 内容块存储
+
+问题背景:
+- search_results 和 instant_search_results 内联存储 html_content（无长度上限）
+- 单个文档可达数百KB，MongoDB 工作集膨胀，未加投影的查询会拖带HTML
+
+解决方案:
+- HTML正文压缩后按内容哈希存入 content_blobs，结果文档只保留 html_ref
+- instant_search_results 中超过内联上限的 Markdown 完整移入内容块（markdown_ref），
+  文档中保留前 INLINE_MARKDOWN_MAX_CHARS 字符的预览
+- 按 _id 分批处理，每批之间短暂休眠以降低对线上负载的影响
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from migrations.base_migration import BaseMigration
+from src.config import settings
+from src.infrastructure.database.content_blob_repository import ContentBlobRepository
+from src.utils.field_codec import field_codec
+
+
+BATCH_SIZE = 200
+BATCH_PAUSE_SECONDS = 0.05
+
+
+class Migration006OffloadContentToBlobs(BaseMigration):
+    """HTML/完整Markdown移入内容块存储"""
+
+    version = "006"
+    description = "将 html_content 和完整 markdown_content 移入 content_blobs"
+
+    async def _iter_batches(self, collection, query: Dict[str, Any], projection: Dict[str, Any]):
+        """按 _id 升序分批遍历（游标分页，不使用 SKIP）"""
+        last_id = None
+        while True:
+            batch_query = dict(query)
+            if last_id is not None:
+                batch_query["_id"] = {"$gt": last_id}
+
+            batch = await collection.find(batch_query, projection).sort("_id", 1).limit(BATCH_SIZE).to_list(BATCH_SIZE)
+            if not batch:
+                return
+
+            yield batch
+            last_id = batch[-1]["_id"]
+            await asyncio.sleep(BATCH_PAUSE_SECONDS)
+
+    async def _offload_collection(self, collection, offload_markdown: bool) -> int:
+        """迁移单个集合，返回修改的文档数"""
+        blob_repo = ContentBlobRepository(self.db)
+        inline_limit = settings.INLINE_MARKDOWN_MAX_CHARS
+        modified = 0
+
+        query = {"html_ref": None, "html_content": {"$nin": [None, ""]}}
+        if offload_markdown:
+            query = {"$or": [
+                query,
+                {"markdown_ref": None, "markdown_content": {"$nin": [None, ""]}}
+            ]}
+
+        async for batch in self._iter_batches(
+            collection, query, {"html_content": 1, "html_ref": 1, "markdown_content": 1, "markdown_ref": 1}
+        ):
+            html_texts: List[Optional[str]] = []
+            markdown_texts: List[Optional[str]] = []
+            for doc in batch:
+                html_texts.append(doc.get("html_content") if not doc.get("html_ref") else None)
+                markdown = field_codec.decode_value(doc.get("markdown_content"))
+                doc["markdown_content"] = markdown
+                if offload_markdown and not doc.get("markdown_ref") and markdown and len(markdown) > inline_limit:
+                    markdown_texts.append(markdown)
+                else:
+                    markdown_texts.append(None)
+
+            html_refs = await blob_repo.put_many(html_texts)
+            markdown_refs = await blob_repo.put_many(markdown_texts)
+
+            operations = []
+            for doc, html_ref, markdown_ref in zip(batch, html_refs, markdown_refs):
+                update: Dict[str, Any] = {}
+                if html_ref:
+                    update["html_ref"] = html_ref
+                    update["html_content"] = None
+                if markdown_ref:
+                    update["markdown_ref"] = markdown_ref
+                    update["markdown_content"] = doc["markdown_content"][:inline_limit]
+                if update:
+                    operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": update}))
+
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count
+
+        return modified
+
+    async def _restore_collection(self, collection, restore_markdown: bool) -> int:
+        """将内容块还原为内联字段，返回修改的文档数"""
+        blob_repo = ContentBlobRepository(self.db)
+        modified = 0
+
+        query: Dict[str, Any] = {"html_ref": {"$ne": None}}
+        if restore_markdown:
+            query = {"$or": [query, {"markdown_ref": {"$ne": None}}]}
+
+        async for batch in self._iter_batches(collection, query, {"html_ref": 1, "markdown_ref": 1}):
+            refs = [doc.get("html_ref") for doc in batch] + [doc.get("markdown_ref") for doc in batch]
+            texts = await blob_repo.get_many(refs)
+
+            operations = []
+            released: Dict[str, int] = {}
+            for doc in batch:
+                update_set: Dict[str, Any] = {}
+                update_unset: Dict[str, Any] = {}
+                for ref_field, content_field in (("html_ref", "html_content"), ("markdown_ref", "markdown_content")):
+                    ref = doc.get(ref_field)
+                    if ref and ref in texts:
+                        update_set[content_field] = texts[ref]
+                        update_unset[ref_field] = ""
+                        released[ref] = released.get(ref, 0) + 1
+                if update_set:
+                    operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": update_set, "$unset": update_unset}))
+
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count
+                await blob_repo.release(released)
+
+        return modified
+
+    async def upgrade(self) -> dict:
+        """执行迁移"""
+        search_modified = await self._offload_collection(self.db.search_results, offload_markdown=False)
+        instant_modified = await self._offload_collection(self.db.instant_search_results, offload_markdown=True)
+
+        return {
+            'modified_count': search_modified + instant_modified,
+            'details': {
+                'search_results': search_modified,
+                'instant_search_results': instant_modified
+            },
+            'message': f'成功迁移 {search_modified + instant_modified} 个结果文档的正文到内容块'
+        }
+
+    async def downgrade(self) -> dict:
+        """回滚迁移"""
+        search_modified = await self._restore_collection(self.db.search_results, restore_markdown=False)
+        instant_modified = await self._restore_collection(self.db.instant_search_results, restore_markdown=True)
+
+        return {
+            'modified_count': search_modified + instant_modified,
+            'details': {
+                'search_results': search_modified,
+                'instant_search_results': instant_modified
+            },
+            'message': f'成功还原 {search_modified + instant_modified} 个结果文档的内联正文'
+        }
+
+    async def validate(self) -> bool:
+        """验证迁移结果"""
+        # 检查是否还有内联HTML未迁移
+        for collection in (self.db.search_results, self.db.instant_search_results):
+            count = await collection.count_documents(
+                {"html_ref": None, "html_content": {"$nin": [None, ""]}}
+            )
+            if count > 0:
+                return False
+
+        return True
@@ -0,0 +1,214 @@
+"""
+Migration 007: 定时搜索结果跨执行去重回填
+
+问题背景:
+- 定时任务每次执行都会重新插入同样的结果，search_results 随执行次数线性增长
+- 新版本按 (task_id, content_hash) 去重，历史数据没有 content_hash，且存在大量重复
+
+解决方案:
+- 为历史结果计算 content_hash（MD5(title + url + content)，与即时搜索一致）
+- 同一任务内的重复结果合并到一条：保留先遇到的一条，累加 seen_count，
+  first_seen_at / last_seen_at 取最早/最晚的 created_at，其余删除并释放内容块引用
+- 已有去重键但仍重复的结果（唯一索引建立前新版本并发写入的）同样合并
+- 受影响任务的物化统计被删除，读取时按需重建
+- 按 _id 分批处理，每批之间短暂休眠以降低对线上负载的影响
+- 合并完成后创建 (task_id, content_hash) 唯一部分索引 idx_task_content_hash
+  （存在重复时无法建立，因此不在启动时创建）
+
+注意: 回滚只移除去重字段和唯一索引，已合并删除的重复结果无法恢复
+"""
+
+import asyncio
+import hashlib
+from collections import Counter
+from typing import Any, Dict, List, Set
+
+from pymongo import UpdateOne
+
+from migrations.base_migration import BaseMigration
+from src.infrastructure.database.content_blob_repository import ContentBlobRepository
+from src.utils.field_codec import field_codec
+
+
+BATCH_SIZE = 500
+BATCH_PAUSE_SECONDS = 0.05
+
+DEDUP_INDEX_NAME = "idx_task_content_hash"
+
+DEDUP_FIELDS = ("content_hash", "first_seen_at", "last_seen_at", "seen_count", "first_execution_id", "last_execution_id")
+
+
+def compute_content_hash(doc: Dict[str, Any]) -> str:
+    """计算内容哈希（content 可能为压缩存储，先解码）"""
+    content = field_codec.decode_value(doc.get("content")) or ""
+    content_str = f"{doc.get('title', '')}||{doc.get('url', '')}||{content}"
+    return hashlib.md5(content_str.encode('utf-8')).hexdigest()
+
+
+class Migration007DedupSearchResults(BaseMigration):
+    """定时搜索结果去重回填"""
+
+    version = "007"
+    description = "为 search_results 回填 content_hash 并合并同一任务内的重复结果"
+
+    async def _dedup_batch(self, batch: List[Dict[str, Any]], affected_tasks: Set[str]) -> Dict[str, int]:
+        """处理一个批次：回填去重键或合并到已有结果"""
+        collection = self.db.search_results
+        blob_repo = ContentBlobRepository(self.db)
+
+        keyed = [(str(doc["task_id"]), compute_content_hash(doc), doc) for doc in batch]
+
+        # 查询已持有相同去重键的结果（之前批次回填的或新版本写入的）
+        keepers: Dict[tuple, Any] = {}
+        hashes_by_task: Dict[str, List[str]] = {}
+        for task_id, content_hash, _ in keyed:
+            hashes_by_task.setdefault(task_id, []).append(content_hash)
+        for task_id, hashes in hashes_by_task.items():
+            async for doc in collection.find(
+                {"task_id": task_id, "content_hash": {"$in": hashes}},
+                {"content_hash": 1}
+            ):
+                keepers[(task_id, doc["content_hash"])] = doc["_id"]
+
+        operations = []
+        duplicate_ids = []
+        released: Dict[str, int] = {}
+        for task_id, content_hash, doc in keyed:
+            key = (task_id, content_hash)
+            created_at = doc.get("created_at")
+
+            if key in keepers:
+                # 重复结果：合并到保留的结果后删除
+                keeper_update: Dict[str, Any] = {"$inc": {"seen_count": 1}}
+                if created_at:
+                    keeper_update["$min"] = {"first_seen_at": created_at}
+                    keeper_update["$max"] = {"last_seen_at": created_at}
+                operations.append(UpdateOne({"_id": keepers[key]}, keeper_update))
+                duplicate_ids.append(doc["_id"])
+                if doc.get("html_ref"):
+                    released[doc["html_ref"]] = released.get(doc["html_ref"], 0) + 1
+                affected_tasks.add(task_id)
+                continue
+
+            keepers[key] = doc["_id"]
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+                "content_hash": content_hash,
+                "first_seen_at": created_at,
+                "last_seen_at": created_at,
+                "seen_count": 1
+            }}))
+
+        # 保留的结果先写入去重键，再合并重复计数（ordered 保证顺序）
+        if operations:
+            await collection.bulk_write(operations, ordered=True)
+        if duplicate_ids:
+            await collection.delete_many({"_id": {"$in": duplicate_ids}})
+            await blob_repo.release(released)
+
+        return {"backfilled": len(batch) - len(duplicate_ids), "merged": len(duplicate_ids)}
+
+    async def _merge_hashed_duplicates(self, affected_tasks: Set[str]) -> int:
+        """合并已有去重键但仍重复的结果：保留最早发现的一条，累加发现次数"""
+        collection = self.db.search_results
+        blob_repo = ContentBlobRepository(self.db)
+        merged = 0
+
+        groups = collection.aggregate([
+            {"$match": {"content_hash": {"$type": "string"}}},
+            {"$group": {
+                "_id": {"task_id": "$task_id", "content_hash": "$content_hash"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1}
+            }},
+            {"$match": {"count": {"$gt": 1}}}
+        ], allowDiskUse=True)
+        async for group in groups:
+            docs = await collection.find(
+                {"_id": {"$in": group["ids"]}},
+                {"first_seen_at": 1, "last_seen_at": 1, "seen_count": 1, "html_ref": 1}
+            ).sort([("first_seen_at", 1), ("_id", 1)]).to_list(None)
+            keeper, duplicates = docs[0], docs[1:]
+
+            keeper_update: Dict[str, Any] = {
+                "$inc": {"seen_count": sum(doc.get("seen_count") or 1 for doc in duplicates)}
+            }
+            last_seen = [doc["last_seen_at"] for doc in duplicates if doc.get("last_seen_at")]
+            if last_seen:
+                keeper_update["$max"] = {"last_seen_at": max(last_seen)}
+            await collection.update_one({"_id": keeper["_id"]}, keeper_update)
+            await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in duplicates]}})
+            await blob_repo.release(dict(Counter(doc["html_ref"] for doc in duplicates if doc.get("html_ref"))))
+
+            affected_tasks.add(str(group["_id"]["task_id"]))
+            merged += len(duplicates)
+
+        return merged
+
+    async def upgrade(self) -> dict:
+        """执行迁移"""
+        collection = self.db.search_results
+        affected_tasks: Set[str] = set()
+        backfilled = 0
+        merged = 0
+
+        last_id = None
+        while True:
+            query: Dict[str, Any] = {"content_hash": {"$exists": False}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            batch = await collection.find(
+                query, {"task_id": 1, "title": 1, "url": 1, "content": 1, "created_at": 1, "html_ref": 1}
+            ).sort("_id", 1).limit(BATCH_SIZE).to_list(BATCH_SIZE)
+            if not batch:
+                break
+
+            counts = await self._dedup_batch(batch, affected_tasks)
+            backfilled += counts["backfilled"]
+            merged += counts["merged"]
+            last_id = batch[-1]["_id"]
+            await asyncio.sleep(BATCH_PAUSE_SECONDS)
+
+        merged += await self._merge_hashed_duplicates(affected_tasks)
+
+        # 去重完成后才能建立唯一索引（历史数据回填前没有 content_hash，使用部分索引）
+        await collection.create_index(
+            [("task_id", 1), ("content_hash", 1)],
+            name=DEDUP_INDEX_NAME,
+            unique=True,
+            partialFilterExpression={"content_hash": {"$type": "string"}}
+        )
+
+        # 受影响任务的统计按需重建
+        if affected_tasks:
+            await self.db.search_result_stats.delete_many({"_id": {"$in": list(affected_tasks)}})
+
+        return {
+            'modified_count': backfilled,
+            'details': {
+                'backfilled': backfilled,
+                'merged_duplicates': merged,
+                'affected_tasks': len(affected_tasks)
+            },
+            'message': f'回填 {backfilled} 个结果的去重键，合并 {merged} 个重复结果'
+        }
+
+    async def downgrade(self) -> dict:
+        """回滚迁移（只移除去重字段和唯一索引，已合并的重复结果不会恢复）"""
+        if DEDUP_INDEX_NAME in await self.db.search_results.index_information():
+            await self.db.search_results.drop_index(DEDUP_INDEX_NAME)
+
+        result = await self.db.search_results.update_many(
+            {"content_hash": {"$exists": True}},
+            {"$unset": {field_name: "" for field_name in DEDUP_FIELDS}}
+        )
+
+        return {
+            'modified_count': result.modified_count,
+            'message': f'移除 {result.modified_count} 个结果的去重字段（已合并的重复结果不会恢复）'
+        }
+
+    async def validate(self) -> bool:
+        """验证迁移结果"""
+        count = await self.db.search_results.count_documents({"content_hash": {"$exists": False}})
+        return count == 0 and DEDUP_INDEX_NAME in await self.db.search_results.index_information()
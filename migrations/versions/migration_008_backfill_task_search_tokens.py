@@ -0,0 +1,80 @@
+"""
+Migration 008: 回填定时搜索任务的关键词搜索词元
+
+问题背景:
+- 任务列表的关键词搜索原先对 name/description/query 执行三个不区分大小写、无锚点的 $regex，
+  每次查询都是全集合扫描
+- 新版本在写入时维护 search_tokens / search_name_tokens（中日韩二元组 + 词前缀），
+  查询走 (search_tokens, created_at, _id) 多键索引
+
+解决方案:
+- 为没有 search_tokens 的历史任务计算词元（与 SearchTaskRepository 写入逻辑一致）
+- 按 _id 分批处理
+"""
+
+from typing import Any, Dict
+
+from pymongo import UpdateOne
+
+from migrations.base_migration import BaseMigration
+from src.utils.text_tokenizer import index_tokens
+
+
+BATCH_SIZE = 500
+
+
+class Migration008BackfillTaskSearchTokens(BaseMigration):
+    """回填任务搜索词元"""
+
+    version = "008"
+    description = "为 search_tasks 回填关键词搜索词元 search_tokens / search_name_tokens"
+
+    async def upgrade(self) -> dict:
+        """执行迁移"""
+        collection = self.db.search_tasks
+        modified = 0
+
+        last_id = None
+        while True:
+            query: Dict[str, Any] = {"search_tokens": {"$exists": False}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            batch = await collection.find(
+                query, {"name": 1, "description": 1, "query": 1}
+            ).sort("_id", 1).limit(BATCH_SIZE).to_list(BATCH_SIZE)
+            if not batch:
+                break
+
+            operations = [
+                UpdateOne({"_id": doc["_id"]}, {"$set": {
+                    "search_tokens": index_tokens(doc.get("name"), doc.get("description"), doc.get("query")),
+                    "search_name_tokens": index_tokens(doc.get("name"))
+                }})
+                for doc in batch
+            ]
+            result = await collection.bulk_write(operations, ordered=False)
+            modified += result.modified_count
+            last_id = batch[-1]["_id"]
+
+        return {
+            'modified_count': modified,
+            'message': f'为 {modified} 个任务回填搜索词元'
+        }
+
+    async def downgrade(self) -> dict:
+        """回滚迁移"""
+        result = await self.db.search_tasks.update_many(
+            {"search_tokens": {"$exists": True}},
+            {"$unset": {"search_tokens": "", "search_name_tokens": ""}}
+        )
+
+        return {
+            'modified_count': result.modified_count,
+            'message': f'移除 {result.modified_count} 个任务的搜索词元'
+        }
+
+    async def validate(self) -> bool:
+        """验证迁移结果"""
+        count = await self.db.search_tasks.count_documents({"search_tokens": {"$exists": False}})
+        return count == 0
@@ -0,0 +1,109 @@
+"""
+Migration 009: 回填统一结果读模型 unified_results
+
+问题背景:
+- 报告列表/搜索需要分别查询 search_results（按 task_id 归属）和 instant_search_results
+  （经映射表与任务关联），再在 Python 中归一化
+- 新版本在两条流水线写入时维护 unified_results（统一结构 + 正文指针），
+  报告查询走单集合索引
+
+解决方案:
+- 按 _id 分批扫描 search_results，写入定时结果行
+- 按 _id 分批扫描 instant_search_result_mappings，按任务写入即时结果行
+- 写入使用 $setOnInsert upsert，可重复执行；完成后再开启 UNIFIED_RESULTS_READ_ENABLED
+"""
+
+from typing import Any, Dict, List
+
+from pymongo import UpdateOne
+
+from migrations.base_migration import BaseMigration
+from src.infrastructure.database.report_search_index_repository import SOURCE_INSTANT, SOURCE_SCHEDULED
+from src.infrastructure.database.unified_results_repository import build_unified_row, scheduled_row
+
+
+BATCH_SIZE = 500
+
+
+class Migration009BackfillUnifiedResults(BaseMigration):
+    """回填统一结果读模型"""
+
+    version = "009"
+    description = "从 search_results / instant_search_result_mappings 回填 unified_results"
+
+    async def _upsert_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """写入统一结果行（已存在的行保持不变）"""
+        if not rows:
+            return 0
+        result = await self.db.unified_results.bulk_write([
+            UpdateOne({"_id": row["_id"]}, {"$setOnInsert": row}, upsert=True) for row in rows
+        ], ordered=False)
+        return result.upserted_count
+
+    async def upgrade(self) -> dict:
+        """执行迁移"""
+        scheduled = 0
+        last_id = None
+        while True:
+            query: Dict[str, Any] = {} if last_id is None else {"_id": {"$gt": last_id}}
+            batch = await self.db.search_results.find(
+                query, {"task_id": 1, "title": 1, "url": 1, "created_at": 1, "relevance_score": 1}
+            ).sort("_id", 1).limit(BATCH_SIZE).to_list(BATCH_SIZE)
+            if not batch:
+                break
+            scheduled += await self._upsert_rows([scheduled_row(doc) for doc in batch])
+            last_id = batch[-1]["_id"]
+
+        instant = 0
+        last_id = None
+        while True:
+            query = {} if last_id is None else {"_id": {"$gt": last_id}}
+            batch = await self.db.instant_search_result_mappings.find(
+                query, {"task_id": 1, "result_id": 1, "found_at": 1, "relevance_score": 1}
+            ).sort("_id", 1).limit(BATCH_SIZE).to_list(BATCH_SIZE)
+            if not batch:
+                break
+            results = {
+                doc["_id"]: doc
+                async for doc in self.db.instant_search_results.find(
+                    {"_id": {"$in": list({mapping["result_id"] for mapping in batch})}},
+                    {"title": 1, "url": 1}
+                )
+            }
+            instant += await self._upsert_rows([
+                build_unified_row(
+                    SOURCE_INSTANT,
+                    mapping["task_id"],
+                    mapping["result_id"],
+                    results[mapping["result_id"]].get("title"),
+                    results[mapping["result_id"]].get("url"),
+                    mapping.get("found_at"),
+                    mapping.get("relevance_score")
+                )
+                for mapping in batch if mapping["result_id"] in results
+            ])
+            last_id = batch[-1]["_id"]
+
+        return {
+            'scheduled_count': scheduled,
+            'instant_count': instant,
+            'message': f'回填统一结果: 定时 {scheduled} 条, 即时 {instant} 条'
+        }
+
+    async def downgrade(self) -> dict:
+        """回滚迁移"""
+        result = await self.db.unified_results.delete_many({})
+
+        return {
+            'deleted_count': result.deleted_count,
+            'message': f'删除 {result.deleted_count} 条统一结果'
+        }
+
+    async def validate(self) -> bool:
+        """验证迁移结果（抽样：每种来源的行数不少于源数据）"""
+        scheduled = await self.db.unified_results.count_documents({"source_type": SOURCE_SCHEDULED})
+        if scheduled < await self.db.search_results.estimated_document_count():
+            return False
+
+        instant_rows = await self.db.unified_results.count_documents({"source_type": SOURCE_INSTANT})
+        return instant_rows > 0 or await self.db.instant_search_result_mappings.estimated_document_count() == 0
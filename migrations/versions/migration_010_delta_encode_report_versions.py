@@ -0,0 +1,104 @@
+"""
+Migration 010: 报告版本改为周期快照 + 文本增量存储
+
+问题背景:
+- update_report_content 每次手动编辑都在 summary_report_versions 保存完整内容快照，
+  长报告编辑数百次后版本集合体积巨大
+- 新版本写入时按需保存相对上一版本的行级增量（见 src/services/report_version_store.py）
+
+解决方案:
+- 按报告、按版本号升序重写历史快照记录（没有 storage 字段的记录）：
+  与新写入逻辑一致地选择快照或增量
+- 遇到新格式的记录即停止处理该报告（之后的记录已按新格式写入）
+- 回滚时把增量记录还原为完整快照
+"""
+
+from typing import Dict
+
+from pymongo import ReplaceOne
+
+from migrations.base_migration import BaseMigration
+from src.core.domain.entities.summary_report import SummaryReportVersion
+from src.services.report_version_store import encode_version_content
+from src.utils.text_delta import apply_delta
+
+
+class Migration010DeltaEncodeReportVersions(BaseMigration):
+    """报告版本增量存储"""
+
+    version = "010"
+    description = "将 summary_report_versions 的历史完整快照改为周期快照 + 行级增量"
+
+    async def upgrade(self) -> dict:
+        """执行迁移"""
+        collection = self.db.summary_report_versions
+        report_ids = await collection.distinct("report_id", {"storage": {"$exists": False}})
+
+        converted = 0
+        for report_id in report_ids:
+            operations = []
+            base_text = None
+            base_number = None
+            base_chain_length = 0
+
+            async for doc in collection.find({"report_id": report_id}).sort("version_number", 1):
+                if "storage" in doc:
+                    break
+
+                version = SummaryReportVersion(**doc)
+                text = version.content_snapshot.get("text") or ""
+                version.base_version = base_number
+                encode_version_content(version, base_text, base_chain_length)
+
+                operations.append(ReplaceOne({"_id": doc["_id"]}, {"_id": doc["_id"], **version.model_dump()}))
+                if version.storage == "delta":
+                    converted += 1
+
+                base_text = text
+                base_number = version.version_number
+                base_chain_length = version.chain_length
+
+            if operations:
+                await collection.bulk_write(operations, ordered=True)
+
+        return {
+            'modified_count': converted,
+            'message': f'{len(report_ids)} 个报告的 {converted} 个历史版本改为增量存储'
+        }
+
+    async def downgrade(self) -> dict:
+        """回滚迁移（增量记录还原为完整快照）"""
+        collection = self.db.summary_report_versions
+        report_ids = await collection.distinct("report_id", {"storage": "delta"})
+
+        restored = 0
+        for report_id in report_ids:
+            texts: Dict[int, str] = {}
+            operations = []
+
+            async for doc in collection.find({"report_id": report_id}).sort("version_number", 1):
+                version = SummaryReportVersion(**doc)
+                if version.storage == "delta":
+                    text = apply_delta(texts[version.base_version], version.delta)
+                    version.content_snapshot = dict(version.content_snapshot, text=text)
+                    version.storage = "snapshot"
+                    version.delta = None
+                    version.base_version = None
+                    version.chain_length = 0
+                    version.stored_size = version.full_size
+                    operations.append(ReplaceOne({"_id": doc["_id"]}, {"_id": doc["_id"], **version.model_dump()}))
+                    restored += 1
+                texts[version.version_number] = version.content_snapshot.get("text") or ""
+
+            if operations:
+                await collection.bulk_write(operations, ordered=True)
+
+        return {
+            'modified_count': restored,
+            'message': f'{restored} 个增量版本还原为完整快照'
+        }
+
+    async def validate(self) -> bool:
+        """验证迁移结果"""
+        count = await self.db.summary_report_versions.count_documents({"storage": {"$exists": False}})
+        return count == 0
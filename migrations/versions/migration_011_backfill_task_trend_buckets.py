@@ -0,0 +1,54 @@
+"""
+Migration 011: 回填任务按天趋势桶 task_trend_buckets
+
+问题背景:
+- 报告趋势（结果数、新结果/共享结果、主要域名、关键词随时间的变化）按需计算时
+  需要扫描报告所有任务的全部结果，一年范围的查询无法实时返回
+- 新版本在两条流水线写入时按任务按天累加预聚合日桶（见 TaskTrendBucketRepository），
+  报告趋势对日桶做一次聚合
+
+解决方案:
+- 按任务重建日桶：定时任务从 search_results（首次发现时间）和 search_result_executions
+  （重复出现）回填，即时任务从 instant_search_result_mappings 回填
+- 每个任务先删除已有日桶再重建，可重复执行；建议在低峰期执行，重建期间并发写入的增量可能丢失
+- 也用于修复写入失败造成的日桶漂移
+"""
+
+from migrations.base_migration import BaseMigration
+from src.infrastructure.database.repositories import TaskTrendBucketRepository
+
+
+class Migration011BackfillTaskTrendBuckets(BaseMigration):
+    """回填任务按天趋势桶"""
+
+    version = "011"
+    description = "从 search_results / instant_search_result_mappings 回填 task_trend_buckets"
+
+    async def upgrade(self) -> dict:
+        """执行迁移"""
+        task_count = await TaskTrendBucketRepository().rebuild_all()
+        bucket_count = await self.db.task_trend_buckets.count_documents({})
+
+        return {
+            'task_count': task_count,
+            'bucket_count': bucket_count,
+            'message': f'回填趋势桶: {task_count} 个任务, {bucket_count} 个日桶'
+        }
+
+    async def downgrade(self) -> dict:
+        """回滚迁移"""
+        result = await self.db.task_trend_buckets.delete_many({})
+
+        return {
+            'deleted_count': result.deleted_count,
+            'message': f'删除 {result.deleted_count} 个趋势日桶'
+        }
+
+    async def validate(self) -> bool:
+        """验证迁移结果（有结果数据时应存在日桶）"""
+        if await self.db.task_trend_buckets.estimated_document_count() > 0:
+            return True
+        return (
+            await self.db.search_results.estimated_document_count() == 0
+            and await self.db.instant_search_result_mappings.estimated_document_count() == 0
+        )
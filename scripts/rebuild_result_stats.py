@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+搜索结果统计重建工具
+
+从 search_results 重新计算 search_result_stats 物化统计文档，
+用于历史数据回填或修复统计漂移。
+
+使用方法:
+    python scripts/rebuild_result_stats.py                 # 重建所有任务的统计
+    python scripts/rebuild_result_stats.py <task_id> ...   # 重建指定任务的统计
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infrastructure.database.connection import init_database, close_database_connections
+from src.infrastructure.database.repositories import SearchResultStatsRepository
+
+
+async def main():
+    """主函数"""
+    task_ids = sys.argv[1:]
+
+    await init_database()
+    stats_repo = SearchResultStatsRepository()
+
+    try:
+        print("🔄 开始重建搜索结果统计...")
+        print("=" * 60)
+
+        if task_ids:
+            for task_id in task_ids:
+                doc = await stats_repo.rebuild_task_stats(task_id)
+                total = doc["total_results"] if doc else 0
+                print(f"   ✅ {task_id}: {total} 条结果")
+            rebuilt_count = len(task_ids)
+        else:
+            rebuilt_count = await stats_repo.rebuild_all()
+
+        print("\n" + "=" * 60)
+        print(f"✅ 统计重建完成: {rebuilt_count} 个任务")
+
+    except Exception as e:
+        print(f"\n❌ 执行失败: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    finally:
+        await close_database_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,6 +4,7 @@ v1.3.0 功能：
 - POST /instant-search-tasks - 创建并执行即时搜索
 - GET /instant-search-tasks/{task_id} - 获取任务详情
 - GET /instant-search-tasks/{task_id}/results - 获取搜索结果（通过映射表）
+- DELETE /instant-search-tasks/{task_id}/results - 删除搜索结果映射（同时使结果页缓存失效）
 - GET /instant-search-tasks - 任务列表
 """
 
@@ -130,10 +131,11 @@ class PaginatedResultsResponse(BaseModel):
 class TaskListResponse(BaseModel):
     """任务列表响应"""
     tasks: List[InstantSearchTaskResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # 下一页游标（无下一页为空）
 
 
 # ==================== API Endpoints ====================
@@ -236,7 +238,9 @@ async def get_instant_search_task(task_id: str):
 async def get_instant_search_results(
     task_id: str,
     page: int = Query(1, ge=1, description="页码"),
-    page_size: int = Query(20, ge=1, le=100, description="每页数量")
+    page_size: int = Query(20, ge=1, le=100, description="每页数量"),
+    include_html: bool = Query(False, description="是否返回html_content（从内容块按需加载）"),
+    include_markdown: bool = Query(False, description="是否返回完整markdown_content（默认只返回预览）")
 ):
     """
     获取即时搜索结果（通过映射表JOIN）
@@ -251,6 +255,8 @@ async def get_instant_search_results(
     - task_id: 任务ID
     - page: 页码（默认1）
     - page_size: 每页数量（默认20，最大100）
+    - include_html: 是否加载HTML正文（默认否）
+    - include_markdown: 是否加载完整Markdown（默认只返回前5000字符预览）
 
     返回：
     - results: 搜索结果列表（含映射元数据）
@@ -264,7 +270,9 @@ async def get_instant_search_results(
         results, total = await service.get_task_results(
             task_id=task_id,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            include_html=include_html,
+            include_markdown=include_markdown
         )
 
         # 计算总页数
@@ -293,11 +301,43 @@ async def get_instant_search_results(
         raise HTTPException(status_code=500, detail=f"服务器错误: {str(e)}")
 
 
+@router.delete("/{task_id}/results")
+async def delete_instant_search_results(task_id: str):
+    """
+    删除即时搜索结果（映射记录）
+
+    说明：
+    - 结果本身可能被其他搜索共享，只删除该任务执行的映射
+    - 同时使该执行的结果页缓存失效
+
+    参数：
+    - task_id: 任务ID
+
+    返回：
+    - deleted_count: 删除的映射数量
+    """
+    try:
+        service = InstantSearchService()
+        deleted_count = await service.delete_task_results(task_id)
+
+        return {"task_id": task_id, "deleted_count": deleted_count}
+
+    except ValueError as e:
+        logger.error(f"参数错误: {str(e)}")
+        raise HTTPException(status_code=404, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"删除搜索结果失败: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"服务器错误: {str(e)}")
+
+
 @router.get("", response_model=TaskListResponse)
 async def list_instant_search_tasks(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
-    status: Optional[str] = Query(None, description="状态过滤（pending, running, completed, failed）")
+    status: Optional[str] = Query(None, description="状态过滤（pending, running, completed, failed）"),
+    cursor: Optional[str] = Query(None, description="分页游标（来自上一页的next_cursor，提供时忽略page）"),
+    include_total: bool = Query(True, description="是否返回总数（深分页时可关闭以减少开销）")
 ):
     """
     获取即时搜索任务列表
@@ -306,24 +346,35 @@ async def list_instant_search_tasks(
     - page: 页码（默认1）
     - page_size: 每页数量（默认20，最大100）
     - status: 状态过滤（可选）
+    - cursor: 分页游标（可选，深分页时使用，不受页数影响）
+    - include_total: 是否返回总数（默认返回）
 
     返回：
     - tasks: 任务列表
     - total: 总任务数
     - pagination: 分页信息
+    - next_cursor: 下一页游标
     """
     try:
         service = InstantSearchService()
 
         # 获取任务列表
-        tasks, total = await service.list_tasks(
-            page=page,
-            page_size=page_size,
-            status=status
-        )
+        try:
+            query_result = await service.query_tasks(
+                page=page,
+                page_size=page_size,
+                cursor=cursor,
+                status=status,
+                include_total=include_total
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        tasks = query_result["items"]
+        total = query_result["total"]
 
         # 计算总页数
-        total_pages = (total + page_size - 1) // page_size
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
 
         # 转换为响应模型
         task_responses = [
@@ -336,9 +387,12 @@ async def list_instant_search_tasks(
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages
+            total_pages=total_pages,
+            next_cursor=query_result["next_cursor"]
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"获取任务列表失败: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"服务器错误: {str(e)}")
@@ -8,7 +8,7 @@
 import os
 from datetime import datetime
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel, Field
 
 from src.core.domain.entities.search_task import SearchTask
@@ -16,9 +16,23 @@ from src.core.domain.entities.search_config import UserSearchConfig, SearchConfi
 from src.core.domain.entities.search_result import SearchResult, SearchResultBatch, ResultStatus
 from src.infrastructure.search.firecrawl_search_adapter import FirecrawlSearchAdapter
 from src.infrastructure.crawlers.firecrawl_adapter import FirecrawlAdapter
-from src.infrastructure.database.repositories import SearchTaskRepository, SearchResultRepository
+from src.infrastructure.database.repositories import (
+    SearchTaskRepository,
+    SearchResultRepository,
+    SearchResultStatsRepository
+)
 from src.infrastructure.database.memory_repositories import InMemorySearchTaskRepository
 from src.infrastructure.database.connection import get_mongodb_database
+from src.config import settings
+from src.core.domain.entities.result_retention import ArchiveTarget
+from src.services.report_job_manager import report_job_manager
+from src.services.report_search_service import report_search_service
+from src.services.result_retention_service import result_retention_service
+from src.services.summary_report_service import summary_report_service
+from src.infrastructure.database.result_write_buffer import result_write_buffer
+from src.infrastructure.database.view_count_buffer import view_count_buffer
+from src.infrastructure.cache import cache_key_gen, redis_client
+from src.utils.field_codec import field_codec
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -103,6 +117,13 @@ class SystemHealthStatus(BaseModel):
     system_config: SystemTestModeStatus = Field(..., description="系统配置")
 
 
+class RetentionPolicyRequest(BaseModel):
+    """结果保留策略请求"""
+    hot_days: int = Field(..., ge=1, description="热集合中保留的天数")
+    archive_target: ArchiveTarget = Field(ArchiveTarget.COLLECTION, description="归档目标：collection（月度归档集合）或 jsonl（本地压缩文件）")
+    enabled: bool = Field(True, description="是否启用归档（关闭后结果永久保留在热集合）")
+
+
 # ==========================================
 # API端点
 # ==========================================
@@ -146,22 +167,23 @@ async def execute_task_manually(task_id: str):
         if result_batch.results:
             try:
                 result_repo = await get_result_repository()
-                await result_repo.save_results(result_batch.results)
-                logger.info(f"保存结果成功: {len(result_batch.results)}条 (任务ID: {task_id})")
+                saved = await result_repo.save_execution(result_batch)
+                logger.info(
+                    f"保存结果成功: 新增 {saved['new_count']} 条, 重复 {saved['duplicate_count']} 条 "
+                    f"(任务ID: {task_id})"
+                )
             except Exception as e:
                 logger.error(f"保存结果失败: {e}")
                 # 不抛出异常,继续处理任务统计
 
-        # 更新任务统计
-        task.record_execution(
+        # 原子更新任务统计（与定时执行重叠时计数不丢失）
+        await repo.record_execution_stats(
+            task_id=task_id,
             success=result_batch.success,
             results_count=result_batch.returned_count,
             credits_used=result_batch.credits_used
         )
 
-        # 更新到仓储
-        await repo.update(task)
-
         logger.info(f"手动执行任务成功: {task.name} (ID: {task_id})")
 
         # 返回执行结果
@@ -181,8 +203,7 @@ async def execute_task_manually(task_id: str):
         logger.error(f"手动执行任务失败: {e}")
 
         # 记录失败统计
-        task.record_execution(success=False)
-        await repo.update(task)
+        await repo.record_execution_stats(task_id=task_id, success=False)
 
         # 返回错误信息
         return TaskExecutionResponse(
@@ -386,6 +407,279 @@ async def clear_old_results(days: int = 30):
         raise HTTPException(500, f"清理操作失败: {str(e)}")
 
 
+@router.post(
+    "/system/maintenance/rebuild-result-stats",
+    summary="重建搜索结果统计",
+    description="在后台从search_results重新计算物化统计文档（回填历史数据或修复漂移）。仅供系统管理使用。"
+)
+async def rebuild_result_stats(background_tasks: BackgroundTasks, task_id: str = None):
+    """重建搜索结果统计（后台执行）"""
+    stats_repo = SearchResultStatsRepository()
+
+    async def _rebuild():
+        try:
+            if task_id:
+                await stats_repo.rebuild_task_stats(task_id)
+            else:
+                rebuilt_count = await stats_repo.rebuild_all()
+                logger.info(f"✅ 结果统计重建完成: {rebuilt_count} 个任务")
+        except Exception as e:
+            logger.error(f"❌ 结果统计重建失败: {e}")
+
+    background_tasks.add_task(_rebuild)
+
+    return {
+        "success": True,
+        "message": "统计重建已在后台启动",
+        "task_id": task_id
+    }
+
+
+@router.get(
+    "/system/retention/policies/{task_id}",
+    summary="获取结果保留策略",
+    description="获取任务的生效保留策略（未配置时返回全局默认策略）。"
+)
+async def get_retention_policy(task_id: str):
+    """获取结果保留策略"""
+    try:
+        policy = await result_retention_service.policy_repo.get(task_id)
+        if policy:
+            return policy.to_summary(is_default=False)
+        return result_retention_service.policy_repo.default_policy(task_id).to_summary(is_default=True)
+    except Exception as e:
+        logger.error(f"获取保留策略失败: {e}")
+        raise HTTPException(500, f"获取保留策略失败: {str(e)}")
+
+
+@router.put(
+    "/system/retention/policies/{task_id}",
+    summary="配置结果保留策略",
+    description="配置任务的热数据保留天数和归档目标。"
+)
+async def set_retention_policy(task_id: str, request: RetentionPolicyRequest):
+    """配置结果保留策略"""
+    try:
+        policy = await result_retention_service.set_policy(
+            task_id=task_id,
+            hot_days=request.hot_days,
+            archive_target=request.archive_target,
+            enabled=request.enabled
+        )
+        return policy.to_summary(is_default=False)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        logger.error(f"配置保留策略失败: {e}")
+        raise HTTPException(500, f"配置保留策略失败: {str(e)}")
+
+
+@router.delete(
+    "/system/retention/policies/{task_id}",
+    summary="删除结果保留策略",
+    description="删除任务的保留策略，恢复使用全局默认策略。"
+)
+async def delete_retention_policy(task_id: str):
+    """删除结果保留策略"""
+    deleted = await result_retention_service.policy_repo.delete(task_id)
+    return {"success": deleted, "task_id": task_id}
+
+
+@router.get(
+    "/system/retention/archives/{task_id}",
+    summary="查询归档分段",
+    description="列出任务已归档的结果分段（归档月份、位置、数量、回迁时间）。"
+)
+async def list_result_archives(task_id: str):
+    """查询归档分段"""
+    try:
+        segments = await result_retention_service.list_archives(task_id)
+        return {
+            "task_id": task_id,
+            "total_segments": len(segments),
+            "total_results": sum(segment.get("result_count", 0) for segment in segments),
+            "segments": [
+                {**segment, "segment_id": segment.pop("_id")} for segment in segments
+            ]
+        }
+    except Exception as e:
+        logger.error(f"查询归档分段失败: {e}")
+        raise HTTPException(500, f"查询归档分段失败: {str(e)}")
+
+
+@router.post(
+    "/system/maintenance/archive-results",
+    summary="执行结果归档",
+    description="在后台按保留策略把超过热数据保留期的搜索结果移入冷存储（与每日定时作业相同）。"
+)
+async def archive_results(background_tasks: BackgroundTasks, task_id: str = None):
+    """执行结果归档（后台执行）"""
+
+    async def _archive():
+        try:
+            await result_retention_service.run([task_id] if task_id else None)
+        except Exception as e:
+            logger.error(f"❌ 结果归档失败: {e}")
+
+    background_tasks.add_task(_archive)
+
+    return {
+        "success": True,
+        "message": "结果归档已在后台启动",
+        "task_id": task_id
+    }
+
+
+@router.post(
+    "/system/maintenance/rehydrate-results",
+    summary="回迁归档结果",
+    description="将任务的归档结果写回热集合（可指定月份 YYYYMM），回迁的结果在保留期内不会被再次归档。"
+)
+async def rehydrate_results(task_id: str, month: str = None):
+    """回迁归档结果"""
+    if month and (len(month) != 6 or not month.isdigit()):
+        raise HTTPException(400, "月份格式应为 YYYYMM")
+
+    try:
+        restored = await result_retention_service.rehydrate(task_id, month)
+        return {
+            "success": True,
+            "task_id": task_id,
+            "month": month,
+            "restored_count": restored
+        }
+    except Exception as e:
+        logger.error(f"回迁归档结果失败: {e}")
+        raise HTTPException(500, f"回迁归档结果失败: {str(e)}")
+
+
+@router.post(
+    "/system/maintenance/rebuild-report-search-index",
+    summary="重建报告搜索索引",
+    description="在后台重建报告跨任务搜索的倒排索引：指定 task_id 时只重建该任务（task_type 为 scheduled/instant），否则重建所有报告关联任务。"
+)
+async def rebuild_report_search_index(
+    background_tasks: BackgroundTasks,
+    task_id: str = None,
+    task_type: str = "scheduled"
+):
+    """重建报告搜索索引（后台执行）"""
+    if task_type not in ("scheduled", "instant"):
+        raise HTTPException(400, "task_type 应为 scheduled 或 instant")
+
+    async def _rebuild():
+        try:
+            if task_id:
+                await report_search_service.rebuild_task(task_type, task_id)
+            else:
+                result = await report_search_service.rebuild_report_tasks()
+                logger.info(f"🔎 报告搜索索引重建完成: {result['tasks']} 个任务, {result['documents']} 个文档")
+        except Exception as e:
+            logger.error(f"❌ 重建报告搜索索引失败: {e}")
+
+    background_tasks.add_task(_rebuild)
+
+    return {
+        "success": True,
+        "message": "报告搜索索引重建已在后台启动",
+        "task_id": task_id,
+        "task_type": task_type
+    }
+
+
+@router.post(
+    "/system/maintenance/reconcile-report-counts",
+    summary="报告计数对账",
+    description="按关联集合的实际数量修复报告的 task_count / data_item_count（定时作业之外的手动触发）。"
+)
+async def reconcile_report_counts():
+    """报告计数对账"""
+    try:
+        repaired = await summary_report_service.reconcile_report_counts()
+        return {"success": True, "repaired_count": repaired}
+    except Exception as e:
+        logger.error(f"报告计数对账失败: {e}")
+        raise HTTPException(500, f"报告计数对账失败: {str(e)}")
+
+
+@router.get(
+    "/system/stats/field-compression",
+    summary="文本字段压缩指标",
+    description="获取文本字段静态压缩的压缩率、节省字节数和编解码CPU耗时（当前进程累计）。"
+)
+async def get_field_compression_stats():
+    """文本字段压缩指标"""
+    return {
+        **field_codec.get_metrics(),
+        "timestamp": datetime.utcnow()
+    }
+
+
+@router.get(
+    "/system/stats/report-search-cache",
+    summary="报告搜索缓存命中率",
+    description="获取报告跨任务搜索缓存的命中/未命中次数和命中率（所有工作进程共享，存储在 Redis）。"
+)
+async def get_report_search_cache_stats():
+    """报告搜索缓存命中率"""
+    if not redis_client.is_available():
+        return {"available": False, "timestamp": datetime.utcnow()}
+
+    stats = await redis_client.hgetall_raw(cache_key_gen.report_search_stats())
+    hits = int(stats.get("hits", 0))
+    misses = int(stats.get("misses", 0))
+    lookups = hits + misses
+
+    return {
+        "available": True,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "timestamp": datetime.utcnow()
+    }
+
+
+@router.get(
+    "/system/stats/result-write-buffer",
+    summary="结果写缓冲指标",
+    description="获取搜索结果写后缓冲的刷新次数、合并程度、刷新耗时和背压等待次数（当前进程累计）。"
+)
+async def get_result_write_buffer_stats():
+    """结果写缓冲指标"""
+    return {
+        "enabled": settings.RESULT_WRITE_BUFFER_ENABLED,
+        **result_write_buffer.get_metrics(),
+        "timestamp": datetime.utcnow()
+    }
+
+
+@router.get(
+    "/system/stats/report-view-buffer",
+    summary="报告查看次数缓冲指标",
+    description="获取报告查看次数缓冲的记录次数、刷新次数、失败次数和待写入计数（当前进程累计）。"
+)
+async def get_report_view_buffer_stats():
+    """报告查看次数缓冲指标"""
+    return {
+        "enabled": settings.REPORT_VIEW_COUNT_BUFFER_ENABLED,
+        **view_count_buffer.get_metrics(),
+        "timestamp": datetime.utcnow()
+    }
+
+
+@router.get(
+    "/system/stats/report-jobs",
+    summary="报告后台作业指标",
+    description="获取报告后台作业的提交、复用、完成、失败、取消、接管次数及当前队列/执行中作业数（当前进程累计）。"
+)
+async def get_report_job_stats():
+    """报告后台作业指标"""
+    return {
+        **report_job_manager.get_metrics(),
+        "timestamp": datetime.utcnow()
+    }
+
+
 @router.get(
     "/system/stats/overview",
     summary="系统统计概览",
@@ -11,7 +11,12 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from src.core.domain.entities.search_result import SearchResult, ResultStatus
-from src.infrastructure.database.repositories import SearchTaskRepository, SearchResultRepository
+from src.infrastructure.database.repositories import (
+    SearchTaskRepository,
+    SearchResultRepository,
+    encode_result_id,
+    normalize_article_tag
+)
 from src.infrastructure.database.memory_repositories import InMemorySearchTaskRepository
 from src.infrastructure.database.connection import get_mongodb_database
 from src.utils.logger import get_logger
@@ -69,6 +74,9 @@ class SearchResultResponse(BaseModel):
     html_content: Optional[str] = Field(None, description="HTML格式内容(用于富文本显示和分析)")
     article_tag: Optional[str] = Field(None, description="文章标签")
     article_published_time: Optional[str] = Field(None, description="文章发布时间")
+    first_seen_at: Optional[datetime] = Field(None, description="首次发现时间")
+    last_seen_at: Optional[datetime] = Field(None, description="最近一次发现时间")
+    seen_count: int = Field(1, description="被多少次执行发现")
     # 已移除字段:
     # - published_date, author, language (业务字段)
     # - raw_data (冗余大字段)
@@ -87,6 +95,24 @@ class SearchResultListResponse(BaseModel):
     total_pages: int = Field(..., description="总页数")
     task_id: str = Field(..., description="任务ID")
     task_name: str = Field(..., description="任务名称")
+    next_cursor: Optional[str] = Field(None, description="下一页游标（传入cursor参数翻页，无下一页为空）")
+
+
+class ExecutionResultResponse(SearchResultResponse):
+    """单次执行发现的结果"""
+    is_new: bool = Field(..., description="是否为该次执行首次发现")
+    search_position: Optional[int] = Field(None, description="该次执行中的排名")
+
+
+class TaskExecutionSummary(BaseModel):
+    """定时执行记录"""
+    execution_id: str = Field(..., description="执行ID")
+    executed_at: datetime = Field(..., description="执行时间")
+    total_results: int = Field(..., description="本次返回结果数")
+    new_count: int = Field(..., description="首次发现的结果数")
+    duplicate_count: int = Field(..., description="之前已发现的结果数")
+    credits_used: int = Field(0, description="消耗积分")
+    success: bool = Field(True, description="是否成功")
 
 
 class SearchResultStats(BaseModel):
@@ -130,12 +156,35 @@ def result_to_response(result: SearchResult) -> SearchResultResponse:
         html_content=result.html_content,
         article_tag=result.article_tag,
         article_published_time=result.article_published_time,
+        first_seen_at=result.first_seen_at,
+        last_seen_at=result.last_seen_at,
+        seen_count=result.seen_count,
         # 已移除映射: published_date, author, language, raw_data,
         # relevance_score, quality_score, status, created_at, processed_at,
         # is_test_data, metadata
     )
 
 
+def document_to_response(doc: Dict[str, Any]) -> SearchResultResponse:
+    """将投影后的结果文档直接转换为响应模型（不构造实体）"""
+    return SearchResultResponse(
+        id=encode_result_id(doc["_id"]),
+        task_id=encode_result_id(doc["task_id"]),
+        title=doc.get("title", ""),
+        url=doc.get("url", ""),
+        content=doc.get("content", ""),
+        snippet=doc.get("snippet"),
+        source=doc.get("source", "web"),
+        markdown_content=doc.get("markdown_content"),
+        html_content=doc.get("html_content"),
+        article_tag=normalize_article_tag(doc.get("article_tag")),
+        article_published_time=doc.get("article_published_time"),
+        first_seen_at=doc.get("first_seen_at"),
+        last_seen_at=doc.get("last_seen_at"),
+        seen_count=doc.get("seen_count", 1),
+    )
+
+
 async def validate_task_exists(task_id: str) -> str:
     """验证任务是否存在，返回任务名称"""
     repo = await get_task_repository()
@@ -145,9 +194,13 @@ async def validate_task_exists(task_id: str) -> str:
     return task.name
 
 
-def calculate_result_stats(task_id: str, task_name: str, results: List[SearchResult]) -> SearchResultStats:
-    """计算搜索结果统计信息"""
-    if not results:
+def stats_document_to_response(
+    task_id: str,
+    task_name: str,
+    stats_doc: Optional[Dict[str, Any]]
+) -> SearchResultStats:
+    """将物化统计文档转换为统计响应模型"""
+    if not stats_doc or not stats_doc.get("total_results"):
         return SearchResultStats(
             task_id=task_id,
             task_name=task_name,
@@ -163,58 +216,45 @@ def calculate_result_stats(task_id: str, task_name: str, results: List[SearchRes
             last_updated=datetime.utcnow()
         )
 
-    # 状态统计
-    status_counts = {status.value: 0 for status in ResultStatus}
-    sources_dist = {}
-    languages_dist = {}
-    total_relevance = 0.0
-    total_quality = 0.0
-    min_date = None
-    max_date = None
-
-    for result in results:
-        # 状态统计
-        status_counts[result.status.value] += 1
-
-        # 来源统计
-        sources_dist[result.source] = sources_dist.get(result.source, 0) + 1
-
-        # 语言统计
-        if result.language:
-            languages_dist[result.language] = languages_dist.get(result.language, 0) + 1
-
-        # 分数统计
-        total_relevance += result.relevance_score
-        total_quality += result.quality_score
-
-        # 日期范围
-        if result.published_date:
-            if not min_date or result.published_date < min_date:
-                min_date = result.published_date
-            if not max_date or result.published_date > max_date:
-                max_date = result.published_date
-
-    total_count = len(results)
+    total_count = stats_doc["total_results"]
+    status_counts = stats_doc.get("status_counts", {})
 
     return SearchResultStats(
         task_id=task_id,
         task_name=task_name,
         total_results=total_count,
-        processed_count=status_counts.get("processed", 0),
-        pending_count=status_counts.get("pending", 0),
-        failed_count=status_counts.get("failed", 0),
-        average_relevance_score=total_relevance / total_count if total_count > 0 else 0.0,
-        average_quality_score=total_quality / total_count if total_count > 0 else 0.0,
-        sources_distribution=sources_dist,
-        languages_distribution=languages_dist,
+        processed_count=status_counts.get(ResultStatus.PROCESSED.value, 0),
+        pending_count=status_counts.get(ResultStatus.PENDING.value, 0),
+        failed_count=status_counts.get(ResultStatus.FAILED.value, 0),
+        average_relevance_score=min(stats_doc.get("relevance_sum", 0.0) / total_count, 1.0),
+        average_quality_score=min(stats_doc.get("quality_sum", 0.0) / total_count, 1.0),
+        sources_distribution=stats_doc.get("source_counts", {}),
+        languages_distribution=stats_doc.get("language_counts", {}),
         date_range={
-            "min_date": min_date,
-            "max_date": max_date
+            "min_date": stats_doc.get("min_published_date"),
+            "max_date": stats_doc.get("max_published_date")
         },
-        last_updated=datetime.utcnow()
+        last_updated=stats_doc.get("updated_at") or datetime.utcnow()
     )
 
 
+async def load_task_stats(task_id: str, task_name: str) -> SearchResultStats:
+    """
+    读取任务的物化统计
+
+    统计文档不存在时（历史数据未回填）按需重建一次
+    """
+    result_repo = await get_result_repository()
+    stats_repo = result_repo.stats_repo
+
+    stats_doc = await stats_repo.get_task_stats(task_id)
+    if stats_doc is None:
+        await stats_repo.rebuild_task_stats(task_id)
+        stats_doc = await stats_repo.get_task_stats(task_id)
+
+    return stats_document_to_response(task_id, task_name, stats_doc)
+
+
 # ==========================================
 # API端点
 # ==========================================
@@ -233,10 +273,13 @@ async def get_task_results(
     language: Optional[str] = Query(None, description="语言过滤"),
     min_relevance_score: Optional[float] = Query(None, ge=0, le=1, description="最小相关性评分"),
     min_quality_score: Optional[float] = Query(None, ge=0, le=1, description="最小质量评分"),
-    sort_by: str = Query("created_at", description="排序字段: created_at, relevance_score, quality_score, published_date"),
-    order: str = Query("desc", description="排序方向: asc, desc")
+    sort_by: str = Query("created_at", description="排序字段: created_at, relevance_score, quality_score, published_date, first_seen_at"),
+    order: str = Query("desc", description="排序方向: asc, desc"),
+    cursor: Optional[str] = Query(None, description="分页游标（来自上一页的next_cursor，提供时忽略page）"),
+    include_html: bool = Query(False, description="是否返回html_content（从内容块按需加载）"),
+    new_since: Optional[str] = Query(None, description="执行ID：只返回该次执行之后首次发现的结果")
 ):
-    """获取指定任务的历史搜索结果 - 从数据库读取"""
+    """获取指定任务的历史搜索结果 - 过滤、排序、分页均在数据库侧完成"""
 
     # 验证任务存在
     task_name = await validate_task_exists(task_id)
@@ -244,69 +287,42 @@ async def get_task_results(
     # 获取结果仓储
     result_repo = await get_result_repository()
 
-    # 从数据库获取所有结果（用于过滤和排序）
-    all_results, total_count = await result_repo.get_results_by_task(
-        task_id=task_id,
-        page=1,
-        page_size=10000  # 获取所有结果
-    )
+    first_seen_after = None
+    if new_since:
+        execution = await result_repo.task_execution_repo.get(task_id, new_since)
+        if not execution:
+            raise HTTPException(404, f"执行记录不存在: {new_since}")
+        first_seen_after = execution["executed_at"]
 
-    if not all_results:
-        return SearchResultListResponse(
-            items=[],
-            total=0,
-            page=page,
-            page_size=page_size,
-            total_pages=0,
+    try:
+        query_result = await result_repo.query_task_results(
             task_id=task_id,
-            task_name=task_name
-        )
-
-    # 过滤
-    filtered_results = all_results
-
-    if source:
-        filtered_results = [r for r in filtered_results if r.source == source]
-
-    if language:
-        filtered_results = [r for r in filtered_results if r.language == language]
-
-    if min_relevance_score is not None:
-        filtered_results = [r for r in filtered_results if r.relevance_score >= min_relevance_score]
-
-    if min_quality_score is not None:
-        filtered_results = [r for r in filtered_results if r.quality_score >= min_quality_score]
-
-    # 排序
-    sort_fields = {
-        "created_at": lambda r: r.created_at,
-        "relevance_score": lambda r: r.relevance_score,
-        "quality_score": lambda r: r.quality_score,
-        "published_date": lambda r: r.published_date or datetime.min
-    }
-
-    if sort_by in sort_fields:
-        filtered_results.sort(
-            key=sort_fields[sort_by],
-            reverse=(order == "desc")
+            source=source,
+            language=language,
+            min_relevance_score=min_relevance_score,
+            min_quality_score=min_quality_score,
+            sort_by=sort_by,
+            order=order,
+            page_size=page_size,
+            page=page,
+            cursor=cursor,
+            include_html=include_html,
+            first_seen_after=first_seen_after
         )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    # 分页
-    total = len(filtered_results)
-    total_pages = (total + page_size - 1) // page_size
-    start = (page - 1) * page_size
-    end = min(start + page_size, total)
-
-    page_results = filtered_results[start:end]
+    total = query_result["total"]
 
     return SearchResultListResponse(
-        items=[result_to_response(r) for r in page_results],
+        items=[document_to_response(doc) for doc in query_result["items"]],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages,
+        total_pages=(total + page_size - 1) // page_size,
         task_id=task_id,
-        task_name=task_name
+        task_name=task_name,
+        next_cursor=query_result["next_cursor"]
     )
 
 
@@ -317,22 +333,12 @@ async def get_task_results(
     description="获取指定搜索任务的结果统计信息，包括数量分布、评分情况、来源分析等。"
 )
 async def get_task_result_stats(task_id: str):
-    """获取任务搜索结果统计 - 从数据库读取"""
+    """获取任务搜索结果统计 - 读取物化统计文档"""
 
     # 验证任务存在
     task_name = await validate_task_exists(task_id)
 
-    # 获取结果仓储
-    result_repo = await get_result_repository()
-
-    # 从数据库获取所有结果
-    task_results, _ = await result_repo.get_results_by_task(
-        task_id=task_id,
-        page=1,
-        page_size=10000
-    )
-
-    return calculate_result_stats(task_id, task_name, task_results)
+    return await load_task_stats(task_id, task_name)
 
 
 @router.get(
@@ -342,7 +348,7 @@ async def get_task_result_stats(task_id: str):
     description="获取任务搜索结果的摘要信息，包括统计数据和最近结果，适用于任务详情页面展示。"
 )
 async def get_task_result_summary(task_id: str):
-    """获取任务结果摘要 - 从数据库读取"""
+    """获取任务结果摘要 - 物化统计 + 最近5条结果"""
 
     # 验证任务存在
     task_name = await validate_task_exists(task_id)
@@ -350,34 +356,95 @@ async def get_task_result_summary(task_id: str):
     # 获取结果仓储
     result_repo = await get_result_repository()
 
-    # 从数据库获取所有结果
-    task_results, _ = await result_repo.get_results_by_task(
-        task_id=task_id,
-        page=1,
-        page_size=10000
-    )
+    # 计算统计信息
+    stats = await load_task_stats(task_id, task_name)
 
     # 获取最近的5条结果
-    recent_results = sorted(task_results, key=lambda r: r.created_at, reverse=True)[:5]
-
-    # 计算统计信息
-    stats = calculate_result_stats(task_id, task_name, task_results)
+    recent_results = await result_repo.get_latest_results(task_id=task_id, limit=5)
 
     return SearchResultSummary(
-        total_results=len(task_results),
+        total_results=stats.total_results,
         recent_results=[result_to_response(r) for r in recent_results],
         stats=stats
     )
 
 
+@router.get(
+    "/{task_id}/executions",
+    response_model=List[TaskExecutionSummary],
+    summary="获取任务执行记录",
+    description="获取任务最近的定时执行记录，包括每次执行首次发现的结果数和重复结果数。"
+)
+async def get_task_executions(
+    task_id: str,
+    limit: int = Query(20, ge=1, le=100, description="返回的执行记录数")
+):
+    """获取任务执行记录 - 按执行时间倒序"""
+
+    # 验证任务存在
+    await validate_task_exists(task_id)
+
+    result_repo = await get_result_repository()
+    executions = await result_repo.task_execution_repo.list_by_task(task_id, limit)
+
+    return [
+        TaskExecutionSummary(
+            execution_id=execution["_id"],
+            executed_at=execution["executed_at"],
+            total_results=execution.get("total_results", 0),
+            new_count=execution.get("new_count", 0),
+            duplicate_count=execution.get("duplicate_count", 0),
+            credits_used=execution.get("credits_used", 0),
+            success=execution.get("success", True)
+        )
+        for execution in executions
+    ]
+
+
+@router.get(
+    "/{task_id}/executions/{execution_id}/results",
+    response_model=List[ExecutionResultResponse],
+    summary="获取单次执行的结果",
+    description="获取某次执行发现的结果（按该次排名排序），每条结果标记是否为该次执行首次发现。"
+)
+async def get_execution_results(
+    task_id: str,
+    execution_id: str,
+    only_new: bool = Query(False, description="只返回该次执行首次发现的结果")
+):
+    """获取单次执行的结果 - 通过执行-结果映射查询"""
+
+    # 验证任务存在
+    await validate_task_exists(task_id)
+
+    result_repo = await get_result_repository()
+    if not await result_repo.task_execution_repo.get(task_id, execution_id):
+        raise HTTPException(404, f"执行记录不存在: {execution_id}")
+
+    items = await result_repo.get_execution_results(task_id, execution_id, only_new)
+
+    return [
+        ExecutionResultResponse(
+            **document_to_response(doc).model_dump(),
+            is_new=doc["is_new"],
+            search_position=doc.get("search_position")
+        )
+        for doc in items
+    ]
+
+
 @router.get(
     "/{task_id}/results/{result_id}",
     response_model=SearchResultResponse,
     summary="获取单个搜索结果详情",
     description="获取指定搜索结果的详细信息，包括完整内容、元数据等。"
 )
-async def get_search_result_detail(task_id: str, result_id: str):
-    """获取单个搜索结果详情 - 从数据库读取"""
+async def get_search_result_detail(
+    task_id: str,
+    result_id: str,
+    include_html: bool = Query(True, description="是否返回html_content（大字段，不需要时可关闭以减少传输）")
+):
+    """获取单个搜索结果详情 - 按 _id 索引点查"""
 
     # 验证任务存在
     await validate_task_exists(task_id)
@@ -385,15 +452,12 @@ async def get_search_result_detail(task_id: str, result_id: str):
     # 获取结果仓储
     result_repo = await get_result_repository()
 
-    # 从数据库查找结果
-    task_results, _ = await result_repo.get_results_by_task(
+    result = await result_repo.get_by_id(
         task_id=task_id,
-        page=1,
-        page_size=10000
+        result_id=result_id,
+        include_html=include_html
     )
+    if not result:
+        raise HTTPException(404, f"搜索结果不存在: {result_id}")
 
-    for result in task_results:
-        if str(result.id) == result_id:
-            return result_to_response(result)
-
-    raise HTTPException(404, f"搜索结果不存在: {result_id}")
\ No newline at end of file
+    return result_to_response(result)
@@ -130,10 +130,11 @@ class SearchTaskResponse(BaseModel):
 class SearchTaskListResponse(BaseModel):
     """任务列表响应"""
     items: List[SearchTaskResponse] = Field(..., description="任务列表")
-    total: int = Field(..., description="总数量")
+    total: Optional[int] = Field(None, description="总数量（include_total=false 时为空）")
     page: int = Field(..., description="当前页码")
     page_size: int = Field(..., description="每页大小")
-    total_pages: int = Field(..., description="总页数")
+    total_pages: Optional[int] = Field(None, description="总页数（include_total=false 时为空）")
+    next_cursor: Optional[str] = Field(None, description="下一页游标（传入cursor参数翻页，无下一页为空）")
 
 
 class ScheduleIntervalOption(BaseModel):
@@ -260,27 +261,34 @@ async def list_search_tasks(
     page_size: int = Query(20, ge=1, le=100, description="每页大小"),
     status: Optional[str] = Query(None, description="任务状态过滤"),
     is_active: Optional[bool] = Query(None, description="启用状态过滤"),
-    query: Optional[str] = Query(None, description="关键词模糊查询")
+    query: Optional[str] = Query(None, description="关键词模糊查询"),
+    cursor: Optional[str] = Query(None, description="分页游标（来自上一页的next_cursor，提供时忽略page）"),
+    include_total: bool = Query(True, description="是否返回总数（深分页时可关闭以减少开销）")
 ):
     """获取搜索任务列表"""
     repo = await get_task_repository()
-    tasks, total = await repo.list_tasks(
-        page=page,
-        page_size=page_size,
-        status=status,
-        is_active=is_active,
-        query=query
-    )
-    
-    # 计算总页数
-    total_pages = (total + page_size - 1) // page_size
-    
+    try:
+        query_result = await repo.query_tasks(
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            status=status,
+            is_active=is_active,
+            query=query,
+            include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    total = query_result["total"]
+
     return SearchTaskListResponse(
-        items=[task_to_response(t) for t in tasks],
+        items=[task_to_response(t) for t in query_result["items"]],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=(total + page_size - 1) // page_size if total is not None else None,
+        next_cursor=query_result["next_cursor"]
     )
 
 
@@ -5,20 +5,29 @@
 2. 任务关联管理
 3. 数据检索与搜索
 4. 内容编辑与版本管理
-5. LLM/AI生成（预留）
+5. LLM/AI生成（后台作业）
 """
+import json
+from datetime import date
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+from src.services.report_analysis_engine import ANALYSIS_TYPES
+from src.services.report_job_manager import JOB_ANALYSIS, JOB_GENERATE, report_job_manager
 from src.services.summary_report_service import summary_report_service
 from src.core.domain.entities.summary_report import (
     SummaryReport,
     SummaryReportTask,
     SummaryReportDataItem,
-    SummaryReportVersion
+    SummaryReportVersion,
+    SummaryReportJob
 )
+from src.infrastructure.database.summary_report_repositories import SummaryReportDataItemRepository
 from src.utils.cursor_pagination import cursor_paginator
+from src.utils.field_codec import field_codec
 
 router = APIRouter(prefix="/summary-reports")
 
@@ -88,6 +97,20 @@ class AddDataItemRequest(BaseModel):
     importance: int = Field(default=0)
 
 
+class BulkAddDataItemsRequest(BaseModel):
+    """批量添加搜索结果为数据项"""
+    source_type: str = Field(..., description="来源类型: search_result/instant_search_result")
+    added_by: str = Field(..., description="添加者ID")
+    result_ids: List[str] = Field(default_factory=list, description="结果ID列表（与 task_id 二选一）")
+    task_id: Optional[str] = Field(None, description="任务ID：添加该任务下符合过滤条件的全部结果")
+    source: Optional[str] = Field(None, description="来源过滤（仅定时搜索结果）")
+    language: Optional[str] = Field(None, description="语言过滤（仅定时搜索结果）")
+    min_relevance_score: Optional[float] = Field(None, ge=0, le=1, description="最小相关性评分")
+    min_quality_score: Optional[float] = Field(None, ge=0, le=1, description="最小质量评分（仅定时搜索结果）")
+    tags: List[str] = Field(default_factory=list)
+    importance: int = Field(default=0)
+
+
 # 内容编辑相关
 class UpdateContentRequest(BaseModel):
     """更新报告内容"""
@@ -100,8 +123,8 @@ class UpdateContentRequest(BaseModel):
 
 # LLM生成相关（预留）
 class GenerateReportRequest(BaseModel):
-    """生成报告请求（预留）"""
-    generation_mode: str = Field(default="comprehensive", description="生成模式")
+    """生成报告请求"""
+    generation_mode: str = Field(default="comprehensive", description="生成模式: comprehensive/summary/analysis")
     llm_config: Optional[Dict[str, Any]] = None
 
 
@@ -286,6 +309,11 @@ async def get_report(
         return response
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"无效的游标: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -500,6 +528,9 @@ async def get_report_data_items(
             direction=-1  # 最新添加的在前
         )
 
+        for item in result["items"]:
+            field_codec.decode_document(item, SummaryReportDataItemRepository.COMPRESSED_FIELDS)
+
         return result
     except ValueError as e:
         raise HTTPException(
@@ -542,6 +573,53 @@ async def add_data_item(report_id: str, request: AddDataItemRequest):
         )
 
 
+@router.post("/{report_id}/data/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_add_data_items(report_id: str, request: BulkAddDataItemsRequest):
+    """
+    批量添加搜索结果为数据项
+
+    - 提供 result_ids：按结果ID批量添加
+    - 提供 task_id：添加该任务下符合过滤条件的全部结果（无需客户端翻页）
+
+    已在报告中的结果会被跳过；单次最多添加 REPORT_BULK_ADD_MAX_ITEMS 条，
+    超出时 truncated 为 true
+    """
+    try:
+        result = await summary_report_service.add_data_items_from_results(
+            report_id=report_id,
+            source_type=request.source_type,
+            added_by=request.added_by,
+            result_ids=request.result_ids,
+            task_id=request.task_id,
+            filters={
+                "source": request.source,
+                "language": request.language,
+                "min_relevance_score": request.min_relevance_score,
+                "min_quality_score": request.min_quality_score
+            },
+            tags=request.tags,
+            importance=request.importance
+        )
+        if result is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"报告不存在: {report_id}"
+            )
+        return {"report_id": report_id, **result}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"批量添加数据项失败: {str(e)}"
+        )
+
+
 # ==========================================
 # 模块4: 内容编辑与版本管理
 # ==========================================
@@ -625,6 +703,46 @@ async def get_report_versions(
         )
 
 
+@router.get("/{report_id}/versions/storage")
+async def get_version_storage_stats(report_id: str):
+    """
+    获取报告版本存储占用
+
+    返回快照/增量版本数量、实际存储字节数、全部保存完整快照时的字节数及压缩比
+    """
+    try:
+        return await summary_report_service.get_version_storage_stats(report_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询版本存储占用失败: {str(e)}"
+        )
+
+
+@router.get("/{report_id}/versions/{version_number}", response_model=SummaryReportVersion)
+async def get_report_version(report_id: str, version_number: int):
+    """
+    获取指定版本的完整内容
+
+    增量存储的版本从最近的快照回放还原，用于版本预览和对比
+    """
+    try:
+        version = await summary_report_service.get_report_version(report_id, version_number)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"版本不存在: {version_number}"
+            )
+        return version
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询版本失败: {str(e)}"
+        )
+
+
 @router.post("/{report_id}/versions/{version_number}/restore")
 async def rollback_to_version(
     report_id: str,
@@ -664,28 +782,54 @@ async def rollback_to_version(
 
 
 # ==========================================
-# 模块5: LLM/AI生成（预留接口）
+# 模块5: LLM/AI生成（后台作业）
 # ==========================================
 
+async def _submit_report_job(report_id: str, job_type: str, params: Dict[str, Any]) -> JSONResponse:
+    """提交报告作业（新建返回 202，复用已有活跃作业返回 200）"""
+    if not await summary_report_service.report_exists(report_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"报告不存在: {report_id}"
+        )
+
+    job, created = await report_job_manager.submit(report_id, job_type, params)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+        content={"job": jsonable_encoder(job), "created": created}
+    )
+
+
+async def _get_report_job(report_id: str, job_id: str) -> SummaryReportJob:
+    """查询报告的作业（不存在或不属于该报告时返回 404）"""
+    job = await report_job_manager.get_job(job_id)
+    if job is None or job.report_id != report_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"作业不存在: {job_id}"
+        )
+    return job
+
+
 @router.post("/{report_id}/generate")
 async def generate_report_with_llm(
     report_id: str,
     request: GenerateReportRequest
 ):
     """
-    使用LLM生成报告总结（预留接口）
+    使用LLM生成报告总结（后台作业）
 
-    调用LLM服务生成报告内容
-    待LLM模块开发完成后实现
+    数据项按 token 预算分块生成摘要后合并为报告（map-reduce），未变化的块复用缓存摘要。
+    同一报告已有生成作业在执行时返回该作业（200），否则新建作业（202）。
+    进度通过 GET /{report_id}/jobs/{job_id}/events 订阅
     """
     try:
-        result = await summary_report_service.generate_report_with_llm(
-            report_id=report_id,
-            generation_mode=request.generation_mode,
-            llm_config=request.llm_config
-        )
-
-        return result
+        return await _submit_report_job(report_id, JOB_GENERATE, {
+            "generation_mode": request.generation_mode,
+            "llm_config": request.llm_config
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -696,23 +840,143 @@ async def generate_report_with_llm(
 @router.get("/{report_id}/analysis")
 async def analyze_report_data_with_ai(
     report_id: str,
-    analysis_type: str = Query(default="trend", description="分析类型")
+    analysis_type: str = Query(default="trend", description="分析类型: keyword/trend")
 ):
     """
-    使用AI分析报告数据（预留接口）
+    分析报告数据（关键词 keyword / 趋势 trend，本地 TF-IDF）
+
+    报告数据未变化且已有分析结果时直接返回（result，job 为 null）；
+    否则同一报告已有分析作业在执行时返回该作业（200），或新建作业（202），
+    分析结果在作业结束后记录在作业的 result 字段。
 
-    调用AI服务进行数据分析
-    待AI模块开发完成后实现
+    分析对象是手动添加到报告的数据项；报告关联任务全部结果的趋势见 GET /{report_id}/trend
     """
     try:
-        result = await summary_report_service.analyze_report_data_with_ai(
-            report_id=report_id,
-            analysis_type=analysis_type
-        )
+        if analysis_type not in ANALYSIS_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"不支持的分析类型: {analysis_type}，可选: {', '.join(ANALYSIS_TYPES)}"
+            )
 
-        return result
+        cached = await summary_report_service.get_cached_analysis(report_id, analysis_type)
+        if cached is not None:
+            return {"job": None, "created": False, "result": cached}
+
+        return await _submit_report_job(report_id, JOB_ANALYSIS, {"analysis_type": analysis_type})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"AI分析失败: {str(e)}"
         )
+
+
+@router.get("/{report_id}/trend")
+async def get_report_trend(
+    report_id: str,
+    start_date: Optional[date] = Query(None, description="起始日期（含，UTC），默认最近30天"),
+    end_date: Optional[date] = Query(None, description="结束日期（含，UTC），默认今天"),
+    granularity: str = Query("day", description="时间粒度: day/week/month")
+):
+    """
+    获取报告关联任务的结果趋势
+
+    由任务按天趋势桶（结果入库时增量维护）一次聚合得到，同步返回：
+    每个周期的结果数/新结果数/共享结果数、主要域名、关键词和近期上升的关键词
+    """
+    try:
+        if not await summary_report_service.report_exists(report_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"报告不存在: {report_id}"
+            )
+
+        return await summary_report_service.get_report_trend(
+            report_id,
+            start_date=start_date,
+            end_date=end_date,
+            granularity=granularity
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询报告趋势失败: {str(e)}"
+        )
+
+
+@router.get("/{report_id}/jobs", response_model=List[SummaryReportJob])
+async def list_report_jobs(
+    report_id: str,
+    limit: int = Query(20, ge=1, le=100, description="返回数量")
+):
+    """获取报告最近的生成/分析作业"""
+    try:
+        return await report_job_manager.list_jobs(report_id, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"获取作业列表失败: {str(e)}"
+        )
+
+
+@router.get("/{report_id}/jobs/{job_id}", response_model=SummaryReportJob)
+async def get_report_job(report_id: str, job_id: str):
+    """获取报告作业状态和进度"""
+    try:
+        return await _get_report_job(report_id, job_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"获取作业失败: {str(e)}"
+        )
+
+
+@router.post("/{report_id}/jobs/{job_id}/cancel", response_model=SummaryReportJob)
+async def cancel_report_job(report_id: str, job_id: str):
+    """
+    取消报告作业
+
+    排队中的作业立即取消；执行中的作业在完成当前块后中止（status 变为 cancelled）
+    """
+    try:
+        await _get_report_job(report_id, job_id)
+        return await report_job_manager.cancel(job_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"取消作业失败: {str(e)}"
+        )
+
+
+@router.get("/{report_id}/jobs/{job_id}/events")
+async def stream_report_job_events(report_id: str, job_id: str):
+    """
+    订阅报告作业事件（Server-Sent Events）
+
+    首个事件为当前状态（status），之后推送 started/progress 事件，作业结束时推送
+    completed/failed/cancelled 事件并关闭连接；无变化时定期发送 ping 保持连接
+    """
+    await _get_report_job(report_id, job_id)
+
+    async def event_stream():
+        async for event in report_job_manager.events(job_id):
+            data = json.dumps(jsonable_encoder(event), ensure_ascii=False)
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
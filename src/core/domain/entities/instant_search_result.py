@@ -54,8 +54,10 @@ class InstantSearchResult:
     url_normalized: str = ""  # 规范化URL（去除查询参数、锚点等）
 
     # Firecrawl 特定字段
-    markdown_content: Optional[str] = None  # Markdown 格式内容
-    html_content: Optional[str] = None  # HTML 格式内容
+    markdown_content: Optional[str] = None  # Markdown 格式内容（存储时超长部分移入内容块，只保留预览）
+    html_content: Optional[str] = None  # HTML 格式内容（存储时移入内容块）
+    markdown_ref: Optional[str] = None  # 完整Markdown内容块引用（content_blobs）
+    html_ref: Optional[str] = None  # HTML内容块引用（content_blobs）
 
     # 元数据
     source: str = "web"  # 来源：web, news, academic 等
@@ -167,6 +169,8 @@ class InstantSearchResult:
             "url_normalized": self.url_normalized,
             "markdown_content": self.markdown_content,
             "html_content": self.html_content,
+            "markdown_ref": self.markdown_ref,
+            "html_ref": self.html_ref,
             "source": self.source,
             "published_date": self.published_date.isoformat() if self.published_date else None,
             "author": self.author,
@@ -0,0 +1,75 @@
+"""搜索结果保留策略实体模型
+
+search_results 按任务配置"热数据保留天数"：
+- 超过保留期的结果移出热集合，写入冷存储（月度归档集合或本地 JSONL.gz 文件）
+- 每次归档写入一个归档分段（segment），登记在 result_archive_index 中，用于按需回迁
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class ArchiveTarget(Enum):
+    """归档目标枚举"""
+    COLLECTION = "collection"  # 月度归档集合 search_results_archive_YYYYMM
+    JSONL = "jsonl"            # 本地压缩文件 {task_id}/{YYYYMM}/{segment_id}.jsonl.gz
+
+
+def archive_month(value: datetime) -> str:
+    """结果所属的归档月份（YYYYMM）"""
+    return value.strftime("%Y%m")
+
+
+def archive_collection_name(month: str) -> str:
+    """月度归档集合名称"""
+    return f"search_results_archive_{month}"
+
+
+@dataclass
+class ResultRetentionPolicy:
+    """搜索结果保留策略（按任务配置，未配置的任务使用全局默认值）"""
+    task_id: str
+    hot_days: int = 90  # 热集合中保留的天数
+    archive_target: ArchiveTarget = ArchiveTarget.COLLECTION
+    enabled: bool = True  # 关闭后该任务的结果永久保留在热集合
+
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为存储字典"""
+        return {
+            "_id": self.task_id,
+            "hot_days": self.hot_days,
+            "archive_target": self.archive_target.value,
+            "enabled": self.enabled,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResultRetentionPolicy":
+        """从存储字典创建"""
+        return cls(
+            task_id=data["_id"],
+            hot_days=data.get("hot_days", 90),
+            archive_target=ArchiveTarget(data.get("archive_target", ArchiveTarget.COLLECTION.value)),
+            enabled=data.get("enabled", True),
+            created_at=data.get("created_at", datetime.utcnow()),
+            updated_at=data.get("updated_at", datetime.utcnow())
+        )
+
+    def to_summary(self, is_default: Optional[bool] = None) -> Dict[str, Any]:
+        """返回API摘要信息"""
+        summary = {
+            "task_id": self.task_id,
+            "hot_days": self.hot_days,
+            "archive_target": self.archive_target.value,
+            "enabled": self.enabled,
+            "updated_at": self.updated_at.isoformat()
+        }
+        if is_default is not None:
+            summary["is_default"] = is_default
+        return summary
@@ -1,9 +1,10 @@
 """搜索结果实体模型"""
 
+import hashlib
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from uuid import UUID, uuid4
 
 
@@ -18,8 +19,8 @@ class ResultStatus(Enum):
 @dataclass
 class SearchResult:
     """搜索结果实体"""
-    id: UUID = field(default_factory=uuid4)
-    task_id: UUID = field(default_factory=uuid4)  # 关联的任务ID
+    id: Union[str, UUID] = field(default_factory=uuid4)  # 存储与API中统一为字符串形式
+    task_id: Union[str, UUID] = field(default_factory=uuid4)  # 关联的任务ID（通常为雪花算法ID字符串）
     
     # 搜索结果核心数据
     title: str = ""
@@ -36,6 +37,7 @@ class SearchResult:
     # Firecrawl 特定字段 - 优化版
     markdown_content: Optional[str] = None  # Markdown 格式内容(最大5000字符)
     html_content: Optional[str] = None  # HTML格式内容(用于富文本显示和分析)
+    html_ref: Optional[str] = None  # HTML内容块引用(content_blobs，html_content 按需加载)
     article_tag: Optional[str] = None  # 文章标签 (article:tag)
     article_published_time: Optional[str] = None  # 文章发布时间 (article:published_time)
 
@@ -61,6 +63,23 @@ class SearchResult:
     
     # 测试模式标记
     is_test_data: bool = False  # 是否为测试数据
+
+    # 跨执行去重（同一任务内按 content_hash 去重，重复出现只更新发现信息）
+    content_hash: str = ""  # MD5(title + url + content)，与即时搜索相同的去重键
+    first_seen_at: Optional[datetime] = None  # 首次发现时间
+    last_seen_at: Optional[datetime] = None  # 最近一次发现时间
+    seen_count: int = 1  # 被多少次执行发现
+    first_execution_id: Optional[str] = None  # 首次发现该结果的执行ID
+    last_execution_id: Optional[str] = None  # 最近一次发现该结果的执行ID
+
+    def compute_content_hash(self) -> str:
+        """
+        计算内容哈希值
+
+        哈希算法与即时搜索结果一致：MD5(title + url + content)
+        """
+        content_str = f"{self.title}||{self.url}||{self.content}"
+        return hashlib.md5(content_str.encode('utf-8')).hexdigest()
     
     def mark_as_processed(self) -> None:
         """标记为已处理"""
@@ -53,6 +53,17 @@ class ScheduleInterval(Enum):
         }
 
 
+# 执行统计字段：只由仓储的 record_execution_stats 原子更新，普通更新不覆盖
+EXECUTION_STATS_FIELDS = (
+    "last_executed_at",
+    "execution_count",
+    "success_count",
+    "failure_count",
+    "total_results",
+    "total_credits_used"
+)
+
+
 def _generate_secure_id() -> str:
     """生成安全的雪花算法ID"""
     return generate_string_id()
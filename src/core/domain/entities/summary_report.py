@@ -29,6 +29,15 @@ class ReportStatus(Enum):
     ARCHIVED = "archived"            # 已归档
 
 
+class ReportJobStatus(Enum):
+    """报告后台作业状态枚举"""
+    QUEUED = "queued"                # 排队中
+    RUNNING = "running"              # 执行中
+    COMPLETED = "completed"          # 已完成
+    FAILED = "failed"                # 失败
+    CANCELLED = "cancelled"          # 已取消
+
+
 class TaskType(Enum):
     """任务类型枚举"""
     SCHEDULED = "scheduled"          # 定时任务 (SearchTask)
@@ -72,6 +81,10 @@ class SummaryReport(BaseModel):
         description="LLM/AI生成配置（预留接口）"
     )
 
+    # LLM生成进度与 token 用量（最近一次生成）
+    generation_progress: Optional[Dict[str, Any]] = Field(default=None, description="生成进度")
+    generation_usage: Optional[Dict[str, Any]] = Field(default=None, description="最近一次生成的 token 用量")
+
     # 版本管理
     version: int = Field(default=1, description="当前版本号")
     auto_version: bool = Field(default=True, description="是否自动版本管理")
@@ -200,9 +213,17 @@ class SummaryReportVersion(BaseModel):
     report_id: str = Field(default="", description="所属报告ID")
     version_number: int = Field(default=1, description="版本号")
 
-    # 版本内容快照
+    # 版本内容快照（增量版本只保存格式等元信息，text 由 delta 相对 base_version 还原）
     content_snapshot: Dict[str, Any] = Field(default_factory=dict, description="内容快照")
 
+    # 存储方式（周期快照 + 文本增量）
+    storage: str = Field(default="snapshot", description="存储方式: snapshot/delta")
+    delta: Optional[List[Any]] = Field(default=None, description="相对基准版本的行级文本增量")
+    base_version: Optional[int] = Field(default=None, description="增量的基准版本号")
+    chain_length: int = Field(default=0, description="距最近快照的增量层数")
+    stored_size: int = Field(default=0, description="实际存储的内容大小（字节）")
+    full_size: int = Field(default=0, description="完整内容大小（字节）")
+
     # 变更信息
     change_description: Optional[str] = Field(default=None, description="变更描述")
     change_type: str = Field(default="manual", description="变更类型: manual/auto_generated/ai_generated")
@@ -213,3 +234,35 @@ class SummaryReportVersion(BaseModel):
 
     # 统计信息
     content_size: int = Field(default=0, description="内容大小（字符数）")
+
+
+class SummaryReportJob(BaseModel):
+    """
+    报告后台作业实体
+
+    报告生成/分析在后台执行，同一报告同一类型同一去重键同时只有一个活跃作业（active=True），
+    执行进程定期写入心跳，进程退出后心跳过期的作业由其他进程或重启后的进程接管
+    """
+    job_id: str = Field(default_factory=_generate_secure_id, description="作业唯一标识")
+    report_id: str = Field(default="", description="报告ID")
+    job_type: str = Field(default="generate", description="作业类型: generate/analysis")
+    params: Dict[str, Any] = Field(default_factory=dict, description="作业参数")
+    job_key: Optional[str] = Field(default=None, description="去重键（区分同类型不同参数的作业，如分析类型）")
+
+    # 状态
+    status: str = Field(default="queued", description="作业状态: queued/running/completed/failed/cancelled")
+    active: Optional[bool] = Field(default=True, description="是否活跃（结束后置空，唯一约束只作用于活跃作业）")
+    cancel_requested: bool = Field(default=False, description="是否已请求取消")
+
+    # 执行（检查点）
+    owner: Optional[str] = Field(default=None, description="执行进程标识")
+    heartbeat_at: Optional[datetime] = Field(default=None, description="最近心跳时间")
+    attempts: int = Field(default=0, description="执行次数（重启接管后递增）")
+    progress: Dict[str, Any] = Field(default_factory=dict, description="最近一次进度")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="执行结果摘要")
+    error: Optional[str] = Field(default=None, description="失败原因")
+
+    # 元数据
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="创建时间")
+    started_at: Optional[datetime] = Field(default=None, description="开始执行时间")
+    finished_at: Optional[datetime] = Field(default=None, description="结束时间")
@@ -7,11 +7,12 @@
 - 异步操作支持
 - 自动序列化/反序列化
 - TTL 管理
-- 缓存失效策略
+- 缓存失效策略（代数计数器：键中嵌入代数，失效只需一次 INCR，旧代数的键随 TTL 过期）
 """
 
+import hashlib
 import json
-from typing import Optional, Any, Union
+from typing import Dict, Optional, Any, Union
 from datetime import timedelta
 import redis.asyncio as redis
 from redis.exceptions import RedisError
@@ -252,6 +253,160 @@ class RedisClient:
             logger.error(f"❌ 计数器递增失败: {key} - {e}")
             return None
 
+    async def get_generation(self, key: str) -> int:
+        """
+        读取代数计数器
+
+        Args:
+            key: 代数计数器键
+
+        Returns:
+            int: 当前代数（不存在或 Redis 不可用时为 0）
+        """
+        if not self.is_available():
+            return 0
+
+        try:
+            value = await self._redis.get(key)
+            return int(value) if value is not None else 0
+
+        except (RedisError, ValueError) as e:
+            logger.error(f"❌ 代数读取失败: {key} - {e}")
+            return 0
+
+    async def bump_generation(
+        self,
+        key: str,
+        ttl: Optional[Union[int, timedelta]] = None
+    ) -> Optional[int]:
+        """
+        递增代数计数器（使嵌入旧代数的所有缓存键失效）
+
+        Args:
+            key: 代数计数器键
+            ttl: 计数器过期时间（需远大于缓存条目的 TTL，每次递增时刷新）
+
+        Returns:
+            int | None: 递增后的代数
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            if isinstance(ttl, timedelta):
+                ttl = int(ttl.total_seconds())
+
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.incr(key)
+                if ttl:
+                    pipe.expire(key, ttl)
+                results = await pipe.execute()
+            return results[0]
+
+        except RedisError as e:
+            logger.error(f"❌ 代数递增失败: {key} - {e}")
+            return None
+
+    async def hincr(self, key: str, field: str, amount: int = 1) -> Optional[int]:
+        """
+        原子递增哈希字段（用于跨进程共享的计数指标）
+
+        Args:
+            key: 哈希键
+            field: 字段名
+            amount: 递增量（默认1）
+
+        Returns:
+            int | None: 递增后的值
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            return await self._redis.hincrby(key, field, amount)
+
+        except RedisError as e:
+            logger.error(f"❌ 哈希计数递增失败: {key}[{field}] - {e}")
+            return None
+
+    async def hgetall_raw(self, key: str) -> Dict[str, str]:
+        """
+        获取哈希的全部字段（原始字符串）
+
+        Args:
+            key: 哈希键
+
+        Returns:
+            dict: 字段 -> 值（不存在或 Redis 不可用时为空）
+        """
+        if not self.is_available():
+            return {}
+
+        try:
+            return await self._redis.hgetall(key)
+
+        except RedisError as e:
+            logger.error(f"❌ 哈希读取失败: {key} - {e}")
+            return {}
+
+    async def hset_raw(
+        self,
+        key: str,
+        field: str,
+        value: str,
+        ttl: Optional[Union[int, timedelta]] = None
+    ) -> bool:
+        """
+        设置哈希字段（原始字符串，不做JSON序列化）
+
+        Args:
+            key: 哈希键
+            field: 字段名
+            value: 字段值（调用方已编码的字符串）
+            ttl: 整个哈希的过期时间（秒或 timedelta 对象）
+
+        Returns:
+            bool: 是否设置成功
+        """
+        if not self.is_available():
+            return False
+
+        try:
+            if isinstance(ttl, timedelta):
+                ttl = int(ttl.total_seconds())
+
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, value)
+                if ttl:
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+            return True
+
+        except RedisError as e:
+            logger.error(f"❌ 哈希字段设置失败: {key}[{field}] - {e}")
+            return False
+
+    async def hget_raw(self, key: str, field: str) -> Optional[str]:
+        """
+        获取哈希字段（原始字符串）
+
+        Args:
+            key: 哈希键
+            field: 字段名
+
+        Returns:
+            str | None: 字段值，不存在则返回 None
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            return await self._redis.hget(key, field)
+
+        except RedisError as e:
+            logger.error(f"❌ 哈希字段读取失败: {key}[{field}] - {e}")
+            return None
+
 
 # 全局 Redis 客户端实例
 redis_client = RedisClient()
@@ -264,11 +419,46 @@ class CacheKeyGenerator:
     PREFIX = "guanshan"  # 项目前缀
 
     @staticmethod
-    def search_result(report_id: str, search_query: str, limit: int) -> str:
-        """搜索结果缓存键"""
-        # 使用哈希值以处理长查询字符串
-        query_hash = hash(search_query)
-        return f"{CacheKeyGenerator.PREFIX}:search:{report_id}:{query_hash}:{limit}"
+    def digest(*parts: Any) -> str:
+        """
+        稳定摘要（跨进程、跨重启一致）
+
+        内置 hash() 对字符串按进程随机化，不能用于共享缓存键
+        """
+        raw = "\x1f".join(str(part) for part in parts)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    @staticmethod
+    def report_generation(report_id: str) -> str:
+        """报告缓存代数计数器键（递增即失效该报告的全部搜索缓存）"""
+        return f"{CacheKeyGenerator.PREFIX}:gen:report:{report_id}"
+
+    @staticmethod
+    def report_data_generation(report_id: str) -> str:
+        """报告数据代数计数器键（数据项变化时递增，使分析结果缓存失效）"""
+        return f"{CacheKeyGenerator.PREFIX}:gen:report_data:{report_id}"
+
+    @staticmethod
+    def report_analysis(report_id: str, analysis_type: str, top_k: int, generation: int = 0) -> str:
+        """报告分析结果缓存键（嵌入报告数据代数）"""
+        params_digest = CacheKeyGenerator.digest(analysis_type, top_k)
+        return f"{CacheKeyGenerator.PREFIX}:analysis:{report_id}:g{generation}:{params_digest}"
+
+    @staticmethod
+    def search_result(report_id: str, search_query: str, limit: int, generation: int = 0) -> str:
+        """搜索结果缓存键（嵌入报告缓存代数；查询文本按空白规范化后取摘要）"""
+        query_digest = CacheKeyGenerator.digest(" ".join(search_query.split()), limit)
+        return f"{CacheKeyGenerator.PREFIX}:search:{report_id}:g{generation}:{query_digest}"
+
+    @staticmethod
+    def report_search_stats() -> str:
+        """报告搜索缓存命中统计（哈希：hits / misses，所有进程共享）"""
+        return f"{CacheKeyGenerator.PREFIX}:stats:report_search_cache"
+
+    @staticmethod
+    def instant_result_pages(search_execution_id: str) -> str:
+        """已完成即时搜索的结果页缓存键（哈希，字段为分页参数）"""
+        return f"{CacheKeyGenerator.PREFIX}:instant_pages:{search_execution_id}"
 
     @staticmethod
     def report_pattern(report_id: str) -> str:
@@ -0,0 +1,170 @@
+"""即时搜索结果页缓存
+
+已完成（COMPLETED）的即时搜索执行，其映射集合不再变化，
+因此结果页可以长期缓存，只在结果被删除时失效。
+
+两级缓存:
+- L1: 进程内 LRU（有界，条目有短 TTL；保存 JSON 文本，命中时反序列化出新对象）
+- L2: Redis 哈希（每个 search_execution_id 一个哈希，字段为分页参数，
+      值为 zlib 压缩 + base64 编码的 JSON）
+
+两级命中都返回 JSON 反序列化后的独立对象：类型一致（datetime 等为字符串），
+调用方修改返回值不会影响缓存。
+
+失效:
+- invalidate(search_execution_id) 清理本进程 L1 条目和 L2 哈希（单次 DEL，无需 SCAN）
+- 其他进程的 L1 条目无法直接清理，最多在 local_ttl 秒后过期
+"""
+
+import base64
+import json
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from src.config import settings
+from src.infrastructure.cache.redis_client import redis_client, cache_key_gen
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResultPageCache:
+    """不可变执行结果页缓存（进程内 LRU + Redis 压缩层）"""
+
+    def __init__(self, max_entries: int, ttl: int, local_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        # 键 -> (JSON 文本, 过期时间 monotonic)
+        self._local: "OrderedDict[Tuple[str, int, int], Tuple[str, float]]" = OrderedDict()
+        self._keys_by_execution: Dict[str, Set[Tuple[str, int, int]]] = {}
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    @staticmethod
+    def _field(page: int, page_size: int) -> str:
+        """Redis 哈希字段名"""
+        return f"{page}:{page_size}"
+
+    @staticmethod
+    def _encode(raw: str) -> str:
+        """压缩 JSON 文本"""
+        return base64.b64encode(zlib.compress(raw.encode("utf-8"), 6)).decode("ascii")
+
+    @staticmethod
+    def _decode(payload: str) -> str:
+        """解压出 JSON 文本"""
+        return zlib.decompress(base64.b64decode(payload)).decode("utf-8")
+
+    def _forget_key(self, key: Tuple[str, int, int]) -> None:
+        """从执行索引中移除 L1 键"""
+        siblings = self._keys_by_execution.get(key[0])
+        if siblings is not None:
+            siblings.discard(key)
+            if not siblings:
+                self._keys_by_execution.pop(key[0], None)
+
+    def _put_local(self, key: Tuple[str, int, int], raw: str) -> None:
+        """写入 L1 并按 LRU 淘汰"""
+        self._local[key] = (raw, time.monotonic() + self.local_ttl)
+        self._local.move_to_end(key)
+        self._keys_by_execution.setdefault(key[0], set()).add(key)
+
+        while len(self._local) > self.max_entries:
+            evicted_key, _ = self._local.popitem(last=False)
+            self._forget_key(evicted_key)
+
+    def _get_local(self, key: Tuple[str, int, int]) -> Optional[str]:
+        """读取未过期的 L1 条目"""
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+
+        raw, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._local[key]
+            self._forget_key(key)
+            return None
+
+        self._local.move_to_end(key)
+        return raw
+
+    async def get(self, search_execution_id: str, page: int, page_size: int) -> Optional[Any]:
+        """
+        读取结果页
+
+        Returns:
+            缓存值（每次返回新对象），未命中返回 None
+        """
+        key = (search_execution_id, page, page_size)
+
+        raw = self._get_local(key)
+        if raw is not None:
+            self._stats["local_hits"] += 1
+            return json.loads(raw)
+
+        payload = await redis_client.hget_raw(
+            cache_key_gen.instant_result_pages(search_execution_id),
+            self._field(page, page_size)
+        )
+        if payload is not None:
+            try:
+                raw = self._decode(payload)
+                value = json.loads(raw)
+            except (ValueError, zlib.error) as e:
+                logger.warning(f"⚠️ 结果页缓存解码失败: {search_execution_id} - {e}")
+            else:
+                self._stats["redis_hits"] += 1
+                self._put_local(key, raw)
+                return value
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, search_execution_id: str, page: int, page_size: int, value: Any) -> None:
+        """写入结果页（L1 + L2，保存序列化后的快照）"""
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        self._put_local((search_execution_id, page, page_size), raw)
+
+        await redis_client.hset_raw(
+            cache_key_gen.instant_result_pages(search_execution_id),
+            self._field(page, page_size),
+            self._encode(raw),
+            ttl=self.ttl
+        )
+
+    async def invalidate(self, search_execution_id: str) -> int:
+        """
+        使某次执行的所有缓存页失效
+
+        Returns:
+            清理的本地条目数
+        """
+        keys = self._keys_by_execution.pop(search_execution_id, set())
+        for key in keys:
+            self._local.pop(key, None)
+
+        await redis_client.delete(cache_key_gen.instant_result_pages(search_execution_id))
+        logger.info(f"🗑️ 结果页缓存失效: {search_execution_id} (本地 {len(keys)} 页)")
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        total = sum(self._stats.values())
+        hits = self._stats["local_hits"] + self._stats["redis_hits"]
+        return {
+            **self._stats,
+            "local_entries": len(self._local),
+            "max_entries": self.max_entries,
+            "local_ttl": self.local_ttl,
+            "hit_rate": hits / total if total else 0.0
+        }
+
+
+# 全局实例
+instant_result_page_cache = ResultPageCache(
+    max_entries=settings.INSTANT_RESULT_CACHE_MAX_ENTRIES,
+    ttl=settings.INSTANT_RESULT_CACHE_TTL,
+    local_ttl=settings.INSTANT_RESULT_CACHE_LOCAL_TTL
+)
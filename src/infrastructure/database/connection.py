@@ -138,12 +138,46 @@ async def create_indexes():
         await search_tasks.create_index("schedule_interval")
         await search_tasks.create_index("next_run_time")
         await search_tasks.create_index("created_at")
+        # 任务列表：(created_at, _id) 复合键游标，按过滤条件组合建立前缀
+        await search_tasks.create_index([("created_at", -1), ("_id", -1)], name="idx_created_id")
+        for filter_field in ("status", "is_active", "created_by"):
+            await search_tasks.create_index(
+                [(filter_field, 1), ("created_at", -1), ("_id", -1)],
+                name=f"idx_{filter_field}_created_id"
+            )
+        await search_tasks.create_index(
+            [("is_active", 1), ("status", 1), ("created_at", -1), ("_id", -1)],
+            name="idx_active_status_created_id"
+        )
+        # 任务关键词搜索：词元多键索引，候选集按创建时间取最近的任务
+        await search_tasks.create_index(
+            [("search_tokens", 1), ("created_at", -1), ("_id", -1)],
+            name="idx_search_tokens_created_id"
+        )
 
         # 定时搜索结果索引
         search_results = db.search_results
         await search_results.create_index("task_id")
         await search_results.create_index("execution_time")
         await search_results.create_index([("task_id", 1), ("execution_time", -1)])
+        # 结果列表：数据库侧排序 + 复合键游标分页（排序字段 + _id 决胜）
+        for sort_field in ("created_at", "relevance_score", "quality_score", "published_date", "first_seen_at"):
+            await search_results.create_index(
+                [("task_id", 1), (sort_field, -1), ("_id", -1)],
+                name=f"idx_task_{sort_field}_id"
+            )
+        # 跨执行去重唯一索引 idx_task_content_hash 由 migration_007 在合并历史重复结果后创建
+
+        # 定时执行记录与执行-结果映射
+        search_task_executions = db.search_task_executions
+        await search_task_executions.create_index([("task_id", 1), ("executed_at", -1)], name="idx_task_executed")
+        search_result_executions = db.search_result_executions
+        await search_result_executions.create_index(
+            [("execution_id", 1), ("search_position", 1)],
+            name="idx_execution_position"
+        )
+        await search_result_executions.create_index("result_id", name="idx_result_id")
+        await search_result_executions.create_index("task_id", name="idx_task_id")
 
         # ==================== v1.3.0 即时搜索索引 ====================
 
@@ -153,12 +187,28 @@ async def create_indexes():
         await instant_search_tasks.create_index("status")
         await instant_search_tasks.create_index("search_execution_id")
         await instant_search_tasks.create_index("created_at")
+        # 任务列表：(created_at, _id) 复合键游标，按过滤条件组合建立前缀
+        await instant_search_tasks.create_index([("created_at", -1), ("_id", -1)], name="idx_created_id")
+        for filter_field in ("status", "created_by"):
+            await instant_search_tasks.create_index(
+                [(filter_field, 1), ("created_at", -1), ("_id", -1)],
+                name=f"idx_{filter_field}_created_id"
+            )
+        await instant_search_tasks.create_index(
+            [("created_by", 1), ("status", 1), ("created_at", -1), ("_id", -1)],
+            name="idx_creator_status_created_id"
+        )
         logger.info("✅ 即时搜索任务索引创建完成")
 
         # 即时搜索结果索引（v1.3.0核心）
         instant_search_results = db.instant_search_results
         await instant_search_results.create_index("content_hash", unique=True)  # 去重键（唯一）
         await instant_search_results.create_index("task_id")
+        # 报告结果列表：按任务归并分页（created_at + _id 复合键游标）
+        await instant_search_results.create_index(
+            [("task_id", 1), ("created_at", -1), ("_id", -1)],
+            name="idx_task_created_at_id"
+        )
         await instant_search_results.create_index("url_normalized")
         await instant_search_results.create_index("first_found_at")
         await instant_search_results.create_index("last_found_at")
@@ -172,6 +222,11 @@ async def create_indexes():
         await instant_search_mappings.create_index("result_id")
         # 按任务查询所有映射
         await instant_search_mappings.create_index("task_id")
+        # 报告结果列表：按 (任务, 结果) 取首次发现时间（覆盖索引）
+        await instant_search_mappings.create_index(
+            [("task_id", 1), ("result_id", 1), ("found_at", 1)],
+            name="idx_task_result_found"
+        )
         # 唯一约束：同一搜索不能重复关联同一结果
         await instant_search_mappings.create_index(
             [("search_execution_id", 1), ("result_id", 1)],
@@ -179,6 +234,49 @@ async def create_indexes():
         )
         logger.info("✅ 即时搜索映射索引创建完成（含唯一约束）")
 
+        # 进行中搜索执行锁（single-flight）：过期自动清理
+        instant_search_inflight = db.instant_search_inflight
+        await instant_search_inflight.create_index("expires_at", expireAfterSeconds=0)
+        logger.info("✅ 即时搜索执行锁索引创建完成（TTL）")
+
+        # 搜索结果归档：分段索引按任务/月份查询（回迁），策略与检查点以 task_id 为 _id
+        result_archive_index = db.result_archive_index
+        await result_archive_index.create_index(
+            [("task_id", 1), ("month", 1), ("archived_at", 1)],
+            name="idx_task_month"
+        )
+        logger.info("✅ 结果归档索引创建完成")
+
+        # 报告跨任务搜索倒排索引：按 (来源, 词, 任务) 读取倒排块，按 (来源, 任务) 删除
+        report_search_postings = db.report_search_postings
+        await report_search_postings.create_index(
+            [("source", 1), ("term", 1), ("task_id", 1), ("size", 1)],
+            name="idx_source_term_task"
+        )
+        await report_search_postings.create_index([("source", 1), ("task_id", 1)], name="idx_source_task")
+        await db.report_search_docs.create_index([("source", 1), ("task_id", 1)], name="idx_source_task")
+        logger.info("✅ 报告搜索倒排索引创建完成")
+
+        # 统一结果读模型：报告范围内按 (created_at, _id) 游标分页
+        await db.unified_results.create_index(
+            [("source_type", 1), ("task_id", 1), ("created_at", -1), ("_id", -1)],
+            name="idx_source_task_created_id"
+        )
+        logger.info("✅ 统一结果读模型索引创建完成")
+
+        # 任务按天趋势桶：报告范围内按 (来源, 任务, 日期范围) 汇总，压缩时查找未压缩的已结束日桶
+        task_trend_buckets = db.task_trend_buckets
+        await task_trend_buckets.create_index(
+            [("source_type", 1), ("task_id", 1), ("day", 1)],
+            name="idx_source_task_day"
+        )
+        await task_trend_buckets.create_index(
+            "day",
+            name="idx_uncompacted_day",
+            partialFilterExpression={"compacted": False}
+        )
+        logger.info("✅ 任务趋势桶索引创建完成")
+
         logger.info("✅ 数据库索引创建完成（含v1.3.0即时搜索索引）")
 
         # ==================== 智能总结报告系统索引 ====================
@@ -234,6 +332,8 @@ async def create_indexes():
         await summary_report_data_items.create_index("item_id", unique=True, name="idx_item_id")
         await summary_report_data_items.create_index("report_id", name="idx_report_id")
         await summary_report_data_items.create_index("source_task_id", name="idx_source_task")
+        # 批量添加时按来源ID跳过已加入报告的结果
+        await summary_report_data_items.create_index([("report_id", 1), ("source_id", 1)], name="idx_report_source")
         # 复合索引（常用查询）
         await summary_report_data_items.create_index(
             [("report_id", 1), ("is_visible", 1), ("display_order", 1)],
@@ -269,6 +369,33 @@ async def create_indexes():
         )
         logger.info("✅ 报告版本历史表索引创建完成")
 
+        # 报告后台作业（同一报告同一类型同一去重键只有一个活跃作业）
+        summary_report_jobs = db.summary_report_jobs
+        await summary_report_jobs.create_index("job_id", unique=True, name="idx_job_id")
+        # 旧唯一索引不含去重键，会拒绝同一报告不同分析类型的并行作业
+        if "idx_unique_active_report_job" in await summary_report_jobs.index_information():
+            await summary_report_jobs.drop_index("idx_unique_active_report_job")
+        await summary_report_jobs.create_index(
+            [("report_id", 1), ("job_type", 1), ("job_key", 1)],
+            unique=True,
+            partialFilterExpression={"active": True},
+            name="idx_unique_active_report_job_key"
+        )
+        await summary_report_jobs.create_index([("report_id", 1), ("created_at", -1)], name="idx_report_created")
+        # 接管扫描：只索引活跃作业
+        await summary_report_jobs.create_index(
+            [("heartbeat_at", 1)],
+            partialFilterExpression={"active": True},
+            name="idx_active_heartbeat"
+        )
+
+        # 报告LLM调用结果缓存（_id 为输入内容哈希，按 TTL 过期）
+        await db.summary_report_llm_cache.create_index(
+            "created_at",
+            expireAfterSeconds=settings.REPORT_LLM_CACHE_TTL_DAYS * 86400,
+            name="idx_created_at_ttl"
+        )
+
         # 5. search_results 和 instant_search_results 的联表查询索引优化
         # 为联表查询优化外键索引
         search_results_extra = db.search_results
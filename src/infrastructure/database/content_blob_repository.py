@@ -0,0 +1,173 @@
+"""内容块存储仓储
+
+大文本字段（HTML、完整Markdown）以内容寻址方式存储在 content_blobs 集合：
+- _id: 原始文本的 sha256（相同内容只存一份，重复结果共享）
+- codec / data: 压缩编码与压缩后的字节（优先 zstd，兜底 zlib）
+- raw_size / stored_size: 原始与压缩后的字节数
+- ref_count: 引用计数（结果文档保存 ref，删除结果时递减）
+
+结果文档只保留引用（html_ref / markdown_ref），需要正文时再批量加载
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from bson import Binary
+from pymongo import UpdateOne
+
+from src.infrastructure.database.connection import get_mongodb_database
+from src.utils.compression import compress_text, decompress_text
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_ref(text: str) -> str:
+    """计算内容引用（原始文本的 sha256）"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ContentBlobRepository:
+    """内容块仓储（内容寻址 + 压缩 + 引用计数）"""
+
+    def __init__(self, db=None):
+        self.collection_name = "content_blobs"
+        # 迁移脚本等场景可直接传入数据库实例
+        self._db = db
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = self._db if self._db is not None else await get_mongodb_database()
+        return db[self.collection_name]
+
+    def _build_upsert(self, ref: str, text: str, count: int) -> UpdateOne:
+        """构建写入操作：首次写入压缩数据，已存在时只增加引用计数"""
+        codec, data = compress_text(text)
+        raw_size = len(text.encode("utf-8"))
+
+        return UpdateOne(
+            {"_id": ref},
+            {
+                "$setOnInsert": {
+                    "codec": codec,
+                    "data": Binary(data),
+                    "raw_size": raw_size,
+                    "stored_size": len(data),
+                    "created_at": datetime.utcnow()
+                },
+                "$inc": {"ref_count": count}
+            },
+            upsert=True
+        )
+
+    async def put_many(self, texts: List[Optional[str]]) -> List[Optional[str]]:
+        """
+        批量写入内容块
+
+        Args:
+            texts: 文本列表（空值跳过）
+
+        Returns:
+            与输入一一对应的引用列表（空文本对应 None）
+        """
+        refs: List[Optional[str]] = []
+        counts: Dict[str, int] = {}
+        first_text: Dict[str, str] = {}
+
+        for text in texts:
+            if not text:
+                refs.append(None)
+                continue
+            ref = content_ref(text)
+            refs.append(ref)
+            counts[ref] = counts.get(ref, 0) + 1
+            first_text.setdefault(ref, text)
+
+        if not counts:
+            return refs
+
+        try:
+            collection = await self._get_collection()
+            operations = [
+                self._build_upsert(ref, first_text[ref], count)
+                for ref, count in counts.items()
+            ]
+            await collection.bulk_write(operations, ordered=False)
+            logger.debug(f"写入内容块: {len(operations)} 个（{len(refs)} 个引用）")
+            return refs
+
+        except Exception as e:
+            logger.error(f"写入内容块失败: {e}")
+            raise
+
+    async def put(self, text: Optional[str]) -> Optional[str]:
+        """写入单个内容块，返回引用"""
+        refs = await self.put_many([text])
+        return refs[0]
+
+    async def get_many(self, refs: Iterable[Optional[str]]) -> Dict[str, str]:
+        """
+        批量读取内容块
+
+        Returns:
+            dict: 引用 -> 解压后的文本（不存在的引用不出现在结果中）
+        """
+        unique_refs = list({ref for ref in refs if ref})
+        if not unique_refs:
+            return {}
+
+        try:
+            collection = await self._get_collection()
+            cursor = collection.find(
+                {"_id": {"$in": unique_refs}},
+                {"codec": 1, "data": 1}
+            )
+
+            texts = {}
+            async for doc in cursor:
+                texts[doc["_id"]] = decompress_text(doc["codec"], bytes(doc["data"]))
+            return texts
+
+        except Exception as e:
+            logger.error(f"读取内容块失败: {e}")
+            raise
+
+    async def get(self, ref: Optional[str]) -> Optional[str]:
+        """读取单个内容块"""
+        if not ref:
+            return None
+        texts = await self.get_many([ref])
+        return texts.get(ref)
+
+    async def release(self, ref_counts: Dict[str, int]) -> int:
+        """
+        释放引用（引用计数减少，归零的内容块被删除）
+
+        Args:
+            ref_counts: 引用 -> 释放次数
+
+        Returns:
+            删除的内容块数量
+        """
+        ref_counts = {ref: count for ref, count in ref_counts.items() if ref and count > 0}
+        if not ref_counts:
+            return 0
+
+        try:
+            collection = await self._get_collection()
+            operations = [
+                UpdateOne({"_id": ref}, {"$inc": {"ref_count": -count}})
+                for ref, count in ref_counts.items()
+            ]
+            await collection.bulk_write(operations, ordered=False)
+
+            result = await collection.delete_many({
+                "_id": {"$in": list(ref_counts.keys())},
+                "ref_count": {"$lte": 0}
+            })
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"释放内容块失败: {e}")
+            raise
@@ -0,0 +1,59 @@
+"""列表总数缓存
+
+列表接口每次请求都执行 count_documents，集合较大时开销与分页查询本身相当。
+本缓存为列表总数提供廉价来源：
+
+- 无过滤条件: 使用 estimated_document_count()（读取集合元数据，O(1)）
+- 有过滤条件: count_documents 结果按 (集合, 过滤条件) 在进程内缓存 LIST_COUNT_CACHE_TTL 秒
+- 仓储在创建/更新/删除文档时按集合失效缓存；多进程部署下其他进程的写入最多延迟 TTL 秒可见
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from bson import json_util
+
+from src.config import settings
+
+
+class CountCache:
+    """进程内列表总数缓存（TTL + LRU）"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int]]" = OrderedDict()
+
+    @staticmethod
+    def _make_key(collection_name: str, filter_dict: Dict[str, Any]) -> Tuple[str, str]:
+        """缓存键：集合名 + 规范化的过滤条件（Extended JSON，支持 datetime/正则）"""
+        return collection_name, json_util.dumps(filter_dict, sort_keys=True)
+
+    async def count(self, collection, filter_dict: Dict[str, Any]) -> int:
+        """获取总数（优先使用估算或缓存值）"""
+        if not filter_dict:
+            return await collection.estimated_document_count()
+
+        key = self._make_key(collection.name, filter_dict)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        value = await collection.count_documents(filter_dict)
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, collection_name: str) -> None:
+        """失效某个集合的全部缓存总数"""
+        for key in [key for key in self._entries if key[0] == collection_name]:
+            self._entries.pop(key, None)
+
+
+# 全局实例
+count_cache = CountCache(ttl=settings.LIST_COUNT_CACHE_TTL)
@@ -4,22 +4,30 @@ v1.3.0 架构说明：
 - InstantSearchTaskRepository: 管理即时搜索任务
 - InstantSearchResultRepository: 管理搜索结果（支持content_hash去重）
 - InstantSearchResultMappingRepository: 管理搜索-结果映射关系（核心）
+- InstantSearchInflightRepository: 管理进行中的搜索执行锁（single-flight，跨worker）
 
 数据库：MongoDB (使用Motor异步驱动)
 集合命名：
 - instant_search_tasks
 - instant_search_results
 - instant_search_result_mappings
+- instant_search_inflight
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
 
 from src.core.domain.entities.instant_search_task import InstantSearchTask, InstantSearchStatus
 from src.core.domain.entities.instant_search_result import InstantSearchResult
 from src.core.domain.entities.instant_search_result_mapping import InstantSearchResultMapping
+from src.config import settings
 from src.infrastructure.database.connection import get_mongodb_database
+from src.infrastructure.database.content_blob_repository import ContentBlobRepository
+from src.infrastructure.database.count_cache import count_cache
+from src.utils.cursor_pagination import cursor_paginator
+from src.utils.field_codec import field_codec
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -98,6 +106,7 @@ class InstantSearchTaskRepository:
             task_dict = self._task_to_dict(task)
 
             await collection.insert_one(task_dict)
+            count_cache.invalidate(self.collection_name)
             logger.info(f"创建即时搜索任务成功: {task.name} (ID: {task.id})")
 
             return task
@@ -135,6 +144,8 @@ class InstantSearchTaskRepository:
             if result.matched_count == 0:
                 raise ValueError(f"即时搜索任务不存在: {task.id}")
 
+            # 状态/创建者可能变化，带过滤条件的缓存总数随之失效
+            count_cache.invalidate(self.collection_name)
             logger.info(f"更新即时搜索任务成功: {task.name} (ID: {task.id})")
             return task
 
@@ -149,12 +160,38 @@ class InstantSearchTaskRepository:
         status: Optional[str] = None,
         created_by: Optional[str] = None
     ) -> Tuple[List[InstantSearchTask], int]:
-        """获取任务列表"""
+        """获取任务列表（页码分页）"""
+        data = await self.query_tasks(
+            page=page,
+            page_size=page_size,
+            status=status,
+            created_by=created_by
+        )
+        return data["items"], data["total"]
+
+    async def query_tasks(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        include_total: bool = True
+    ) -> Dict[str, Any]:
+        """
+        查询任务列表
+
+        - 按 (created_at, _id) 降序排列，提供 cursor 时使用复合键游标（无 SKIP）
+        - include_total=False 时不计算总数；计算时使用估算总数或短期缓存的总数
+
+        Returns:
+            dict: items（任务实体列表）、total（可能为 None）、next_cursor
+        """
         try:
             collection = await self._get_collection()
 
             # 构建查询条件
-            filter_dict = {}
+            filter_dict: Dict[str, Any] = {}
 
             if status:
                 filter_dict["status"] = status
@@ -162,19 +199,37 @@ class InstantSearchTaskRepository:
             if created_by:
                 filter_dict["created_by"] = created_by
 
-            # 计算总数
-            total = await collection.count_documents(filter_dict)
-
-            # 分页查询
-            skip = (page - 1) * page_size
-            cursor = collection.find(filter_dict).sort("created_at", -1).skip(skip).limit(page_size)
-
-            tasks = []
-            async for data in cursor:
-                tasks.append(self._dict_to_task(data))
-
-            return tasks, total
-
+            total = await count_cache.count(collection, filter_dict) if include_total else None
+
+            find_filter = filter_dict
+            skip = 0
+            if cursor:
+                cursor_info = cursor_paginator.decode_keyset_cursor(cursor)
+                if cursor_info.field != "created_at" or cursor_info.direction != -1:
+                    raise ValueError("游标与当前排序条件不匹配")
+                find_filter = {"$and": [filter_dict, cursor_paginator.build_keyset_filter(cursor_info)]}
+            else:
+                skip = (page - 1) * page_size
+
+            # 多取一条用于判断是否有下一页
+            find_cursor = collection.find(find_filter).sort([("created_at", -1), ("_id", -1)])
+            if skip:
+                find_cursor = find_cursor.skip(skip)
+            docs = await find_cursor.limit(page_size + 1).to_list(page_size + 1)
+
+            next_cursor = None
+            if len(docs) > page_size:
+                docs = docs[:page_size]
+                next_cursor = cursor_paginator.make_keyset_cursor(docs[-1], "created_at", -1)
+
+            return {
+                "items": [self._dict_to_task(data) for data in docs],
+                "total": total,
+                "next_cursor": next_cursor
+            }
+
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"获取即时搜索任务列表失败: {e}")
             raise
@@ -183,8 +238,12 @@ class InstantSearchTaskRepository:
 class InstantSearchResultRepository:
     """即时搜索结果仓储"""
 
+    # 可压缩存储的大文本字段（开启 FIELD_COMPRESSION_ENABLED 时生效）
+    COMPRESSED_FIELDS = ("content", "snippet", "markdown_content")
+
     def __init__(self):
         self.collection_name = "instant_search_results"
+        self.blob_repo = ContentBlobRepository()
 
     async def _get_collection(self):
         """获取集合"""
@@ -193,7 +252,7 @@ class InstantSearchResultRepository:
 
     def _result_to_dict(self, result: InstantSearchResult) -> Dict[str, Any]:
         """将结果实体转换为字典"""
-        return {
+        result_dict = {
             "_id": result.id,
             "task_id": result.task_id,
             "title": result.title,
@@ -202,8 +261,15 @@ class InstantSearchResultRepository:
             "snippet": result.snippet,
             "content_hash": result.content_hash,  # v1.3.0 去重键
             "url_normalized": result.url_normalized,  # v1.3.0 规范化URL
-            "markdown_content": result.markdown_content,
-            "html_content": result.html_content,
+            # 正文已移入内容块时：Markdown只保留预览，HTML只保留引用
+            "markdown_content": (
+                result.markdown_content[:settings.INLINE_MARKDOWN_MAX_CHARS]
+                if result.markdown_ref and result.markdown_content
+                else result.markdown_content
+            ),
+            "html_content": None if result.html_ref else result.html_content,
+            "markdown_ref": result.markdown_ref,
+            "html_ref": result.html_ref,
             "source": result.source,
             "published_date": result.published_date,
             "author": result.author,
@@ -219,9 +285,12 @@ class InstantSearchResultRepository:
             "created_at": result.created_at,
             "updated_at": result.updated_at
         }
+        return field_codec.encode_document(result_dict, self.COMPRESSED_FIELDS)
 
     def _dict_to_result(self, data: Dict[str, Any]) -> InstantSearchResult:
         """将字典转换为结果实体"""
+        field_codec.decode_document(data, self.COMPRESSED_FIELDS)
+
         return InstantSearchResult(
             id=data["_id"],
             task_id=data["task_id"],
@@ -233,6 +302,8 @@ class InstantSearchResultRepository:
             url_normalized=data.get("url_normalized", ""),
             markdown_content=data.get("markdown_content"),
             html_content=data.get("html_content"),
+            markdown_ref=data.get("markdown_ref"),
+            html_ref=data.get("html_ref"),
             source=data.get("source", "web"),
             published_date=data.get("published_date"),
             author=data.get("author"),
@@ -274,6 +345,10 @@ class InstantSearchResultRepository:
         """创建结果"""
         try:
             collection = await self._get_collection()
+
+            if settings.CONTENT_BLOB_OFFLOAD_ENABLED:
+                await self._offload_bodies(result)
+
             result_dict = self._result_to_dict(result)
 
             await collection.insert_one(result_dict)
@@ -285,6 +360,57 @@ class InstantSearchResultRepository:
             logger.error(f"创建即时搜索结果失败: {e}")
             raise
 
+    async def _offload_bodies(self, result: InstantSearchResult) -> None:
+        """
+        将正文写入内容块并记录引用
+
+        - HTML：整体移入内容块
+        - Markdown：超过内联上限时完整内容移入内容块（文档中保留预览）
+        """
+        html_text = result.html_content if not result.html_ref else None
+        markdown_text = None
+        if (
+            result.markdown_content
+            and not result.markdown_ref
+            and len(result.markdown_content) > settings.INLINE_MARKDOWN_MAX_CHARS
+        ):
+            markdown_text = result.markdown_content
+
+        html_ref, markdown_ref = await self.blob_repo.put_many([html_text, markdown_text])
+        if html_ref:
+            result.html_ref = html_ref
+        if markdown_ref:
+            result.markdown_ref = markdown_ref
+
+    async def hydrate_bodies(
+        self,
+        result_dicts: List[Dict[str, Any]],
+        include_html: bool = False,
+        include_markdown: bool = False
+    ) -> None:
+        """
+        为结果字典（to_dict 格式）按需加载正文
+
+        - include_html: 从 html_ref 加载 html_content
+        - include_markdown: 从 markdown_ref 加载完整 markdown_content（替换预览）
+        """
+        wanted = []
+        if include_html:
+            wanted.append(("html_ref", "html_content"))
+        if include_markdown:
+            wanted.append(("markdown_ref", "markdown_content"))
+        if not wanted:
+            return
+
+        texts = await self.blob_repo.get_many(
+            item.get(ref_field) for item in result_dicts for ref_field, _ in wanted
+        )
+        for item in result_dicts:
+            for ref_field, content_field in wanted:
+                ref = item.get(ref_field)
+                if ref and ref in texts:
+                    item[content_field] = texts[ref]
+
     async def update_discovery_stats(self, result: InstantSearchResult) -> InstantSearchResult:
         """
         更新发现统计信息（去重命中时调用）
@@ -327,6 +453,43 @@ class InstantSearchResultRepository:
             logger.error(f"更新发现统计失败: {e}")
             raise
 
+    async def bulk_update_discovery_stats(self, result_ids: List[str]) -> int:
+        """
+        批量更新发现统计（single-flight 跟随者共享结果时调用）
+
+        与 update_discovery_stats 语义相同，但一次 update_many 完成
+
+        Returns:
+            更新的结果数量
+        """
+        if not result_ids:
+            return 0
+
+        try:
+            collection = await self._get_collection()
+            now = datetime.utcnow()
+
+            update_result = await collection.update_many(
+                {"_id": {"$in": result_ids}},
+                {
+                    "$set": {
+                        "last_found_at": now,
+                        "updated_at": now
+                    },
+                    "$inc": {
+                        "found_count": 1,
+                        "unique_searches": 1
+                    }
+                }
+            )
+
+            logger.debug(f"批量更新发现统计成功: {update_result.modified_count}条")
+            return update_result.modified_count
+
+        except Exception as e:
+            logger.error(f"批量更新发现统计失败: {e}")
+            raise
+
     async def get_by_id(self, result_id: str) -> Optional[InstantSearchResult]:
         """根据ID获取结果"""
         try:
@@ -341,6 +504,26 @@ class InstantSearchResultRepository:
             logger.error(f"获取即时搜索结果失败: {e}")
             raise
 
+    async def get_fields_by_ids(
+        self,
+        result_ids: List[str],
+        fields: Tuple[str, ...] = ("title", "content", "url")
+    ) -> Dict[str, Dict[str, Any]]:
+        """按ID批量读取结果的指定字段（不构建实体），返回 结果ID -> 字段字典"""
+        if not result_ids:
+            return {}
+
+        try:
+            collection = await self._get_collection()
+            docs = {}
+            async for doc in collection.find({"_id": {"$in": result_ids}}, {field: 1 for field in fields}):
+                docs[doc["_id"]] = field_codec.decode_document(doc, self.COMPRESSED_FIELDS)
+            return docs
+
+        except Exception as e:
+            logger.error(f"批量获取即时搜索结果失败: {e}")
+            raise
+
 
 class InstantSearchResultMappingRepository:
     """即时搜索结果映射仓储（v1.3.0核心）"""
@@ -500,3 +683,116 @@ class InstantSearchResultMappingRepository:
         except Exception as e:
             logger.error(f"查询结果映射失败: {e}")
             raise
+
+    async def get_mappings_by_search_execution(
+        self,
+        search_execution_id: str
+    ) -> List[InstantSearchResultMapping]:
+        """获取某次搜索执行的全部映射（按排名排序，不JOIN结果表）"""
+        try:
+            collection = await self._get_collection()
+            cursor = collection.find(
+                {"search_execution_id": search_execution_id}
+            ).sort("search_position", 1)
+
+            mappings = []
+            async for doc in cursor:
+                mappings.append(self._dict_to_mapping(doc))
+
+            return mappings
+
+        except Exception as e:
+            logger.error(f"查询执行映射失败: {e}")
+            raise
+
+    async def delete_by_search_execution(self, search_execution_id: str) -> int:
+        """删除某次搜索执行的所有映射记录"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_many({"search_execution_id": search_execution_id})
+
+            logger.info(f"删除结果映射: search_execution_id={search_execution_id}, 删除数量: {result.deleted_count}")
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"删除结果映射失败: {e}")
+            raise
+
+
+class InstantSearchInflightRepository:
+    """
+    进行中搜索执行锁仓储（single-flight）
+
+    每个搜索指纹（规范化query + crawl_url + 有效配置）对应一条锁记录：
+    - _id: 搜索指纹
+    - leader_task_id / search_execution_id: 正在执行的领导者任务
+    - expires_at: 锁过期时间（TTL索引自动清理，过期锁可被接管）
+    """
+
+    def __init__(self):
+        self.collection_name = "instant_search_inflight"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    async def try_acquire(
+        self,
+        fingerprint: str,
+        task_id: str,
+        search_execution_id: str,
+        ttl_seconds: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        尝试获取执行锁
+
+        Returns:
+            获取成功返回 None；已被其他执行持有时返回锁记录（领导者信息）
+        """
+        try:
+            collection = await self._get_collection()
+            now = datetime.utcnow()
+            lock_doc = {
+                "leader_task_id": task_id,
+                "search_execution_id": search_execution_id,
+                "acquired_at": now,
+                "expires_at": now + timedelta(seconds=ttl_seconds)
+            }
+
+            try:
+                await collection.insert_one({"_id": fingerprint, **lock_doc})
+                return None
+            except DuplicateKeyError:
+                pass
+
+            # 锁已存在：若已过期则接管（TTL清理有延迟）
+            taken_over = await collection.find_one_and_update(
+                {"_id": fingerprint, "expires_at": {"$lte": now}},
+                {"$set": lock_doc}
+            )
+            if taken_over is not None:
+                logger.info(f"接管过期的搜索执行锁: {fingerprint[:12]}... (原领导者: {taken_over.get('leader_task_id')})")
+                return None
+
+            existing = await collection.find_one({"_id": fingerprint})
+            if existing is None:
+                # 锁在两次查询之间被释放，重新竞争
+                return await self.try_acquire(fingerprint, task_id, search_execution_id, ttl_seconds)
+
+            return existing
+
+        except Exception as e:
+            logger.error(f"获取搜索执行锁失败: {e}")
+            raise
+
+    async def release(self, fingerprint: str, task_id: str) -> bool:
+        """释放执行锁（只释放自己持有的锁）"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_one({"_id": fingerprint, "leader_task_id": task_id})
+            return result.deleted_count > 0
+
+        except Exception as e:
+            logger.error(f"释放搜索执行锁失败: {e}")
+            raise
@@ -1,12 +1,15 @@
 """内存仓储实现（用于开发和测试）"""
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from uuid import UUID
 
-from src.core.domain.entities.search_task import SearchTask, TaskStatus
+from src.core.domain.entities.search_task import EXECUTION_STATS_FIELDS, SearchTask, TaskStatus
 from src.core.domain.entities.search_result import SearchResult
+from src.config import settings
+from src.utils.cursor_pagination import cursor_paginator
 from src.utils.logger import get_logger
+from src.utils.text_tokenizer import index_tokens, match_score, query_tokens
 
 logger = get_logger(__name__)
 
@@ -16,11 +19,37 @@ class InMemorySearchTaskRepository:
     
     def __init__(self):
         self._storage: Dict[str, SearchTask] = {}
+        # 关键词搜索倒排索引：词元 -> 任务ID；任务ID -> (名称词元, 全部词元)
+        self._token_index: Dict[str, Set[str]] = {}
+        self._task_tokens: Dict[str, Tuple[Set[str], Set[str]]] = {}
         logger.info("初始化内存任务存储")
+
+    def _index_task(self, task: SearchTask) -> None:
+        """写入任务的搜索词元（先移除旧词元）"""
+        task_id = str(task.id)
+        self._unindex_task(task_id)
+
+        all_tokens = set(index_tokens(task.name, task.description, task.query))
+        self._task_tokens[task_id] = (set(index_tokens(task.name)), all_tokens)
+        for token in all_tokens:
+            self._token_index.setdefault(token, set()).add(task_id)
+
+    def _unindex_task(self, task_id: str) -> None:
+        """移除任务的搜索词元"""
+        tokens = self._task_tokens.pop(task_id, None)
+        if tokens is None:
+            return
+        for token in tokens[1]:
+            task_ids = self._token_index.get(token)
+            if task_ids is not None:
+                task_ids.discard(task_id)
+                if not task_ids:
+                    del self._token_index[token]
     
     async def create(self, task: SearchTask) -> SearchTask:
         """创建任务"""
         self._storage[str(task.id)] = task
+        self._index_task(task)
         logger.info(f"创建任务成功: {task.name} (ID: {task.id})")
         return task
     
@@ -29,18 +58,44 @@ class InMemorySearchTaskRepository:
         return self._storage.get(task_id)
     
     async def update(self, task: SearchTask) -> SearchTask:
-        """更新任务"""
-        if str(task.id) not in self._storage:
+        """更新任务（执行统计字段保留存储中的值，与 MongoDB 仓储一致）"""
+        stored = self._storage.get(str(task.id))
+        if stored is None:
             raise ValueError(f"任务不存在: {task.id}")
-        
+
+        for field_name in EXECUTION_STATS_FIELDS:
+            setattr(task, field_name, getattr(stored, field_name))
         self._storage[str(task.id)] = task
+        self._index_task(task)
         logger.info(f"更新任务成功: {task.name} (ID: {task.id})")
         return task
+
+    async def record_execution_stats(
+        self,
+        task_id: str,
+        success: bool,
+        results_count: int = 0,
+        credits_used: int = 0,
+        executed_at: Optional[datetime] = None,
+        next_run_time: Optional[datetime] = None
+    ) -> Optional[SearchTask]:
+        """记录一次执行的统计"""
+        task = self._storage.get(task_id)
+        if task is None:
+            return None
+
+        task.record_execution(success=success, results_count=results_count, credits_used=credits_used)
+        if executed_at is not None:
+            task.last_executed_at = executed_at
+        if next_run_time is not None:
+            task.next_run_time = next_run_time
+        return task
     
     async def delete(self, task_id: str) -> bool:
         """删除任务"""
         if task_id in self._storage:
             task = self._storage.pop(task_id)
+            self._unindex_task(task_id)
             logger.info(f"删除任务成功: {task.name} (ID: {task_id})")
             return True
         return False
@@ -55,38 +110,115 @@ class InMemorySearchTaskRepository:
         created_by: Optional[str] = None
     ) -> tuple[List[SearchTask], int]:
         """获取任务列表"""
+        data = await self.query_tasks(
+            page=page,
+            page_size=page_size,
+            status=status,
+            is_active=is_active,
+            query=query,
+            created_by=created_by
+        )
+        return data["items"], data["total"]
+
+    async def query_tasks(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        query: Optional[str] = None,
+        created_by: Optional[str] = None,
+        include_total: bool = True
+    ) -> Dict[str, Any]:
+        """查询任务列表（与 MongoDB 仓储一致：(created_at, _id) 降序，支持复合键游标和关键词搜索）"""
+        if query:
+            return self._search_tasks(query, page, page_size, cursor, status, is_active, created_by, include_total)
+
         # 过滤任务
-        filtered_tasks = list(self._storage.values())
+        filtered_tasks = self._filter_tasks(list(self._storage.values()), status, is_active, created_by)
         
+        # 排序（按创建时间、ID倒序）
+        filtered_tasks.sort(key=lambda t: (t.created_at, str(t.id)), reverse=True)
+        total = len(filtered_tasks) if include_total else None
+
+        if cursor:
+            cursor_info = cursor_paginator.decode_keyset_cursor(cursor)
+            if cursor_info.field != "created_at" or cursor_info.direction != -1:
+                raise ValueError("游标与当前排序条件不匹配")
+            position = (cursor_info.value, str(cursor_info.last_id))
+            filtered_tasks = [t for t in filtered_tasks if (t.created_at, str(t.id)) < position]
+            start = 0
+        else:
+            start = (page - 1) * page_size
+
+        page_tasks = filtered_tasks[start:start + page_size]
+        next_cursor = None
+        if len(filtered_tasks) > start + page_size:
+            last = page_tasks[-1]
+            next_cursor = cursor_paginator.make_keyset_cursor(
+                {"created_at": last.created_at, "_id": str(last.id)}, "created_at", -1
+            )
+
+        return {"items": page_tasks, "total": total, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _filter_tasks(
+        tasks: List[SearchTask],
+        status: Optional[str],
+        is_active: Optional[bool],
+        created_by: Optional[str]
+    ) -> List[SearchTask]:
+        """按状态、启用状态和创建者过滤任务"""
         if status:
-            filtered_tasks = [t for t in filtered_tasks if t.status.value == status]
+            tasks = [t for t in tasks if t.status.value == status]
         
         if is_active is not None:
-            filtered_tasks = [t for t in filtered_tasks if t.is_active == is_active]
+            tasks = [t for t in tasks if t.is_active == is_active]
         
         if created_by:
-            filtered_tasks = [t for t in filtered_tasks if t.created_by == created_by]
-        
-        if query:
-            query_lower = query.lower()
-            filtered_tasks = [
-                t for t in filtered_tasks
-                if (query_lower in t.name.lower() or 
-                    query_lower in t.query.lower() or
-                    (t.description and query_lower in t.description.lower()))
-            ]
-        
-        # 排序（按创建时间倒序）
-        filtered_tasks.sort(key=lambda t: t.created_at, reverse=True)
-        
-        # 分页
-        total = len(filtered_tasks)
+            tasks = [t for t in tasks if t.created_by == created_by]
+
+        return tasks
+
+    def _search_tasks(
+        self,
+        query: str,
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        status: Optional[str],
+        is_active: Optional[bool],
+        created_by: Optional[str],
+        include_total: bool
+    ) -> Dict[str, Any]:
+        """关键词搜索任务（倒排索引求交集，按相关度排序）"""
+        if cursor:
+            raise ValueError("关键词搜索按相关度排序，不支持游标分页")
+
+        tokens = query_tokens(query)
+        posting_lists = sorted((self._token_index.get(token, set()) for token in tokens), key=len)
+        task_ids = set(posting_lists[0]).intersection(*posting_lists[1:]) if posting_lists else set()
+
+        candidates = self._filter_tasks(
+            [self._storage[task_id] for task_id in task_ids], status, is_active, created_by
+        )
+        # 与 MongoDB 仓储一致：候选集取最近创建的任务
+        candidates.sort(key=lambda t: (t.created_at, str(t.id)), reverse=True)
+        candidates = candidates[:settings.TASK_SEARCH_CANDIDATE_LIMIT]
+
+        def sort_key(task: SearchTask):
+            name_tokens, all_tokens = self._task_tokens[str(task.id)]
+            return match_score(tokens, name_tokens, all_tokens), task.created_at, str(task.id)
+
+        candidates.sort(key=sort_key, reverse=True)
         start = (page - 1) * page_size
-        end = min(start + page_size, total)
-        
-        page_tasks = filtered_tasks[start:end]
-        
-        return page_tasks, total
+
+        return {
+            "items": candidates[start:start + page_size],
+            "total": len(candidates) if include_total else None,
+            "next_cursor": None
+        }
     
     async def get_active_tasks(self) -> List[SearchTask]:
         """获取所有活跃任务（用于调度）"""
@@ -112,15 +244,45 @@ class InMemorySearchResultRepository:
         self._storage: Dict[str, SearchResult] = {}
         logger.info("初始化内存结果存储")
     
-    async def save_results(self, results: List[SearchResult]) -> None:
-        """批量保存搜索结果"""
-        if not results:
-            return
-        
+    async def save_results(
+        self,
+        results: List[SearchResult],
+        execution_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """批量保存搜索结果（同一任务内按 content_hash 去重）"""
+        seen_at = datetime.utcnow()
+        existing = {
+            (str(result.task_id), result.content_hash): result
+            for result in self._storage.values()
+        }
+
+        new_ids = []
         for result in results:
+            if not result.content_hash:
+                result.content_hash = result.compute_content_hash()
+            key = (str(result.task_id), result.content_hash)
+
+            if key in existing:
+                stored = existing[key]
+                stored.last_seen_at = seen_at
+                stored.last_execution_id = execution_id
+                stored.seen_count += 1
+                result.id = stored.id
+                continue
+
+            result.first_seen_at = result.last_seen_at = seen_at
+            result.first_execution_id = result.last_execution_id = execution_id
             self._storage[str(result.id)] = result
+            existing[key] = result
+            new_ids.append(str(result.id))
         
-        logger.info(f"保存搜索结果成功: {len(results)}条")
+        logger.info(f"保存搜索结果成功: 新增 {len(new_ids)} 条")
+        return {
+            "new_count": len(new_ids),
+            "duplicate_count": len(results) - len(new_ids),
+            "new_result_ids": new_ids,
+            "seen_at": seen_at
+        }
     
     async def get_results_by_task(
         self,
@@ -154,6 +316,18 @@ class InMemorySearchResultRepository:
         
         return page_results, total
     
+    async def get_by_id(
+        self,
+        task_id: str,
+        result_id: str,
+        include_html: bool = True
+    ) -> Optional[SearchResult]:
+        """根据ID获取单个结果（内存存储中 include_html 不影响返回内容）"""
+        result = self._storage.get(str(result_id))
+        if result and str(result.task_id) == task_id:
+            return result
+        return None
+    
     async def get_latest_results(
         self,
         task_id: str,
@@ -0,0 +1,249 @@
+"""报告跨任务搜索倒排索引仓储
+
+MongoDB $text 不切分中文，报告跨任务搜索改用自建倒排索引（按任务分区，便于报告范围查询）：
+
+- report_search_docs: 已索引文档（_id = "{source}:{task_id}:{doc_id}"，记录文档长度；
+  插入成功才写倒排，保证同一文档重复索引时幂等；写倒排失败时先删除已写入的倒排、
+  再删除本次登记的文档，之后的增量索引或重建可以重新索引）
+- report_search_postings: 倒排块，按 (source, task_id, term) 追加，块内以并列数组存储
+  doc_ids / tfs / lens（文档ID、词频、文档长度），达到 REPORT_SEARCH_POSTING_BLOCK_SIZE 后新开一块
+- report_search_task_stats: 任务级语料统计（文档数、总长度），用于 BM25 的 N 和平均文档长度
+
+source 为 scheduled（search_results）或 instant（instant_search_results，结果在任务间共享，
+按任务分别索引）。结果被删除/归档后倒排不立即清理，查询回填文档时自动过滤。
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.config import settings
+from src.infrastructure.database.connection import get_mongodb_database
+from src.infrastructure.id_generator import generate_string_id
+from src.utils.logger import get_logger
+from src.utils.text_tokenizer import analyze_terms
+
+logger = get_logger(__name__)
+
+SOURCE_SCHEDULED = "scheduled"
+SOURCE_INSTANT = "instant"
+
+
+@dataclass
+class IndexDocument:
+    """待索引文档"""
+    task_id: str
+    doc_id: str
+    title: Optional[str] = ""
+    content: Optional[str] = ""
+
+    def term_counts(self) -> Counter:
+        """计算词频（标题词频按 REPORT_SEARCH_TITLE_WEIGHT 加权）"""
+        counts = Counter(analyze_terms((self.content or "")[:settings.REPORT_SEARCH_MAX_INDEX_CHARS]))
+        for term in analyze_terms(self.title):
+            counts[term] += settings.REPORT_SEARCH_TITLE_WEIGHT
+        return counts
+
+
+class ReportSearchIndexRepository:
+    """报告跨任务搜索倒排索引仓储"""
+
+    def __init__(self):
+        self.docs_collection_name = "report_search_docs"
+        self.postings_collection_name = "report_search_postings"
+        self.stats_collection_name = "report_search_task_stats"
+
+    async def _get_collections(self):
+        """获取 (文档, 倒排, 统计) 集合"""
+        db = await get_mongodb_database()
+        return (
+            db[self.docs_collection_name],
+            db[self.postings_collection_name],
+            db[self.stats_collection_name]
+        )
+
+    async def index_documents(self, source: str, documents: Iterable[IndexDocument]) -> int:
+        """
+        增量索引文档（已索引的文档跳过）
+
+        Returns:
+            int: 新索引的文档数
+        """
+        prepared = {}
+        for document in documents:
+            counts = document.term_counts()
+            if counts:
+                prepared[f"{source}:{document.task_id}:{document.doc_id}"] = (document, counts)
+        if not prepared:
+            return 0
+
+        try:
+            docs_collection, postings_collection, stats_collection = await self._get_collections()
+
+            # 1. 登记文档（重复键表示已索引，跳过）
+            doc_records = [
+                {
+                    "_id": key,
+                    "source": source,
+                    "task_id": document.task_id,
+                    "doc_id": document.doc_id,
+                    "length": sum(counts.values())
+                }
+                for key, (document, counts) in prepared.items()
+            ]
+            try:
+                await docs_collection.insert_many(doc_records, ordered=False)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != 11000 for error in write_errors):
+                    raise
+                duplicate_indexes = {error["index"] for error in write_errors}
+                doc_records = [record for i, record in enumerate(doc_records) if i not in duplicate_indexes]
+
+            if not doc_records:
+                return 0
+
+            # 2. 按 (任务, 词) 合并后追加到未满的倒排块
+            postings: Dict[tuple, Dict[str, List[Any]]] = {}
+            task_stats: Dict[str, Dict[str, int]] = {}
+            for record in doc_records:
+                _, counts = prepared[record["_id"]]
+                for term, tf in counts.items():
+                    entry = postings.setdefault(
+                        (record["task_id"], term), {"doc_ids": [], "tfs": [], "lens": []}
+                    )
+                    entry["doc_ids"].append(record["doc_id"])
+                    entry["tfs"].append(tf)
+                    entry["lens"].append(record["length"])
+                stats = task_stats.setdefault(record["task_id"], {"doc_count": 0, "total_length": 0})
+                stats["doc_count"] += 1
+                stats["total_length"] += record["length"]
+
+            block_size = settings.REPORT_SEARCH_POSTING_BLOCK_SIZE
+            operations = [
+                UpdateOne(
+                    {"source": source, "term": term, "task_id": task_id, "size": {"$lt": block_size}},
+                    {
+                        "$push": {
+                            "doc_ids": {"$each": entry["doc_ids"]},
+                            "tfs": {"$each": entry["tfs"]},
+                            "lens": {"$each": entry["lens"]}
+                        },
+                        "$inc": {"size": len(entry["doc_ids"])},
+                        "$setOnInsert": {"_id": generate_string_id()}
+                    },
+                    upsert=True
+                )
+                for (task_id, term), entry in postings.items()
+            ]
+            try:
+                await postings_collection.bulk_write(operations, ordered=False)
+            except Exception:
+                # 无序写入可能已部分成功：先删除这些文档已写入的倒排，再撤销登记，
+                # 否则文档永远不会再被索引，或重新索引时倒排重复
+                doc_ids_by_task: Dict[str, List[str]] = {}
+                for record in doc_records:
+                    doc_ids_by_task.setdefault(record["task_id"], []).append(record["doc_id"])
+                for task_id, doc_ids in doc_ids_by_task.items():
+                    await self._remove_postings(postings_collection, source, task_id, doc_ids)
+                await docs_collection.delete_many({"_id": {"$in": [record["_id"] for record in doc_records]}})
+                raise
+
+            # 3. 累加任务级语料统计
+            await stats_collection.bulk_write([
+                UpdateOne(
+                    {"_id": f"{source}:{task_id}"},
+                    {
+                        "$inc": stats,
+                        "$setOnInsert": {"source": source, "task_id": task_id}
+                    },
+                    upsert=True
+                )
+                for task_id, stats in task_stats.items()
+            ], ordered=False)
+
+            return len(doc_records)
+
+        except Exception as e:
+            logger.error(f"索引报告搜索文档失败 ({source}): {e}")
+            raise
+
+    @staticmethod
+    async def _remove_postings(postings_collection, source: str, task_id: str, doc_ids: List[str]) -> None:
+        """从任务的倒排块中删除指定文档（doc_ids / tfs / lens 按相同下标一并删除）"""
+        keep = {
+            "$filter": {
+                "input": {"$range": [0, {"$size": "$doc_ids"}]},
+                "as": "i",
+                "cond": {"$not": [{"$in": [{"$arrayElemAt": ["$doc_ids", "$$i"]}, doc_ids]}]}
+            }
+        }
+        await postings_collection.update_many(
+            {"source": source, "task_id": task_id, "doc_ids": {"$in": doc_ids}},
+            [
+                {"$set": {"_keep": keep}},
+                {"$set": {
+                    field: {"$map": {"input": "$_keep", "as": "i", "in": {"$arrayElemAt": [f"${field}", "$$i"]}}}
+                    for field in ("doc_ids", "tfs", "lens")
+                }},
+                {"$set": {"size": {"$size": "$_keep"}}},
+                {"$unset": "_keep"}
+            ]
+        )
+
+    async def get_postings(
+        self,
+        source: str,
+        task_ids: List[str],
+        terms: List[str]
+    ) -> List[Dict[str, Any]]:
+        """读取指定任务范围内查询词的倒排块"""
+        if not task_ids or not terms:
+            return []
+
+        try:
+            _, postings_collection, _ = await self._get_collections()
+            cursor = postings_collection.find(
+                {"source": source, "term": {"$in": terms}, "task_id": {"$in": task_ids}},
+                {"_id": 0, "term": 1, "task_id": 1, "doc_ids": 1, "tfs": 1, "lens": 1}
+            )
+            return await cursor.to_list(length=None)
+
+        except Exception as e:
+            logger.error(f"读取报告搜索倒排失败 ({source}): {e}")
+            raise
+
+    async def get_corpus_stats(self, source: str, task_ids: List[str]) -> Dict[str, int]:
+        """汇总任务范围内的文档数和总长度"""
+        if not task_ids:
+            return {"doc_count": 0, "total_length": 0}
+
+        try:
+            _, _, stats_collection = await self._get_collections()
+            doc_count = 0
+            total_length = 0
+            async for stats in stats_collection.find(
+                {"_id": {"$in": [f"{source}:{task_id}" for task_id in task_ids]}}
+            ):
+                doc_count += stats.get("doc_count", 0)
+                total_length += stats.get("total_length", 0)
+            return {"doc_count": doc_count, "total_length": total_length}
+
+        except Exception as e:
+            logger.error(f"读取报告搜索语料统计失败 ({source}): {e}")
+            raise
+
+    async def delete_task(self, source: str, task_id: str) -> None:
+        """删除任务的全部索引"""
+        try:
+            docs_collection, postings_collection, stats_collection = await self._get_collections()
+            await postings_collection.delete_many({"source": source, "task_id": task_id})
+            await docs_collection.delete_many({"source": source, "task_id": task_id})
+            await stats_collection.delete_one({"_id": f"{source}:{task_id}"})
+
+        except Exception as e:
+            logger.error(f"删除任务搜索索引失败 ({source}:{task_id}): {e}")
+            raise
@@ -1,21 +1,59 @@
 """数据库仓储层实现"""
 
 import json
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Union
+from urllib.parse import urlparse
 from uuid import UUID
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
 
-from src.core.domain.entities.search_task import SearchTask, TaskStatus
-from src.core.domain.entities.search_result import SearchResult, ResultStatus
+from src.core.domain.entities.search_task import EXECUTION_STATS_FIELDS, SearchTask, TaskStatus
+from src.core.domain.entities.search_result import SearchResult, SearchResultBatch, ResultStatus
+from src.config import settings
 from src.infrastructure.database.connection import get_mongodb_database
+from src.infrastructure.database.content_blob_repository import ContentBlobRepository
+from src.infrastructure.database.count_cache import count_cache
+from src.infrastructure.database.report_search_index_repository import (
+    SOURCE_INSTANT, SOURCE_SCHEDULED, IndexDocument, ReportSearchIndexRepository
+)
+from src.infrastructure.database.result_write_buffer import (
+    PartialResultWriteError, PendingResultWrite, result_write_buffer
+)
+from src.infrastructure.database.unified_results_repository import UnifiedResultRepository, scheduled_row
+from src.infrastructure.id_generator import generate_string_id
+from src.utils.cursor_pagination import cursor_paginator
+from src.utils.field_codec import field_codec
+from src.utils.text_tokenizer import NAME_TOKEN_WEIGHT, analyze_terms, index_tokens, is_keyword_term, query_tokens
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def encode_result_id(raw_id: Union[str, UUID]) -> str:
+    """
+    搜索结果ID编解码（存储与API统一使用字符串形式）
+
+    雪花算法ID和UUID字符串原样往返：实体ID、数据库 _id、API 中的 id 三者一致
+    """
+    return str(raw_id)
+
+
+def normalize_article_tag(article_tag_raw: Any) -> Optional[str]:
+    """处理article_tag：数据库中可能存储为列表，用逗号连接成字符串"""
+    if isinstance(article_tag_raw, list):
+        return ', '.join(str(tag) for tag in article_tag_raw) if article_tag_raw else None
+    return article_tag_raw
+
+
 class SearchTaskRepository:
     """搜索任务仓储"""
+
+    # 列表查询不返回搜索词元
+    SEARCH_TOKEN_EXCLUSION = {"search_tokens": 0, "search_name_tokens": 0}
     
     def __init__(self):
         self.collection_name = "search_tasks"
@@ -47,9 +85,20 @@ class SearchTaskRepository:
             "success_count": task.success_count,
             "failure_count": task.failure_count,
             "total_results": task.total_results,
-            "total_credits_used": task.total_credits_used
+            "total_credits_used": task.total_credits_used,
+            # 关键词搜索词元（写入时维护，见 src/utils/text_tokenizer.py）
+            "search_tokens": index_tokens(task.name, task.description, task.query),
+            "search_name_tokens": index_tokens(task.name)
         }
     
+    def _task_to_update_dict(self, task: SearchTask) -> Dict[str, Any]:
+        """更新用字典（不含ID和执行统计字段，避免用调用方读到的旧值覆盖并发累加的计数）"""
+        task_dict = self._task_to_dict(task)
+        task_dict.pop("_id")
+        for field_name in EXECUTION_STATS_FIELDS:
+            task_dict.pop(field_name)
+        return task_dict
+
     def _dict_to_task(self, data: Dict[str, Any]) -> SearchTask:
         """将字典转换为任务实体"""
         task = SearchTask(
@@ -87,6 +136,7 @@ class SearchTaskRepository:
             task_dict = self._task_to_dict(task)
             
             await collection.insert_one(task_dict)
+            count_cache.invalidate(self.collection_name)
             logger.info(f"创建任务成功: {task.name} (ID: {task.id})")
             
             return task
@@ -110,12 +160,11 @@ class SearchTaskRepository:
             raise
     
     async def update(self, task: SearchTask) -> SearchTask:
-        """更新任务"""
+        """更新任务（执行统计字段除外，见 record_execution_stats）"""
         try:
             collection = await self._get_collection()
-            task_dict = self._task_to_dict(task)
-            task_dict.pop("_id")  # 移除ID字段
-            
+            task_dict = self._task_to_update_dict(task)
+
             result = await collection.update_one(
                 {"_id": str(task.id)},
                 {"$set": task_dict}
@@ -123,7 +172,9 @@ class SearchTaskRepository:
             
             if result.matched_count == 0:
                 raise ValueError(f"任务不存在: {task.id}")
-            
+
+            # 状态/启用/创建者可能变化，带过滤条件的缓存总数随之失效
+            count_cache.invalidate(self.collection_name)
             logger.info(f"更新任务成功: {task.name} (ID: {task.id})")
             return task
             
@@ -131,6 +182,67 @@ class SearchTaskRepository:
             logger.error(f"更新任务失败: {e}")
             raise
     
+    async def record_execution_stats(
+        self,
+        task_id: str,
+        success: bool,
+        results_count: int = 0,
+        credits_used: int = 0,
+        executed_at: Optional[datetime] = None,
+        next_run_time: Optional[datetime] = None
+    ) -> Optional[SearchTask]:
+        """
+        原子记录一次执行的统计
+
+        单次 find_one_and_update：$inc 累加执行/成功/失败次数、结果数和积分，
+        $set 更新 last_executed_at / next_run_time。手动执行与定时执行重叠时计数不会丢失
+
+        Args:
+            task_id: 任务ID
+            success: 执行是否成功
+            results_count: 本次结果数
+            credits_used: 本次消耗积分
+            executed_at: 执行时间（默认当前时间）
+            next_run_time: 下次执行时间（None 表示不修改）
+
+        Returns:
+            更新后的任务，不存在返回 None
+        """
+        try:
+            collection = await self._get_collection()
+            now = datetime.utcnow()
+
+            update_set: Dict[str, Any] = {
+                "last_executed_at": executed_at or now,
+                "updated_at": now
+            }
+            if next_run_time is not None:
+                update_set["next_run_time"] = next_run_time
+
+            data = await collection.find_one_and_update(
+                {"_id": task_id},
+                {
+                    "$inc": {
+                        "execution_count": 1,
+                        "success_count": 1 if success else 0,
+                        "failure_count": 0 if success else 1,
+                        "total_results": results_count,
+                        "total_credits_used": credits_used
+                    },
+                    "$set": update_set
+                },
+                return_document=ReturnDocument.AFTER
+            )
+
+            # 只改计数与时间字段，不影响任何列表过滤条件，缓存总数无需失效
+            if data is None:
+                return None
+            return self._dict_to_task(data)
+
+        except Exception as e:
+            logger.error(f"记录执行统计失败: {e}")
+            raise
+
     async def delete(self, task_id: str) -> bool:
         """删除任务"""
         try:
@@ -138,6 +250,7 @@ class SearchTaskRepository:
             result = await collection.delete_one({"_id": task_id})
             
             if result.deleted_count > 0:
+                count_cache.invalidate(self.collection_name)
                 logger.info(f"删除任务成功: {task_id}")
                 return True
             
@@ -156,46 +269,153 @@ class SearchTaskRepository:
         query: Optional[str] = None,
         created_by: Optional[str] = None
     ) -> tuple[List[SearchTask], int]:
-        """获取任务列表"""
+        """获取任务列表（页码分页）"""
+        data = await self.query_tasks(
+            page=page,
+            page_size=page_size,
+            status=status,
+            is_active=is_active,
+            query=query,
+            created_by=created_by
+        )
+        return data["items"], data["total"]
+
+    async def query_tasks(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        query: Optional[str] = None,
+        created_by: Optional[str] = None,
+        include_total: bool = True
+    ) -> Dict[str, Any]:
+        """
+        查询任务列表
+
+        - 按 (created_at, _id) 降序排列，依赖 (过滤字段, created_at, _id) 复合索引
+        - 提供 cursor 时使用复合键游标（无 SKIP，深分页耗时不随页数增长），否则回退到页码分页
+        - include_total=False 时不计算总数；计算时使用估算总数或短期缓存的总数
+        - 提供 query 时走词元索引的关键词搜索，按相关度排序（见 _search_tasks）
+
+        Returns:
+            dict:
+                - items: 任务实体列表
+                - total: 过滤后的总数（include_total=False 时为 None）
+                - next_cursor: 下一页游标（无下一页为 None）
+        """
         try:
             collection = await self._get_collection()
-            
+
             # 构建查询条件
-            filter_dict = {}
-            
+            filter_dict: Dict[str, Any] = {}
+
             if status:
                 filter_dict["status"] = status
-            
+
             if is_active is not None:
                 filter_dict["is_active"] = is_active
-            
+
             if created_by:
                 filter_dict["created_by"] = created_by
-            
+
             if query:
-                # 模糊查询名称、描述和查询词
-                filter_dict["$or"] = [
-                    {"name": {"$regex": query, "$options": "i"}},
-                    {"description": {"$regex": query, "$options": "i"}},
-                    {"query": {"$regex": query, "$options": "i"}}
-                ]
-            
-            # 计算总数
-            total = await collection.count_documents(filter_dict)
-            
-            # 分页查询
-            skip = (page - 1) * page_size
-            cursor = collection.find(filter_dict).sort("created_at", -1).skip(skip).limit(page_size)
-            
-            tasks = []
-            async for data in cursor:
-                tasks.append(self._dict_to_task(data))
-            
-            return tasks, total
-            
+                return await self._search_tasks(collection, filter_dict, query, page, page_size, cursor, include_total)
+
+            total = await count_cache.count(collection, filter_dict) if include_total else None
+
+            find_filter = filter_dict
+            skip = 0
+            if cursor:
+                cursor_info = cursor_paginator.decode_keyset_cursor(cursor)
+                if cursor_info.field != "created_at" or cursor_info.direction != -1:
+                    raise ValueError("游标与当前排序条件不匹配")
+                find_filter = {"$and": [filter_dict, cursor_paginator.build_keyset_filter(cursor_info)]}
+            else:
+                skip = (page - 1) * page_size
+
+            # 多取一条用于判断是否有下一页
+            find_cursor = collection.find(find_filter, self.SEARCH_TOKEN_EXCLUSION).sort(
+                [("created_at", -1), ("_id", -1)]
+            )
+            if skip:
+                find_cursor = find_cursor.skip(skip)
+            docs = await find_cursor.limit(page_size + 1).to_list(page_size + 1)
+
+            next_cursor = None
+            if len(docs) > page_size:
+                docs = docs[:page_size]
+                next_cursor = cursor_paginator.make_keyset_cursor(docs[-1], "created_at", -1)
+
+            return {
+                "items": [self._dict_to_task(data) for data in docs],
+                "total": total,
+                "next_cursor": next_cursor
+            }
+
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"获取任务列表失败: {e}")
             raise
+
+    async def _search_tasks(
+        self,
+        collection,
+        filter_dict: Dict[str, Any],
+        query: str,
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        include_total: bool
+    ) -> Dict[str, Any]:
+        """
+        关键词搜索任务（按相关度排序）
+
+        - 查询词元全部命中 search_tokens（多键索引 (search_tokens, created_at, _id)）
+        - 候选集取最近创建的 TASK_SEARCH_CANDIDATE_LIMIT 个，按 名称命中加权 + 全字段命中 计分排序
+        - 相关度排序不支持游标分页，使用页码分页
+        """
+        if cursor:
+            raise ValueError("关键词搜索按相关度排序，不支持游标分页")
+
+        tokens = query_tokens(query)
+        if not tokens:
+            # 查询中没有可检索的字符
+            return {"items": [], "total": 0 if include_total else None, "next_cursor": None}
+
+        search_filter = dict(filter_dict)
+        search_filter["search_tokens"] = {"$all": tokens}
+        candidate_limit = settings.TASK_SEARCH_CANDIDATE_LIMIT
+
+        total = None
+        if include_total:
+            total = min(await count_cache.count(collection, search_filter), candidate_limit)
+
+        pipeline = [
+            {"$match": search_filter},
+            {"$sort": {"created_at": -1, "_id": -1}},
+            {"$limit": candidate_limit},
+            {"$addFields": {"_search_score": {"$add": [
+                {"$multiply": [
+                    NAME_TOKEN_WEIGHT,
+                    {"$size": {"$setIntersection": [tokens, {"$ifNull": ["$search_name_tokens", []]}]}}
+                ]},
+                {"$size": {"$setIntersection": [tokens, "$search_tokens"]}}
+            ]}}},
+            {"$sort": {"_search_score": -1, "created_at": -1, "_id": -1}},
+            {"$skip": (page - 1) * page_size},
+            {"$limit": page_size},
+            {"$project": dict(self.SEARCH_TOKEN_EXCLUSION, _search_score=0)}
+        ]
+        docs = await collection.aggregate(pipeline).to_list(page_size)
+
+        return {
+            "items": [self._dict_to_task(data) for data in docs],
+            "total": total,
+            "next_cursor": None
+        }
     
     async def get_active_tasks(self) -> List[SearchTask]:
         """获取所有活跃任务（用于调度）"""
@@ -204,7 +424,7 @@ class SearchTaskRepository:
             cursor = collection.find({
                 "is_active": True,
                 "status": TaskStatus.ACTIVE.value
-            })
+            }, self.SEARCH_TOKEN_EXCLUSION)
             
             tasks = []
             async for data in cursor:
@@ -227,7 +447,7 @@ class SearchTaskRepository:
                     {"next_run_time": None},  # 从未执行过的任务
                     {"next_run_time": {"$lte": current_time}}  # 到期的任务
                 ]
-            })
+            }, self.SEARCH_TOKEN_EXCLUSION)
             
             tasks = []
             async for data in cursor:
@@ -242,9 +462,44 @@ class SearchTaskRepository:
 
 class SearchResultRepository:
     """搜索结果仓储"""
+
+    # 结果列表支持的排序字段（均有 (task_id, 字段, _id) 复合索引）
+    SORTABLE_FIELDS = ("created_at", "relevance_score", "quality_score", "published_date", "first_seen_at")
+
+    # 可压缩存储的大文本字段（开启 FIELD_COMPRESSION_ENABLED 时生效）
+    COMPRESSED_FIELDS = ("content", "snippet", "markdown_content")
+
+    # 结果列表响应所需字段投影（不加载 raw_data/metadata 等大字段）
+    LIST_PROJECTION = {
+        "task_id": 1,
+        "title": 1,
+        "url": 1,
+        "content": 1,
+        "snippet": 1,
+        "source": 1,
+        "markdown_content": 1,
+        "html_content": 1,
+        "html_ref": 1,
+        "article_tag": 1,
+        "article_published_time": 1,
+        "created_at": 1,
+        "relevance_score": 1,
+        "quality_score": 1,
+        "published_date": 1,
+        "first_seen_at": 1,
+        "last_seen_at": 1,
+        "seen_count": 1
+    }
     
     def __init__(self):
         self.collection_name = "search_results"
+        self.stats_repo = SearchResultStatsRepository()
+        self.blob_repo = ContentBlobRepository()
+        self.execution_map_repo = SearchResultExecutionRepository()
+        self.task_execution_repo = SearchTaskExecutionRepository()
+        self.search_index_repo = ReportSearchIndexRepository()
+        self.unified_repo = UnifiedResultRepository()
+        self.trend_repo = TaskTrendBucketRepository()
     
     async def _get_collection(self):
         """获取集合"""
@@ -253,9 +508,9 @@ class SearchResultRepository:
     
     def _result_to_dict(self, result: SearchResult) -> Dict[str, Any]:
         """将结果实体转换为字典 - 优化后的模型"""
-        return {
-            "_id": str(result.id),
-            "task_id": str(result.task_id),
+        result_dict = {
+            "_id": encode_result_id(result.id),
+            "task_id": encode_result_id(result.task_id),
             "title": result.title,
             "url": result.url,
             "content": result.content,
@@ -266,7 +521,9 @@ class SearchResultRepository:
             "language": result.language,
             # 优化后的字段
             "markdown_content": result.markdown_content,  # 最大5000字符
-            "html_content": result.html_content,  # HTML格式内容
+            # HTML格式内容：已移入内容块时只保留引用
+            "html_content": None if result.html_ref else result.html_content,
+            "html_ref": result.html_ref,
             "article_tag": result.article_tag,
             "article_published_time": result.article_published_time,
             "source_url": result.source_url,
@@ -279,34 +536,27 @@ class SearchResultRepository:
             "status": result.status.value,
             "created_at": result.created_at,
             "processed_at": result.processed_at,
-            "is_test_data": result.is_test_data
+            "is_test_data": result.is_test_data,
+            # 跨执行去重
+            "content_hash": result.content_hash or result.compute_content_hash(),
+            "first_seen_at": result.first_seen_at or result.created_at,
+            "last_seen_at": result.last_seen_at or result.created_at,
+            "seen_count": result.seen_count,
+            "first_execution_id": result.first_execution_id,
+            "last_execution_id": result.last_execution_id
         }
+        return field_codec.encode_document(result_dict, self.COMPRESSED_FIELDS)
     
     def _dict_to_result(self, data: Dict[str, Any]) -> SearchResult:
         """将字典转换为结果实体"""
-        # 处理ID转换 - task_id可能是字符串格式的数字ID（雪花算法）
-        # 需要转换为UUID格式，如果不是有效的UUID，使用uuid5生成
-        try:
-            result_id = UUID(data["_id"])
-        except (ValueError, AttributeError):
-            # 如果不是有效的UUID，使用字符串作为命名空间生成UUID
-            import uuid
-            result_id = uuid.uuid5(uuid.NAMESPACE_OID, str(data["_id"]))
+        field_codec.decode_document(data, self.COMPRESSED_FIELDS)
 
-        try:
-            task_id = UUID(data["task_id"])
-        except (ValueError, AttributeError):
-            # 使用雪花ID字符串生成UUID
-            import uuid
-            task_id = uuid.uuid5(uuid.NAMESPACE_OID, str(data["task_id"]))
+        # ID原样保留（雪花算法ID或UUID字符串）
+        result_id = encode_result_id(data["_id"])
+        task_id = encode_result_id(data["task_id"])
 
         # 处理article_tag：数据库中可能存储为列表
-        article_tag_raw = data.get("article_tag")
-        if isinstance(article_tag_raw, list):
-            # 如果是列表，用逗号连接成字符串
-            article_tag = ', '.join(str(tag) for tag in article_tag_raw) if article_tag_raw else None
-        else:
-            article_tag = article_tag_raw
+        article_tag = normalize_article_tag(data.get("article_tag"))
 
         return SearchResult(
             id=result_id,
@@ -322,6 +572,7 @@ class SearchResultRepository:
             # 优化后的字段
             markdown_content=data.get("markdown_content"),
             html_content=data.get("html_content"),
+            html_ref=data.get("html_ref"),
             article_tag=article_tag,
             article_published_time=data.get("article_published_time"),
             source_url=data.get("source_url"),
@@ -334,25 +585,317 @@ class SearchResultRepository:
             status=ResultStatus(data.get("status", "pending")),
             created_at=data.get("created_at", datetime.utcnow()),
             processed_at=data.get("processed_at"),
-            is_test_data=data.get("is_test_data", False)
+            is_test_data=data.get("is_test_data", False),
+            content_hash=data.get("content_hash", ""),
+            first_seen_at=data.get("first_seen_at"),
+            last_seen_at=data.get("last_seen_at"),
+            seen_count=data.get("seen_count", 1),
+            first_execution_id=data.get("first_execution_id"),
+            last_execution_id=data.get("last_execution_id")
         )
+
+    async def _find_existing_ids(self, collection, keys: List[tuple]) -> Dict[tuple, str]:
+        """按 (task_id, content_hash) 查询已存在的结果ID"""
+        hashes_by_task: Dict[str, List[str]] = {}
+        for task_id, content_hash in keys:
+            hashes_by_task.setdefault(task_id, []).append(content_hash)
+
+        existing: Dict[tuple, str] = {}
+        for task_id, hashes in hashes_by_task.items():
+            cursor = collection.find(
+                {"task_id": task_id, "content_hash": {"$in": hashes}},
+                {"content_hash": 1}
+            )
+            async for doc in cursor:
+                existing[(task_id, doc["content_hash"])] = doc["_id"]
+        return existing
     
-    async def save_results(self, results: List[SearchResult]) -> None:
-        """批量保存搜索结果"""
+    async def save_results(
+        self,
+        results: List[SearchResult],
+        execution_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        批量保存搜索结果（同一任务内按 content_hash 跨执行去重）
+
+        - 首次出现的结果插入，记录 first_seen_at / first_execution_id
+        - 已存在的结果不再插入，只更新 last_seen_at / last_execution_id 并累加 seen_count，
+          实体ID替换为已存在结果的ID
+        - 提供 execution_id 时记录执行与结果的映射（含 is_new 标记）
+        - 开启 RESULT_WRITE_BUFFER_ENABLED 时经进程级写缓冲与其他执行合并写入，
+          返回前等待写入完成
+
+        Returns:
+            dict: new_count / duplicate_count / new_result_ids / seen_at
+        """
         if not results:
-            return
-        
+            return {"new_count": 0, "duplicate_count": 0, "new_result_ids": [], "seen_at": datetime.utcnow()}
+
+        write = PendingResultWrite(results=results, execution_id=execution_id)
+        if settings.RESULT_WRITE_BUFFER_ENABLED:
+            return await result_write_buffer.submit(write)
+
+        summaries = await self.persist_writes([write])
+        return summaries[0]
+
+    async def persist_writes(self, writes: List[PendingResultWrite]) -> List[Dict[str, Any]]:
+        """
+        将多次执行的结果合并写入（一次无序 insert_many + 一次 bulk_write 更新发现信息）
+
+        多次执行之间同样去重：先提交的执行插入新结果，后提交的执行中相同内容计为重复
+
+        失败处理：
+        - 未写入任何数据时直接抛出原异常（未插入结果占用的内容块引用已释放），可以安全重试
+        - 已有结果插入或发现信息已更新后失败时，仍为已插入的结果维护统计/索引/读模型，
+          最后抛出 PartialResultWriteError；重试会把已插入的结果计为重复，调用方不应重试
+
+        Returns:
+            与 writes 一一对应的写入摘要
+        """
+        seen_at = datetime.utcnow()
+        partial_error: Optional[Exception] = None
+
+        # 计算去重键（每次执行内的重复只计一次）
+        write_keys: List[List[tuple]] = []
+        for write in writes:
+            keys = []
+            for result in write.results:
+                if not result.content_hash:
+                    result.content_hash = result.compute_content_hash()
+                key = (encode_result_id(result.task_id), result.content_hash)
+                if key not in keys:
+                    keys.append(key)
+            write_keys.append(keys)
+
         try:
             collection = await self._get_collection()
-            result_dicts = [self._result_to_dict(result) for result in results]
-            
-            await collection.insert_many(result_dicts)
-            logger.info(f"保存搜索结果成功: {len(results)}条")
-            
+            existing = await self._find_existing_ids(
+                collection, list({key for keys in write_keys for key in keys})
+            )
+
+            # 分配新结果：每个去重键由最先提交的执行插入
+            owners: Dict[tuple, int] = {}
+            new_results: List[SearchResult] = []
+            for index, (write, keys) in enumerate(zip(writes, write_keys)):
+                first_by_key = {}
+                for result in write.results:
+                    first_by_key.setdefault((encode_result_id(result.task_id), result.content_hash), result)
+                for key in keys:
+                    if key in existing or key in owners:
+                        continue
+                    result = first_by_key[key]
+                    result.first_seen_at = result.last_seen_at = seen_at
+                    result.seen_count = 1
+                    result.first_execution_id = result.last_execution_id = write.execution_id
+                    owners[key] = index
+                    new_results.append(result)
+
+            # HTML正文移入内容块（按内容哈希共享）
+            if settings.CONTENT_BLOB_OFFLOAD_ENABLED:
+                await self._offload_html(new_results)
+
+            result_dicts = [self._result_to_dict(result) for result in new_results]
+            if result_dicts:
+                try:
+                    await collection.insert_many(result_dicts, ordered=False)
+                except Exception as e:
+                    # 无序插入可能部分成功（网络错误时是否写入未知）：以数据库中实际存在的行为准
+                    written_ids = set(await collection.distinct(
+                        "_id", {"_id": {"$in": [d["_id"] for d in result_dicts]}}
+                    ))
+                    failed_dicts = [d for d in result_dicts if d["_id"] not in written_ids]
+                    result_dicts = [d for d in result_dicts if d["_id"] in written_ids]
+                    await self._release_unwritten(new_results, failed_dicts)
+
+                    # 其他进程并发写入了相同内容：重复键的结果按已存在处理
+                    for d in failed_dicts:
+                        owners.pop((d["task_id"], d["content_hash"]), None)
+                    existing.update(await self._find_existing_ids(
+                        collection, [(d["task_id"], d["content_hash"]) for d in failed_dicts]
+                    ))
+
+                    write_errors = e.details.get("writeErrors", []) if isinstance(e, BulkWriteError) else None
+                    if write_errors is None or any(error.get("code") != 11000 for error in write_errors):
+                        if not result_dicts:
+                            raise
+                        partial_error = e
+                        logger.error(f"部分搜索结果插入失败（已插入 {len(result_dicts)} 条）: {e}")
+
+            canonical_ids = dict(existing)
+            canonical_ids.update({(d["task_id"], d["content_hash"]): d["_id"] for d in result_dicts})
+
+            # 重复出现的结果只更新发现信息（按提交顺序，最后一次执行的信息生效）
+            update_operations = []
+            for index, (write, keys) in enumerate(zip(writes, write_keys)):
+                duplicate_ids = [
+                    canonical_ids[key] for key in keys
+                    if owners.get(key) != index and key in canonical_ids
+                ]
+                if duplicate_ids:
+                    update_operations.append(UpdateMany(
+                        {"_id": {"$in": duplicate_ids}},
+                        {
+                            "$set": {"last_seen_at": seen_at, "last_execution_id": write.execution_id},
+                            "$inc": {"seen_count": 1}
+                        }
+                    ))
+            if update_operations:
+                try:
+                    await collection.bulk_write(update_operations, ordered=True)
+                except Exception as e:
+                    # 新结果已插入或部分发现信息已更新：不能再整体重试
+                    nothing_updated = isinstance(e, BulkWriteError) and not e.details.get("nModified")
+                    if not result_dicts:
+                        if nothing_updated:
+                            raise
+                        raise PartialResultWriteError(f"更新重复结果发现信息失败: {e}") from e
+                    partial_error = partial_error or e
+                    logger.error(f"更新重复结果发现信息失败（新结果已插入 {len(result_dicts)} 条）: {e}")
+
+            for write in writes:
+                for result in write.results:
+                    key = (encode_result_id(result.task_id), result.content_hash)
+                    if key in canonical_ids:
+                        result.id = canonical_ids[key]
+
+            logger.info(
+                f"保存搜索结果成功: {len(writes)} 次执行, 新增 {len(result_dicts)} 条, "
+                f"重复 {sum(len(keys) for keys in write_keys) - len(result_dicts)} 条"
+            )
+
         except Exception as e:
             logger.error(f"保存搜索结果失败: {e}")
             raise
+
+        summaries = []
+        mappings = []
+        for index, (write, keys) in enumerate(zip(writes, write_keys)):
+            new_ids = [canonical_ids[key] for key in keys if owners.get(key) == index]
+            summaries.append({
+                "new_count": len(new_ids),
+                "duplicate_count": len(keys) - len(new_ids),
+                "new_result_ids": new_ids,
+                "seen_at": seen_at
+            })
+            if write.execution_id:
+                mappings.extend(self.execution_map_repo.build_mappings(
+                    write.execution_id, write.results, set(new_ids), seen_at
+                ))
+
+        # 记录执行与结果的映射（失败不影响结果保存）
+        try:
+            await self.execution_map_repo.insert_many(mappings)
+        except Exception as e:
+            logger.error(f"记录执行结果映射失败: {e}")
+
+        # 增量更新任务统计（只累加新结果；失败不影响结果保存，可通过重建脚本修复）
+        try:
+            await self.stats_repo.apply_results(result_dicts)
+        except Exception as e:
+            logger.error(f"更新结果统计失败（可运行 scripts/rebuild_result_stats.py 修复）: {e}")
+
+        # 增量更新报告搜索索引（只索引新结果；失败不影响结果保存，可通过重建接口修复）
+        if settings.REPORT_SEARCH_INDEX_ENABLED and result_dicts:
+            inserted_ids = {d["_id"] for d in result_dicts}
+            try:
+                await self.search_index_repo.index_documents(SOURCE_SCHEDULED, [
+                    IndexDocument(
+                        task_id=encode_result_id(result.task_id),
+                        doc_id=encode_result_id(result.id),
+                        title=result.title,
+                        content=result.content
+                    )
+                    for result in new_results if encode_result_id(result.id) in inserted_ids
+                ])
+            except Exception as e:
+                logger.error(f"更新报告搜索索引失败（可调用重建接口修复）: {e}")
+
+        # 同步统一结果读模型（只写新结果；失败不影响结果保存，可运行 migration_009 回填）
+        if settings.UNIFIED_RESULTS_WRITE_ENABLED and result_dicts:
+            try:
+                await self.unified_repo.upsert_rows(scheduled_row(d) for d in result_dicts)
+            except Exception as e:
+                logger.error(f"同步统一结果失败（可运行 migration_009 回填）: {e}")
+
+        # 累加任务按天趋势桶（新结果计入域名/关键词，重复出现只计数；失败不影响结果保存，可运行 migration_011 重建）
+        if settings.TREND_BUCKETS_ENABLED:
+            inserted_ids = {d["_id"] for d in result_dicts}
+            observations = [
+                TrendObservation(
+                    task_id=encode_result_id(result.task_id),
+                    observed_at=seen_at,
+                    is_new=True,
+                    title=result.title,
+                    content=result.content,
+                    url=result.url
+                )
+                for result in new_results if encode_result_id(result.id) in inserted_ids
+            ]
+            for index, keys in enumerate(write_keys):
+                observations.extend(
+                    TrendObservation(task_id=key[0], observed_at=seen_at, is_new=False, profiled=False)
+                    for key in keys if owners.get(key) != index and key in canonical_ids
+                )
+            try:
+                await self.trend_repo.apply(SOURCE_SCHEDULED, observations)
+            except Exception as e:
+                logger.error(f"更新趋势桶失败（可运行 migration_011 重建）: {e}")
+
+        if partial_error is not None:
+            raise PartialResultWriteError(
+                f"搜索结果已部分写入（新增 {len(result_dicts)} 条）: {partial_error}"
+            ) from partial_error
+
+        return summaries
+
+    async def _release_unwritten(self, new_results: List[SearchResult], failed_dicts: List[Dict[str, Any]]) -> None:
+        """释放未插入结果占用的内容块引用，并清除结果上的引用（重试时重新写入内容块）"""
+        failed_ids = {d["_id"] for d in failed_dicts}
+        release_counts: Counter = Counter(d["html_ref"] for d in failed_dicts if d.get("html_ref"))
+        for result in new_results:
+            if encode_result_id(result.id) in failed_ids and result.html_content:
+                result.html_ref = None
+        await self.blob_repo.release(dict(release_counts))
+
+    async def save_execution(self, batch: SearchResultBatch) -> Dict[str, Any]:
+        """
+        保存一次定时执行的结果并记录执行
+
+        Returns:
+            dict: execution_id / new_count / duplicate_count / new_result_ids
+        """
+        if not batch.execution_id:
+            batch.execution_id = generate_string_id()
+
+        summary = await self.save_results(batch.results, batch.execution_id)
+
+        try:
+            await self.task_execution_repo.create(batch, summary)
+        except Exception as e:
+            logger.error(f"记录任务执行失败: {e}")
+
+        return {"execution_id": batch.execution_id, **summary}
     
+    async def _offload_html(self, results: List[SearchResult]) -> None:
+        """将结果的HTML正文写入内容块并记录引用"""
+        pending = [r for r in results if r.html_content and not r.html_ref]
+        if not pending:
+            return
+
+        refs = await self.blob_repo.put_many([r.html_content for r in pending])
+        for result, ref in zip(pending, refs):
+            result.html_ref = ref
+
+    async def hydrate_html(self, results: List[SearchResult]) -> None:
+        """为只有引用的结果批量加载HTML正文"""
+        pending = [r for r in results if r.html_ref and not r.html_content]
+        if not pending:
+            return
+
+        texts = await self.blob_repo.get_many(r.html_ref for r in pending)
+        for result in pending:
+            result.html_content = texts.get(result.html_ref)
+
     async def get_results_by_task(
         self,
         task_id: str,
@@ -386,6 +929,187 @@ class SearchResultRepository:
             logger.error(f"获取任务结果失败: {e}")
             raise
     
+    async def query_task_results(
+        self,
+        task_id: str,
+        source: Optional[str] = None,
+        language: Optional[str] = None,
+        min_relevance_score: Optional[float] = None,
+        min_quality_score: Optional[float] = None,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        page_size: int = 20,
+        page: int = 1,
+        cursor: Optional[str] = None,
+        include_html: bool = False,
+        first_seen_after: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        在数据库侧过滤、排序和分页任务结果
+
+        - 过滤/排序全部下推到MongoDB，依赖 (task_id, 排序字段, _id) 复合索引
+        - 提供 cursor 时使用复合键游标（无 SKIP），否则回退到页码分页
+        - 只返回 LIST_PROJECTION 中的字段（原始文档，不转换为实体）
+        - include_html=False 时不返回HTML；为 True 时从内容块批量加载
+        - first_seen_after 只返回该时间之后首次发现的结果（"自某次执行以来的新结果"）
+
+        Returns:
+            dict:
+                - items: 原始文档列表
+                - total: 过滤后的总数
+                - next_cursor: 下一页游标（无下一页为 None）
+        """
+        if sort_by not in self.SORTABLE_FIELDS:
+            sort_by = "created_at"
+        direction = 1 if order == "asc" else -1
+
+        try:
+            collection = await self._get_collection()
+
+            # 构建过滤条件
+            filter_dict: Dict[str, Any] = {"task_id": task_id}
+            if source:
+                filter_dict["source"] = source
+            if language:
+                filter_dict["language"] = language
+            if min_relevance_score is not None:
+                filter_dict["relevance_score"] = {"$gte": min_relevance_score}
+            if min_quality_score is not None:
+                filter_dict["quality_score"] = {"$gte": min_quality_score}
+            if first_seen_after is not None:
+                filter_dict["first_seen_at"] = {"$gt": first_seen_after}
+
+            total = await collection.count_documents(filter_dict)
+
+            query = filter_dict
+            skip = 0
+            if cursor:
+                cursor_info = cursor_paginator.decode_keyset_cursor(cursor)
+                if cursor_info.field != sort_by or cursor_info.direction != direction:
+                    raise ValueError("游标与当前排序条件不匹配")
+                query = {"$and": [filter_dict, cursor_paginator.build_keyset_filter(cursor_info)]}
+            else:
+                skip = (page - 1) * page_size
+
+            projection = dict(self.LIST_PROJECTION)
+            if not include_html:
+                projection.pop("html_content")
+                projection.pop("html_ref")
+
+            # 多取一条用于判断是否有下一页
+            find_cursor = collection.find(query, projection).sort(
+                [(sort_by, direction), ("_id", direction)]
+            )
+            if skip:
+                find_cursor = find_cursor.skip(skip)
+            items = await find_cursor.limit(page_size + 1).to_list(page_size + 1)
+
+            next_cursor = None
+            if len(items) > page_size:
+                items = items[:page_size]
+                next_cursor = cursor_paginator.make_keyset_cursor(items[-1], sort_by, direction)
+
+            for doc in items:
+                field_codec.decode_document(doc, self.COMPRESSED_FIELDS)
+
+            if include_html:
+                texts = await self.blob_repo.get_many(
+                    doc.get("html_ref") for doc in items if not doc.get("html_content")
+                )
+                for doc in items:
+                    if doc.get("html_ref") and not doc.get("html_content"):
+                        doc["html_content"] = texts.get(doc["html_ref"])
+
+            return {
+                "items": items,
+                "total": total,
+                "next_cursor": next_cursor
+            }
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"查询任务结果失败: {e}")
+            raise
+
+    async def get_by_id(
+        self,
+        task_id: str,
+        result_id: str,
+        include_html: bool = True
+    ) -> Optional[SearchResult]:
+        """
+        根据ID获取单个结果（_id 索引点查）
+
+        Args:
+            task_id: 任务ID（结果必须属于该任务）
+            result_id: 结果ID
+            include_html: 是否加载 html_content 大字段
+        """
+        try:
+            collection = await self._get_collection()
+            projection = None if include_html else {"html_content": 0}
+
+            data = await collection.find_one(
+                {"_id": encode_result_id(result_id), "task_id": encode_result_id(task_id)},
+                projection
+            )
+
+            if not data:
+                return None
+
+            result = self._dict_to_result(data)
+            if include_html:
+                await self.hydrate_html([result])
+            return result
+
+        except Exception as e:
+            logger.error(f"获取搜索结果失败: {e}")
+            raise
+
+    async def get_execution_results(
+        self,
+        task_id: str,
+        execution_id: str,
+        only_new: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        获取某次执行发现的结果（按该次执行中的排名排序）
+
+        Returns:
+            LIST_PROJECTION 投影后的原始文档列表（不含HTML），附加 is_new / search_position
+        """
+        try:
+            mappings = await self.execution_map_repo.get_by_execution(execution_id, only_new)
+            mappings = [m for m in mappings if m["task_id"] == task_id]
+            if not mappings:
+                return []
+
+            collection = await self._get_collection()
+            projection = dict(self.LIST_PROJECTION)
+            projection.pop("html_content")
+            projection.pop("html_ref")
+
+            docs = {}
+            async for doc in collection.find(
+                {"_id": {"$in": [m["result_id"] for m in mappings]}},
+                projection
+            ):
+                docs[doc["_id"]] = field_codec.decode_document(doc, self.COMPRESSED_FIELDS)
+
+            items = []
+            for mapping in mappings:
+                doc = docs.get(mapping["result_id"])
+                if doc is None:
+                    # 结果已归档或删除
+                    continue
+                items.append({**doc, "is_new": mapping["is_new"], "search_position": mapping["search_position"]})
+            return items
+
+        except Exception as e:
+            logger.error(f"获取执行结果失败: {e}")
+            raise
+
     async def get_latest_results(
         self,
         task_id: str,
@@ -410,11 +1134,838 @@ class SearchResultRepository:
         """删除任务的所有结果"""
         try:
             collection = await self._get_collection()
+
+            # 统计该任务引用的内容块，删除后释放引用
+            ref_counts = {}
+            async for item in collection.aggregate([
+                {"$match": {"task_id": task_id, "html_ref": {"$ne": None}}},
+                {"$group": {"_id": "$html_ref", "count": {"$sum": 1}}}
+            ]):
+                ref_counts[item["_id"]] = item["count"]
+
             result = await collection.delete_many({"task_id": task_id})
+            await self.stats_repo.delete(task_id)
+            await self.blob_repo.release(ref_counts)
+            await self.execution_map_repo.delete_by_task(task_id)
+            await self.task_execution_repo.delete_by_task(task_id)
+            await self.search_index_repo.delete_task(SOURCE_SCHEDULED, task_id)
+            await self.unified_repo.delete_task(SOURCE_SCHEDULED, task_id)
+            await self.trend_repo.delete_task(SOURCE_SCHEDULED, task_id)
             
             logger.info(f"删除任务结果: {task_id}, 删除数量: {result.deleted_count}")
             return result.deleted_count
             
         except Exception as e:
             logger.error(f"删除任务结果失败: {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+def _escape_stats_key(key: str) -> str:
+    """转义统计分布的键（MongoDB字段名不能包含 '.'，不能以 '$' 开头）"""
+    key = key.replace(".", "\uff0e")
+    if key.startswith("$"):
+        key = "\uff04" + key[1:]
+    return key
+
+
+def _unescape_stats_key(key: str) -> str:
+    """还原转义后的统计分布键"""
+    if key.startswith("\uff04"):
+        key = "$" + key[1:]
+    return key.replace("\uff0e", ".")
+
+
+class SearchResultStatsRepository:
+    """
+    搜索结果统计仓储（每个任务一份物化统计文档）
+
+    文档结构（_id = task_id）：
+    - total_results: 结果总数
+    - status_counts / source_counts / language_counts: 分布计数
+    - relevance_sum / quality_sum: 评分总和（平均值 = 总和 / 总数）
+    - min_published_date / max_published_date: 发布日期范围
+    - updated_at: 最后更新时间
+
+    写入路径通过 $inc/$min/$max 原子更新，读取为单文档点查
+    """
+
+    def __init__(self):
+        self.collection_name = "search_result_stats"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    @staticmethod
+    def build_update(result_dicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        根据一批结果文档构建统计更新操作
+
+        Returns:
+            dict: 包含 $inc/$min/$max/$set 的更新文档
+        """
+        inc: Dict[str, Any] = {"total_results": 0, "relevance_sum": 0.0, "quality_sum": 0.0}
+        min_date = None
+        max_date = None
+
+        for data in result_dicts:
+            inc["total_results"] += 1
+            inc["relevance_sum"] += data.get("relevance_score") or 0.0
+            inc["quality_sum"] += data.get("quality_score") or 0.0
+
+            status_key = f"status_counts.{_escape_stats_key(data.get('status') or 'pending')}"
+            inc[status_key] = inc.get(status_key, 0) + 1
+
+            source_key = f"source_counts.{_escape_stats_key(data.get('source') or 'web')}"
+            inc[source_key] = inc.get(source_key, 0) + 1
+
+            if data.get("language"):
+                language_key = f"language_counts.{_escape_stats_key(data['language'])}"
+                inc[language_key] = inc.get(language_key, 0) + 1
+
+            published_date = data.get("published_date")
+            if isinstance(published_date, datetime):
+                if min_date is None or published_date < min_date:
+                    min_date = published_date
+                if max_date is None or published_date > max_date:
+                    max_date = published_date
+
+        update: Dict[str, Any] = {
+            "$inc": inc,
+            "$set": {"updated_at": datetime.utcnow()}
+        }
+        if min_date is not None:
+            update["$min"] = {"min_published_date": min_date}
+            update["$max"] = {"max_published_date": max_date}
+
+        return update
+
+    async def apply_results(self, result_dicts: List[Dict[str, Any]]) -> None:
+        """将新保存的结果累加到各自任务的统计文档（按任务分组，每个任务一次原子更新）"""
+        if not result_dicts:
+            return
+
+        by_task: Dict[str, List[Dict[str, Any]]] = {}
+        for data in result_dicts:
+            by_task.setdefault(str(data["task_id"]), []).append(data)
+
+        collection = await self._get_collection()
+        for task_id, task_results in by_task.items():
+            await collection.update_one(
+                {"_id": task_id},
+                self.build_update(task_results),
+                upsert=True
+            )
+
+    async def get_task_stats(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取任务统计（单文档点查）
+
+        Returns:
+            统计文档（分布键已还原），不存在返回 None
+        """
+        try:
+            collection = await self._get_collection()
+            doc = await collection.find_one({"_id": task_id})
+            if doc is None:
+                return None
+
+            for dist_field in ("status_counts", "source_counts", "language_counts"):
+                doc[dist_field] = {
+                    _unescape_stats_key(key): count
+                    for key, count in (doc.get(dist_field) or {}).items()
+                }
+            return doc
+
+        except Exception as e:
+            logger.error(f"获取结果统计失败: {e}")
+            raise
+
+    async def rebuild_task_stats(self, task_id: str) -> Dict[str, Any]:
+        """
+        从 search_results 重新计算任务统计并覆盖统计文档
+
+        用于历史数据回填和修复漂移；重建期间并发写入的增量可能丢失，
+        建议在低峰期执行。没有结果的任务同样保存全零统计文档，
+        避免读取时每次都按需重建
+        """
+        try:
+            db = await get_mongodb_database()
+            results_collection = db.search_results
+
+            pipeline = [
+                {"$match": {"task_id": task_id}},
+                {"$facet": {
+                    "totals": [{"$group": {
+                        "_id": None,
+                        "total_results": {"$sum": 1},
+                        "relevance_sum": {"$sum": {"$ifNull": ["$relevance_score", 0]}},
+                        "quality_sum": {"$sum": {"$ifNull": ["$quality_score", 0]}},
+                        "min_published_date": {"$min": "$published_date"},
+                        "max_published_date": {"$max": "$published_date"}
+                    }}],
+                    "status_counts": [{"$group": {"_id": {"$ifNull": ["$status", "pending"]}, "count": {"$sum": 1}}}],
+                    "source_counts": [{"$group": {"_id": {"$ifNull": ["$source", "web"]}, "count": {"$sum": 1}}}],
+                    "language_counts": [
+                        {"$match": {"language": {"$nin": [None, ""]}}},
+                        {"$group": {"_id": "$language", "count": {"$sum": 1}}}
+                    ]
+                }}
+            ]
+
+            facets = await results_collection.aggregate(pipeline).to_list(1)
+            facet = facets[0] if facets else {}
+            totals = (facet.get("totals") or [{}])[0]
+
+            doc = {
+                "_id": task_id,
+                "total_results": totals.get("total_results", 0),
+                "relevance_sum": totals.get("relevance_sum", 0.0),
+                "quality_sum": totals.get("quality_sum", 0.0),
+                "min_published_date": totals.get("min_published_date"),
+                "max_published_date": totals.get("max_published_date"),
+                "updated_at": datetime.utcnow()
+            }
+            for dist_field in ("status_counts", "source_counts", "language_counts"):
+                doc[dist_field] = {
+                    _escape_stats_key(str(item["_id"])): item["count"]
+                    for item in facet.get(dist_field, [])
+                }
+
+            collection = await self._get_collection()
+            await collection.replace_one({"_id": task_id}, doc, upsert=True)
+            logger.info(f"重建结果统计完成: {task_id} (共 {doc['total_results']} 条)")
+            return doc
+
+        except Exception as e:
+            logger.error(f"重建结果统计失败: {e}")
+            raise
+
+    async def rebuild_all(self) -> int:
+        """重建所有任务的统计，返回处理的任务数"""
+        db = await get_mongodb_database()
+        task_ids = await db.search_results.distinct("task_id")
+
+        for task_id in task_ids:
+            await self.rebuild_task_stats(str(task_id))
+
+        return len(task_ids)
+
+    async def delete(self, task_id: str) -> bool:
+        """删除任务统计"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_one({"_id": task_id})
+            return result.deleted_count > 0
+
+        except Exception as e:
+            logger.error(f"删除结果统计失败: {e}")
+            raise
+
+
+def result_domain(url: Optional[str]) -> Optional[str]:
+    """提取结果URL的域名（小写，去除 www. 前缀）"""
+    if not url:
+        return None
+    try:
+        hostname = urlparse(url).hostname
+    except ValueError:
+        return None
+    if not hostname:
+        return None
+    return hostname[4:] if hostname.startswith("www.") else hostname
+
+
+def result_keywords(title: Optional[str], content: Optional[str], limit: int) -> List[str]:
+    """
+    提取结果的关键词（词频最高的前 limit 个，标题词频按 REPORT_SEARCH_TITLE_WEIGHT 加权）
+
+    每个结果只计入少量代表性词项，限制趋势桶中关键词分布的增长
+    """
+    counts = Counter(analyze_terms((content or "")[:settings.TREND_BUCKET_MAX_CHARS]))
+    for term in analyze_terms(title):
+        counts[term] += settings.REPORT_SEARCH_TITLE_WEIGHT
+    terms = [term for term in counts if is_keyword_term(term)]
+    terms.sort(key=lambda term: (-counts[term], term))
+    return terms[:limit]
+
+
+def bucket_day(moment: datetime) -> datetime:
+    """时间所在的日桶（UTC 零点）"""
+    return datetime(moment.year, moment.month, moment.day)
+
+
+@dataclass
+class TrendObservation:
+    """
+    结果在任务中的一次出现
+
+    - is_new: 计入 new_count（首次发现），否则计入 shared_count（重复出现/与其他任务共享）
+    - profiled: 计入域名和关键词分布（结果在该任务中首次出现时为 True，重复出现不重复计入）
+    """
+    task_id: str
+    observed_at: datetime
+    is_new: bool
+    profiled: bool = True
+    title: Optional[str] = None
+    content: Optional[str] = None
+    url: Optional[str] = None
+
+
+class TaskTrendBucketRepository:
+    """
+    任务按天趋势桶仓储（每个任务每天一份预聚合文档）
+
+    文档结构（_id = "{source_type}:{task_id}:{YYYYMMDD}"）：
+    - source_type / task_id / day: 来源、任务、日桶（UTC 零点）
+    - result_count / new_count / shared_count: 当天出现的结果数，其中首次发现/重复（共享）的数量
+    - profiled_count: 计入域名和关键词分布的结果数（趋势中关键词文档占比的分母）
+    - domains / keywords: 域名、关键词 -> 结果数（键经转义）
+    - compacted: 是否已压缩（已结束的日桶只保留前 N 个关键词/域名）
+    - updated_at: 最后更新时间
+
+    写入路径按 $inc 原子累加（每批结果一次无序 bulk_write），报告趋势按
+    (source_type, task_id, day) 索引一次聚合汇总，查询代价与天数和任务数成正比，与结果总数无关
+    """
+
+    def __init__(self):
+        self.collection_name = "task_trend_buckets"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    @staticmethod
+    def bucket_id(source_type: str, task_id: str, day: datetime) -> str:
+        """日桶文档ID"""
+        return f"{source_type}:{task_id}:{day.strftime('%Y%m%d')}"
+
+    @staticmethod
+    def build_updates(source_type: str, observations: Iterable[TrendObservation]) -> Dict[str, Dict[str, Any]]:
+        """
+        按日桶合并一批结果出现记录
+
+        Returns:
+            日桶ID -> 包含 $inc/$set/$setOnInsert 的更新文档
+        """
+        terms_per_result = settings.TREND_BUCKET_TERMS_PER_RESULT
+        now = datetime.utcnow()
+        updates: Dict[str, Dict[str, Any]] = {}
+
+        for observation in observations:
+            day = bucket_day(observation.observed_at)
+            key = TaskTrendBucketRepository.bucket_id(source_type, observation.task_id, day)
+            update = updates.get(key)
+            if update is None:
+                update = updates[key] = {
+                    "$inc": {"result_count": 0, "new_count": 0, "shared_count": 0, "profiled_count": 0},
+                    "$set": {"updated_at": now, "compacted": False},
+                    "$setOnInsert": {"source_type": source_type, "task_id": observation.task_id, "day": day}
+                }
+            inc = update["$inc"]
+            inc["result_count"] += 1
+            inc["new_count" if observation.is_new else "shared_count"] += 1
+            if not observation.profiled:
+                continue
+
+            inc["profiled_count"] += 1
+            domain = result_domain(observation.url)
+            if domain:
+                domain_key = f"domains.{_escape_stats_key(domain)}"
+                inc[domain_key] = inc.get(domain_key, 0) + 1
+            for term in result_keywords(observation.title, observation.content, terms_per_result):
+                keyword_key = f"keywords.{_escape_stats_key(term)}"
+                inc[keyword_key] = inc.get(keyword_key, 0) + 1
+
+        return updates
+
+    async def apply(self, source_type: str, observations: Iterable[TrendObservation]) -> int:
+        """
+        将一批结果出现记录累加到日桶
+
+        Returns:
+            int: 更新的日桶数
+        """
+        updates = self.build_updates(source_type, observations)
+        if not updates:
+            return 0
+
+        try:
+            collection = await self._get_collection()
+            await collection.bulk_write([
+                UpdateOne({"_id": key}, update, upsert=True) for key, update in updates.items()
+            ], ordered=False)
+            return len(updates)
+
+        except Exception as e:
+            logger.error(f"更新趋势桶失败 ({source_type}): {e}")
+            raise
+
+    @staticmethod
+    def _scope_filter(
+        scopes: Dict[str, List[str]],
+        start_day: datetime,
+        end_day: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """构建来源 + 任务 + 日期范围条件（每个分支命中 (source_type, task_id, day) 索引）"""
+        branches = [
+            {
+                "source_type": source_type,
+                "task_id": {"$in": task_ids},
+                "day": {"$gte": start_day, "$lte": end_day}
+            }
+            for source_type, task_ids in scopes.items() if task_ids
+        ]
+        if not branches:
+            return None
+        return branches[0] if len(branches) == 1 else {"$or": branches}
+
+    async def rollup(
+        self,
+        scopes: Dict[str, List[str]],
+        start_day: datetime,
+        end_day: datetime,
+        recent_from: datetime,
+        top_domains: int = 20,
+        keyword_candidates: int = 200
+    ) -> Dict[str, Any]:
+        """
+        一次聚合汇总报告范围内的日桶
+
+        Args:
+            scopes: 来源 -> 任务ID列表
+            start_day / end_day: 日期范围（含两端）
+            recent_from: 关键词按此日期拆分为较早/最近两部分计数
+            top_domains: 返回的域名数
+            keyword_candidates: 返回的候选关键词数（按总次数）
+
+        Returns:
+            {"timeline": [{day, result_count, new_count, shared_count, profiled_count}],
+             "domains": [{domain, count}],
+             "keywords": [{keyword, count, recent_count}],
+             "recent_profiled_count": int}
+        """
+        query = self._scope_filter(scopes, start_day, end_day)
+        empty = {"timeline": [], "domains": [], "keywords": [], "recent_profiled_count": 0}
+        if query is None:
+            return empty
+
+        def distribution(field: str, limit: int, split_recent: bool) -> List[Dict[str, Any]]:
+            group: Dict[str, Any] = {"_id": "$entry.k", "count": {"$sum": "$entry.v"}}
+            if split_recent:
+                group["recent_count"] = {
+                    "$sum": {"$cond": [{"$gte": ["$day", recent_from]}, "$entry.v", 0]}
+                }
+            return [
+                {"$project": {"day": 1, "entry": {"$objectToArray": {"$ifNull": [f"${field}", {}]}}}},
+                {"$unwind": "$entry"},
+                {"$group": group},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": limit}
+            ]
+
+        pipeline = [
+            {"$match": query},
+            {"$facet": {
+                "timeline": [
+                    {"$group": {
+                        "_id": "$day",
+                        "result_count": {"$sum": "$result_count"},
+                        "new_count": {"$sum": "$new_count"},
+                        "shared_count": {"$sum": "$shared_count"},
+                        "profiled_count": {"$sum": "$profiled_count"},
+                    }},
+                    {"$sort": {"_id": 1}}
+                ],
+                "domains": distribution("domains", top_domains, split_recent=False),
+                "keywords": distribution("keywords", keyword_candidates, split_recent=True)
+            }}
+        ]
+
+        try:
+            collection = await self._get_collection()
+            facets = await collection.aggregate(pipeline, allowDiskUse=True).to_list(1)
+
+        except Exception as e:
+            logger.error(f"汇总趋势桶失败: {e}")
+            raise
+
+        if not facets:
+            return empty
+        facet = facets[0]
+        timeline = [
+            {
+                "day": row["_id"],
+                "result_count": row["result_count"],
+                "new_count": row["new_count"],
+                "shared_count": row["shared_count"],
+                "profiled_count": row["profiled_count"]
+            }
+            for row in facet.get("timeline", [])
+        ]
+        return {
+            "timeline": timeline,
+            "domains": [
+                {"domain": _unescape_stats_key(row["_id"]), "count": row["count"]}
+                for row in facet.get("domains", [])
+            ],
+            "keywords": [
+                {"keyword": _unescape_stats_key(row["_id"]), "count": row["count"], "recent_count": row["recent_count"]}
+                for row in facet.get("keywords", [])
+            ],
+            "recent_profiled_count": sum(row["profiled_count"] for row in timeline if row["day"] >= recent_from)
+        }
+
+    async def compact(self, before_day: datetime, batch_size: int = 500) -> int:
+        """
+        压缩已结束的日桶：关键词/域名分布只保留前 TREND_BUCKET_MAX_KEYWORDS / TREND_BUCKET_MAX_DOMAINS 个
+
+        长尾词项对报告级排名几乎没有影响，压缩后一年范围的汇总展开量有上界。
+        按 updated_at 条件写回，压缩期间有新的累加时跳过该桶（下次压缩时处理）
+
+        Returns:
+            int: 压缩的日桶数
+        """
+        max_keywords = settings.TREND_BUCKET_MAX_KEYWORDS
+        max_domains = settings.TREND_BUCKET_MAX_DOMAINS
+
+        def top(distribution: Dict[str, int], limit: int) -> Dict[str, int]:
+            if len(distribution) <= limit:
+                return distribution
+            ranked = sorted(distribution.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return dict(ranked)
+
+        try:
+            collection = await self._get_collection()
+            compacted = 0
+            while True:
+                batch = await collection.find(
+                    {"compacted": False, "day": {"$lt": before_day}},
+                    {"domains": 1, "keywords": 1, "updated_at": 1}
+                ).limit(batch_size).to_list(batch_size)
+                if not batch:
+                    break
+
+                operations = [
+                    UpdateOne(
+                        {"_id": doc["_id"], "updated_at": doc.get("updated_at")},
+                        {"$set": {
+                            "domains": top(doc.get("domains") or {}, max_domains),
+                            "keywords": top(doc.get("keywords") or {}, max_keywords),
+                            "compacted": True
+                        }}
+                    )
+                    for doc in batch
+                ]
+                result = await collection.bulk_write(operations, ordered=False)
+                compacted += result.modified_count
+                if result.matched_count == 0:
+                    # 本批全部被并发更新，留待下次压缩，避免重复读取同一批
+                    break
+
+            logger.info(f"🗜️ 趋势桶压缩完成: {compacted} 个日桶")
+            return compacted
+
+        except Exception as e:
+            logger.error(f"压缩趋势桶失败: {e}")
+            raise
+
+    async def rebuild_task(self, source_type: str, task_id: str, batch_size: int = 500) -> int:
+        """
+        从结果数据重建任务的日桶（历史数据回填和修复漂移）
+
+        - scheduled: search_results 中的结果按首次发现时间计入新结果，
+          search_result_executions 中的重复出现按执行时间计入重复数
+        - instant: instant_search_result_mappings 按发现时间计入，is_first_discovery 区分新结果/共享结果
+
+        重建期间并发写入的增量可能丢失，建议在低峰期执行
+
+        Returns:
+            int: 计入的结果出现次数
+        """
+        try:
+            db = await get_mongodb_database()
+            collection = await self._get_collection()
+            await collection.delete_many({"source_type": source_type, "task_id": task_id})
+
+            observed = 0
+            last_id = None
+            if source_type == SOURCE_SCHEDULED:
+                while True:
+                    query: Dict[str, Any] = {"task_id": task_id}
+                    if last_id is not None:
+                        query["_id"] = {"$gt": last_id}
+                    batch = await db.search_results.find(
+                        query, {"title": 1, "content": 1, "url": 1, "first_seen_at": 1, "created_at": 1}
+                    ).sort("_id", 1).limit(batch_size).to_list(batch_size)
+                    if not batch:
+                        break
+                    observations = []
+                    for doc in batch:
+                        field_codec.decode_document(doc, ("content",))
+                        observed_at = doc.get("first_seen_at") or doc.get("created_at")
+                        if observed_at is None:
+                            continue
+                        observations.append(TrendObservation(
+                            task_id=task_id, observed_at=observed_at, is_new=True,
+                            title=doc.get("title"), content=doc.get("content"), url=doc.get("url")
+                        ))
+                    await self.apply(source_type, observations)
+                    observed += len(observations)
+                    last_id = batch[-1]["_id"]
+
+                async for row in db.search_result_executions.aggregate([
+                    {"$match": {"task_id": task_id, "is_new": False}},
+                    {"$group": {
+                        "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$found_at"}},
+                        "count": {"$sum": 1}
+                    }}
+                ]):
+                    day = datetime.strptime(row["_id"], "%Y-%m-%d")
+                    await collection.update_one(
+                        {"_id": self.bucket_id(source_type, task_id, day)},
+                        {
+                            "$inc": {"result_count": row["count"], "shared_count": row["count"]},
+                            "$set": {"updated_at": datetime.utcnow(), "compacted": False},
+                            "$setOnInsert": {"source_type": source_type, "task_id": task_id, "day": day}
+                        },
+                        upsert=True
+                    )
+                    observed += row["count"]
+            else:
+                while True:
+                    query = {"task_id": task_id}
+                    if last_id is not None:
+                        query["_id"] = {"$gt": last_id}
+                    batch = await db.instant_search_result_mappings.find(
+                        query, {"result_id": 1, "found_at": 1, "is_first_discovery": 1}
+                    ).sort("_id", 1).limit(batch_size).to_list(batch_size)
+                    if not batch:
+                        break
+                    results = {}
+                    async for doc in db.instant_search_results.find(
+                        {"_id": {"$in": list({mapping["result_id"] for mapping in batch})}},
+                        {"title": 1, "content": 1, "url": 1}
+                    ):
+                        results[doc["_id"]] = field_codec.decode_document(doc, ("content",))
+                    observations = []
+                    for mapping in batch:
+                        if not mapping.get("found_at"):
+                            continue
+                        result = results.get(mapping["result_id"])
+                        observations.append(TrendObservation(
+                            task_id=task_id,
+                            observed_at=mapping["found_at"],
+                            is_new=bool(mapping.get("is_first_discovery")),
+                            profiled=result is not None,
+                            title=(result or {}).get("title"),
+                            content=(result or {}).get("content"),
+                            url=(result or {}).get("url")
+                        ))
+                    await self.apply(source_type, observations)
+                    observed += len(observations)
+                    last_id = batch[-1]["_id"]
+
+            logger.info(f"重建趋势桶完成: {source_type}:{task_id} (共 {observed} 次出现)")
+            return observed
+
+        except Exception as e:
+            logger.error(f"重建趋势桶失败 ({source_type}:{task_id}): {e}")
+            raise
+
+    async def rebuild_all(self) -> int:
+        """重建所有任务的日桶，返回处理的任务数"""
+        db = await get_mongodb_database()
+        scheduled_task_ids = await db.search_results.distinct("task_id")
+        instant_task_ids = await db.instant_search_result_mappings.distinct("task_id")
+
+        for task_id in scheduled_task_ids:
+            await self.rebuild_task(SOURCE_SCHEDULED, str(task_id))
+        for task_id in instant_task_ids:
+            await self.rebuild_task(SOURCE_INSTANT, str(task_id))
+
+        return len(scheduled_task_ids) + len(instant_task_ids)
+
+    async def delete_task(self, source_type: str, task_id: str) -> int:
+        """删除任务的全部日桶"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_many({"source_type": source_type, "task_id": task_id})
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"删除趋势桶失败 ({source_type}:{task_id}): {e}")
+            raise
+
+
+class SearchResultExecutionRepository:
+    """
+    定时执行-结果映射仓储（search_result_executions）
+
+    记录每次执行发现了哪些结果：
+    - execution_id / task_id / result_id: 关联关系
+    - search_position / relevance_score: 该次执行中的排名与评分
+    - is_new: 是否为该次执行首次发现
+    - found_at: 发现时间
+    """
+
+    def __init__(self):
+        self.collection_name = "search_result_executions"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    @staticmethod
+    def build_mappings(
+        execution_id: str,
+        results: List[SearchResult],
+        new_ids: set,
+        found_at: datetime
+    ) -> List[Dict[str, Any]]:
+        """构建一次执行的结果映射文档（同一结果在一次执行中只记录一次）"""
+        mappings = []
+        recorded = set()
+        for position, result in enumerate(results, start=1):
+            result_id = encode_result_id(result.id)
+            if result_id in recorded:
+                continue
+            recorded.add(result_id)
+            mappings.append({
+                "_id": generate_string_id(),
+                "execution_id": execution_id,
+                "task_id": encode_result_id(result.task_id),
+                "result_id": result_id,
+                "search_position": result.search_position or position,
+                "relevance_score": result.relevance_score,
+                "is_new": result_id in new_ids,
+                "found_at": found_at
+            })
+        return mappings
+
+    async def insert_many(self, mappings: List[Dict[str, Any]]) -> None:
+        """批量写入结果映射"""
+        if not mappings:
+            return
+
+        try:
+            collection = await self._get_collection()
+            await collection.insert_many(mappings, ordered=False)
+
+        except Exception as e:
+            logger.error(f"记录执行结果映射失败: {e}")
+            raise
+
+    async def get_by_execution(
+        self,
+        execution_id: str,
+        only_new: bool = False
+    ) -> List[Dict[str, Any]]:
+        """获取执行的结果映射（按排名排序）"""
+        try:
+            collection = await self._get_collection()
+            query: Dict[str, Any] = {"execution_id": execution_id}
+            if only_new:
+                query["is_new"] = True
+
+            cursor = collection.find(query).sort("search_position", 1)
+            return await cursor.to_list(length=None)
+
+        except Exception as e:
+            logger.error(f"获取执行结果映射失败: {e}")
+            raise
+
+    async def delete_by_task(self, task_id: str) -> int:
+        """删除任务的所有映射"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_many({"task_id": task_id})
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"删除执行结果映射失败: {e}")
+            raise
+
+
+class SearchTaskExecutionRepository:
+    """
+    定时任务执行记录仓储（search_task_executions，_id = execution_id）
+
+    每次执行一条记录，包含新结果数和重复结果数，
+    executed_at 作为"自某次执行以来的新结果"查询的时间基准
+    """
+
+    def __init__(self):
+        self.collection_name = "search_task_executions"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    async def create(self, batch: SearchResultBatch, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        根据结果批次和保存摘要创建执行记录
+
+        executed_at 与本次新结果的 first_seen_at 相同，
+        因此"自该执行以来的新结果"不包含本次执行发现的结果
+        """
+        task_id = encode_result_id(batch.results[0].task_id) if batch.results else encode_result_id(batch.task_id)
+
+        doc = {
+            "_id": batch.execution_id,
+            "task_id": task_id,
+            "executed_at": summary["seen_at"],
+            "query": batch.query,
+            "total_results": len(batch.results),
+            "new_count": summary["new_count"],
+            "duplicate_count": summary["duplicate_count"],
+            "credits_used": batch.credits_used,
+            "execution_time_ms": batch.execution_time_ms,
+            "success": batch.success,
+            "is_test_mode": batch.is_test_mode
+        }
+
+        try:
+            collection = await self._get_collection()
+            await collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+            return doc
+
+        except Exception as e:
+            logger.error(f"创建执行记录失败: {e}")
+            raise
+
+    async def get(self, task_id: str, execution_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务的执行记录"""
+        try:
+            collection = await self._get_collection()
+            return await collection.find_one({"_id": execution_id, "task_id": task_id})
+
+        except Exception as e:
+            logger.error(f"获取执行记录失败: {e}")
+            raise
+
+    async def list_by_task(self, task_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """获取任务最近的执行记录"""
+        try:
+            collection = await self._get_collection()
+            cursor = collection.find({"task_id": task_id}).sort("executed_at", -1).limit(limit)
+            return await cursor.to_list(length=limit)
+
+        except Exception as e:
+            logger.error(f"获取执行记录列表失败: {e}")
+            raise
+
+    async def delete_by_task(self, task_id: str) -> int:
+        """删除任务的所有执行记录"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_many({"task_id": task_id})
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"删除执行记录失败: {e}")
+            raise
@@ -0,0 +1,342 @@
+"""搜索结果归档相关仓储
+
+- ResultRetentionPolicyRepository: 按任务的保留策略（result_retention_policies）
+- ResultArchiveIndexRepository: 归档分段索引（result_archive_index），用于按需回迁
+- ResultRetentionCheckpointRepository: 归档作业检查点（result_retention_checkpoints），中断后可续跑
+- ResultArchiveStore: 冷存储读写（月度归档集合 / 本地 JSONL.gz 文件）
+"""
+
+import asyncio
+import gzip
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+from pymongo import ReplaceOne
+
+from src.config import settings
+from src.core.domain.entities.result_retention import (
+    ArchiveTarget, ResultRetentionPolicy, archive_collection_name
+)
+from src.infrastructure.database.connection import get_mongodb_database
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def write_jsonl_gz(path: Path, docs: List[Dict[str, Any]]) -> int:
+    """
+    将文档写入 gzip 压缩的 JSONL 文件（Extended JSON，保留 datetime/Binary 类型）
+
+    先写临时文件再原子重命名，避免中断时留下半个文件
+
+    Returns:
+        int: 写入的文件字节数
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for doc in docs:
+            f.write(json_util.dumps(doc, json_options=CANONICAL_JSON_OPTIONS))
+            f.write("\n")
+
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+def read_jsonl_gz(path: Path) -> List[Dict[str, Any]]:
+    """读取 gzip 压缩的 JSONL 文件"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json_util.loads(line) for line in f if line.strip()]
+
+
+class ResultRetentionPolicyRepository:
+    """结果保留策略仓储"""
+
+    def __init__(self):
+        self.collection_name = "result_retention_policies"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    def default_policy(self, task_id: str) -> ResultRetentionPolicy:
+        """全局默认策略"""
+        return ResultRetentionPolicy(
+            task_id=task_id,
+            hot_days=settings.RESULT_RETENTION_DEFAULT_HOT_DAYS,
+            archive_target=ArchiveTarget(settings.RESULT_RETENTION_DEFAULT_TARGET)
+        )
+
+    async def get(self, task_id: str) -> Optional[ResultRetentionPolicy]:
+        """获取任务的保留策略（未配置返回 None）"""
+        try:
+            collection = await self._get_collection()
+            data = await collection.find_one({"_id": task_id})
+            return ResultRetentionPolicy.from_dict(data) if data else None
+
+        except Exception as e:
+            logger.error(f"获取保留策略失败: {e}")
+            raise
+
+    async def get_all(self) -> Dict[str, ResultRetentionPolicy]:
+        """获取所有已配置的保留策略（task_id -> 策略）"""
+        try:
+            collection = await self._get_collection()
+            policies = {}
+            async for data in collection.find({}):
+                policy = ResultRetentionPolicy.from_dict(data)
+                policies[policy.task_id] = policy
+            return policies
+
+        except Exception as e:
+            logger.error(f"获取保留策略列表失败: {e}")
+            raise
+
+    async def save(self, policy: ResultRetentionPolicy) -> ResultRetentionPolicy:
+        """创建或更新保留策略"""
+        try:
+            collection = await self._get_collection()
+            policy.updated_at = datetime.utcnow()
+            data = policy.to_dict()
+            created_at = data.pop("created_at")
+
+            await collection.update_one(
+                {"_id": policy.task_id},
+                {"$set": data, "$setOnInsert": {"created_at": created_at}},
+                upsert=True
+            )
+            logger.info(f"保存保留策略: {policy.task_id} (热数据 {policy.hot_days} 天, {policy.archive_target.value})")
+            return policy
+
+        except Exception as e:
+            logger.error(f"保存保留策略失败: {e}")
+            raise
+
+    async def delete(self, task_id: str) -> bool:
+        """删除保留策略（恢复为默认策略）"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_one({"_id": task_id})
+            return result.deleted_count > 0
+
+        except Exception as e:
+            logger.error(f"删除保留策略失败: {e}")
+            raise
+
+
+class ResultArchiveIndexRepository:
+    """
+    归档分段索引仓储
+
+    每个分段对应一次批量归档中同一任务、同一月份的结果：
+    - _id: 分段ID
+    - task_id / month: 任务与归档月份（YYYYMM）
+    - target / location: 归档目标与位置（集合名或相对文件路径）
+    - result_count / min_created_at / max_created_at: 分段内容概要
+    - archived_at / rehydrated_at: 归档与最近一次回迁时间
+    """
+
+    def __init__(self):
+        self.collection_name = "result_archive_index"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    async def add_segment(self, segment: Dict[str, Any]) -> None:
+        """登记归档分段"""
+        try:
+            collection = await self._get_collection()
+            await collection.replace_one({"_id": segment["_id"]}, segment, upsert=True)
+
+        except Exception as e:
+            logger.error(f"登记归档分段失败: {e}")
+            raise
+
+    async def find_segments(self, task_id: str, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        """查询任务的归档分段（按月份、归档时间排序）"""
+        try:
+            collection = await self._get_collection()
+            query: Dict[str, Any] = {"task_id": task_id}
+            if month:
+                query["month"] = month
+
+            cursor = collection.find(query).sort([("month", 1), ("archived_at", 1)])
+            return await cursor.to_list(length=None)
+
+        except Exception as e:
+            logger.error(f"查询归档分段失败: {e}")
+            raise
+
+    async def mark_rehydrated(self, segment_ids: List[str]) -> None:
+        """记录分段的回迁时间"""
+        if not segment_ids:
+            return
+
+        try:
+            collection = await self._get_collection()
+            await collection.update_many(
+                {"_id": {"$in": segment_ids}},
+                {"$set": {"rehydrated_at": datetime.utcnow()}}
+            )
+
+        except Exception as e:
+            logger.error(f"更新归档分段失败: {e}")
+            raise
+
+
+class ResultRetentionCheckpointRepository:
+    """
+    归档作业检查点仓储（_id = task_id）
+
+    记录当前轮次已处理到的 (created_at, _id) 位置，作业中断后从该位置续跑
+    """
+
+    def __init__(self):
+        self.collection_name = "result_retention_checkpoints"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务的检查点"""
+        try:
+            collection = await self._get_collection()
+            return await collection.find_one({"_id": task_id})
+
+        except Exception as e:
+            logger.error(f"获取归档检查点失败: {e}")
+            raise
+
+    async def save_progress(
+        self,
+        task_id: str,
+        cutoff: datetime,
+        last_created_at: datetime,
+        last_id: str,
+        archived_delta: int
+    ) -> None:
+        """记录批次进度"""
+        try:
+            collection = await self._get_collection()
+            now = datetime.utcnow()
+            await collection.update_one(
+                {"_id": task_id},
+                {
+                    "$set": {
+                        "status": "running",
+                        "cutoff": cutoff,
+                        "last_created_at": last_created_at,
+                        "last_id": last_id,
+                        "updated_at": now
+                    },
+                    "$inc": {"archived_count": archived_delta},
+                    "$setOnInsert": {"started_at": now}
+                },
+                upsert=True
+            )
+
+        except Exception as e:
+            logger.error(f"保存归档检查点失败: {e}")
+            raise
+
+    async def complete(self, task_id: str) -> None:
+        """标记本轮完成（下一轮从头扫描）"""
+        try:
+            collection = await self._get_collection()
+            await collection.update_one(
+                {"_id": task_id},
+                {
+                    "$set": {
+                        "status": "completed",
+                        "completed_at": datetime.utcnow(),
+                        "archived_count": 0
+                    },
+                    "$unset": {"last_created_at": "", "last_id": "", "started_at": ""}
+                }
+            )
+
+        except Exception as e:
+            logger.error(f"完成归档检查点失败: {e}")
+            raise
+
+
+class ResultArchiveStore:
+    """
+    冷存储读写
+
+    - collection: 写入月度归档集合 search_results_archive_YYYYMM（按 _id 幂等覆盖）
+    - jsonl: 写入 RESULT_ARCHIVE_DIR/{task_id}/{YYYYMM}/{segment_id}.jsonl.gz
+    """
+
+    def __init__(self, archive_dir: Optional[str] = None):
+        self.archive_dir = Path(archive_dir or settings.RESULT_ARCHIVE_DIR)
+        # 已确认索引的归档集合（每个进程只创建一次）
+        self._indexed_collections = set()
+
+    async def _get_archive_collection(self, month: str):
+        """获取月度归档集合（首次使用时创建索引）"""
+        db = await get_mongodb_database()
+        name = archive_collection_name(month)
+        collection = db[name]
+
+        if name not in self._indexed_collections:
+            await collection.create_index("archive_segment_id")
+            await collection.create_index([("task_id", 1), ("created_at", -1)])
+            self._indexed_collections.add(name)
+
+        return collection
+
+    async def write_segment(
+        self,
+        target: ArchiveTarget,
+        task_id: str,
+        month: str,
+        segment_id: str,
+        docs: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        写入一个归档分段
+
+        Returns:
+            dict: location（集合名或相对文件路径）和 stored_bytes（仅文件目标）
+        """
+        try:
+            if target == ArchiveTarget.COLLECTION:
+                collection = await self._get_archive_collection(month)
+                await collection.bulk_write(
+                    [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+                    ordered=False
+                )
+                return {"location": archive_collection_name(month), "stored_bytes": None}
+
+            relative_path = Path(task_id) / month / f"{segment_id}.jsonl.gz"
+            stored_bytes = await asyncio.to_thread(write_jsonl_gz, self.archive_dir / relative_path, docs)
+            return {"location": relative_path.as_posix(), "stored_bytes": stored_bytes}
+
+        except Exception as e:
+            logger.error(f"写入归档分段失败 ({target.value}, {month}): {e}")
+            raise
+
+    async def read_segment(self, segment: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """读取归档分段中的全部文档"""
+        try:
+            if segment["target"] == ArchiveTarget.COLLECTION.value:
+                collection = await self._get_archive_collection(segment["month"])
+                cursor = collection.find({"archive_segment_id": segment["_id"]})
+                return await cursor.to_list(length=None)
+
+            return await asyncio.to_thread(read_jsonl_gz, self.archive_dir / segment["location"])
+
+        except Exception as e:
+            logger.error(f"读取归档分段失败 ({segment.get('_id')}): {e}")
+            raise
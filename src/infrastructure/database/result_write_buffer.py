@@ -0,0 +1,256 @@
+"""搜索结果写后缓冲（write-behind）
+
+整点时大量定时执行同时保存结果，每次执行单独 insert_many 会产生数百个小的并发写入。
+本缓冲在进程内合并多次执行的结果写入：
+
+- 提交: 执行调用 submit() 后等待持久化 Future，写入完成（或失败）后才返回，语义不变
+- 刷新: 待写入结果数达到 RESULT_WRITE_BUFFER_MAX_BATCH，或最早的提交等待超过
+  RESULT_WRITE_BUFFER_MAX_DELAY 秒时，合并为一次无序批量写入
+- 背压: 同一时间只有一个刷新在进行；MongoDB 变慢时待写入结果堆积，
+  超过 RESULT_WRITE_BUFFER_MAX_PENDING 后新的提交等待空间
+- 关闭: drain() 刷新全部待写入结果后停止，之后的提交直接写入
+- 容错: 合并写入在写入任何数据之前失败时逐个提交重试，单个执行的错误不影响其他执行；
+  已部分写入后失败（PartialResultWriteError）时不重试，错误交给本批全部执行
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PartialResultWriteError(Exception):
+    """结果已部分写入后失败（重试会把已插入的结果计为重复，不能逐个重试）"""
+
+
+@dataclass
+class PendingResultWrite:
+    """一次执行的待写入结果"""
+    results: List[Any]
+    execution_id: Optional[str] = None
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+# 刷新函数：写入一组提交，返回与提交一一对应的写入摘要
+FlushFunction = Callable[[List[PendingResultWrite]], Awaitable[List[Dict[str, Any]]]]
+
+
+class ResultWriteBuffer:
+    """进程级搜索结果写后缓冲"""
+
+    def __init__(
+        self,
+        max_batch: int,
+        max_delay: float,
+        max_pending: int,
+        flush_function: Optional[FlushFunction] = None
+    ):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max(max_pending, max_batch)
+        self._flush_function = flush_function
+
+        self._pending: List[Tuple[PendingResultWrite, asyncio.Future]] = []
+        self._pending_count = 0
+        self._closed = False
+        self._worker: Optional[asyncio.Task] = None
+
+        # 同步原语在首次提交时创建（绑定到运行中的事件循环）
+        self._condition: Optional[asyncio.Condition] = None
+        self._has_items: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+
+        self._metrics = {
+            "flushes": 0,
+            "flushed_writes": 0,
+            "flushed_results": 0,
+            "flush_seconds": 0.0,
+            "max_flush_results": 0,
+            "fallback_flushes": 0,
+            "partial_failures": 0,
+            "backpressure_waits": 0
+        }
+
+    def _get_flush_function(self) -> FlushFunction:
+        """获取刷新函数（默认使用 MongoDB 搜索结果仓储的直接写入）"""
+        if self._flush_function is None:
+            from src.infrastructure.database.repositories import SearchResultRepository
+            self._flush_function = SearchResultRepository().persist_writes
+        return self._flush_function
+
+    def _ensure_started(self) -> None:
+        """首次提交时创建同步原语并启动刷新协程"""
+        if self._worker is not None and not self._worker.done():
+            return
+
+        self._condition = asyncio.Condition()
+        self._has_items = asyncio.Event()
+        self._full = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, write: PendingResultWrite) -> Dict[str, Any]:
+        """
+        提交一次执行的结果并等待持久化完成
+
+        Returns:
+            dict: 该次提交的写入摘要（new_count / duplicate_count / new_result_ids / seen_at）
+        """
+        if self._closed:
+            summaries = await self._get_flush_function()([write])
+            return summaries[0]
+
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        size = max(len(write.results), 1)
+
+        async with self._condition:
+            # 背压：待写入结果过多时等待刷新腾出空间
+            if self._pending_count > 0 and self._pending_count + size > self.max_pending:
+                self._metrics["backpressure_waits"] += 1
+                await self._condition.wait_for(
+                    lambda: self._pending_count == 0 or self._pending_count + size <= self.max_pending
+                )
+
+            self._pending.append((write, future))
+            self._pending_count += size
+            self._has_items.set()
+            if self._pending_count >= self.max_batch:
+                self._full.set()
+
+        return await future
+
+    async def _run(self) -> None:
+        """刷新协程：达到批量大小或等待超时后刷新"""
+        while True:
+            await self._has_items.wait()
+
+            if not self._full.is_set():
+                oldest = self._pending[0][0].submitted_at if self._pending else time.monotonic()
+                remaining = self.max_delay - (time.monotonic() - oldest)
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(self._full.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+
+            await self._flush_once()
+
+            if self._closed and not self._pending:
+                return
+
+    async def _take_batch(self) -> List[Tuple[PendingResultWrite, asyncio.Future]]:
+        """取出一批待写入提交（至少一个，结果数不超过 max_batch）"""
+        async with self._condition:
+            batch = []
+            batch_count = 0
+            while self._pending:
+                write, future = self._pending[0]
+                size = max(len(write.results), 1)
+                if batch and batch_count + size > self.max_batch:
+                    break
+                self._pending.pop(0)
+                batch.append((write, future))
+                batch_count += size
+
+            self._pending_count -= batch_count
+            if not self._pending:
+                self._has_items.clear()
+            if self._pending_count < self.max_batch and not self._closed:
+                self._full.clear()
+            self._condition.notify_all()
+            return batch
+
+    async def _flush_once(self) -> None:
+        """刷新一批提交并设置各自的 Future"""
+        batch = await self._take_batch()
+        if not batch:
+            return
+
+        writes = [write for write, _ in batch]
+        flush_function = self._get_flush_function()
+        start = time.perf_counter()
+
+        try:
+            summaries = await flush_function(writes)
+            for (_, future), summary in zip(batch, summaries):
+                if not future.done():
+                    future.set_result(summary)
+
+        except PartialResultWriteError as e:
+            # 已部分写入：重试会重复累加发现信息，错误交给本批全部执行
+            logger.error(f"❌ 合并写入搜索结果部分失败，不重试: {e}")
+            self._metrics["partial_failures"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+        except Exception as e:
+            # 合并写入在写入数据之前失败：逐个提交重试，把错误只交给出错的执行
+            logger.error(f"❌ 合并写入搜索结果失败，逐个重试: {e}")
+            self._metrics["fallback_flushes"] += 1
+            for write, future in batch:
+                try:
+                    summary = (await flush_function([write]))[0]
+                    if not future.done():
+                        future.set_result(summary)
+                except Exception as write_error:
+                    if not future.done():
+                        future.set_exception(write_error)
+
+        elapsed = time.perf_counter() - start
+        result_count = sum(len(write.results) for write in writes)
+        self._metrics["flushes"] += 1
+        self._metrics["flushed_writes"] += len(writes)
+        self._metrics["flushed_results"] += result_count
+        self._metrics["flush_seconds"] += elapsed
+        self._metrics["max_flush_results"] = max(self._metrics["max_flush_results"], result_count)
+        logger.debug(f"刷新搜索结果写缓冲: {len(writes)} 次执行, {result_count} 条结果, {elapsed * 1000:.1f}ms")
+
+    async def drain(self) -> None:
+        """刷新全部待写入结果并停止（应用关闭时调用）"""
+        self._closed = True
+        if self._worker is None or self._worker.done():
+            return
+
+        async with self._condition:
+            self._full.set()
+            if self._pending:
+                self._has_items.set()
+
+        if not self._pending:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            return
+
+        await self._worker
+        logger.info("✅ 搜索结果写缓冲已清空")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取缓冲指标"""
+        metrics = dict(self._metrics)
+        metrics["pending_writes"] = len(self._pending)
+        metrics["pending_results"] = self._pending_count
+        metrics["closed"] = self._closed
+        metrics["avg_flush_ms"] = (
+            metrics["flush_seconds"] * 1000 / metrics["flushes"] if metrics["flushes"] else 0.0
+        )
+        metrics["avg_writes_per_flush"] = (
+            metrics["flushed_writes"] / metrics["flushes"] if metrics["flushes"] else 0.0
+        )
+        return metrics
+
+
+# 全局实例
+result_write_buffer = ResultWriteBuffer(
+    max_batch=settings.RESULT_WRITE_BUFFER_MAX_BATCH,
+    max_delay=settings.RESULT_WRITE_BUFFER_MAX_DELAY,
+    max_pending=settings.RESULT_WRITE_BUFFER_MAX_PENDING
+)
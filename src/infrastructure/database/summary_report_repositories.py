@@ -2,13 +2,16 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
 
 from src.core.domain.entities.summary_report import (
     SummaryReport,
     SummaryReportTask,
     SummaryReportDataItem,
-    SummaryReportVersion
+    SummaryReportVersion,
+    SummaryReportJob
 )
+from src.utils.field_codec import field_codec
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -110,6 +113,13 @@ class SummaryReportRepository:
         )
         return result.modified_count > 0
 
+    async def update_generation_progress(self, report_id: str, progress: Dict[str, Any]) -> None:
+        """写入LLM生成进度（生成过程中频繁调用，不更新 updated_at）"""
+        await self.collection.update_one(
+            {"report_id": report_id},
+            {"$set": {"generation_progress": progress}}
+        )
+
     async def increment_view_count(self, report_id: str) -> bool:
         """增加查看次数"""
         result = await self.collection.update_one(
@@ -118,6 +128,65 @@ class SummaryReportRepository:
         )
         return result.modified_count > 0
 
+    async def increment_view_counts(self, counts: Dict[str, int]) -> None:
+        """批量累加查看次数（一次无序 bulk_write，每个报告一个 $inc）"""
+        if not counts:
+            return
+
+        await self.collection.bulk_write([
+            UpdateOne({"report_id": report_id}, {"$inc": {"view_count": count}})
+            for report_id, count in counts.items()
+        ], ordered=False)
+
+    async def increment_counts(
+        self,
+        report_id: str,
+        task_count: int = 0,
+        data_item_count: int = 0
+    ) -> bool:
+        """原子增减任务/数据项计数（单次 $inc，并发编辑下不会相互覆盖）"""
+        increments = {
+            field: delta
+            for field, delta in (("task_count", task_count), ("data_item_count", data_item_count))
+            if delta
+        }
+        if not increments:
+            return False
+
+        result = await self.collection.update_one(
+            {"report_id": report_id},
+            {"$inc": increments}
+        )
+        return result.modified_count > 0
+
+    async def reconcile_counts(
+        self,
+        task_counts: Dict[str, int],
+        data_item_counts: Dict[str, int]
+    ) -> int:
+        """
+        按实际关联数量修复计数漂移
+
+        Args:
+            task_counts: 报告ID -> 实际任务数（缺失视为0）
+            data_item_counts: 报告ID -> 实际数据项数（缺失视为0）
+
+        Returns:
+            int: 修复的报告数
+        """
+        operations = []
+        async for report in self.collection.find({}, {"report_id": 1, "task_count": 1, "data_item_count": 1}):
+            expected = {
+                "task_count": task_counts.get(report["report_id"], 0),
+                "data_item_count": data_item_counts.get(report["report_id"], 0)
+            }
+            if any(report.get(field) != count for field, count in expected.items()):
+                operations.append(UpdateOne({"report_id": report["report_id"]}, {"$set": expected}))
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
     async def update_task_count(self, report_id: str, count: int) -> bool:
         """更新任务数量"""
         result = await self.collection.update_one(
@@ -242,19 +311,61 @@ class SummaryReportTaskRepository:
         """统计报告的任务数量"""
         return await self.collection.count_documents({"report_id": report_id})
 
+    async def count_grouped_by_report(self) -> Dict[str, int]:
+        """统计每个报告的任务数量（计数对账用）"""
+        return {
+            doc["_id"]: doc["count"]
+            async for doc in self.collection.aggregate([
+                {"$group": {"_id": "$report_id", "count": {"$sum": 1}}}
+            ])
+        }
+
 
 class SummaryReportDataItemRepository:
     """报告数据项仓储"""
 
+    # 可压缩存储的大文本字段（开启 FIELD_COMPRESSION_ENABLED 时生效）
+    # 注意：压缩后的 content 不再参与 $text 全文索引匹配（title/tags 仍可匹配）
+    COMPRESSED_FIELDS = ("content",)
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db.summary_report_data_items
 
+    def _to_model(self, doc: Dict[str, Any]) -> SummaryReportDataItem:
+        """将文档转换为数据项模型（解码压缩字段）"""
+        field_codec.decode_document(doc, self.COMPRESSED_FIELDS)
+        return SummaryReportDataItem(**doc)
+
     async def create(self, data_item: SummaryReportDataItem) -> SummaryReportDataItem:
         """创建数据项"""
-        await self.collection.insert_one(data_item.model_dump())
+        await self.collection.insert_one(
+            field_codec.encode_document(data_item.model_dump(), self.COMPRESSED_FIELDS)
+        )
         logger.info(f"✅ 添加数据项到报告: {data_item.report_id} - {data_item.title}")
         return data_item
 
+    async def create_many(self, data_items: List[SummaryReportDataItem]) -> int:
+        """批量创建数据项（一次 insert_many）"""
+        if not data_items:
+            return 0
+
+        result = await self.collection.insert_many(
+            [field_codec.encode_document(item.model_dump(), self.COMPRESSED_FIELDS) for item in data_items],
+            ordered=False
+        )
+        logger.info(f"✅ 批量添加数据项到报告: {data_items[0].report_id} - {len(result.inserted_ids)} 条")
+        return len(result.inserted_ids)
+
+    async def find_existing_source_ids(self, report_id: str, source_ids: List[str]) -> List[str]:
+        """返回报告中已存在的来源ID（批量添加时跳过重复结果）"""
+        if not source_ids:
+            return []
+
+        return await self.collection.distinct(
+            "source_id",
+            {"report_id": report_id, "source_id": {"$in": source_ids}}
+        )
+
     async def find_by_report(
         self,
         report_id: str,
@@ -268,7 +379,14 @@ class SummaryReportDataItemRepository:
 
         cursor = self.collection.find(query).sort("display_order", 1).limit(limit)
         docs = await cursor.to_list(length=limit)
-        return [SummaryReportDataItem(**doc) for doc in docs]
+        return [self._to_model(doc) for doc in docs]
+
+    async def find_for_generation(self, report_id: str) -> List[SummaryReportDataItem]:
+        """读取参与LLM生成的全部可见数据项（按添加顺序，顺序稳定才能命中分块摘要缓存）"""
+        cursor = self.collection.find({"report_id": report_id, "is_visible": True}).sort([
+            ("added_at", 1), ("item_id", 1)
+        ])
+        return [self._to_model(doc) async for doc in cursor]
 
     async def search(
         self,
@@ -291,7 +409,7 @@ class SummaryReportDataItemRepository:
         ).sort([("score", {"$meta": "textScore"})]).limit(limit)
 
         docs = await cursor.to_list(length=limit)
-        return [SummaryReportDataItem(**doc) for doc in docs]
+        return [self._to_model(doc) for doc in docs]
 
     async def find_by_task(
         self,
@@ -306,11 +424,12 @@ class SummaryReportDataItemRepository:
             "task_type": task_type
         })
         docs = await cursor.to_list(length=100)
-        return [SummaryReportDataItem(**doc) for doc in docs]
+        return [self._to_model(doc) for doc in docs]
 
     async def update(self, item_id: str, update_data: Dict[str, Any]) -> bool:
         """更新数据项"""
         update_data["updated_at"] = datetime.utcnow()
+        field_codec.encode_document(update_data, self.COMPRESSED_FIELDS)
         result = await self.collection.update_one(
             {"item_id": item_id},
             {"$set": update_data}
@@ -356,9 +475,12 @@ class SummaryReportDataItemRepository:
         )
         return result.modified_count > 0
 
-    async def delete(self, item_id: str) -> bool:
-        """删除数据项"""
-        result = await self.collection.delete_one({"item_id": item_id})
+    async def delete(self, item_id: str, report_id: Optional[str] = None) -> bool:
+        """删除数据项（指定 report_id 时只删除属于该报告的数据项）"""
+        query = {"item_id": item_id}
+        if report_id is not None:
+            query["report_id"] = report_id
+        result = await self.collection.delete_one(query)
         logger.info(f"🗑️  删除数据项: {item_id}")
         return result.deleted_count > 0
 
@@ -371,6 +493,15 @@ class SummaryReportDataItemRepository:
         """统计报告的数据项数量"""
         return await self.collection.count_documents({"report_id": report_id})
 
+    async def count_grouped_by_report(self) -> Dict[str, int]:
+        """统计每个报告的数据项数量（计数对账用）"""
+        return {
+            doc["_id"]: doc["count"]
+            async for doc in self.collection.aggregate([
+                {"$group": {"_id": "$report_id", "count": {"$sum": 1}}}
+            ])
+        }
+
 
 class SummaryReportVersionRepository:
     """报告版本历史仓储"""
@@ -420,6 +551,52 @@ class SummaryReportVersionRepository:
         )
         return SummaryReportVersion(**doc) if doc else None
 
+    async def find_replay_chain(
+        self,
+        report_id: str,
+        version_number: int
+    ) -> List[SummaryReportVersion]:
+        """
+        查询还原指定版本所需的版本记录（最近的快照到该版本之间的全部记录）
+
+        历史记录没有 storage 字段，按快照处理
+        """
+        snapshot = await self.collection.find_one(
+            {
+                "report_id": report_id,
+                "version_number": {"$lte": version_number},
+                "storage": {"$ne": "delta"}
+            },
+            {"version_number": 1},
+            sort=[("version_number", -1)]
+        )
+        if not snapshot:
+            return []
+
+        cursor = self.collection.find({
+            "report_id": report_id,
+            "version_number": {"$gte": snapshot["version_number"], "$lte": version_number}
+        })
+        return [SummaryReportVersion(**doc) async for doc in cursor]
+
+    async def get_storage_stats(self, report_id: str) -> Dict[str, Any]:
+        """统计报告版本的存储占用（历史快照记录按正文字节数计算）"""
+        text_bytes = {"$strLenBytes": {"$ifNull": ["$content_snapshot.text", ""]}}
+        stats = {"snapshot_count": 0, "delta_count": 0, "stored_bytes": 0, "full_bytes": 0}
+        async for group in self.collection.aggregate([
+            {"$match": {"report_id": report_id}},
+            {"$group": {
+                "_id": {"$ifNull": ["$storage", "snapshot"]},
+                "count": {"$sum": 1},
+                "stored_bytes": {"$sum": {"$ifNull": ["$stored_size", text_bytes]}},
+                "full_bytes": {"$sum": {"$ifNull": ["$full_size", text_bytes]}}
+            }}
+        ]):
+            stats[f"{group['_id']}_count"] = group["count"]
+            stats["stored_bytes"] += group["stored_bytes"]
+            stats["full_bytes"] += group["full_bytes"]
+        return stats
+
     async def delete_by_report(self, report_id: str) -> int:
         """删除报告的所有版本记录"""
         result = await self.collection.delete_many({"report_id": report_id})
@@ -428,3 +605,152 @@ class SummaryReportVersionRepository:
     async def count_by_report(self, report_id: str) -> int:
         """统计报告的版本数量"""
         return await self.collection.count_documents({"report_id": report_id})
+
+
+class SummaryReportLLMCacheRepository:
+    """报告LLM调用结果缓存仓储（按输入内容哈希缓存块摘要/合并结果，TTL 索引过期）"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.summary_report_llm_cache
+
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存条目"""
+        return await self.collection.find_one({"_id": cache_key})
+
+    async def put(self, cache_key: str, entry: Dict[str, Any]) -> None:
+        """写入缓存条目（相同输入并发生成时后写覆盖，内容等价）"""
+        await self.collection.replace_one(
+            {"_id": cache_key},
+            dict(entry, created_at=datetime.utcnow()),
+            upsert=True
+        )
+
+
+class SummaryReportJobRepository:
+    """报告后台作业仓储"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.summary_report_jobs
+
+    async def create(self, job: SummaryReportJob) -> SummaryReportJob:
+        """创建作业（同一报告同一类型同一去重键已有活跃作业时抛出 DuplicateKeyError）"""
+        await self.collection.insert_one(job.model_dump())
+        logger.info(f"✅ 创建报告作业: {job.report_id} - {job.job_type} ({job.job_id})")
+        return job
+
+    async def find_by_id(self, job_id: str) -> Optional[SummaryReportJob]:
+        """根据ID查询作业"""
+        doc = await self.collection.find_one({"job_id": job_id})
+        return SummaryReportJob(**doc) if doc else None
+
+    async def find_active(
+        self,
+        report_id: str,
+        job_type: str,
+        job_key: Optional[str] = None
+    ) -> Optional[SummaryReportJob]:
+        """查询报告指定类型、指定去重键的活跃作业（job_key=None 同时匹配旧作业缺失的字段）"""
+        doc = await self.collection.find_one(
+            {"report_id": report_id, "job_type": job_type, "job_key": job_key, "active": True}
+        )
+        return SummaryReportJob(**doc) if doc else None
+
+    async def find_by_report(self, report_id: str, limit: int = 20) -> List[SummaryReportJob]:
+        """查询报告最近的作业"""
+        cursor = self.collection.find({"report_id": report_id}).sort("created_at", -1).limit(limit)
+        return [SummaryReportJob(**doc) async for doc in cursor]
+
+    async def find_claimable(self, stale_before: datetime, limit: int = 100) -> List[str]:
+        """查询可接管的活跃作业ID（未被认领，或执行进程心跳已过期）"""
+        cursor = self.collection.find(
+            {"active": True, "$or": [{"owner": None}, {"heartbeat_at": {"$lt": stale_before}}]},
+            {"job_id": 1}
+        ).sort("created_at", 1).limit(limit)
+        return [doc["job_id"] async for doc in cursor]
+
+    async def claim(self, job_id: str, owner: str, stale_before: datetime) -> Optional[SummaryReportJob]:
+        """原子认领作业（已被其他存活进程认领或已结束时返回 None）"""
+        now = datetime.utcnow()
+        doc = await self.collection.find_one_and_update(
+            {
+                "job_id": job_id,
+                "active": True,
+                "$or": [{"owner": None}, {"heartbeat_at": {"$lt": stale_before}}]
+            },
+            {
+                "$set": {"owner": owner, "status": "running", "heartbeat_at": now, "started_at": now},
+                "$inc": {"attempts": 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        return SummaryReportJob(**doc) if doc else None
+
+    async def update_progress(self, job_id: str, progress: Dict[str, Any]) -> bool:
+        """
+        写入作业进度（同时刷新心跳）
+
+        Returns:
+            bool: 是否已请求取消
+        """
+        doc = await self.collection.find_one_and_update(
+            {"job_id": job_id},
+            {"$set": {"progress": progress, "heartbeat_at": datetime.utcnow()}},
+            projection={"cancel_requested": 1}
+        )
+        return bool(doc and doc.get("cancel_requested"))
+
+    async def heartbeat(self, job_ids: List[str], owner: str) -> None:
+        """刷新本进程执行中作业的心跳"""
+        if not job_ids:
+            return
+        await self.collection.update_many(
+            {"job_id": {"$in": job_ids}, "owner": owner},
+            {"$set": {"heartbeat_at": datetime.utcnow()}}
+        )
+
+    async def request_cancel(self, job_id: str) -> bool:
+        """标记取消请求（只对活跃作业生效）"""
+        result = await self.collection.update_one(
+            {"job_id": job_id, "active": True},
+            {"$set": {"cancel_requested": True}}
+        )
+        return result.matched_count > 0
+
+    async def cancel_unclaimed(self, job_id: str) -> bool:
+        """直接取消尚未被认领的作业"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"job_id": job_id, "active": True, "owner": None},
+            {"$set": {"status": "cancelled", "active": None, "cancel_requested": True, "finished_at": now}}
+        )
+        return result.modified_count > 0
+
+    async def finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """结束作业（释放活跃约束）"""
+        await self.collection.update_one(
+            {"job_id": job_id},
+            {"$set": {
+                "status": status,
+                "active": None,
+                "owner": None,
+                "result": result,
+                "error": error,
+                "finished_at": datetime.utcnow()
+            }}
+        )
+
+    async def release(self, job_ids: List[str], owner: str) -> int:
+        """释放本进程认领的作业（正常关闭时调用，重启后立即接管）"""
+        if not job_ids:
+            return 0
+        result = await self.collection.update_many(
+            {"job_id": {"$in": job_ids}, "owner": owner, "active": True},
+            {"$set": {"status": "queued", "owner": None, "heartbeat_at": None}}
+        )
+        return result.modified_count
@@ -0,0 +1,254 @@
+"""统一结果读模型仓储（unified_results）
+
+定时搜索结果（search_results，按 task_id 归属）和即时搜索结果（instant_search_results，
+经 instant_search_result_mappings 与任务多对多关联）结构不同，报告查询原先需要分别查询两个集合
+再在 Python 中归一化。unified_results 为两者维护统一结构的只读投影，报告列表/搜索回填只需
+单集合索引查询：
+
+- _id = "{source_type}:{task_id}:{result_id}"（即时结果被多个任务共享时按任务各存一行）
+- source_type / task_id / result_id / title / url / created_at / score
+- content_ref: 正文指针 {"collection": 源集合, "id": 结果ID}，正文仍保存在源集合
+
+由两条流水线的写入路径增量维护（失败不影响结果保存），历史数据由 migration_009 回填。
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from src.infrastructure.database.connection import get_mongodb_database
+from src.infrastructure.database.report_search_index_repository import SOURCE_INSTANT, SOURCE_SCHEDULED
+from src.utils.cursor_pagination import KeysetCursorInfo, cursor_paginator
+from src.utils.field_codec import field_codec
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 来源 -> 源结果集合
+SOURCE_COLLECTIONS = {
+    SOURCE_SCHEDULED: "search_results",
+    SOURCE_INSTANT: "instant_search_results"
+}
+
+# 同步即时结果时每批读取的结果数
+SYNC_BATCH_SIZE = 500
+
+
+def build_unified_row(
+    source_type: str,
+    task_id: str,
+    result_id: str,
+    title: Optional[str],
+    url: Optional[str],
+    created_at: Any,
+    score: Optional[float]
+) -> Dict[str, Any]:
+    """构建统一结果行"""
+    return {
+        "_id": f"{source_type}:{task_id}:{result_id}",
+        "source_type": source_type,
+        "task_id": task_id,
+        "result_id": result_id,
+        "title": title,
+        "url": url,
+        "created_at": created_at,
+        "score": score,
+        "content_ref": {"collection": SOURCE_COLLECTIONS[source_type], "id": result_id}
+    }
+
+
+def scheduled_row(result_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """由 search_results 文档构建统一结果行"""
+    return build_unified_row(
+        SOURCE_SCHEDULED,
+        result_dict["task_id"],
+        result_dict["_id"],
+        result_dict.get("title"),
+        result_dict.get("url"),
+        result_dict.get("created_at"),
+        result_dict.get("relevance_score")
+    )
+
+
+class UnifiedResultRepository:
+    """统一结果读模型仓储"""
+
+    def __init__(self):
+        self.collection_name = "unified_results"
+
+    async def _get_collection(self):
+        """获取集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    # ==================== 写入 ====================
+
+    async def upsert_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        写入统一结果行（已存在的行保持不变，重复同步幂等）
+
+        Returns:
+            int: 新写入的行数
+        """
+        operations = [
+            UpdateOne({"_id": row["_id"]}, {"$setOnInsert": row}, upsert=True)
+            for row in rows
+        ]
+        if not operations:
+            return 0
+
+        try:
+            collection = await self._get_collection()
+            result = await collection.bulk_write(operations, ordered=False)
+            return result.upserted_count
+
+        except Exception as e:
+            logger.error(f"写入统一结果失败: {e}")
+            raise
+
+    async def sync_instant_mappings(self, mappings: List[Dict[str, Any]]) -> int:
+        """
+        按即时搜索映射同步统一结果行（标题/URL 从 instant_search_results 读取）
+
+        Args:
+            mappings: 映射字段字典（含 result_id / task_id / found_at / relevance_score）
+        """
+        if not mappings:
+            return 0
+
+        db = await get_mongodb_database()
+        synced = 0
+        for start in range(0, len(mappings), SYNC_BATCH_SIZE):
+            batch = mappings[start:start + SYNC_BATCH_SIZE]
+            results = {
+                doc["_id"]: doc
+                async for doc in db.instant_search_results.find(
+                    {"_id": {"$in": list({mapping["result_id"] for mapping in batch})}},
+                    {"title": 1, "url": 1}
+                )
+            }
+            synced += await self.upsert_rows(
+                build_unified_row(
+                    SOURCE_INSTANT,
+                    mapping["task_id"],
+                    mapping["result_id"],
+                    results[mapping["result_id"]].get("title"),
+                    results[mapping["result_id"]].get("url"),
+                    mapping.get("found_at"),
+                    mapping.get("relevance_score")
+                )
+                for mapping in batch if mapping["result_id"] in results
+            )
+        return synced
+
+    async def delete_task(self, source_type: str, task_id: str) -> int:
+        """删除任务的全部统一结果行"""
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_many({"source_type": source_type, "task_id": task_id})
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"删除统一结果失败 ({source_type}:{task_id}): {e}")
+            raise
+
+    async def delete_results(self, source_type: str, task_id: str, result_ids: List[str]) -> int:
+        """删除任务中指定结果的统一结果行（如结果归档移出热集合）"""
+        if not result_ids:
+            return 0
+
+        try:
+            collection = await self._get_collection()
+            result = await collection.delete_many({
+                "_id": {"$in": [f"{source_type}:{task_id}:{result_id}" for result_id in result_ids]}
+            })
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"删除统一结果失败 ({source_type}:{task_id}): {e}")
+            raise
+
+    # ==================== 查询 ====================
+
+    @staticmethod
+    def _scope_filter(scopes: Dict[str, List[str]]) -> Optional[Dict[str, Any]]:
+        """构建来源 + 任务范围条件（每个分支命中 (source_type, task_id, created_at, _id) 索引）"""
+        branches = [
+            {"source_type": source_type, "task_id": {"$in": task_ids}}
+            for source_type, task_ids in scopes.items() if task_ids
+        ]
+        if not branches:
+            return None
+        return branches[0] if len(branches) == 1 else {"$or": branches}
+
+    async def find_page(
+        self,
+        scopes: Dict[str, List[str]],
+        position: Optional[KeysetCursorInfo],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """按 (created_at, _id) 降序读取游标之后的 limit+1 行"""
+        query = self._scope_filter(scopes)
+        if query is None:
+            return []
+        if position is not None:
+            query = {"$and": [query, cursor_paginator.build_keyset_filter(position)]}
+
+        try:
+            collection = await self._get_collection()
+            cursor = collection.find(query).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1)
+            return await cursor.to_list(length=limit + 1)
+
+        except Exception as e:
+            logger.error(f"查询统一结果失败: {e}")
+            raise
+
+    async def get_rows(self, row_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """按行ID批量读取统一结果行"""
+        if not row_ids:
+            return {}
+
+        try:
+            collection = await self._get_collection()
+            return {row["_id"]: row async for row in collection.find({"_id": {"$in": row_ids}})}
+
+        except Exception as e:
+            logger.error(f"读取统一结果失败: {e}")
+            raise
+
+    async def load_content(
+        self,
+        rows: List[Dict[str, Any]],
+        fields: Iterable[str] = ("markdown_content",)
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        按正文指针批量读取源集合中的字段（每个源集合一次按 _id 查询）
+
+        Returns:
+            dict: 行ID -> 解码后的字段（源结果已删除的行不出现）
+        """
+        fields = tuple(fields)
+        ids_by_collection: Dict[str, List[str]] = {}
+        for row in rows:
+            ref = row["content_ref"]
+            ids_by_collection.setdefault(ref["collection"], []).append(ref["id"])
+
+        try:
+            db = await get_mongodb_database()
+            contents: Dict[tuple, Dict[str, Any]] = {}
+            for collection_name, ids in ids_by_collection.items():
+                async for doc in db[collection_name].find({"_id": {"$in": ids}}, {field: 1 for field in fields}):
+                    contents[(collection_name, doc["_id"])] = {
+                        field: field_codec.decode_value(doc.get(field)) for field in fields
+                    }
+
+        except Exception as e:
+            logger.error(f"读取统一结果正文失败: {e}")
+            raise
+
+        loaded = {}
+        for row in rows:
+            key = (row["content_ref"]["collection"], row["content_ref"]["id"])
+            if key in contents:
+                loaded[row["_id"]] = contents[key]
+        return loaded
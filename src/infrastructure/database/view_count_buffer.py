@@ -0,0 +1,143 @@
+"""报告查看次数写后缓冲
+
+仪表盘会频繁轮询报告详情，每次读取都执行一次 $inc 会让读接口变成"读 + 写"。本缓冲在进程内
+累加各报告的查看次数：
+
+- 记录: record() 只累加内存计数，不访问数据库
+- 刷新: 每 REPORT_VIEW_COUNT_FLUSH_INTERVAL 秒把累计值合并为一次无序 bulk_write（每个报告一个 $inc）
+- 容错: 刷新失败时把计数合并回缓冲，下次刷新重试
+- 关闭: drain() 停止定时刷新并写入剩余计数（应用关闭时调用），之后的记录直接写入
+"""
+
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 刷新函数：写入 报告ID -> 增量
+FlushFunction = Callable[[Dict[str, int]], Awaitable[None]]
+
+
+class ViewCountBuffer:
+    """进程级报告查看次数缓冲"""
+
+    def __init__(self, flush_interval: float, flush_function: Optional[FlushFunction] = None):
+        self.flush_interval = flush_interval
+        self._flush_function = flush_function
+
+        self._counts: Counter = Counter()
+        self._closed = False
+        self._worker: Optional[asyncio.Task] = None
+        # 保证同一时间只有一个刷新在进行
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+        self._metrics = {
+            "recorded_views": 0,
+            "flushes": 0,
+            "flushed_reports": 0,
+            "flushed_views": 0,
+            "failed_flushes": 0
+        }
+
+    def _get_flush_function(self) -> FlushFunction:
+        """获取刷新函数（默认写入 summary_reports）"""
+        if self._flush_function is None:
+            async def flush_to_mongodb(counts: Dict[str, int]) -> None:
+                from src.infrastructure.database.connection import get_mongodb_database
+                from src.infrastructure.database.summary_report_repositories import SummaryReportRepository
+
+                db = await get_mongodb_database()
+                await SummaryReportRepository(db).increment_view_counts(counts)
+
+            self._flush_function = flush_to_mongodb
+        return self._flush_function
+
+    def _ensure_started(self) -> None:
+        """首次记录时创建锁并启动定时刷新协程（绑定到运行中的事件循环）"""
+        if self._worker is not None and not self._worker.done():
+            return
+
+        self._flush_lock = asyncio.Lock()
+        self._worker = asyncio.create_task(self._run())
+
+    async def record(self, report_id: str, count: int = 1) -> None:
+        """记录报告查看次数"""
+        self._metrics["recorded_views"] += count
+        if self._closed:
+            await self._get_flush_function()({report_id: count})
+            return
+
+        self._ensure_started()
+        self._counts[report_id] += count
+
+    def pending(self, report_id: str) -> int:
+        """报告尚未写入数据库的查看次数（读取时叠加到已持久化的计数上）"""
+        return self._counts.get(report_id, 0)
+
+    async def _run(self) -> None:
+        """定时刷新协程"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        写入当前累计的查看次数
+
+        Returns:
+            int: 本次写入的报告数
+        """
+        if self._flush_lock is None or not self._counts:
+            return 0
+
+        async with self._flush_lock:
+            counts, self._counts = dict(self._counts), Counter()
+            if not counts:
+                return 0
+
+            try:
+                await self._get_flush_function()(counts)
+            except Exception as e:
+                # 合并回缓冲，下次刷新重试
+                logger.error(f"❌ 写入报告查看次数失败，下次刷新重试: {e}")
+                self._counts.update(counts)
+                self._metrics["failed_flushes"] += 1
+                return 0
+
+            self._metrics["flushes"] += 1
+            self._metrics["flushed_reports"] += len(counts)
+            self._metrics["flushed_views"] += sum(counts.values())
+            logger.debug(f"刷新报告查看次数: {len(counts)} 个报告, {sum(counts.values())} 次查看")
+            return len(counts)
+
+    async def drain(self) -> None:
+        """停止定时刷新并写入剩余计数（应用关闭时调用）"""
+        self._closed = True
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+        if self._counts:
+            logger.warning(f"⚠️ 报告查看次数未能全部写入: {sum(self._counts.values())} 次查看丢失")
+        else:
+            logger.info("✅ 报告查看次数缓冲已清空")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取缓冲指标"""
+        metrics = dict(self._metrics)
+        metrics["pending_reports"] = len(self._counts)
+        metrics["pending_views"] = sum(self._counts.values())
+        metrics["closed"] = self._closed
+        return metrics
+
+
+# 全局实例
+view_count_buffer = ViewCountBuffer(flush_interval=settings.REPORT_VIEW_COUNT_FLUSH_INTERVAL)
@@ -14,6 +14,9 @@ from src.config import settings
 from src.utils.logger import get_logger
 from src.api.v1.router import api_router
 from src.infrastructure.database.connection import init_database, close_database_connections
+from src.infrastructure.database.result_write_buffer import result_write_buffer
+from src.infrastructure.database.view_count_buffer import view_count_buffer
+from src.services.report_job_manager import report_job_manager
 from src.services.task_scheduler import start_scheduler, stop_scheduler
 
 logger = get_logger(__name__)
@@ -40,6 +43,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         except Exception as e:
             logger.warning(f"⚠️ 定时任务调度器启动失败: {e}")
 
+        # 启动报告后台作业管理器（接管未完成的作业）
+        try:
+            await report_job_manager.start()
+        except Exception as e:
+            logger.warning(f"⚠️ 报告作业管理器启动失败: {e}")
+
         # TODO: 初始化缓存
         # await init_redis()
 
@@ -65,6 +74,24 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         except Exception as e:
             logger.warning(f"⚠️ 停止调度器时出错: {e}")
 
+        # 停止报告作业（释放执行中的作业，重启后继续）
+        try:
+            await report_job_manager.shutdown()
+        except Exception as e:
+            logger.warning(f"⚠️ 停止报告作业管理器时出错: {e}")
+
+        # 清空搜索结果写缓冲（在关闭数据库连接之前）
+        try:
+            await result_write_buffer.drain()
+        except Exception as e:
+            logger.warning(f"⚠️ 清空结果写缓冲时出错: {e}")
+
+        # 写入缓冲的报告查看次数
+        try:
+            await view_count_buffer.drain()
+        except Exception as e:
+            logger.warning(f"⚠️ 清空报告查看次数缓冲时出错: {e}")
+
         # 关闭数据库连接
         await close_database_connections()
         logger.info("✅ 数据库连接已关闭")
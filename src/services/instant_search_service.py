@@ -5,8 +5,12 @@ v1.3.0 核心业务逻辑：
 - 实现content_hash去重机制
 - 创建结果映射表实现跨搜索可见性
 - 完整的统计信息（新结果、共享结果）
+- single-flight：相同搜索并发时只执行一次上游调用，后来者共享结果集
 """
 
+import asyncio
+import hashlib
+import json
 import time
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Tuple
@@ -23,23 +27,71 @@ from src.core.domain.entities.instant_search_result_mapping import (
 from src.infrastructure.database.instant_search_repositories import (
     InstantSearchTaskRepository,
     InstantSearchResultRepository,
-    InstantSearchResultMappingRepository
+    InstantSearchResultMappingRepository,
+    InstantSearchInflightRepository
 )
+from src.infrastructure.database.report_search_index_repository import (
+    SOURCE_INSTANT,
+    IndexDocument,
+    ReportSearchIndexRepository
+)
+from src.infrastructure.database.repositories import TaskTrendBucketRepository, TrendObservation
+from src.infrastructure.database.unified_results_repository import UnifiedResultRepository
+from src.infrastructure.cache.result_page_cache import instant_result_page_cache
 from src.infrastructure.crawlers.firecrawl_adapter import FirecrawlAdapter
 from src.infrastructure.search.firecrawl_search_adapter import FirecrawlSearchAdapter
-from src.core.domain.entities.search_config import UserSearchConfig
+from src.core.domain.entities.search_config import UserSearchConfig, SearchConfigManager
+from src.services.report_search_service import report_search_service
+from src.config import settings
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def build_search_fingerprint(
+    query: Optional[str],
+    crawl_url: Optional[str],
+    search_config: Optional[Dict[str, Any]]
+) -> str:
+    """
+    计算搜索指纹（用于识别相同的进行中搜索）
+
+    组成：
+    - Crawl模式：去除首尾空白的crawl_url（优先于query，与执行逻辑一致）
+    - Search模式：规范化query（去首尾空白、合并连续空白、小写）
+    - 有效配置：模板 + 用户覆盖合并后的配置（键排序序列化）
+
+    Returns:
+        sha256十六进制字符串
+    """
+    if crawl_url:
+        key: Dict[str, Any] = {"mode": "crawl", "crawl_url": crawl_url.strip()}
+    else:
+        key = {"mode": "search", "query": " ".join((query or "").split()).lower()}
+
+    key["config"] = SearchConfigManager().get_effective_config(
+        UserSearchConfig.from_json(search_config or {})
+    )
+
+    payload = json.dumps(key, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 class InstantSearchService:
     """即时搜索服务"""
 
+    # 本进程内进行中的执行：指纹 -> (领导者任务ID, 完成信号)
+    # 服务按请求实例化，因此放在类级别共享
+    _local_flights: Dict[str, Tuple[str, "asyncio.Future"]] = {}
+
     def __init__(self):
         self.task_repo = InstantSearchTaskRepository()
         self.result_repo = InstantSearchResultRepository()
         self.mapping_repo = InstantSearchResultMappingRepository()
+        self.inflight_repo = InstantSearchInflightRepository()
+        self.search_index_repo = ReportSearchIndexRepository()
+        self.unified_repo = UnifiedResultRepository()
+        self.trend_repo = TaskTrendBucketRepository()
         # 使用 FirecrawlSearchAdapter（稳定的HTTP直接调用）代替 FirecrawlAdapter
         self.firecrawl_search = FirecrawlSearchAdapter()
         # 保留 FirecrawlAdapter 用于 scrape 功能
@@ -67,6 +119,11 @@ class InstantSearchService:
            - 创建映射记录
         4. 更新任务统计
 
+        single-flight：若已有相同指纹（规范化query + crawl_url + 有效配置）的执行
+        正在进行（本进程或其他worker，通过 instant_search_inflight 锁识别），
+        则不再调用 Firecrawl，而是等待该执行完成后复制其映射到本任务。
+        领导者失败或等待超时时，本任务自行执行。
+
         Args:
             name: 任务名称
             query: 搜索关键词（Search模式）
@@ -99,6 +156,38 @@ class InstantSearchService:
         task.start_execution()
         await self.task_repo.update(task)
 
+        mode = task.get_search_mode()
+        if not settings.INSTANT_SEARCH_SINGLE_FLIGHT_ENABLED or mode not in ("search", "crawl"):
+            return await self._execute_and_complete(task, search_config, start_time)
+
+        fingerprint = build_search_fingerprint(query, crawl_url, search_config)
+
+        try:
+            leader_task_id = await self._join_or_lead(fingerprint, task)
+        except Exception as e:
+            logger.warning(f"⚠️ single-flight 锁不可用，直接执行: {e}")
+            return await self._execute_and_complete(task, search_config, start_time)
+
+        if leader_task_id is None:
+            return await self._lead_flight(fingerprint, task, search_config, start_time)
+
+        # 跟随者：等待领导者执行完成
+        logger.info(f"相同搜索正在执行，等待共享结果: {task.name} -> 领导者任务 {leader_task_id}")
+        leader_task = await self._wait_for_leader(fingerprint, leader_task_id)
+
+        if leader_task is not None and leader_task.status == InstantSearchStatus.COMPLETED:
+            return await self._attach_to_leader(task, leader_task, start_time)
+
+        logger.warning(f"⚠️ 领导者任务未在等待时间内成功完成，自行执行: {task.name} (领导者: {leader_task_id})")
+        return await self._execute_and_complete(task, search_config, start_time)
+
+    async def _execute_and_complete(
+        self,
+        task: InstantSearchTask,
+        search_config: Optional[Dict[str, Any]],
+        start_time: float
+    ) -> InstantSearchTask:
+        """执行搜索、处理结果并更新任务统计（实际调用 Firecrawl 的路径）"""
         try:
             # 3. 执行搜索
             credits_used = 1  # 默认积分消耗
@@ -146,6 +235,162 @@ class InstantSearchService:
             logger.error(f"即时搜索失败: {task.name} - {str(e)}")
             raise
 
+    async def _join_or_lead(self, fingerprint: str, task: InstantSearchTask) -> Optional[str]:
+        """
+        加入进行中的执行或成为领导者
+
+        Returns:
+            成为领导者返回 None；否则返回领导者任务ID
+        """
+        local_flight = self._local_flights.get(fingerprint)
+        if local_flight is not None and not local_flight[1].done():
+            return local_flight[0]
+
+        existing_lock = await self.inflight_repo.try_acquire(
+            fingerprint=fingerprint,
+            task_id=task.id,
+            search_execution_id=task.search_execution_id,
+            ttl_seconds=settings.INSTANT_SEARCH_INFLIGHT_LOCK_TTL
+        )
+        if existing_lock is None:
+            return None
+
+        return existing_lock["leader_task_id"]
+
+    async def _lead_flight(
+        self,
+        fingerprint: str,
+        task: InstantSearchTask,
+        search_config: Optional[Dict[str, Any]],
+        start_time: float
+    ) -> InstantSearchTask:
+        """以领导者身份执行，完成后通知本进程的跟随者并释放锁"""
+        done_signal = asyncio.get_running_loop().create_future()
+        self._local_flights[fingerprint] = (task.id, done_signal)
+
+        try:
+            return await self._execute_and_complete(task, search_config, start_time)
+
+        finally:
+            if self._local_flights.get(fingerprint, (None,))[0] == task.id:
+                self._local_flights.pop(fingerprint, None)
+            if not done_signal.done():
+                done_signal.set_result(None)
+
+            try:
+                await self.inflight_repo.release(fingerprint, task.id)
+            except Exception as e:
+                # 锁带有过期时间，释放失败不影响结果
+                logger.warning(f"⚠️ 释放搜索执行锁失败: {e}")
+
+    async def _wait_for_leader(
+        self,
+        fingerprint: str,
+        leader_task_id: str
+    ) -> Optional[InstantSearchTask]:
+        """
+        等待领导者执行结束
+
+        - 本进程内的领导者：直接等待完成信号
+        - 其他worker的领导者：轮询任务状态
+        - 最多等待 INSTANT_SEARCH_LEADER_WAIT_TIMEOUT 秒（超时由跟随者自行执行）
+
+        Returns:
+            结束后的领导者任务；超时或任务不存在返回 None
+        """
+        timeout = settings.INSTANT_SEARCH_LEADER_WAIT_TIMEOUT
+
+        local_flight = self._local_flights.get(fingerprint)
+        if local_flight is not None and local_flight[0] == leader_task_id:
+            try:
+                await asyncio.wait_for(asyncio.shield(local_flight[1]), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+            return await self.task_repo.get_by_id(leader_task_id)
+
+        finished_statuses = (
+            InstantSearchStatus.COMPLETED,
+            InstantSearchStatus.FAILED,
+            InstantSearchStatus.CANCELLED
+        )
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            leader_task = await self.task_repo.get_by_id(leader_task_id)
+            if leader_task is None:
+                return None
+            if leader_task.status in finished_statuses:
+                return leader_task
+            await asyncio.sleep(settings.INSTANT_SEARCH_INFLIGHT_POLL_INTERVAL)
+
+        return None
+
+    async def _attach_to_leader(
+        self,
+        task: InstantSearchTask,
+        leader_task: InstantSearchTask,
+        start_time: float
+    ) -> InstantSearchTask:
+        """
+        跟随者：复制领导者的映射到本任务执行
+
+        结果集与领导者共享，因此全部计为共享结果，不消耗积分
+        """
+        try:
+            leader_mappings = await self.mapping_repo.get_mappings_by_search_execution(
+                leader_task.search_execution_id
+            )
+
+            mappings = [
+                create_result_mapping(
+                    search_execution_id=task.search_execution_id,
+                    result_id=leader_mapping.result_id,
+                    task_id=task.id,
+                    search_position=leader_mapping.search_position,
+                    relevance_score=leader_mapping.relevance_score,
+                    is_first_discovery=False
+                )
+                for leader_mapping in leader_mappings
+            ]
+
+            if mappings:
+                await self.mapping_repo.batch_create(mappings)
+                await self.result_repo.bulk_update_discovery_stats(
+                    [mapping.result_id for mapping in mappings]
+                )
+                if settings.REPORT_SEARCH_INDEX_ENABLED:
+                    try:
+                        await report_search_service.index_instant_results(
+                            task.id, [mapping.result_id for mapping in mappings]
+                        )
+                    except Exception as e:
+                        logger.error(f"更新报告搜索索引失败: {e}")
+                await self._sync_unified_results(mappings)
+                await self._apply_trend_buckets(mappings)
+
+            execution_time = int((time.time() - start_time) * 1000)
+            task.mark_as_completed(
+                total=len(mappings),
+                new=0,
+                shared=len(mappings),
+                credits=0,
+                execution_time=execution_time
+            )
+            await self.task_repo.update(task)
+
+            logger.info(
+                f"即时搜索完成（共享执行 {leader_task.search_execution_id}）: {task.name} - "
+                f"总结果={len(mappings)}"
+            )
+            return task
+
+        except Exception as e:
+            task.mark_as_failed(str(e))
+            await self.task_repo.update(task)
+
+            logger.error(f"共享搜索结果失败: {task.name} - {str(e)}")
+            raise
+
     async def _execute_search_with_batch(
         self,
         query: str,
@@ -259,6 +504,8 @@ class InstantSearchService:
         new_count = 0
         shared_count = 0
         mappings = []
+        index_documents = []
+        trend_fields = {}
 
         for idx, data in enumerate(results_data, start=1):
             # 1. 创建结果实体（自动计算content_hash）
@@ -304,19 +551,83 @@ class InstantSearchService:
                 is_first_discovery=is_first_discovery
             )
             mappings.append(mapping)
+            index_documents.append(IndexDocument(
+                task_id=task_id, doc_id=result_id, title=result.title, content=result.content
+            ))
+            trend_fields[result_id] = {"title": result.title, "content": result.content, "url": result.url}
 
         # 4. 批量保存映射
         if mappings:
             await self.mapping_repo.batch_create(mappings)
             logger.info(f"创建 {len(mappings)} 条结果映射")
 
+        # 5. 更新报告搜索索引（共享结果同样按本任务索引；失败不影响结果保存）
+        if settings.REPORT_SEARCH_INDEX_ENABLED and index_documents:
+            try:
+                await self.search_index_repo.index_documents(SOURCE_INSTANT, index_documents)
+            except Exception as e:
+                logger.error(f"更新报告搜索索引失败: {e}")
+
+        # 6. 同步统一结果读模型
+        await self._sync_unified_results(mappings)
+
+        # 7. 累加任务按天趋势桶
+        await self._apply_trend_buckets(mappings, trend_fields)
+
         return new_count, shared_count
 
+    async def _sync_unified_results(self, mappings: List[InstantSearchResultMapping]) -> None:
+        """按本任务的映射同步统一结果读模型（失败不影响结果保存，可运行 migration_009 回填）"""
+        if not settings.UNIFIED_RESULTS_WRITE_ENABLED or not mappings:
+            return
+
+        try:
+            await self.unified_repo.sync_instant_mappings([vars(mapping) for mapping in mappings])
+        except Exception as e:
+            logger.error(f"同步统一结果失败: {e}")
+
+    async def _apply_trend_buckets(
+        self,
+        mappings: List[InstantSearchResultMapping],
+        result_fields: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> None:
+        """
+        按本任务的映射累加按天趋势桶（失败不影响结果保存，可运行 migration_011 重建）
+
+        即时任务只执行一次，全部结果都计入域名/关键词分布；is_first_discovery 区分新结果和共享结果。
+        result_fields 未提供时（共享执行）按结果ID读取标题、正文和URL
+        """
+        if not settings.TREND_BUCKETS_ENABLED or not mappings:
+            return
+
+        try:
+            if result_fields is None:
+                result_fields = await self.result_repo.get_fields_by_ids(
+                    list({mapping.result_id for mapping in mappings})
+                )
+            observations = []
+            for mapping in mappings:
+                fields = result_fields.get(mapping.result_id)
+                observations.append(TrendObservation(
+                    task_id=mapping.task_id,
+                    observed_at=mapping.found_at,
+                    is_new=mapping.is_first_discovery,
+                    profiled=fields is not None,
+                    title=(fields or {}).get("title"),
+                    content=(fields or {}).get("content"),
+                    url=(fields or {}).get("url")
+                ))
+            await self.trend_repo.apply(SOURCE_INSTANT, observations)
+        except Exception as e:
+            logger.error(f"更新趋势桶失败: {e}")
+
     async def get_task_results(
         self,
         task_id: str,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        include_html: bool = False,
+        include_markdown: bool = False
     ) -> Tuple[List[Dict[str, Any]], int]:
         """
         获取任务的搜索结果（通过映射表JOIN）
@@ -326,6 +637,12 @@ class InstantSearchService:
         - JOIN instant_search_results表
         - 返回完整结果 + 映射元数据
 
+        已完成的执行映射集合不再变化，结果页走 instant_result_page_cache，
+        只在结果被删除时失效（见 delete_task_results）。
+
+        正文按需加载：缓存中只保存内容块引用，
+        include_html / include_markdown 为 True 时再从内容块加载HTML/完整Markdown。
+
         Returns:
             (results, total): 结果列表和总数
         """
@@ -334,6 +651,15 @@ class InstantSearchService:
         if not task:
             raise ValueError(f"任务不存在: {task_id}")
 
+        is_immutable = task.status == InstantSearchStatus.COMPLETED
+        if is_immutable:
+            cached_page = await instant_result_page_cache.get(
+                task.search_execution_id, page, page_size
+            )
+            if cached_page is not None:
+                results = await self._with_bodies(cached_page["results"], include_html, include_markdown)
+                return results, cached_page["total"]
+
         # 2. 通过映射表查询结果
         results_with_mapping, total = await self.mapping_repo.get_results_by_search_execution(
             search_execution_id=task.search_execution_id,
@@ -357,7 +683,63 @@ class InstantSearchService:
                 }
             })
 
-        return formatted_results, total
+        if is_immutable:
+            await instant_result_page_cache.set(
+                task.search_execution_id,
+                page,
+                page_size,
+                {"results": formatted_results, "total": total}
+            )
+
+        results = await self._with_bodies(formatted_results, include_html, include_markdown)
+        return results, total
+
+    async def _with_bodies(
+        self,
+        formatted_results: List[Dict[str, Any]],
+        include_html: bool,
+        include_markdown: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        按需附加正文（返回浅拷贝，不修改缓存中的对象）
+
+        未请求HTML时清空 html_content（兼容仍内联存储HTML的历史数据）
+        """
+        results = []
+        for item in formatted_results:
+            result_dict = dict(item["result"])
+            if not include_html:
+                result_dict["html_content"] = None
+            results.append({"result": result_dict, "mapping_info": item["mapping_info"]})
+
+        await self.result_repo.hydrate_bodies(
+            [item["result"] for item in results],
+            include_html=include_html,
+            include_markdown=include_markdown
+        )
+        return results
+
+    async def delete_task_results(self, task_id: str) -> int:
+        """
+        删除任务的结果映射
+
+        结果本身可能被其他搜索共享，这里只删除该任务执行的映射记录，
+        并使该执行的结果页缓存失效。
+
+        Returns:
+            删除的映射数量
+        """
+        task = await self.task_repo.get_by_id(task_id)
+        if not task:
+            raise ValueError(f"任务不存在: {task_id}")
+
+        deleted_count = await self.mapping_repo.delete_by_search_execution(task.search_execution_id)
+        await instant_result_page_cache.invalidate(task.search_execution_id)
+        await self.search_index_repo.delete_task(SOURCE_INSTANT, task_id)
+        await self.unified_repo.delete_task(SOURCE_INSTANT, task_id)
+        await self.trend_repo.delete_task(SOURCE_INSTANT, task_id)
+
+        return deleted_count
 
     async def get_task_by_id(self, task_id: str) -> Optional[InstantSearchTask]:
         """获取任务"""
@@ -375,3 +757,20 @@ class InstantSearchService:
             page_size=page_size,
             status=status
         )
+
+    async def query_tasks(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        include_total: bool = True
+    ) -> Dict[str, Any]:
+        """查询任务列表（支持复合键游标，总数可选）"""
+        return await self.task_repo.query_tasks(
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            status=status,
+            include_total=include_total
+        )
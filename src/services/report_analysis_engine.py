@@ -0,0 +1,302 @@
+"""报告本地分析引擎（关键词 / 趋势）
+
+对报告的全部数据项一次性分词并构建稀疏词项矩阵（CSR：indptr / indices / counts），
+在矩阵上计算 TF-IDF，不调用外部 LLM：
+
+- 分词: 复用 analyze_terms（中日韩文字二元组，其他文字按词），标题词频按 TITLE_WEIGHT 加权，
+  标签作为完整词项；按 is_keyword_term 过滤停用词、纯数字和单字
+- keyword: 文档内词频取 1+log(tf)、乘以 idf 后按文档做 L2 归一化，按词项汇总得到报告关键词
+- trend: 按添加日期统计数据项数量；按时间把文档分为较早 2/3 与最近 1/3，
+  比较词项在两部分中的文档占比，得到新兴关键词
+
+安装 numpy 时矩阵运算向量化（1 万条数据项单核数秒内完成），未安装时回退到等价的纯 Python 实现。
+分词是 CPU 密集操作，调用方应在线程中执行 analyze_items。
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.text_tokenizer import analyze_terms, is_keyword_term
+
+logger = get_logger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    logger.warning("⚠️ numpy 未安装，报告关键词分析将使用纯 Python 实现")
+
+# 支持的分析类型
+ANALYSIS_TYPES = ("keyword", "trend")
+
+# 标题词频权重
+TITLE_WEIGHT = 3
+
+# 最近部分占全部文档的比例（趋势分析）
+RECENT_FRACTION = 1 / 3
+
+# 新兴关键词在最近部分至少出现的次数
+EMERGING_MIN_RECENT = 2
+
+
+def document_terms(
+    title: Optional[str],
+    content: Optional[str],
+    tags: Iterable[str] = (),
+    max_chars: Optional[int] = None
+) -> Counter:
+    """计算单个数据项的词频（停用词按去重后的词项过滤，不逐次出现判断）"""
+    text = content[:max_chars] if content and max_chars else content
+    counts: Counter = Counter(analyze_terms(text))
+    for term, count in Counter(analyze_terms(title)).items():
+        counts[term] += count * TITLE_WEIGHT
+    for tag in tags:
+        tag = tag.strip().lower()
+        if tag:
+            counts[tag] += TITLE_WEIGHT
+
+    for term in [term for term in counts if not is_keyword_term(term)]:
+        del counts[term]
+    return counts
+
+
+@dataclass
+class TermMatrix:
+    """文档-词项稀疏矩阵（CSR）"""
+    vocabulary: List[str]
+    indptr: List[int]
+    indices: List[int]
+    counts: List[int]
+
+    @property
+    def document_count(self) -> int:
+        return len(self.indptr) - 1
+
+
+def build_term_matrix(documents: Iterable[Counter]) -> TermMatrix:
+    """一次遍历构建词表和 CSR 矩阵"""
+    term_ids: Dict[str, int] = {}
+    indptr, indices, counts = [0], [], []
+    for document in documents:
+        for term, count in document.items():
+            indices.append(term_ids.setdefault(term, len(term_ids)))
+            counts.append(count)
+        indptr.append(len(indices))
+    return TermMatrix(vocabulary=list(term_ids), indptr=indptr, indices=indices, counts=counts)
+
+
+def _min_document_frequency(document_count: int) -> int:
+    """参与排名的最小文档频率（文档较多时排除只出现一次的词项）"""
+    return 2 if document_count >= 20 else 1
+
+
+def _top(scores: Dict[Any, float], top_k: int) -> List[Any]:
+    """按得分降序取前 top_k 个词项（词项ID或关键词，得分相同按词项，结果确定）"""
+    return sorted(scores, key=lambda term: (-scores[term], term))[:top_k]
+
+
+def tfidf_keywords(matrix: TermMatrix, top_k: int = 20) -> List[Dict[str, Any]]:
+    """
+    计算报告关键词
+
+    Returns:
+        [{"keyword", "score", "document_count"}]，score 为各文档归一化 TF-IDF 权重的均值
+    """
+    n = matrix.document_count
+    if n == 0 or not matrix.indices:
+        return []
+    min_df = _min_document_frequency(n)
+
+    if NUMPY_AVAILABLE:
+        indptr = np.asarray(matrix.indptr, dtype=np.int64)
+        indices = np.asarray(matrix.indices, dtype=np.int64)
+        counts = np.asarray(matrix.counts, dtype=np.float64)
+        vocabulary_size = len(matrix.vocabulary)
+
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        df = np.bincount(indices, minlength=vocabulary_size)
+        idf = np.log((1 + n) / (1 + df)) + 1
+        weights = (1 + np.log(counts)) * idf[indices]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+        weights /= norms[rows]
+        scores = np.bincount(indices, weights=weights, minlength=vocabulary_size) / n
+        scores[df < min_df] = 0
+
+        candidates = min(top_k, int(np.count_nonzero(scores)))
+        if candidates == 0:
+            return []
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        ranked = sorted(top.tolist(), key=lambda term_id: (-scores[term_id], term_id))
+        return [
+            {
+                "keyword": matrix.vocabulary[term_id],
+                "score": round(float(scores[term_id]), 6),
+                "document_count": int(df[term_id])
+            }
+            for term_id in ranked
+        ]
+
+    df_counter: Counter = Counter(matrix.indices)
+    idf = {term_id: math.log((1 + n) / (1 + df)) + 1 for term_id, df in df_counter.items()}
+    totals: Dict[int, float] = {}
+    for row in range(n):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        weights = [
+            (matrix.indices[k], (1 + math.log(matrix.counts[k])) * idf[matrix.indices[k]])
+            for k in range(start, end)
+        ]
+        norm = math.sqrt(sum(weight * weight for _, weight in weights))
+        for term_id, weight in weights:
+            totals[term_id] = totals.get(term_id, 0.0) + weight / norm
+
+    scores = {term_id: total / n for term_id, total in totals.items() if df_counter[term_id] >= min_df}
+    return [
+        {
+            "keyword": matrix.vocabulary[term_id],
+            "score": round(scores[term_id], 6),
+            "document_count": df_counter[term_id]
+        }
+        for term_id in _top(scores, top_k)
+    ]
+
+
+def rank_emerging(
+    frequencies: Dict[Any, Tuple[int, int]],
+    recent_total: int,
+    earlier_total: int,
+    top_k: int = 10
+) -> List[Tuple[Any, float]]:
+    """
+    按最近部分占比相对较早部分的提升倍数（加一平滑）排序新兴关键词
+
+    lift = (recent / recent_total) / ((earlier + 1) / (earlier_total + 1))，
+    最近部分出现少于 EMERGING_MIN_RECENT 次或 lift 不大于 1 的词不计入。
+    报告数据项分析（按文档）与报告任务趋势（按日桶汇总）共用
+
+    Args:
+        frequencies: {关键词: (最近部分出现次数, 较早部分出现次数)}
+        recent_total / earlier_total: 最近/较早部分的总数
+
+    Returns:
+        [(关键词, lift)]，按 lift 降序（相同按关键词）
+    """
+    if recent_total == 0 or earlier_total == 0:
+        return []
+
+    scores = {}
+    for key, (recent, earlier) in frequencies.items():
+        if recent < EMERGING_MIN_RECENT:
+            continue
+        lift = (recent / recent_total) / ((earlier + 1) / (earlier_total + 1))
+        if lift > 1:
+            scores[key] = lift
+    return [(key, scores[key]) for key in _top(scores, top_k)]
+
+
+def emerging_keywords(matrix: TermMatrix, recent_rows: Sequence[int], top_k: int = 10) -> List[Dict[str, Any]]:
+    """
+    新兴关键词：最近文档中的文档占比相对较早文档的提升倍数（见 rank_emerging）
+
+    Args:
+        recent_rows: 最近部分的文档行号
+    """
+    n = matrix.document_count
+    n_recent = len(recent_rows)
+    n_old = n - n_recent
+    if n_recent == 0 or n_old == 0:
+        return []
+
+    if NUMPY_AVAILABLE:
+        indptr = np.asarray(matrix.indptr, dtype=np.int64)
+        indices = np.asarray(matrix.indices, dtype=np.int64)
+        vocabulary_size = len(matrix.vocabulary)
+        recent_mask = np.zeros(n, dtype=bool)
+        recent_mask[np.asarray(recent_rows, dtype=np.int64)] = True
+        entry_recent = np.repeat(recent_mask, np.diff(indptr))
+
+        df_recent = np.bincount(indices[entry_recent], minlength=vocabulary_size)
+        df_old = np.bincount(indices[~entry_recent], minlength=vocabulary_size)
+        frequencies = {
+            matrix.vocabulary[term_id]: (int(df_recent[term_id]), int(df_old[term_id]))
+            for term_id in np.flatnonzero(df_recent >= EMERGING_MIN_RECENT)
+        }
+    else:
+        recent_set = set(recent_rows)
+        recent_counter: Counter = Counter()
+        old_counter: Counter = Counter()
+        for row in range(n):
+            target = recent_counter if row in recent_set else old_counter
+            target.update(matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]])
+        frequencies = {
+            matrix.vocabulary[term_id]: (df, old_counter[term_id])
+            for term_id, df in recent_counter.items()
+            if df >= EMERGING_MIN_RECENT
+        }
+
+    return [
+        {
+            "keyword": keyword,
+            "lift": round(lift, 4),
+            "recent_document_count": frequencies[keyword][0],
+            "earlier_document_count": frequencies[keyword][1]
+        }
+        for keyword, lift in rank_emerging(frequencies, n_recent, n_old, top_k)
+    ]
+
+
+def analyze_items(
+    items: List[Dict[str, Any]],
+    analysis_type: str,
+    top_k: int = 20,
+    max_chars: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    分析数据项
+
+    Args:
+        items: 数据项字典（title / content / tags / added_at）
+        analysis_type: keyword 或 trend
+        top_k: 返回的关键词数量
+        max_chars: 每个数据项参与分词的最大正文长度
+
+    Returns:
+        {"analysis_results": dict, "insights": list}
+    """
+    if analysis_type not in ANALYSIS_TYPES:
+        raise ValueError(f"不支持的分析类型: {analysis_type}")
+
+    matrix = build_term_matrix(
+        document_terms(item.get("title"), item.get("content"), item.get("tags") or (), max_chars)
+        for item in items
+    )
+    keywords = tfidf_keywords(matrix, top_k)
+    results: Dict[str, Any] = {
+        "document_count": matrix.document_count,
+        "vocabulary_size": len(matrix.vocabulary),
+        "keywords": keywords
+    }
+    insights = []
+    if keywords:
+        insights.append("主要关键词: " + "、".join(keyword["keyword"] for keyword in keywords[:5]))
+
+    if analysis_type == "trend":
+        dates = [item.get("added_at") for item in items]
+        timeline = Counter(date.strftime("%Y-%m-%d") for date in dates if date is not None)
+        results["timeline"] = [{"date": day, "count": timeline[day]} for day in sorted(timeline)]
+
+        dated_rows = sorted((date, row) for row, date in enumerate(dates) if date is not None)
+        recent_count = int(len(dated_rows) * RECENT_FRACTION)
+        recent_rows = [row for _, row in dated_rows[len(dated_rows) - recent_count:]] if recent_count else []
+        results["emerging_keywords"] = emerging_keywords(matrix, recent_rows, top_k=max(top_k // 2, 1))
+        if results["emerging_keywords"]:
+            insights.append(
+                "近期上升的关键词: "
+                + "、".join(keyword["keyword"] for keyword in results["emerging_keywords"][:5])
+            )
+
+    return {"analysis_results": results, "insights": insights}
@@ -0,0 +1,449 @@
+"""报告 map-reduce 生成引擎
+
+报告数据项可能有数千条，一次性交给 LLM 会超出上下文窗口。生成分为两个阶段：
+
+- map: 数据项按 token 预算打包成块，每块并发（受 REPORT_LLM_MAP_CONCURRENCY 限制）生成块摘要
+- reduce: 块摘要超出预算时按预算分组逐层合并，最后一次调用按生成模式写出完整报告
+
+每次调用的结果按输入内容哈希缓存（summary_report_llm_cache）。分块边界由数据项内容哈希决定
+（内容定义分块），新增/删除少量数据项只改变所在块，其余块的摘要直接命中缓存；生成中途失败时
+已完成的块同样已缓存，重试只需补齐剩余部分。
+
+token 计数优先使用 tiktoken，未安装时按字符估算（CJK 字符按 1 token，其他字符按 4 字符 1 token）。
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+    logger.warning("⚠️ tiktoken 未安装，报告生成将按字符估算 token 数")
+
+try:
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    AsyncOpenAI = None
+    OPENAI_AVAILABLE = False
+
+# 提示词版本（修改提示词后递增，使旧缓存失效）
+PROMPT_VERSION = 1
+
+# 内容定义分块：块超过半个预算后，在内容哈希满足该除数的数据项之后切分
+CHUNK_BOUNDARY_DIVISOR = 4
+
+# 生成模式 -> 最终报告的写作要求
+MODE_INSTRUCTIONS = {
+    "comprehensive": "撰写一份完整的综合报告：概述、分主题的要点、关键事实与数据、结论。",
+    "summary": "撰写一份简明摘要，只保留最重要的结论和事实。",
+    "analysis": "撰写一份分析报告：识别趋势、对比不同来源的观点，并给出判断依据。"
+}
+
+SYSTEM_PROMPT = "你是一名情报分析助手，根据提供的资料撰写中文 Markdown 报告，只使用资料中的信息。"
+MAP_INSTRUCTION = "将以下资料逐条压缩为要点列表（每条以 \"- \" 开头，保留标题、关键事实和数字）："
+MERGE_INSTRUCTION = "将以下要点合并去重为更精炼的要点列表（每条以 \"- \" 开头）："
+
+_CJK_PATTERN = re.compile(r"[⺀-鿿가-힯豈-﫿＀-￯]")
+_SENTENCE_END = re.compile(r"(?<=[。！？.!?])\s*|\n")
+
+_encoding = None
+
+
+def _get_encoding():
+    """获取 tiktoken 编码（首次使用时加载）"""
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding(settings.REPORT_LLM_TOKENIZER_ENCODING)
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """计算文本的 token 数"""
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        return len(_get_encoding().encode(text, disallowed_special=()))
+
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """截断文本到 max_tokens 以内"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if TIKTOKEN_AVAILABLE:
+        encoding = _get_encoding()
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+    # 二分查找满足预算的最长前缀
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def hash_text(text: str) -> str:
+    """内容哈希"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class GenerationItem:
+    """参与生成的数据项（正文已截断到单项预算）"""
+    text: str
+    tokens: int
+    content_hash: str
+
+    @classmethod
+    def from_content(cls, title: str, content: str, url: Optional[str], max_tokens: int) -> "GenerationItem":
+        """由数据项字段构建（格式即 map 提示词中的资料块）"""
+        text = f"### {title or '无标题'}\n{content or ''}".strip()
+        if url:
+            text = f"{text}\n来源: {url}"
+        text = truncate_to_tokens(text, max_tokens)
+        return cls(text=text, tokens=count_tokens(text), content_hash=hash_text(text))
+
+
+def pack_chunks(items: List[GenerationItem], budget: int) -> List[List[GenerationItem]]:
+    """
+    按 token 预算把数据项打包成块（保持顺序）
+
+    块超过半个预算后，在内容哈希满足 CHUNK_BOUNDARY_DIVISOR 的数据项之后切分，
+    边界只取决于附近数据项的内容，插入/删除数据项后后续块的边界会重新对齐。
+    """
+    chunks: List[List[GenerationItem]] = []
+    current: List[GenerationItem] = []
+    current_tokens = 0
+
+    for item in items:
+        if current and current_tokens + item.tokens > budget:
+            chunks.append(current)
+            current, current_tokens = [], 0
+
+        current.append(item)
+        current_tokens += item.tokens
+
+        if current_tokens * 2 > budget and int(item.content_hash[:8], 16) % CHUNK_BOUNDARY_DIVISOR == 0:
+            chunks.append(current)
+            current, current_tokens = [], 0
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# ==================== LLM 客户端 ====================
+
+@dataclass
+class LLMCompletion:
+    """一次 LLM 调用的结果"""
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+
+
+class StubLLMClient:
+    """
+    本地确定性 LLM（测试/开发用，LLM_PROVIDER=stub）
+
+    不调用外部服务：资料块输出 "- 标题：首句"，要点列表原样合并去重，输出截断到 max_tokens。
+    相同输入总是得到相同输出。
+    """
+
+    model = "stub"
+
+    async def complete(self, system: str, prompt: str, max_tokens: int) -> LLMCompletion:
+        lines: List[str] = []
+        title = None
+        for line in prompt.splitlines():
+            line = line.strip()
+            if line.startswith("### "):
+                if title is not None:
+                    lines.append(f"- {title}")
+                title = line[4:].strip()
+            elif line.startswith("- "):
+                if line not in lines:
+                    lines.append(line)
+            elif title is not None and line and not line.startswith("来源:"):
+                sentence = _SENTENCE_END.split(line, maxsplit=1)[0][:80]
+                lines.append(f"- {title}：{sentence}")
+                title = None
+
+        if title is not None:
+            lines.append(f"- {title}")
+
+        text = truncate_to_tokens("\n".join(lines), max_tokens)
+        return LLMCompletion(
+            text=text,
+            prompt_tokens=count_tokens(system) + count_tokens(prompt),
+            completion_tokens=count_tokens(text)
+        )
+
+
+class OpenAILLMClient:
+    """OpenAI Chat Completions 客户端"""
+
+    def __init__(self, api_key: str, model: str):
+        self.model = model
+        self._client = AsyncOpenAI(api_key=api_key)
+
+    async def complete(self, system: str, prompt: str, max_tokens: int) -> LLMCompletion:
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0
+        )
+        text = response.choices[0].message.content or ""
+        usage = response.usage
+        return LLMCompletion(
+            text=text,
+            prompt_tokens=usage.prompt_tokens if usage else count_tokens(system) + count_tokens(prompt),
+            completion_tokens=usage.completion_tokens if usage else count_tokens(text)
+        )
+
+
+def create_llm_client(provider: Optional[str] = None):
+    """
+    按配置创建 LLM 客户端
+
+    Raises:
+        ValueError: 提供方不受支持或未配置
+    """
+    provider = provider or settings.LLM_PROVIDER
+    if provider == "stub":
+        return StubLLMClient()
+    if provider == "openai":
+        if not OPENAI_AVAILABLE:
+            raise ValueError("openai 未安装，无法使用 OpenAI 生成报告")
+        if not settings.OPENAI_API_KEY:
+            raise ValueError("未配置 OPENAI_API_KEY")
+        return OpenAILLMClient(settings.OPENAI_API_KEY, settings.OPENAI_MODEL)
+    raise ValueError(f"不支持的LLM提供方: {provider}")
+
+
+# ==================== map-reduce ====================
+
+# 进度回调：接收当前进度字典（抛出 GenerationCancelled 中止生成）
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class GenerationCancelled(Exception):
+    """生成被取消（由进度回调抛出）"""
+
+
+@dataclass
+class GenerationResult:
+    """生成结果"""
+    content: str
+    model: str
+    usage: Dict[str, Any] = field(default_factory=dict)
+
+
+class MapReduceGenerator:
+    """map-reduce 报告生成器"""
+
+    def __init__(
+        self,
+        client,
+        cache_repo=None,
+        progress_callback: Optional[ProgressCallback] = None,
+        chunk_tokens: Optional[int] = None,
+        summary_tokens: Optional[int] = None,
+        report_tokens: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ):
+        self.client = client
+        self.cache_repo = cache_repo
+        self.progress_callback = progress_callback
+        self.chunk_tokens = chunk_tokens or settings.REPORT_LLM_CHUNK_TOKENS
+        self.summary_tokens = summary_tokens or settings.REPORT_LLM_SUMMARY_MAX_TOKENS
+        self.report_tokens = report_tokens or settings.REPORT_LLM_REPORT_MAX_TOKENS
+        self.concurrency = concurrency or settings.REPORT_LLM_MAP_CONCURRENCY
+
+        # 合并阶段每组至少容纳两条摘要，保证每层调用数递减
+        if self.chunk_tokens < self.summary_tokens * 2:
+            raise ValueError("REPORT_LLM_CHUNK_TOKENS 必须不小于 REPORT_LLM_SUMMARY_MAX_TOKENS 的两倍")
+
+        self.progress: Dict[str, Any] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # 任一调用失败或被取消后置位：其余调用不再调用 LLM，也不再回调进度
+        self._aborted = False
+
+    def _cache_key(self, stage: str, mode: str, input_hashes: List[str]) -> str:
+        """调用缓存键（提示词版本 + 模型 + 阶段 + 输入内容哈希）"""
+        payload = json.dumps(
+            [PROMPT_VERSION, self.client.model, stage, mode, input_hashes],
+            separators=(",", ":")
+        )
+        return hash_text(payload)
+
+    def _ensure_active(self) -> None:
+        """生成已中止时抛出 GenerationCancelled"""
+        if self._aborted:
+            raise GenerationCancelled()
+
+    async def _report_progress(self, **changes: Any) -> None:
+        """更新进度并通知回调"""
+        self._ensure_active()
+        self.progress.update(changes)
+        if self.progress_callback is not None:
+            try:
+                await self.progress_callback(dict(self.progress))
+            except BaseException:
+                self._aborted = True
+                raise
+
+    async def _run_all(self, coroutines: Iterable[Awaitable[str]]) -> List[str]:
+        """并发执行一层调用；任一失败（包括进度回调抛出取消）时取消其余调用后再抛出"""
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            self._aborted = True
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _call(self, cache_key: str, prompt: str, max_tokens: int) -> str:
+        """执行一次调用（先查缓存，未命中时在并发限制内调用 LLM 并写入缓存）"""
+        if self.cache_repo is not None:
+            cached = await self.cache_repo.get(cache_key)
+            if cached is not None:
+                self.progress["cache_hits"] += 1
+                return cached["summary"]
+
+        self._ensure_active()
+        async with self._semaphore:
+            self._ensure_active()
+            try:
+                completion = await self.client.complete(SYSTEM_PROMPT, prompt, max_tokens)
+            except BaseException:
+                self._aborted = True
+                raise
+
+        self.progress["llm_calls"] += 1
+        self.progress["prompt_tokens"] += completion.prompt_tokens
+        self.progress["completion_tokens"] += completion.completion_tokens
+
+        if self.cache_repo is not None:
+            await self.cache_repo.put(cache_key, {
+                "summary": completion.text,
+                "model": self.client.model,
+                "prompt_tokens": completion.prompt_tokens,
+                "completion_tokens": completion.completion_tokens
+            })
+        return completion.text
+
+    async def _map_chunk(self, chunk: List[GenerationItem], mode: str) -> str:
+        """生成一个块的摘要"""
+        prompt = MAP_INSTRUCTION + "\n\n" + "\n\n".join(item.text for item in chunk)
+        summary = await self._call(
+            self._cache_key("map", mode, [item.content_hash for item in chunk]),
+            prompt,
+            self.summary_tokens
+        )
+        await self._report_progress(completed_chunks=self.progress["completed_chunks"] + 1)
+        return summary
+
+    async def _merge_level(self, summaries: List[str], mode: str) -> List[str]:
+        """按预算把摘要分组合并一层（只有一条摘要的组原样保留）"""
+        items = [
+            GenerationItem(text=summary, tokens=count_tokens(summary), content_hash=hash_text(summary))
+            for summary in summaries
+        ]
+        groups = pack_chunks(items, self.chunk_tokens)
+
+        async def merge(group: List[GenerationItem]) -> str:
+            if len(group) == 1:
+                return group[0].text
+            return await self._call(
+                self._cache_key("merge", mode, [item.content_hash for item in group]),
+                MERGE_INSTRUCTION + "\n\n" + "\n\n".join(item.text for item in group),
+                self.summary_tokens
+            )
+
+        return await self._run_all(merge(group) for group in groups)
+
+    async def generate(self, items: List[GenerationItem], mode: str = "comprehensive") -> GenerationResult:
+        """
+        生成报告
+
+        Args:
+            items: 数据项（按稳定顺序排列，顺序影响分块和缓存命中）
+            mode: 生成模式 (comprehensive/summary/analysis)
+        """
+        if mode not in MODE_INSTRUCTIONS:
+            raise ValueError(f"不支持的生成模式: {mode}")
+
+        started = time.monotonic()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._aborted = False
+        chunks = pack_chunks(items, self.chunk_tokens)
+        self.progress = {
+            "stage": "map",
+            "item_count": len(items),
+            "total_chunks": len(chunks),
+            "completed_chunks": 0,
+            "reduce_levels": 0,
+            "llm_calls": 0,
+            "cache_hits": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0
+        }
+        await self._report_progress()
+
+        summaries = await self._run_all(self._map_chunk(chunk, mode) for chunk in chunks)
+
+        await self._report_progress(stage="reduce")
+        while sum(count_tokens(summary) for summary in summaries) > self.chunk_tokens:
+            merged = await self._merge_level(summaries, mode)
+            await self._report_progress(reduce_levels=self.progress["reduce_levels"] + 1)
+            if len(merged) >= len(summaries):
+                # 摘要超出单条预算导致无法继续分组合并，截断后进入最终调用
+                logger.warning(f"⚠️ 块摘要无法继续合并，截断到 {self.chunk_tokens} tokens")
+                summaries = [truncate_to_tokens("\n\n".join(merged), self.chunk_tokens)]
+                break
+            summaries = merged
+
+        prompt = (
+            MODE_INSTRUCTIONS[mode] + "\n\n以下是按资料整理的要点：\n\n" + "\n\n".join(summaries)
+        )
+        content = await self._call(
+            self._cache_key("reduce", mode, [hash_text(summary) for summary in summaries]),
+            prompt,
+            self.report_tokens
+        )
+
+        await self._report_progress(
+            stage="completed",
+            generation_time=round(time.monotonic() - started, 3)
+        )
+        logger.info(
+            f"✅ 报告生成完成: {len(items)} 个数据项, {len(chunks)} 块, "
+            f"{self.progress['llm_calls']} 次调用, {self.progress['cache_hits']} 次缓存命中"
+        )
+        return GenerationResult(content=content, model=self.client.model, usage=dict(self.progress))
@@ -0,0 +1,407 @@
+"""报告后台作业管理
+
+报告生成/分析原先在请求内同步执行，同一报告可能被并发重复生成。改为后台作业：
+
+- 去重: 同一报告同一类型只有一个活跃作业（部分唯一索引保证，跨进程生效），
+  重复提交直接返回已有作业
+- 执行: 进程内固定数量的 worker 协程从队列取作业，先原子认领再执行
+- 取消: 排队中的作业直接取消；执行中的作业标记取消请求，在下一次进度回调时中止
+  （分析作业在线程分析前后各回调一次，分析过程中的取消在分析完成后生效，结果不保存）
+- 进度: 进度写入作业文档并推送给本进程的订阅者（SSE），其他进程执行的作业按间隔轮询
+- 恢复: 执行进程定期写心跳；进程退出后心跳过期的作业被重新认领执行。生成的块摘要已按
+  内容哈希缓存，重新执行时直接命中，相当于从检查点继续。正常关闭时释放作业，重启后立即接管
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from src.config import settings
+from src.core.domain.entities.summary_report import SummaryReportJob
+from src.services.report_generation_engine import GenerationCancelled
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_GENERATE = "generate"
+JOB_ANALYSIS = "analysis"
+
+# 参与去重的作业参数：同一报告不同分析类型的作业互不复用
+JOB_KEY_PARAMS = {JOB_ANALYSIS: "analysis_type"}
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# 心跳超过该倍数的间隔未刷新即视为执行进程已退出
+STALE_HEARTBEAT_FACTOR = 3
+
+# 作业执行函数：接收作业和进度回调，返回结果摘要（失败时抛出异常）
+JobRunner = Callable[[SummaryReportJob, Callable[[Dict[str, Any]], Awaitable[None]]], Awaitable[Dict[str, Any]]]
+
+
+async def run_generate_job(job: SummaryReportJob, on_progress) -> Dict[str, Any]:
+    """执行报告生成作业"""
+    from src.services.summary_report_service import summary_report_service
+
+    result = await summary_report_service.generate_report_with_llm(
+        job.report_id,
+        generation_mode=job.params.get("generation_mode", "comprehensive"),
+        llm_config=job.params.get("llm_config"),
+        progress_callback=on_progress
+    )
+    if not result.get("success"):
+        raise RuntimeError(result.get("error") or "报告生成失败")
+
+    # 报告正文已写入报告，作业只保留摘要信息
+    return {key: result.get(key) for key in ("model", "tokens_used", "generation_time", "usage")}
+
+
+async def run_analysis_job(job: SummaryReportJob, on_progress) -> Dict[str, Any]:
+    """执行报告分析作业"""
+    from src.services.summary_report_service import summary_report_service
+
+    result = await summary_report_service.analyze_report_data_with_ai(
+        job.report_id,
+        analysis_type=job.params.get("analysis_type", "trend"),
+        progress_callback=on_progress
+    )
+    if not result.get("success"):
+        raise RuntimeError(result.get("error") or "报告分析失败")
+    return result
+
+
+def job_event(name: str, job: SummaryReportJob) -> Dict[str, Any]:
+    """构建作业事件"""
+    return {
+        "event": name,
+        "job_id": job.job_id,
+        "report_id": job.report_id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error
+    }
+
+
+class ReportJobManager:
+    """报告后台作业管理器"""
+
+    def __init__(
+        self,
+        max_workers: int,
+        heartbeat_interval: float,
+        event_poll_interval: float = 2.0,
+        job_repo=None,
+        runners: Optional[Dict[str, JobRunner]] = None
+    ):
+        self.max_workers = max_workers
+        self.heartbeat_interval = heartbeat_interval
+        self.event_poll_interval = event_poll_interval
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._job_repo = job_repo
+        self.runners = runners or {JOB_GENERATE: run_generate_job, JOB_ANALYSIS: run_analysis_job}
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        # 本进程执行中的作业 -> 作业，及已请求取消的作业
+        self._running: Dict[str, SummaryReportJob] = {}
+        self._cancelled: Set[str] = set()
+        # 作业ID -> 订阅者事件队列
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+
+        self._metrics = {
+            "submitted": 0,
+            "attached": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "resumed": 0
+        }
+
+    async def _get_repo(self):
+        """获取作业仓储（默认使用 summary_report_jobs）"""
+        if self._job_repo is None:
+            from src.infrastructure.database.connection import get_mongodb_database
+            from src.infrastructure.database.summary_report_repositories import SummaryReportJobRepository
+
+            self._job_repo = SummaryReportJobRepository(await get_mongodb_database())
+        return self._job_repo
+
+    def _stale_before(self) -> datetime:
+        """心跳早于该时间的作业视为执行进程已退出"""
+        return datetime.utcnow() - timedelta(seconds=self.heartbeat_interval * STALE_HEARTBEAT_FACTOR)
+
+    # ==================== 生命周期 ====================
+
+    def _ensure_started(self) -> None:
+        """启动 worker 和心跳协程（绑定到运行中的事件循环）"""
+        if self._workers and not all(worker.done() for worker in self._workers):
+            return
+
+        self._closing = False
+        self._queue = asyncio.Queue()
+        self._queued = set()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def start(self) -> None:
+        """启动作业管理器并接管未完成的作业（应用启动时调用）"""
+        self._ensure_started()
+        resumed = await self.resume_stale()
+        logger.info(f"✅ 报告作业管理器已启动: {self.max_workers} 个 worker, 接管 {resumed} 个未完成作业")
+
+    async def shutdown(self) -> None:
+        """停止执行并释放本进程的作业（应用关闭时调用，重启后继续执行）"""
+        self._closing = True
+        tasks = list(self._workers)
+        if self._heartbeat_task is not None:
+            tasks.append(self._heartbeat_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat_task = None
+
+        running = list(self._running)
+        self._running.clear()
+        if running:
+            released = await (await self._get_repo()).release(running, self.owner_id)
+            logger.info(f"✅ 已释放 {released} 个执行中的报告作业，重启后继续执行")
+
+    # ==================== 提交与取消 ====================
+
+    async def submit(
+        self,
+        report_id: str,
+        job_type: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[SummaryReportJob, bool]:
+        """
+        提交作业（同一报告同一类型同一去重键已有活跃作业时返回该作业）
+
+        Returns:
+            (作业, 是否新建)
+        """
+        if job_type not in self.runners:
+            raise ValueError(f"不支持的作业类型: {job_type}")
+
+        params = params or {}
+        key_param = JOB_KEY_PARAMS.get(job_type)
+        job_key = str(params.get(key_param)) if key_param and params.get(key_param) is not None else None
+
+        repo = await self._get_repo()
+        existing = await repo.find_active(report_id, job_type, job_key)
+        if existing is None:
+            job = SummaryReportJob(report_id=report_id, job_type=job_type, params=params, job_key=job_key)
+            try:
+                await repo.create(job)
+            except DuplicateKeyError:
+                existing = await repo.find_active(report_id, job_type, job_key)
+                if existing is None:
+                    raise
+            else:
+                self._metrics["submitted"] += 1
+                self._ensure_started()
+                self._enqueue(job.job_id)
+                return job, True
+
+        self._metrics["attached"] += 1
+        logger.info(f"🔗 报告已有活跃作业，复用: {report_id} - {job_type} ({existing.job_id})")
+        return existing, False
+
+    def _enqueue(self, job_id: str) -> None:
+        """加入本进程队列（已在队列或执行中时跳过）"""
+        if job_id in self._queued or job_id in self._running:
+            return
+        self._queued.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[SummaryReportJob]:
+        """
+        取消作业
+
+        排队中的作业立即取消；执行中的作业在下一次进度回调时中止（可能在其他进程执行）
+
+        Returns:
+            取消后的作业，作业不存在时返回 None
+        """
+        repo = await self._get_repo()
+        if await repo.cancel_unclaimed(job_id):
+            self._metrics["cancelled"] += 1
+            job = await repo.find_by_id(job_id)
+            self._publish(job_id, job_event("cancelled", job))
+            logger.info(f"🛑 取消排队中的报告作业: {job_id}")
+            return job
+
+        if await repo.request_cancel(job_id):
+            self._cancelled.add(job_id)
+            logger.info(f"🛑 请求取消执行中的报告作业: {job_id}")
+        return await repo.find_by_id(job_id)
+
+    async def get_job(self, job_id: str) -> Optional[SummaryReportJob]:
+        """查询作业"""
+        return await (await self._get_repo()).find_by_id(job_id)
+
+    async def list_jobs(self, report_id: str, limit: int = 20) -> List[SummaryReportJob]:
+        """查询报告最近的作业"""
+        return await (await self._get_repo()).find_by_report(report_id, limit)
+
+    # ==================== 执行 ====================
+
+    async def _worker(self) -> None:
+        """worker 协程"""
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._execute(job_id)
+            except Exception as e:
+                logger.error(f"❌ 执行报告作业出错 ({job_id}): {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job_id: str) -> None:
+        """认领并执行作业"""
+        repo = await self._get_repo()
+        job = await repo.claim(job_id, self.owner_id, self._stale_before())
+        if job is None:
+            # 已被其他进程认领、已取消或已结束
+            return
+
+        if job.attempts > 1:
+            self._metrics["resumed"] += 1
+            logger.info(f"🔄 接管报告作业: {job.report_id} - {job.job_type} ({job_id}, 第 {job.attempts} 次执行)")
+
+        self._running[job_id] = job
+        self._publish(job_id, job_event("started", job))
+
+        async def on_progress(progress: Dict[str, Any]) -> None:
+            job.progress = progress
+            cancel_requested = await repo.update_progress(job_id, progress)
+            self._publish(job_id, job_event("progress", job))
+            if cancel_requested or job_id in self._cancelled:
+                raise GenerationCancelled()
+
+        status, result, error = "completed", None, None
+        try:
+            if job.cancel_requested:
+                raise GenerationCancelled()
+            result = await self.runners[job.job_type](job, on_progress)
+        except GenerationCancelled:
+            status = "cancelled"
+        except asyncio.CancelledError:
+            # 应用关闭：保留活跃状态，由 shutdown 释放后重启继续
+            if self._closing:
+                raise
+            status, error = "cancelled", "作业被中断"
+        except Exception as e:
+            status, error = "failed", str(e)
+            logger.error(f"❌ 报告作业失败 ({job_id}): {e}")
+        finally:
+            if not self._closing:
+                self._running.pop(job_id, None)
+                self._cancelled.discard(job_id)
+
+        await repo.finish(job_id, status, result=result, error=error)
+        self._metrics[status] += 1
+
+        job.status, job.result, job.error = status, result, error
+        self._publish(job_id, job_event(status, job))
+        logger.info(f"✅ 报告作业结束: {job.report_id} - {job.job_type} ({job_id}) -> {status}")
+
+    async def _heartbeat(self) -> None:
+        """定时刷新心跳并接管心跳过期的作业"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                repo = await self._get_repo()
+                await repo.heartbeat(list(self._running), self.owner_id)
+                await self.resume_stale()
+            except Exception as e:
+                logger.error(f"❌ 报告作业心跳失败: {e}")
+
+    async def resume_stale(self) -> int:
+        """把未被认领或执行进程已退出的活跃作业加入本进程队列"""
+        self._ensure_started()
+        repo = await self._get_repo()
+        job_ids = await repo.find_claimable(self._stale_before())
+        for job_id in job_ids:
+            self._enqueue(job_id)
+        return len(job_ids)
+
+    # ==================== 事件订阅 ====================
+
+    def _publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        """推送事件给本进程的订阅者"""
+        for queue in self._listeners.get(job_id, ()):
+            queue.put_nowait(event)
+
+    async def events(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        订阅作业事件（首个事件为当前状态，作业结束后停止）
+
+        本进程执行的作业实时推送；其他进程执行的作业按 event_poll_interval 轮询，
+        无变化时产生 ping 事件用于保持连接
+        """
+        repo = await self._get_repo()
+        job = await repo.find_by_id(job_id)
+        if job is None:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.setdefault(job_id, set()).add(queue)
+        try:
+            yield job_event("status", job)
+            if job.status in TERMINAL_STATUSES:
+                return
+
+            last_seen = (job.status, job.progress)
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=self.event_poll_interval)
+                except asyncio.TimeoutError:
+                    job = await repo.find_by_id(job_id)
+                    if job is None:
+                        return
+                    if (job.status, job.progress) == last_seen:
+                        yield {"event": "ping", "job_id": job_id}
+                        continue
+                    event = job_event(job.status if job.status in TERMINAL_STATUSES else "progress", job)
+
+                last_seen = (event["status"], event["progress"])
+                yield event
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            listeners = self._listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(queue)
+                if not listeners:
+                    del self._listeners[job_id]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取作业管理器指标"""
+        metrics = dict(self._metrics)
+        metrics["owner"] = self.owner_id
+        metrics["workers"] = len(self._workers)
+        metrics["queued"] = len(self._queued)
+        metrics["running"] = len(self._running)
+        metrics["subscribers"] = sum(len(listeners) for listeners in self._listeners.values())
+        return metrics
+
+
+# 全局实例
+report_job_manager = ReportJobManager(
+    max_workers=settings.REPORT_JOB_MAX_WORKERS,
+    heartbeat_interval=settings.REPORT_JOB_HEARTBEAT_INTERVAL,
+    event_poll_interval=settings.REPORT_JOB_EVENT_POLL_INTERVAL
+)
@@ -0,0 +1,297 @@
+"""报告跨任务全文搜索服务（倒排索引 + BM25）
+
+查询流程：
+1. 查询文本按 analyze_terms() 切分（中文二元组 / 完整词），去重
+2. 读取报告范围内（报告关联的定时/即时任务）查询词的倒排块和语料统计
+3. 按 BM25 计分（两种来源使用合并后的语料统计，得分可直接比较），
+   每种来源取前 limit 条
+4. 从结果集合（开启 UNIFIED_RESULTS_READ_ENABLED 时为 unified_results）回填文档与任务信息
+   （已删除/归档的结果自动过滤）
+
+索引在结果保存时增量维护（见 SearchResultRepository.persist_writes 与即时搜索服务），
+历史数据通过 rebuild_task() / rebuild_report_tasks() 回填。
+"""
+
+import asyncio
+import heapq
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.infrastructure.database.connection import get_mongodb_database
+from src.infrastructure.database.report_search_index_repository import (
+    SOURCE_INSTANT,
+    SOURCE_SCHEDULED,
+    IndexDocument,
+    ReportSearchIndexRepository
+)
+from src.infrastructure.database.unified_results_repository import UnifiedResultRepository
+from src.utils.field_codec import field_codec
+from src.utils.logger import get_logger
+from src.utils.text_tokenizer import analyze_terms
+
+logger = get_logger(__name__)
+
+# 回填结果时返回的字段
+RESULT_PROJECTION = {"task_id": 1, "title": 1, "url": 1, "markdown_content": 1, "created_at": 1}
+
+# 重建索引时每批读取的结果数
+REBUILD_BATCH_SIZE = 500
+
+
+def bm25_idf(doc_count: int, doc_freq: int) -> float:
+    """BM25 逆文档频率（加 1 平滑，保证非负）"""
+    return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def bm25_term_score(idf: float, tf: int, doc_length: int, avg_length: float) -> float:
+    """单个词在单个文档中的 BM25 得分"""
+    k1 = settings.REPORT_SEARCH_BM25_K1
+    b = settings.REPORT_SEARCH_BM25_B
+    norm = k1 * (1 - b + b * doc_length / avg_length) if avg_length else k1
+    return idf * tf * (k1 + 1) / (tf + norm)
+
+
+class ReportSearchService:
+    """报告跨任务全文搜索服务"""
+
+    def __init__(self):
+        self.index_repo = ReportSearchIndexRepository()
+        self.unified_repo = UnifiedResultRepository()
+
+    # ==================== 查询 ====================
+
+    async def search(
+        self,
+        scheduled_task_ids: List[str],
+        instant_task_ids: List[str],
+        search_query: str,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        在报告关联的任务范围内搜索结果
+
+        Returns:
+            (定时任务结果, 即时任务结果)，各自按 relevance_score 降序，最多 limit 条
+        """
+        terms = list(dict.fromkeys(analyze_terms(search_query)))
+        if not terms:
+            return [], []
+
+        scopes = {SOURCE_SCHEDULED: scheduled_task_ids, SOURCE_INSTANT: instant_task_ids}
+        postings_list, stats_list = await asyncio.gather(
+            asyncio.gather(*(
+                self.index_repo.get_postings(source, task_ids, terms) for source, task_ids in scopes.items()
+            )),
+            asyncio.gather(*(
+                self.index_repo.get_corpus_stats(source, task_ids) for source, task_ids in scopes.items()
+            ))
+        )
+
+        # 合并两种来源的语料统计
+        doc_count = sum(stats["doc_count"] for stats in stats_list)
+        total_length = sum(stats["total_length"] for stats in stats_list)
+        if not doc_count:
+            return [], []
+        avg_length = total_length / doc_count
+
+        doc_freqs: Dict[str, int] = defaultdict(int)
+        for postings in postings_list:
+            for block in postings:
+                doc_freqs[block["term"]] += len(block["doc_ids"])
+        idfs = {term: bm25_idf(doc_count, df) for term, df in doc_freqs.items()}
+
+        ranked = []
+        for postings in postings_list:
+            # 按 (任务, 文档) 累加得分；即时结果可能被报告中多个任务共享，取得分最高的任务
+            scores: Dict[Tuple[str, str], float] = defaultdict(float)
+            for block in postings:
+                idf = idfs[block["term"]]
+                for doc_id, tf, doc_length in zip(block["doc_ids"], block["tfs"], block["lens"]):
+                    scores[(block["task_id"], doc_id)] += bm25_term_score(idf, tf, doc_length, avg_length)
+
+            best: Dict[str, Tuple[str, float, str]] = {}
+            for (task_id, doc_id), score in scores.items():
+                if doc_id not in best or score > best[doc_id][1]:
+                    best[doc_id] = (doc_id, score, task_id)
+            # 多取一些，抵消已删除/归档的结果
+            ranked.append(heapq.nlargest(limit * 2, best.values(), key=lambda item: item[1]))
+
+        scheduled_results, instant_results = await asyncio.gather(
+            self._hydrate(SOURCE_SCHEDULED, ranked[0], limit),
+            self._hydrate(SOURCE_INSTANT, ranked[1], limit)
+        )
+        return scheduled_results, instant_results
+
+    async def _hydrate(
+        self,
+        source: str,
+        ranked: List[Tuple[str, float, str]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """按得分顺序回填结果文档和任务信息（ranked 为 (结果ID, 得分, 命中的任务ID)）"""
+        if not ranked:
+            return []
+
+        if settings.UNIFIED_RESULTS_READ_ENABLED:
+            results = await self._load_unified(source, ranked, limit)
+        else:
+            results = await self._load_source(source, ranked, limit)
+
+        db = await get_mongodb_database()
+        if source == SOURCE_SCHEDULED:
+            tasks_collection = db.search_tasks
+            task_projection = {"name": 1, "query": 1}
+        else:
+            tasks_collection = db.instant_search_tasks
+            task_projection = {"name": 1, "query": 1, "created_at": 1}
+
+        task_ids = list({doc["task_id"] for doc in results})
+        tasks = {}
+        if task_ids:
+            async for task in tasks_collection.find({"_id": {"$in": task_ids}}, task_projection):
+                task_id = task.pop("_id")
+                tasks[task_id] = dict(task, id=task_id)
+        for doc in results:
+            doc["task_info"] = tasks.get(doc["task_id"])
+
+        return results
+
+    async def _load_source(
+        self,
+        source: str,
+        ranked: List[Tuple[str, float, str]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """从源结果集合按 _id 读取结果文档"""
+        db = await get_mongodb_database()
+        results_collection = db.search_results if source == SOURCE_SCHEDULED else db.instant_search_results
+
+        docs = {
+            doc["_id"]: doc
+            async for doc in results_collection.find(
+                {"_id": {"$in": [doc_id for doc_id, _, _ in ranked]}}, RESULT_PROJECTION
+            )
+        }
+
+        results = []
+        for doc_id, score, task_id in ranked:
+            doc = docs.get(doc_id)
+            if doc is None:
+                continue
+            field_codec.decode_document(doc, ("markdown_content",))
+            doc["result_id"] = doc.pop("_id")
+            doc["task_id"] = task_id
+            doc["relevance_score"] = round(score, 4)
+            results.append(doc)
+            if len(results) >= limit:
+                break
+        return results
+
+    async def _load_unified(
+        self,
+        source: str,
+        ranked: List[Tuple[str, float, str]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """从统一结果读模型按行ID读取结果，正文按指针加载"""
+        row_ids = [f"{source}:{task_id}:{doc_id}" for doc_id, _, task_id in ranked]
+        rows = await self.unified_repo.get_rows(row_ids)
+        contents = await self.unified_repo.load_content(list(rows.values()), ("markdown_content",))
+
+        results = []
+        for row_id, (doc_id, score, task_id) in zip(row_ids, ranked):
+            row = rows.get(row_id)
+            if row is None or row_id not in contents:
+                continue
+            results.append({
+                "result_id": doc_id,
+                "task_id": task_id,
+                "title": row.get("title"),
+                "url": row.get("url"),
+                "markdown_content": contents[row_id]["markdown_content"],
+                "created_at": row.get("created_at"),
+                "relevance_score": round(score, 4)
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    # ==================== 索引维护 ====================
+
+    async def index_instant_results(self, task_id: str, result_ids: List[str]) -> int:
+        """按结果ID为即时任务建立索引（用于共享执行和重建）"""
+        if not result_ids:
+            return 0
+
+        db = await get_mongodb_database()
+        indexed = 0
+        for start in range(0, len(result_ids), REBUILD_BATCH_SIZE):
+            batch_ids = result_ids[start:start + REBUILD_BATCH_SIZE]
+            documents = []
+            async for doc in db.instant_search_results.find(
+                {"_id": {"$in": batch_ids}}, {"title": 1, "content": 1}
+            ):
+                field_codec.decode_document(doc, ("content",))
+                documents.append(IndexDocument(
+                    task_id=task_id, doc_id=doc["_id"], title=doc.get("title"), content=doc.get("content")
+                ))
+            indexed += await self.index_repo.index_documents(SOURCE_INSTANT, documents)
+        return indexed
+
+    async def rebuild_task(self, source: str, task_id: str) -> int:
+        """重建单个任务的索引，返回索引的文档数"""
+        await self.index_repo.delete_task(source, task_id)
+        db = await get_mongodb_database()
+
+        if source == SOURCE_INSTANT:
+            result_ids = await db.instant_search_result_mappings.distinct("result_id", {"task_id": task_id})
+            indexed = await self.index_instant_results(task_id, result_ids)
+        else:
+            indexed = 0
+            last_id: Optional[str] = None
+            while True:
+                query: Dict[str, Any] = {"task_id": task_id}
+                if last_id is not None:
+                    query["_id"] = {"$gt": last_id}
+                batch = await db.search_results.find(
+                    query, {"title": 1, "content": 1}
+                ).sort("_id", 1).limit(REBUILD_BATCH_SIZE).to_list(REBUILD_BATCH_SIZE)
+                if not batch:
+                    break
+
+                documents = []
+                for doc in batch:
+                    field_codec.decode_document(doc, ("content",))
+                    documents.append(IndexDocument(
+                        task_id=task_id, doc_id=doc["_id"], title=doc.get("title"), content=doc.get("content")
+                    ))
+                indexed += await self.index_repo.index_documents(SOURCE_SCHEDULED, documents)
+                last_id = batch[-1]["_id"]
+
+        logger.info(f"🔎 重建报告搜索索引: {source}:{task_id} ({indexed} 个文档)")
+        return indexed
+
+    async def rebuild_report_tasks(self) -> Dict[str, int]:
+        """重建所有报告关联任务的索引（历史数据回填）"""
+        db = await get_mongodb_database()
+        pairs = await db.summary_report_tasks.aggregate([
+            {"$group": {"_id": {"task_id": "$task_id", "task_type": "$task_type"}}}
+        ]).to_list(length=None)
+
+        tasks = 0
+        documents = 0
+        for pair in pairs:
+            source = SOURCE_INSTANT if pair["_id"].get("task_type") == SOURCE_INSTANT else SOURCE_SCHEDULED
+            try:
+                documents += await self.rebuild_task(source, pair["_id"]["task_id"])
+                tasks += 1
+            except Exception as e:
+                logger.error(f"❌ 重建报告搜索索引失败 {source}:{pair['_id']['task_id']}: {e}")
+
+        return {"tasks": tasks, "documents": documents}
+
+
+# 全局实例
+report_search_service = ReportSearchService()
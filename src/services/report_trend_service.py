@@ -0,0 +1,227 @@
+"""报告任务结果趋势服务（按天趋势桶汇总）
+
+任务结果在入库时增量累加到 task_trend_buckets（每个任务每天一份，见 TaskTrendBucketRepository），
+报告趋势只需一次聚合汇总报告关联任务在日期范围内的日桶：
+
+- timeline: 每天的结果数、新结果数、重复/共享结果数，按 day / week / month 重新分组并补齐空缺
+- top_domains / keywords: 范围内的域名和关键词分布
+- emerging_keywords: 日期范围按时间分为较早 2/3 与最近 1/3，比较关键词的结果占比，得到新兴关键词
+
+查询代价只与天数和任务数相关，一年范围同样在单次索引聚合内完成，不扫描结果集合。
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.infrastructure.database.repositories import TaskTrendBucketRepository
+from src.services.report_analysis_engine import RECENT_FRACTION, rank_emerging
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 支持的时间粒度
+GRANULARITIES = ("day", "week", "month")
+
+# 返回的域名数
+TOP_DOMAINS = 20
+
+# 参与新兴关键词计算的候选关键词数（按总次数）
+KEYWORD_CANDIDATES = 200
+
+# 时间线中累加的计数字段
+TIMELINE_COUNTERS = ("result_count", "new_count", "shared_count")
+
+
+def _day_start(day: date) -> datetime:
+    """日期对应的日桶时间（UTC 零点）"""
+    return datetime(day.year, day.month, day.day)
+
+
+def period_start(day: date, granularity: str) -> date:
+    """日期所在周期的第一天（周从周一开始）"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(start: date, granularity: str) -> date:
+    """下一个周期的第一天"""
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def regroup_timeline(
+    rows: List[Dict[str, Any]],
+    start_day: date,
+    end_day: date,
+    granularity: str = "day"
+) -> List[Dict[str, Any]]:
+    """
+    按粒度重新分组日桶汇总，并补齐没有结果的周期
+
+    Args:
+        rows: 按天汇总的计数（day 为 datetime 或 date）
+
+    Returns:
+        [{"date": 周期第一天 YYYY-MM-DD, "result_count", "new_count", "shared_count"}]
+    """
+    periods: Dict[date, Dict[str, int]] = {}
+    current = period_start(start_day, granularity)
+    while current <= end_day:
+        periods[current] = {counter: 0 for counter in TIMELINE_COUNTERS}
+        current = _next_period(current, granularity)
+
+    for row in rows:
+        day = row["day"].date() if isinstance(row["day"], datetime) else row["day"]
+        totals = periods.get(period_start(day, granularity))
+        if totals is None:
+            continue
+        for counter in TIMELINE_COUNTERS:
+            totals[counter] += row.get(counter, 0)
+
+    return [{"date": start.isoformat(), **totals} for start, totals in periods.items()]
+
+
+def emerging_keywords(
+    keywords: List[Dict[str, Any]],
+    recent_total: int,
+    earlier_total: int,
+    top_k: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    新兴关键词：最近部分中含该词的结果占比相对较早部分的提升倍数（见 rank_emerging）
+
+    Args:
+        keywords: [{"keyword", "count", "recent_count"}]
+        recent_total / earlier_total: 最近/较早部分计入关键词分布的结果数
+    """
+    frequencies = {
+        keyword["keyword"]: (keyword["recent_count"], keyword["count"] - keyword["recent_count"])
+        for keyword in keywords
+    }
+    return [
+        {
+            "keyword": term,
+            "lift": round(lift, 4),
+            "recent_count": frequencies[term][0],
+            "earlier_count": frequencies[term][1]
+        }
+        for term, lift in rank_emerging(frequencies, recent_total, earlier_total, top_k)
+    ]
+
+
+def resolve_range(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    today: Optional[date] = None
+) -> Tuple[date, date]:
+    """
+    解析趋势日期范围（默认最近 REPORT_TREND_DEFAULT_DAYS 天）
+
+    Raises:
+        ValueError: 起始日期晚于结束日期，或范围超过 REPORT_TREND_MAX_DAYS 天
+    """
+    end_day = end_date or today or datetime.utcnow().date()
+    start_day = start_date or end_day - timedelta(days=settings.REPORT_TREND_DEFAULT_DAYS - 1)
+    if start_day > end_day:
+        raise ValueError("起始日期不能晚于结束日期")
+    if (end_day - start_day).days + 1 > settings.REPORT_TREND_MAX_DAYS:
+        raise ValueError(f"日期范围不能超过 {settings.REPORT_TREND_MAX_DAYS} 天")
+    return start_day, end_day
+
+
+class ReportTrendService:
+    """报告任务结果趋势服务"""
+
+    def __init__(self):
+        self.bucket_repo = TaskTrendBucketRepository()
+
+    async def get_trend(
+        self,
+        scopes: Dict[str, List[str]],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        granularity: str = "day",
+        top_k: int = 20
+    ) -> Dict[str, Any]:
+        """
+        汇总任务范围内的结果趋势
+
+        Args:
+            scopes: 来源 -> 任务ID列表
+            start_date / end_date: 日期范围（含两端，UTC）
+            granularity: 时间线粒度 day / week / month
+            top_k: 返回的关键词数
+
+        Raises:
+            ValueError: 粒度不支持或日期范围无效
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"不支持的时间粒度: {granularity}")
+        start_day, end_day = resolve_range(start_date, end_date)
+        start_time = time.time()
+
+        days = (end_day - start_day).days + 1
+        recent_days = max(int(days * RECENT_FRACTION), 1)
+        recent_day = end_day - timedelta(days=recent_days - 1)
+
+        rollup = await self.bucket_repo.rollup(
+            scopes,
+            _day_start(start_day),
+            _day_start(end_day),
+            _day_start(recent_day),
+            top_domains=TOP_DOMAINS,
+            keyword_candidates=max(KEYWORD_CANDIDATES, top_k)
+        )
+
+        profiled_total = sum(row["profiled_count"] for row in rollup["timeline"])
+        recent_total = rollup["recent_profiled_count"]
+        keywords = [
+            {"keyword": keyword["keyword"], "count": keyword["count"]}
+            for keyword in rollup["keywords"][:top_k]
+        ]
+        emerging = emerging_keywords(
+            rollup["keywords"],
+            recent_total,
+            profiled_total - recent_total,
+            top_k=max(top_k // 2, 1)
+        ) if days > 1 else []
+
+        totals = {
+            counter: sum(row[counter] for row in rollup["timeline"])
+            for counter in TIMELINE_COUNTERS
+        }
+        insights = []
+        if keywords:
+            insights.append("主要关键词: " + "、".join(keyword["keyword"] for keyword in keywords[:5]))
+        if emerging:
+            insights.append("近期上升的关键词: " + "、".join(keyword["keyword"] for keyword in emerging[:5]))
+        if rollup["domains"]:
+            insights.append("主要来源: " + "、".join(domain["domain"] for domain in rollup["domains"][:3]))
+
+        query_time = round((time.time() - start_time) * 1000, 2)
+        logger.info(f"📈 报告趋势汇总: {days} 天, {len(rollup['timeline'])} 个有数据的日期, 耗时 {query_time}ms")
+
+        return {
+            "start_date": start_day.isoformat(),
+            "end_date": end_day.isoformat(),
+            "granularity": granularity,
+            "totals": totals,
+            "timeline": regroup_timeline(rollup["timeline"], start_day, end_day, granularity),
+            "top_domains": rollup["domains"],
+            "keywords": keywords,
+            "emerging_keywords": emerging,
+            "insights": insights,
+            "query_time": query_time
+        }
+
+
+# 全局实例
+report_trend_service = ReportTrendService()
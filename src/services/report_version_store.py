@@ -0,0 +1,177 @@
+"""报告版本存储（周期快照 + 文本增量）
+
+每次手动编辑都保存完整内容快照，长报告编辑数百次后版本集合会快速膨胀。版本改为两种存储方式：
+
+- 快照（storage=snapshot）：content_snapshot 保存完整内容
+- 增量（storage=delta）：content_snapshot 只保存格式等元信息，正文以相对 base_version 的
+  行级增量（见 src.utils.text_delta）保存
+
+距最近快照已有 REPORT_VERSION_SNAPSHOT_INTERVAL 层增量，或增量不小于全文一半时改存快照，
+限制还原时需要回放的增量数量。读取任意版本时从最近的快照起回放增量；最近物化的版本
+保存在进程内 LRU 中，同时作为下一次编辑计算增量的基准。
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.config import settings
+from src.core.domain.entities.summary_report import SummaryReportVersion
+from src.infrastructure.database.summary_report_repositories import SummaryReportVersionRepository
+from src.utils.logger import get_logger
+from src.utils.text_delta import apply_delta, delta_size, make_delta
+
+logger = get_logger(__name__)
+
+
+def encode_version_content(
+    version: SummaryReportVersion,
+    base_text: Optional[str],
+    base_chain_length: int
+) -> SummaryReportVersion:
+    """
+    选择版本的存储方式并填充存储字段
+
+    Args:
+        version: content_snapshot 为完整内容的版本
+        base_text: 上一个版本的完整正文（没有上一个版本时为 None）
+        base_chain_length: 上一个版本距最近快照的增量层数
+    """
+    content = version.content_snapshot
+    text = content.get("text") or ""
+    full_size = len(text.encode("utf-8"))
+    version.full_size = full_size
+
+    if base_text is not None and base_chain_length + 1 < settings.REPORT_VERSION_SNAPSHOT_INTERVAL:
+        delta = make_delta(base_text, text)
+        size = delta_size(delta)
+        if size * 2 < full_size:
+            version.storage = "delta"
+            version.delta = delta
+            version.chain_length = base_chain_length + 1
+            version.stored_size = size
+            version.content_snapshot = {key: value for key, value in content.items() if key != "text"}
+            return version
+
+    version.storage = "snapshot"
+    version.delta = None
+    version.base_version = None
+    version.chain_length = 0
+    version.stored_size = full_size
+    return version
+
+
+class ReportVersionStore:
+    """报告版本存储"""
+
+    def __init__(self, version_repo: SummaryReportVersionRepository, cache_size: int):
+        self.version_repo = version_repo
+        self.cache_size = cache_size
+        # (报告ID, 版本号) -> 完整内容
+        self._cache: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+
+    def _cache_get(self, report_id: str, version_number: int) -> Optional[Dict[str, Any]]:
+        """读取已物化的版本内容"""
+        key = (report_id, version_number)
+        content = self._cache.get(key)
+        if content is None:
+            return None
+        self._cache.move_to_end(key)
+        return dict(content)
+
+    def _cache_put(self, report_id: str, version_number: int, content: Dict[str, Any]) -> None:
+        """缓存物化的版本内容（超出容量时淘汰最久未使用的版本）"""
+        key = (report_id, version_number)
+        self._cache[key] = dict(content)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def create_version(self, version: SummaryReportVersion) -> SummaryReportVersion:
+        """保存版本（content_snapshot 传入完整内容，按需转为相对上一个版本的增量）"""
+        content = dict(version.content_snapshot)
+
+        latest = await self.version_repo.get_latest_version(version.report_id)
+        base_text = None
+        base_chain_length = 0
+        if latest is not None:
+            base_content = await self.materialize(version.report_id, latest.version_number)
+            if base_content is not None:
+                base_text = base_content.get("text") or ""
+                base_chain_length = latest.chain_length
+                version.base_version = latest.version_number
+
+        encode_version_content(version, base_text, base_chain_length)
+        await self.version_repo.create(version)
+        self._cache_put(version.report_id, version.version_number, content)
+
+        logger.debug(
+            f"保存报告版本: {version.report_id} v{version.version_number} "
+            f"({version.storage}, {version.stored_size}/{version.full_size} 字节)"
+        )
+        return version
+
+    async def materialize(self, report_id: str, version_number: int) -> Optional[Dict[str, Any]]:
+        """
+        还原版本的完整内容（从最近的快照回放增量）
+
+        Returns:
+            完整的 content 字典，版本不存在时返回 None
+        """
+        cached = self._cache_get(report_id, version_number)
+        if cached is not None:
+            return cached
+
+        versions = {
+            version.version_number: version
+            for version in await self.version_repo.find_replay_chain(report_id, version_number)
+        }
+
+        # 沿 base_version 回溯到快照或已缓存的版本
+        chain = []
+        current = version_number
+        while True:
+            content = self._cache_get(report_id, current)
+            if content is not None:
+                break
+            version = versions.get(current)
+            if version is None:
+                version = await self.version_repo.find_by_version_number(report_id, current)
+            if version is None:
+                if chain:
+                    logger.error(f"❌ 报告版本增量链断裂: {report_id} v{version_number} 缺少基准 v{current}")
+                return None
+            if version.storage != "delta":
+                content = dict(version.content_snapshot)
+                self._cache_put(report_id, current, content)
+                break
+            chain.append(version)
+            current = version.base_version
+
+        for version in reversed(chain):
+            content = dict(version.content_snapshot, text=apply_delta(content.get("text") or "", version.delta))
+            self._cache_put(report_id, version.version_number, content)
+
+        return content
+
+    async def get_version(self, report_id: str, version_number: int) -> Optional[SummaryReportVersion]:
+        """读取版本（content_snapshot 为还原后的完整内容）"""
+        version = await self.version_repo.find_by_version_number(report_id, version_number)
+        if version is None:
+            return None
+
+        content = await self.materialize(report_id, version_number)
+        if content is None:
+            return None
+        version.content_snapshot = content
+        version.delta = None
+        return version
+
+    async def get_storage_stats(self, report_id: str) -> Dict[str, Any]:
+        """报告版本存储占用（实际存储字节数 / 全部保存完整快照时的字节数）"""
+        stats = await self.version_repo.get_storage_stats(report_id)
+        stats["report_id"] = report_id
+        stats["version_count"] = stats["snapshot_count"] + stats["delta_count"]
+        stats["compression_ratio"] = (
+            round(stats["stored_bytes"] / stats["full_bytes"], 4) if stats["full_bytes"] else None
+        )
+        return stats
@@ -0,0 +1,309 @@
+"""搜索结果分层保留与归档服务
+
+每小时的定时任务都会写入整批结果，search_results 若不清理会无限增长。本服务按任务的
+保留策略把超过热数据保留期的结果移出热集合：
+
+1. 按 (created_at, _id) 升序分批扫描过期结果（复合键游标，不使用 SKIP）
+2. 按月份分组写入冷存储（月度归档集合或本地 JSONL.gz 文件），登记归档分段索引
+3. 从热集合删除已归档结果，保存检查点，批次之间休眠以限制对线上负载的影响
+4. 任务处理完成后重建该任务的结果统计
+
+回迁时按分段索引读取冷存储，恢复原状态写回热集合，并在 retain_until 之前不再归档。
+内容块引用（html_ref）随归档文档保留，内容块不会被释放。
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from src.config import settings
+from src.core.domain.entities.result_retention import (
+    ArchiveTarget, ResultRetentionPolicy, archive_month
+)
+from src.core.domain.entities.search_result import ResultStatus
+from src.infrastructure.database.connection import get_mongodb_database
+from src.infrastructure.database.repositories import SearchResultStatsRepository
+from src.infrastructure.database.report_search_index_repository import SOURCE_SCHEDULED
+from src.infrastructure.database.result_archive_repositories import (
+    ResultArchiveIndexRepository,
+    ResultArchiveStore,
+    ResultRetentionCheckpointRepository,
+    ResultRetentionPolicyRepository
+)
+from src.infrastructure.database.unified_results_repository import UnifiedResultRepository, scheduled_row
+from src.infrastructure.id_generator import generate_string_id
+from src.utils.cursor_pagination import KeysetCursorInfo, cursor_paginator
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 归档时附加、回迁时移除的字段
+ARCHIVE_FIELDS = ("archived_at", "archived_status")
+
+
+class ResultRetentionService:
+    """搜索结果保留与归档服务"""
+
+    def __init__(self):
+        self.collection_name = "search_results"
+        self.policy_repo = ResultRetentionPolicyRepository()
+        self.index_repo = ResultArchiveIndexRepository()
+        self.checkpoint_repo = ResultRetentionCheckpointRepository()
+        self.archive_store = ResultArchiveStore()
+        self.stats_repo = SearchResultStatsRepository()
+        self.unified_repo = UnifiedResultRepository()
+        # 同一进程内避免定时作业与手动触发并发执行
+        self._run_lock = asyncio.Lock()
+
+    async def _get_collection(self):
+        """获取热集合"""
+        db = await get_mongodb_database()
+        return db[self.collection_name]
+
+    # ==================== 策略管理 ====================
+
+    async def get_policy(self, task_id: str) -> ResultRetentionPolicy:
+        """获取任务的生效策略（未配置时返回默认策略）"""
+        policy = await self.policy_repo.get(task_id)
+        return policy or self.policy_repo.default_policy(task_id)
+
+    async def set_policy(
+        self,
+        task_id: str,
+        hot_days: int,
+        archive_target: ArchiveTarget,
+        enabled: bool = True
+    ) -> ResultRetentionPolicy:
+        """配置任务的保留策略"""
+        if hot_days < 1:
+            raise ValueError("热数据保留天数必须大于0")
+
+        policy = await self.policy_repo.get(task_id) or ResultRetentionPolicy(task_id=task_id)
+        policy.hot_days = hot_days
+        policy.archive_target = archive_target
+        policy.enabled = enabled
+        return await self.policy_repo.save(policy)
+
+    # ==================== 归档 ====================
+
+    async def run(self, task_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        执行一轮归档
+
+        Args:
+            task_ids: 只处理指定任务（默认处理热集合中的所有任务）
+
+        Returns:
+            dict: 处理的任务数、归档数量和耗时
+        """
+        if self._run_lock.locked():
+            logger.warning("⚠️ 结果归档作业正在运行，跳过本次触发")
+            return {"skipped": True, "tasks": 0, "archived_count": 0}
+
+        async with self._run_lock:
+            start = datetime.utcnow()
+            collection = await self._get_collection()
+
+            if task_ids is None:
+                task_ids = await collection.distinct("task_id")
+            policies = await self.policy_repo.get_all()
+
+            archived_total = 0
+            processed_tasks = 0
+            for task_id in task_ids:
+                policy = policies.get(task_id) or self.policy_repo.default_policy(task_id)
+                if not policy.enabled:
+                    continue
+
+                try:
+                    archived_total += await self.archive_task(policy)
+                    processed_tasks += 1
+                except Exception as e:
+                    # 单个任务失败不影响其他任务，下一轮从检查点续跑
+                    logger.error(f"❌ 任务结果归档失败 {task_id}: {e}")
+
+            elapsed = (datetime.utcnow() - start).total_seconds()
+            logger.info(
+                f"📦 结果归档完成: {processed_tasks} 个任务, 归档 {archived_total} 条, 耗时 {elapsed:.1f}s"
+            )
+            return {
+                "skipped": False,
+                "tasks": processed_tasks,
+                "archived_count": archived_total,
+                "elapsed_seconds": round(elapsed, 1)
+            }
+
+    async def archive_task(self, policy: ResultRetentionPolicy) -> int:
+        """按策略归档单个任务的过期结果，返回归档数量"""
+        collection = await self._get_collection()
+        now = datetime.utcnow()
+        cutoff = now - timedelta(days=policy.hot_days)
+        batch_size = settings.RESULT_RETENTION_BATCH_SIZE
+
+        base_filter = {
+            "task_id": policy.task_id,
+            "created_at": {"$lt": cutoff},
+            # 仍在被新的执行发现的结果保留在热集合（无 last_seen_at 的历史数据按 created_at 判断）
+            "last_seen_at": {"$not": {"$gte": cutoff}},
+            # 回迁的结果在保留期内不再归档
+            "$or": [{"retain_until": None}, {"retain_until": {"$lte": now}}]
+        }
+
+        # 上一轮中断时从检查点续跑
+        position = None
+        checkpoint = await self.checkpoint_repo.get(policy.task_id)
+        if checkpoint and checkpoint.get("status") == "running" and checkpoint.get("last_id"):
+            position = KeysetCursorInfo(
+                field="created_at",
+                value=checkpoint["last_created_at"],
+                last_id=checkpoint["last_id"],
+                direction=1
+            )
+            logger.info(f"🔁 从检查点续跑归档: {policy.task_id} (last_id={checkpoint['last_id']})")
+
+        archived = 0
+        while True:
+            query = base_filter
+            if position is not None:
+                query = {"$and": [base_filter, cursor_paginator.build_keyset_filter(position)]}
+
+            batch = await collection.find(query).sort(
+                [("created_at", 1), ("_id", 1)]
+            ).limit(batch_size).to_list(batch_size)
+            if not batch:
+                break
+
+            await self._archive_batch(policy, batch, now)
+
+            last = batch[-1]
+            await self.checkpoint_repo.save_progress(
+                policy.task_id, cutoff, last["created_at"], last["_id"], len(batch)
+            )
+            position = KeysetCursorInfo(
+                field="created_at", value=last["created_at"], last_id=last["_id"], direction=1
+            )
+            archived += len(batch)
+
+            if len(batch) < batch_size:
+                break
+            await asyncio.sleep(settings.RESULT_RETENTION_BATCH_PAUSE)
+
+        await self.checkpoint_repo.complete(policy.task_id)
+
+        if archived:
+            await self.stats_repo.rebuild_task_stats(policy.task_id)
+            logger.info(f"📦 任务 {policy.task_id} 归档 {archived} 条结果（早于 {cutoff:%Y-%m-%d}）")
+
+        return archived
+
+    async def _archive_batch(
+        self,
+        policy: ResultRetentionPolicy,
+        batch: List[Dict[str, Any]],
+        now: datetime
+    ) -> None:
+        """归档一个批次：写冷存储 -> 登记分段 -> 删除热数据"""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in batch:
+            # 回迁过的结果已存在于原分段中，只需从热集合删除
+            if doc.get("archive_segment_id"):
+                continue
+            groups.setdefault(archive_month(doc["created_at"]), []).append(doc)
+
+        for month, docs in groups.items():
+            segment_id = generate_string_id()
+            for doc in docs:
+                doc["archived_status"] = doc.get("status")
+                doc["status"] = ResultStatus.ARCHIVED.value
+                doc["archived_at"] = now
+                doc["archive_segment_id"] = segment_id
+                doc.pop("retain_until", None)
+
+            written = await self.archive_store.write_segment(
+                policy.archive_target, policy.task_id, month, segment_id, docs
+            )
+            await self.index_repo.add_segment({
+                "_id": segment_id,
+                "task_id": policy.task_id,
+                "month": month,
+                "target": policy.archive_target.value,
+                "location": written["location"],
+                "stored_bytes": written["stored_bytes"],
+                "result_count": len(docs),
+                "min_created_at": docs[0]["created_at"],
+                "max_created_at": docs[-1]["created_at"],
+                "archived_at": now,
+                "rehydrated_at": None
+            })
+
+        collection = await self._get_collection()
+        await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        await self.unified_repo.delete_results(SOURCE_SCHEDULED, policy.task_id, [doc["_id"] for doc in batch])
+
+    # ==================== 回迁 ====================
+
+    async def rehydrate(self, task_id: str, month: Optional[str] = None) -> int:
+        """
+        将归档结果回迁到热集合
+
+        回迁的结果在 RESULT_REHYDRATE_RETAIN_DAYS 天内不会被再次归档；
+        保留 archive_segment_id，再次过期时直接删除，不重复写冷存储
+
+        Args:
+            task_id: 任务ID
+            month: 只回迁指定月份（YYYYMM，默认全部）
+
+        Returns:
+            int: 回迁的结果数量
+        """
+        segments = await self.index_repo.find_segments(task_id, month)
+        if not segments:
+            return 0
+
+        collection = await self._get_collection()
+        retain_until = datetime.utcnow() + timedelta(days=settings.RESULT_REHYDRATE_RETAIN_DAYS)
+
+        restored = 0
+        for segment in segments:
+            docs = await self.archive_store.read_segment(segment)
+            operations = []
+            for doc in docs:
+                doc["status"] = doc.get("archived_status") or ResultStatus.PROCESSED.value
+                for field_name in ARCHIVE_FIELDS:
+                    doc.pop(field_name, None)
+                doc["retain_until"] = retain_until
+                operations.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+
+            if operations:
+                skipped = set()
+                try:
+                    result = await collection.bulk_write(operations, ordered=False)
+                    restored += result.upserted_count + result.modified_count
+                except BulkWriteError as e:
+                    # 相同内容归档后又被新的执行发现（去重键冲突）：热集合中已有该结果，跳过
+                    write_errors = e.details.get("writeErrors", [])
+                    if any(error.get("code") != 11000 for error in write_errors):
+                        raise
+                    restored += e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+                    skipped = {error["index"] for error in write_errors}
+
+                await self.unified_repo.upsert_rows(
+                    scheduled_row(doc) for i, doc in enumerate(docs) if i not in skipped
+                )
+
+        await self.index_repo.mark_rehydrated([segment["_id"] for segment in segments])
+        await self.stats_repo.rebuild_task_stats(task_id)
+
+        logger.info(f"♻️ 回迁归档结果: {task_id} ({month or '全部月份'}) {restored} 条")
+        return restored
+
+    async def list_archives(self, task_id: str) -> List[Dict[str, Any]]:
+        """列出任务的归档分段"""
+        return await self.index_repo.find_segments(task_id)
+
+
+# 全局实例
+result_retention_service = ResultRetentionService()
@@ -1,9 +1,13 @@
 """智能总结报告业务逻辑服务"""
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime
 import asyncio
+import heapq
+import itertools
 import time
 
+from pymongo.errors import DuplicateKeyError
+
 from src.core.domain.entities.summary_report import (
     SummaryReport,
     SummaryReportTask,
@@ -14,13 +18,62 @@ from src.infrastructure.database.summary_report_repositories import (
     SummaryReportRepository,
     SummaryReportTaskRepository,
     SummaryReportDataItemRepository,
-    SummaryReportVersionRepository
+    SummaryReportVersionRepository,
+    SummaryReportLLMCacheRepository
 )
+from src.config import settings
 from src.infrastructure.database.connection import get_mongodb_database
+from src.infrastructure.database.report_search_index_repository import SOURCE_INSTANT, SOURCE_SCHEDULED
+from src.infrastructure.database.unified_results_repository import UnifiedResultRepository
+from src.infrastructure.database.view_count_buffer import view_count_buffer
+from src.services.report_analysis_engine import (
+    ANALYSIS_TYPES,
+    analyze_items,
+    build_term_matrix,
+    document_terms,
+    tfidf_keywords
+)
+from src.services.report_generation_engine import (
+    GenerationCancelled,
+    GenerationItem,
+    MapReduceGenerator,
+    ProgressCallback,
+    create_llm_client
+)
+from src.services.report_search_service import report_search_service
+from src.services.report_trend_service import report_trend_service
+from src.services.report_version_store import ReportVersionStore
+from src.utils.cursor_pagination import KeysetCursorInfo, cursor_paginator
+from src.utils.field_codec import field_codec
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 报告结果列表返回的字段
+REPORT_RESULT_PROJECTION = {
+    "task_id": 1,
+    "title": 1,
+    "url": 1,
+    "markdown_content": 1,
+    "created_at": 1,
+    "metadata": 1
+}
+
+# 统一结果读模型分页时合并游标中的位置键
+UNIFIED_CURSOR_KEY = "unified"
+
+# 批量添加数据项：数据项来源类型 -> (结果集合, 任务类型)
+BULK_RESULT_SOURCES = {
+    "search_result": ("search_results", "scheduled"),
+    "instant_search_result": ("instant_search_results", "instant")
+}
+
+# 批量添加数据项时读取的结果字段
+BULK_RESULT_PROJECTION = {"task_id": 1, "title": 1, "content": 1, "url": 1}
+
+# 批量添加数据项时每批读取/写入的结果数
+BULK_ADD_BATCH_SIZE = 500
+
 # Redis缓存是可选的
 try:
     from src.infrastructure.cache import redis_client, cache_key_gen
@@ -34,25 +87,33 @@ except ImportError:
 
 class LLMService:
     """
-    LLM服务（预留接口）
+    LLM服务
 
-    待LLM模块开发完成后实现
-    用于调用大语言模型生成报告总结
+    报告总结使用 map-reduce 生成（见 src.services.report_generation_engine）：
+    数据项按 token 预算分块并发生成块摘要，再逐层合并为最终报告
     """
 
+    def __init__(self, client=None):
+        # 未指定时按 LLM_PROVIDER 在首次生成时创建
+        self.client = client
+
     async def generate_summary(
         self,
         report_id: str,
         content_items: List[Dict[str, Any]],
-        generation_mode: str = "comprehensive"
+        generation_mode: str = "comprehensive",
+        cache_repo: Optional[SummaryReportLLMCacheRepository] = None,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
-        生成报告总结（预留接口）
+        生成报告总结
 
         Args:
             report_id: 报告ID
-            content_items: 内容项列表
+            content_items: 内容项列表（按稳定顺序排列）
             generation_mode: 生成模式 (comprehensive/summary/analysis)
+            cache_repo: 调用结果缓存（为空时不缓存）
+            progress_callback: 进度回调
 
         Returns:
             生成结果字典:
@@ -61,18 +122,49 @@ class LLMService:
                 "content": str,  # 生成的内容
                 "model": str,    # 使用的模型
                 "tokens_used": int,
-                "generation_time": float
+                "generation_time": float,
+                "usage": dict    # 分块数、调用次数、缓存命中、token 用量
             }
         """
-        # TODO: 实现LLM调用逻辑
-        logger.warning("⚠️  LLM服务未实现，返回占位内容")
+        started = time.monotonic()
+        try:
+            if self.client is None:
+                self.client = create_llm_client()
+
+            items = [
+                GenerationItem.from_content(
+                    item.get("title"),
+                    item.get("content"),
+                    item.get("url"),
+                    settings.REPORT_LLM_ITEM_MAX_TOKENS
+                )
+                for item in content_items
+            ]
+            generator = MapReduceGenerator(
+                self.client,
+                cache_repo=cache_repo,
+                progress_callback=progress_callback
+            )
+            result = await generator.generate(items, generation_mode)
+
+        except ValueError as e:
+            logger.error(f"❌ 报告生成失败 ({report_id}): {e}")
+            return {
+                "success": False,
+                "content": "",
+                "model": getattr(self.client, "model", None),
+                "tokens_used": 0,
+                "generation_time": round(time.monotonic() - started, 3),
+                "error": str(e)
+            }
+
         return {
-            "success": False,
-            "content": "",
-            "model": "pending",
-            "tokens_used": 0,
-            "generation_time": 0.0,
-            "error": "LLM module not yet implemented"
+            "success": True,
+            "content": result.content,
+            "model": result.model,
+            "tokens_used": result.usage["prompt_tokens"] + result.usage["completion_tokens"],
+            "generation_time": round(time.monotonic() - started, 3),
+            "usage": result.usage
         }
 
     async def refine_content(
@@ -96,25 +188,27 @@ class LLMService:
 
 class AIAnalysisService:
     """
-    AI分析服务（预留接口）
+    AI分析服务
 
-    待AI模块开发完成后实现
-    用于数据分析、趋势识别、关键信息提取等
+    关键词/趋势分析在本地完成（TF-IDF，见 src.services.report_analysis_engine），
+    不调用外部 LLM；分词为 CPU 密集操作，在线程中执行，不阻塞事件循环
     """
 
     async def analyze_data(
         self,
         report_id: str,
         data_items: List[Dict[str, Any]],
-        analysis_type: str = "trend"
+        analysis_type: str = "trend",
+        progress_callback: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
-        分析数据（预留接口）
+        分析数据
 
         Args:
             report_id: 报告ID
-            data_items: 数据项列表
-            analysis_type: 分析类型 (trend/keyword/sentiment/classification)
+            data_items: 数据项列表（title / content / tags / added_at）
+            analysis_type: 分析类型 (keyword/trend)
+            progress_callback: 进度回调（在线程分析前后各调用一次；抛出 GenerationCancelled 时中止）
 
         Returns:
             分析结果字典:
@@ -125,14 +219,40 @@ class AIAnalysisService:
                 "recommendations": list
             }
         """
-        # TODO: 实现AI分析逻辑
-        logger.warning("⚠️  AI分析服务未实现，返回占位内容")
+        if analysis_type not in ANALYSIS_TYPES:
+            return {
+                "success": False,
+                "analysis_results": {},
+                "insights": [],
+                "recommendations": [],
+                "error": f"不支持的分析类型: {analysis_type}，可选: {', '.join(ANALYSIS_TYPES)}"
+            }
+
+        if progress_callback is not None:
+            await progress_callback({"stage": "analyze", "total_items": len(data_items)})
+
+        started = time.monotonic()
+        result = await asyncio.to_thread(
+            analyze_items,
+            data_items,
+            analysis_type,
+            settings.REPORT_ANALYSIS_TOP_KEYWORDS,
+            settings.REPORT_ANALYSIS_MAX_CHARS
+        )
+        analysis_time = round(time.monotonic() - started, 3)
+
+        # 分析在线程中一次完成，无法中途中止：完成后再检查一次取消，被取消时不返回/缓存结果
+        if progress_callback is not None:
+            await progress_callback({"stage": "completed", "total_items": len(data_items)})
+        logger.info(f"✅ 报告分析完成: {report_id} ({analysis_type}), {len(data_items)} 个数据项, {analysis_time}s")
+
         return {
-            "success": False,
-            "analysis_results": {},
-            "insights": [],
+            "success": True,
+            "analysis_type": analysis_type,
+            "analysis_results": result["analysis_results"],
+            "insights": result["insights"],
             "recommendations": [],
-            "error": "AI analysis module not yet implemented"
+            "analysis_time": analysis_time
         }
 
     async def extract_keywords(
@@ -140,12 +260,9 @@ class AIAnalysisService:
         content: str,
         max_keywords: int = 10
     ) -> List[str]:
-        """
-        提取关键词（预留接口）
-        """
-        # TODO: 实现关键词提取
-        logger.warning("⚠️  AI关键词提取服务未实现")
-        return []
+        """提取单段文本的关键词（按词频，单文档时 idf 相同）"""
+        matrix = build_term_matrix([document_terms(None, content, max_chars=settings.REPORT_ANALYSIS_MAX_CHARS)])
+        return [keyword["keyword"] for keyword in tfidf_keywords(matrix, max_keywords)]
 
 
 class SummaryReportService:
@@ -157,6 +274,8 @@ class SummaryReportService:
         self.task_repo = None
         self.data_item_repo = None
         self.version_repo = None
+        self.version_store = None
+        self.unified_repo = UnifiedResultRepository()
         self.llm_service = LLMService()
         self.ai_service = AIAnalysisService()
 
@@ -168,6 +287,7 @@ class SummaryReportService:
             self.task_repo = SummaryReportTaskRepository(self.db)
             self.data_item_repo = SummaryReportDataItemRepository(self.db)
             self.version_repo = SummaryReportVersionRepository(self.db)
+            self.version_store = ReportVersionStore(self.version_repo, settings.REPORT_VERSION_CACHE_SIZE)
 
     # ==========================================
     # 报告管理
@@ -194,14 +314,23 @@ class SummaryReportService:
 
         return await self.report_repo.create(report)
 
+    async def report_exists(self, report_id: str) -> bool:
+        """报告是否存在（不计入查看次数）"""
+        await self._init_repos()
+        return await self.report_repo.find_by_id(report_id) is not None
+
     async def get_report(self, report_id: str) -> Optional[SummaryReport]:
         """获取报告详情"""
         await self._init_repos()
         report = await self.report_repo.find_by_id(report_id)
 
         if report:
-            # 增加查看次数
-            await self.report_repo.increment_view_count(report_id)
+            # 增加查看次数（开启缓冲时只累加内存计数，读接口不产生写入）
+            if settings.REPORT_VIEW_COUNT_BUFFER_ENABLED:
+                await view_count_buffer.record(report_id)
+                report.view_count += view_count_buffer.pending(report_id)
+            else:
+                await self.report_repo.increment_view_count(report_id)
 
         return report
 
@@ -264,11 +393,6 @@ class SummaryReportService:
         """添加任务到报告"""
         await self._init_repos()
 
-        # 检查是否已存在
-        exists = await self.task_repo.exists(report_id, task_id, task_type)
-        if exists:
-            raise ValueError(f"Task {task_id} already added to report {report_id}")
-
         report_task = SummaryReportTask(
             report_id=report_id,
             task_id=task_id,
@@ -278,23 +402,56 @@ class SummaryReportService:
             priority=priority
         )
 
-        result = await self.task_repo.create(report_task)
+        # 唯一索引 idx_unique_report_task 保证同一任务不会重复关联（并发添加时只有一个成功）
+        try:
+            result = await self.task_repo.create(report_task)
+        except DuplicateKeyError:
+            raise ValueError(f"Task {task_id} already added to report {report_id}")
 
-        # 更新报告的任务计数
-        count = await self.task_repo.count_by_report(report_id)
-        await self.report_repo.update_task_count(report_id, count)
+        # 原子递增报告的任务计数（漂移由 reconcile_report_counts 定期修复）
+        await self.report_repo.increment_counts(report_id, task_count=1)
 
         # ==========================================
         # 缓存失效：删除该报告的所有搜索缓存
         # ==========================================
-        if REDIS_AVAILABLE:
-            cache_pattern = cache_key_gen.report_pattern(report_id)
-            deleted_count = await redis_client.delete_pattern(cache_pattern)
-            if deleted_count > 0:
-                logger.info(f"🗑️ 缓存失效: {cache_pattern}, 删除 {deleted_count} 个缓存键")
+        await self._invalidate_search_cache(report_id)
 
         return result
 
+    async def _invalidate_search_cache(self, report_id: str) -> None:
+        """使报告的全部搜索缓存失效（递增缓存代数，一次 INCR，无需扫描键空间）"""
+        if not REDIS_AVAILABLE:
+            return
+
+        generation = await redis_client.bump_generation(
+            cache_key_gen.report_generation(report_id),
+            ttl=settings.REPORT_CACHE_GENERATION_TTL
+        )
+        if generation is not None:
+            logger.info(f"🗑️ 缓存失效: 报告 {report_id} 搜索缓存代数 -> {generation}")
+
+    async def reconcile_report_counts(self) -> int:
+        """
+        按关联集合的实际数量修复报告的任务/数据项计数
+
+        计数在关联写入后以 $inc 增量维护；关联写入成功但 $inc 失败（进程中断、网络错误）
+        会产生漂移，由定时作业调用本方法修复
+
+        Returns:
+            int: 修复的报告数
+        """
+        await self._init_repos()
+
+        task_counts, data_item_counts = await asyncio.gather(
+            self.task_repo.count_grouped_by_report(),
+            self.data_item_repo.count_grouped_by_report()
+        )
+        repaired = await self.report_repo.reconcile_counts(task_counts, data_item_counts)
+
+        if repaired:
+            logger.warning(f"🔧 修复报告计数漂移: {repaired} 个报告")
+        return repaired
+
     async def get_report_tasks(
         self,
         report_id: str,
@@ -315,18 +472,13 @@ class SummaryReportService:
         result = await self.task_repo.delete(report_id, task_id, task_type)
 
         if result:
-            # 更新报告的任务计数
-            count = await self.task_repo.count_by_report(report_id)
-            await self.report_repo.update_task_count(report_id, count)
+            # 原子递减报告的任务计数
+            await self.report_repo.increment_counts(report_id, task_count=-1)
 
             # ==========================================
             # 缓存失效：删除该报告的所有搜索缓存
             # ==========================================
-            if REDIS_AVAILABLE:
-                cache_pattern = cache_key_gen.report_pattern(report_id)
-                deleted_count = await redis_client.delete_pattern(cache_pattern)
-                if deleted_count > 0:
-                    logger.info(f"🗑️ 缓存失效: {cache_pattern}, 删除 {deleted_count} 个缓存键")
+            await self._invalidate_search_cache(report_id)
 
         return result
 
@@ -357,12 +509,133 @@ class SummaryReportService:
 
         result = await self.data_item_repo.create(data_item)
 
-        # 更新报告的数据项计数
-        count = await self.data_item_repo.count_by_report(report_id)
-        await self.report_repo.update_data_item_count(report_id, count)
+        # 原子递增报告的数据项计数（O(1)，与报告中已有数据项数量无关）
+        await self.report_repo.increment_counts(report_id, data_item_count=1)
+        await self._invalidate_data_cache(report_id)
 
         return result
 
+    async def add_data_items_from_results(
+        self,
+        report_id: str,
+        source_type: str,
+        added_by: str,
+        result_ids: Optional[List[str]] = None,
+        task_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        tags: Optional[List[str]] = None,
+        importance: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        批量将搜索结果添加为报告数据项
+
+        - result_ids: 按结果ID添加（一次 $in 查询，只读取数据项需要的字段）
+        - task_id: 添加该任务下符合 filters 的全部结果，服务端分批读取，
+          最多 REPORT_BULK_ADD_MAX_ITEMS 条
+        - 报告中已存在的结果（相同 source_id）跳过
+        - 数据项按批 insert_many 写入，报告计数只更新一次
+
+        Args:
+            source_type: search_result / instant_search_result
+            filters: source / language / min_relevance_score / min_quality_score
+                （即时搜索结果只支持 min_relevance_score，按本任务映射的相关性过滤）
+
+        Returns:
+            {"added_count", "skipped_count", "truncated"}；报告不存在时返回 None
+        """
+        if source_type not in BULK_RESULT_SOURCES:
+            raise ValueError(f"不支持的来源类型: {source_type}")
+        if not result_ids and not task_id:
+            raise ValueError("需要提供 result_ids 或 task_id")
+
+        await self._init_repos()
+        if not await self.report_repo.find_by_id(report_id):
+            return None
+
+        collection_name, task_type = BULK_RESULT_SOURCES[source_type]
+        max_items = settings.REPORT_BULK_ADD_MAX_ITEMS
+
+        if result_ids:
+            query: Dict[str, Any] = {"_id": {"$in": list(dict.fromkeys(result_ids))}}
+        else:
+            query = await self._build_bulk_result_query(source_type, task_id, filters or {}, max_items)
+
+        added = 0
+        skipped = 0
+        fetched = 0
+        truncated = False
+        cursor = self.db[collection_name].find(query, BULK_RESULT_PROJECTION).limit(max_items + 1)
+        while not truncated:
+            docs = await cursor.to_list(length=BULK_ADD_BATCH_SIZE)
+            if not docs:
+                break
+            if fetched + len(docs) > max_items:
+                docs = docs[:max_items - fetched]
+                truncated = True
+            fetched += len(docs)
+
+            existing = set(await self.data_item_repo.find_existing_source_ids(
+                report_id, [doc["_id"] for doc in docs]
+            ))
+            data_items = [
+                SummaryReportDataItem(
+                    report_id=report_id,
+                    source_type=source_type,
+                    source_id=doc["_id"],
+                    task_id=task_id or doc.get("task_id"),
+                    task_type=task_type,
+                    title=doc.get("title") or "",
+                    content=field_codec.decode_value(doc.get("content")) or "",
+                    url=doc.get("url"),
+                    tags=list(tags or []),
+                    importance=importance,
+                    added_by=added_by
+                )
+                for doc in docs if doc["_id"] not in existing
+            ]
+            added += await self.data_item_repo.create_many(data_items)
+            skipped += len(docs) - len(data_items)
+
+        # 报告计数只更新一次
+        if added:
+            await self.report_repo.increment_counts(report_id, data_item_count=added)
+            await self._invalidate_data_cache(report_id)
+
+        logger.info(
+            f"✅ 批量添加数据项: 报告 {report_id}, 新增 {added}, 跳过 {skipped}"
+            + ("（已达上限）" if truncated else "")
+        )
+        return {"added_count": added, "skipped_count": skipped, "truncated": truncated}
+
+    async def _build_bulk_result_query(
+        self,
+        source_type: str,
+        task_id: str,
+        filters: Dict[str, Any],
+        max_items: int
+    ) -> Dict[str, Any]:
+        """构建按任务批量添加时的结果查询条件（内部方法）"""
+        min_relevance_score = filters.get("min_relevance_score")
+
+        if source_type == "instant_search_result":
+            # 即时结果经映射表与任务关联（结果可能由其他任务首次发现）
+            mapping_query: Dict[str, Any] = {"task_id": task_id}
+            if min_relevance_score is not None:
+                mapping_query["relevance_score"] = {"$gte": min_relevance_score}
+            result_ids = await self.db.instant_search_result_mappings.distinct("result_id", mapping_query)
+            return {"_id": {"$in": result_ids[:max_items + 1]}}
+
+        query: Dict[str, Any] = {"task_id": task_id}
+        if filters.get("source"):
+            query["source"] = filters["source"]
+        if filters.get("language"):
+            query["language"] = filters["language"]
+        if min_relevance_score is not None:
+            query["relevance_score"] = {"$gte": min_relevance_score}
+        if filters.get("min_quality_score") is not None:
+            query["quality_score"] = {"$gte": filters["min_quality_score"]}
+        return query
+
     async def get_report_data_items(
         self,
         report_id: str,
@@ -393,174 +666,6 @@ class SummaryReportService:
         # 使用全文搜索
         return await self.data_item_repo.search(report_id, search_query, limit)
 
-    async def _search_scheduled_results(
-        self,
-        task_ids: List[str],
-        search_query: str,
-        limit: int
-    ) -> List[Dict[str, Any]]:
-        """
-        查询定时任务的搜索结果（内部方法）
-
-        使用优化的聚合管道和查询提示
-        """
-        if not task_ids:
-            return []
-
-        try:
-            # 优化的聚合管道：先过滤后联表
-            pipeline = [
-                # 第一阶段：精确匹配（使用索引）
-                {
-                    "$match": {
-                        "task_id": {"$in": task_ids},
-                        "$text": {"$search": search_query}
-                    }
-                },
-                # 第二阶段：按相关性排序
-                {
-                    "$sort": {"score": {"$meta": "textScore"}}
-                },
-                # 第三阶段：限制结果数
-                {"$limit": limit},
-                # 第四阶段：联表查询（只查询需要的字段）
-                {
-                    "$lookup": {
-                        "from": "search_tasks",
-                        "let": {"taskId": "$task_id"},
-                        "pipeline": [
-                            {
-                                "$match": {
-                                    "$expr": {"$eq": ["$id", "$$taskId"]}
-                                }
-                            },
-                            # 只返回需要的字段（减少数据传输）
-                            {
-                                "$project": {
-                                    "_id": 0,
-                                    "id": 1,
-                                    "name": 1,
-                                    "query": 1
-                                }
-                            }
-                        ],
-                        "as": "task_info"
-                    }
-                },
-                # 第五阶段：投影（只返回需要的字段）
-                {
-                    "$project": {
-                        "_id": 0,
-                        "result_id": 1,
-                        "task_id": 1,
-                        "title": 1,
-                        "url": 1,
-                        "markdown_content": 1,
-                        "created_at": 1,
-                        "task_info": {"$arrayElemAt": ["$task_info", 0]},
-                        "relevance_score": {"$meta": "textScore"}
-                    }
-                }
-            ]
-
-            # 使用hint强制使用最优索引
-            cursor = self.db.search_results.aggregate(
-                pipeline,
-                hint="idx_task_created"  # 强制使用 task_id + created_at 索引
-            )
-
-            results = await cursor.to_list(length=limit)
-            logger.debug(f"📊 查询定时任务结果: {len(results)} 条")
-            return results
-
-        except Exception as e:
-            logger.error(f"❌ 查询定时任务结果失败: {e}")
-            return []
-
-    async def _search_instant_results(
-        self,
-        task_ids: List[str],
-        search_query: str,
-        limit: int
-    ) -> List[Dict[str, Any]]:
-        """
-        查询即时任务的搜索结果（内部方法）
-
-        使用优化的聚合管道和查询提示
-        """
-        if not task_ids:
-            return []
-
-        try:
-            # 优化的聚合管道：先过滤后联表
-            pipeline = [
-                # 第一阶段：精确匹配（使用索引）
-                {
-                    "$match": {
-                        "execution_id": {"$in": task_ids},
-                        "$text": {"$search": search_query}
-                    }
-                },
-                # 第二阶段：按相关性排序
-                {
-                    "$sort": {"score": {"$meta": "textScore"}}
-                },
-                # 第三阶段：限制结果数
-                {"$limit": limit},
-                # 第四阶段：联表查询（只查询需要的字段）
-                {
-                    "$lookup": {
-                        "from": "instant_search_tasks",
-                        "let": {"execId": "$execution_id"},
-                        "pipeline": [
-                            {
-                                "$match": {
-                                    "$expr": {"$eq": ["$execution_id", "$$execId"]}
-                                }
-                            },
-                            # 只返回需要的字段
-                            {
-                                "$project": {
-                                    "_id": 0,
-                                    "execution_id": 1,
-                                    "query": 1,
-                                    "created_at": 1
-                                }
-                            }
-                        ],
-                        "as": "task_info"
-                    }
-                },
-                # 第五阶段：投影
-                {
-                    "$project": {
-                        "_id": 0,
-                        "result_id": 1,
-                        "execution_id": 1,
-                        "title": 1,
-                        "url": 1,
-                        "markdown_content": 1,
-                        "created_at": 1,
-                        "task_info": {"$arrayElemAt": ["$task_info", 0]},
-                        "relevance_score": {"$meta": "textScore"}
-                    }
-                }
-            ]
-
-            # 使用hint强制使用最优索引
-            cursor = self.db.instant_search_results.aggregate(
-                pipeline,
-                hint="idx_execution_created"  # 强制使用 execution_id + created_at 索引
-            )
-
-            results = await cursor.to_list(length=limit)
-            logger.debug(f"📊 查询即时任务结果: {len(results)} 条")
-            return results
-
-        except Exception as e:
-            logger.error(f"❌ 查询即时任务结果失败: {e}")
-            return []
-
     async def search_across_tasks(
         self,
         report_id: str,
@@ -568,13 +673,13 @@ class SummaryReportService:
         limit: int = 50
     ) -> Dict[str, Any]:
         """
-        跨任务联表查询搜索结果（优化版 + Redis缓存）
+        跨任务联表查询搜索结果（倒排索引 + Redis缓存）
 
         性能优化策略：
         1. Redis缓存：5分钟TTL，减少重复查询压力
         2. 分阶段查询：先获取任务列表（小表），再分离类型
-        3. 并行查询：使用asyncio.gather同时查询scheduled和instant结果
-        4. 查询提示：使用hint强制使用最优索引
+        3. 全文检索：报告搜索倒排索引（中文二元组切分 + BM25），见 report_search_service
+        4. 报告范围：只读取报告关联任务中查询词的倒排块
         5. 结果限制：每个任务类型限制结果数，避免过载
         6. 投影优化：只返回需要的字段，减少数据传输
 
@@ -591,13 +696,17 @@ class SummaryReportService:
         # ==========================================
         cache_key = None
         if REDIS_AVAILABLE:
-            cache_key = cache_key_gen.search_result(report_id, search_query, limit)
+            # 键中嵌入报告缓存代数：报告任务变化时递增代数，旧键不再命中并随TTL过期
+            generation = await redis_client.get_generation(cache_key_gen.report_generation(report_id))
+            cache_key = cache_key_gen.search_result(report_id, search_query, limit, generation)
             cached_result = await redis_client.get(cache_key)
 
             if cached_result:
+                await redis_client.hincr(cache_key_gen.report_search_stats(), "hits")
                 logger.info(f"✅ 缓存命中: {cache_key}")
                 return cached_result
 
+            await redis_client.hincr(cache_key_gen.report_search_stats(), "misses")
             logger.debug(f"🔍 缓存未命中，执行查询: {cache_key}")
 
         # ==========================================
@@ -645,33 +754,21 @@ class SummaryReportService:
         )
 
         # ==========================================
-        # 阶段3: 并行查询（使用asyncio.gather，最大化性能）
+        # 阶段3: 倒排索引查询（报告范围，BM25排序）
         # ==========================================
         start_time = time.time()
 
-        # 并发执行两个查询
-        scheduled_results, instant_results = await asyncio.gather(
-            self._search_scheduled_results(
+        # 倒排索引 + BM25（两种来源并行读取倒排，得分可直接比较）
+        try:
+            scheduled_results, instant_results = await report_search_service.search(
                 scheduled_task_ids,
-                search_query,
-                limit
-            ),
-            self._search_instant_results(
                 instant_task_ids,
                 search_query,
                 limit
-            ),
-            return_exceptions=True  # 捕获异常而不中断
-        )
-
-        # 处理异常结果
-        if isinstance(scheduled_results, Exception):
-            logger.error(f"❌ 定时任务查询异常: {scheduled_results}")
-            scheduled_results = []
-
-        if isinstance(instant_results, Exception):
-            logger.error(f"❌ 即时任务查询异常: {instant_results}")
-            instant_results = []
+            )
+        except Exception as e:
+            logger.error(f"❌ 跨任务搜索查询异常: {e}")
+            scheduled_results, instant_results = [], []
 
         # ==========================================
         # 阶段4: 合并结果并排序（按相关性分数）
@@ -727,21 +824,25 @@ class SummaryReportService:
     async def update_data_item(
         self,
         item_id: str,
-        update_data: Dict[str, Any]
+        update_data: Dict[str, Any],
+        report_id: Optional[str] = None
     ) -> bool:
-        """更新数据项"""
+        """更新数据项（提供 report_id 时使该报告的分析缓存失效）"""
         await self._init_repos()
-        return await self.data_item_repo.update(item_id, update_data)
+        result = await self.data_item_repo.update(item_id, update_data)
+        if result and report_id:
+            await self._invalidate_data_cache(report_id)
+        return result
 
     async def delete_data_item(self, item_id: str, report_id: str) -> bool:
         """删除数据项"""
         await self._init_repos()
-        result = await self.data_item_repo.delete(item_id)
+        result = await self.data_item_repo.delete(item_id, report_id)
 
         if result:
-            # 更新报告的数据项计数
-            count = await self.data_item_repo.count_by_report(report_id)
-            await self.report_repo.update_data_item_count(report_id, count)
+            # 原子递减报告的数据项计数
+            await self.report_repo.increment_counts(report_id, data_item_count=-1)
+            await self._invalidate_data_cache(report_id)
 
         return result
 
@@ -766,7 +867,7 @@ class SummaryReportService:
         if not report:
             return False
 
-        # 如果启用自动版本管理，创建版本快照
+        # 如果启用自动版本管理，创建版本（按需存为相对上一版本的增量）
         if report.auto_version and is_manual:
             version = SummaryReportVersion(
                 report_id=report_id,
@@ -777,7 +878,7 @@ class SummaryReportService:
                 created_by=updated_by,
                 content_size=len(content_text)
             )
-            await self.version_repo.create(version)
+            await self.version_store.create_version(version)
 
         # 更新内容
         return await self.report_repo.update_content(
@@ -796,6 +897,20 @@ class SummaryReportService:
         await self._init_repos()
         return await self.version_repo.find_by_report(report_id, limit)
 
+    async def get_report_version(
+        self,
+        report_id: str,
+        version_number: int
+    ) -> Optional[SummaryReportVersion]:
+        """获取指定版本（内容从最近的快照回放增量还原）"""
+        await self._init_repos()
+        return await self.version_store.get_version(report_id, version_number)
+
+    async def get_version_storage_stats(self, report_id: str) -> Dict[str, Any]:
+        """获取报告版本的存储占用"""
+        await self._init_repos()
+        return await self.version_store.get_storage_stats(report_id)
+
     async def rollback_to_version(
         self,
         report_id: str,
@@ -805,8 +920,8 @@ class SummaryReportService:
         """回滚到指定版本"""
         await self._init_repos()
 
-        # 获取目标版本
-        version = await self.version_repo.find_by_version_number(report_id, version_number)
+        # 获取目标版本（还原完整内容）
+        version = await self.version_store.get_version(report_id, version_number)
         if not version:
             return False
 
@@ -832,27 +947,36 @@ class SummaryReportService:
         self,
         report_id: str,
         generation_mode: str = "comprehensive",
-        llm_config: Optional[Dict[str, Any]] = None
+        llm_config: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
-        使用LLM生成报告内容（预留接口）
+        使用LLM生成报告内容（map-reduce，块摘要按内容哈希缓存）
+
+        生成进度写入报告的 generation_progress，完成后 token 用量写入 generation_usage
 
         Args:
             report_id: 报告ID
             generation_mode: 生成模式
             llm_config: LLM配置参数
+            progress_callback: 额外的进度回调（抛出 GenerationCancelled 时恢复报告状态并向上抛出）
 
         Returns:
             生成结果
         """
         await self._init_repos()
 
+        report = await self.report_repo.find_by_id(report_id)
+        if not report:
+            return {"success": False, "error": f"报告不存在: {report_id}"}
+        previous_status = report.status if report.status != "generating" else "draft"
+
         # 更新报告状态为生成中
         await self.report_repo.update_status(report_id, "generating")
 
         try:
-            # 获取报告的所有数据项
-            data_items = await self.data_item_repo.find_by_report(report_id)
+            # 获取报告的全部可见数据项
+            data_items = await self.data_item_repo.find_for_generation(report_id)
 
             # 转换为LLM输入格式
             content_items = [
@@ -865,11 +989,18 @@ class SummaryReportService:
                 for item in data_items
             ]
 
+            async def save_progress(progress: Dict[str, Any]) -> None:
+                await self.report_repo.update_generation_progress(report_id, progress)
+                if progress_callback is not None:
+                    await progress_callback(progress)
+
             # 调用LLM服务生成内容
             result = await self.llm_service.generate_summary(
                 report_id,
                 content_items,
-                generation_mode
+                generation_mode,
+                cache_repo=SummaryReportLLMCacheRepository(self.db),
+                progress_callback=save_progress
             )
 
             if result["success"]:
@@ -882,14 +1013,19 @@ class SummaryReportService:
                     change_description="LLM generated content"
                 )
 
-                # 更新生成配置
+                # 更新生成配置和 token 用量
                 gen_config = {
                     "llm_model": result.get("model"),
                     "ai_analysis_type": generation_mode,
                     "generation_params": llm_config or {}
                 }
                 await self.report_repo.update(report_id, {
-                    "generation_config": gen_config
+                    "generation_config": gen_config,
+                    "generation_usage": dict(
+                        result["usage"],
+                        model=result.get("model"),
+                        generated_at=datetime.utcnow()
+                    )
                 })
 
                 # 更新状态为已完成
@@ -900,6 +1036,11 @@ class SummaryReportService:
 
             return result
 
+        except GenerationCancelled:
+            logger.info(f"🛑 报告生成已取消: {report_id}")
+            await self.report_repo.update_status(report_id, previous_status)
+            raise
+
         except Exception as e:
             logger.error(f"❌ LLM生成失败: {e}")
             await self.report_repo.update_status(report_id, "failed")
@@ -911,22 +1052,34 @@ class SummaryReportService:
     async def analyze_report_data_with_ai(
         self,
         report_id: str,
-        analysis_type: str = "trend"
+        analysis_type: str = "trend",
+        progress_callback: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
-        使用AI分析报告数据（预留接口）
+        分析报告数据（关键词/趋势，本地 TF-IDF）
+
+        结果按报告数据代数缓存：数据项增删改时递增代数，旧结果不再命中
 
         Args:
             report_id: 报告ID
             analysis_type: 分析类型
+            progress_callback: 进度回调（抛出 GenerationCancelled 时中止，不缓存结果）
 
         Returns:
             分析结果
         """
         await self._init_repos()
 
-        # 获取报告的所有数据项
-        data_items = await self.data_item_repo.find_by_report(report_id)
+        # 代数在读取数据项之前获取：分析期间数据变化会递增代数，本次结果写入旧代数不会被命中
+        cache_key = await self._analysis_cache_key(report_id, analysis_type)
+        if cache_key:
+            cached = await redis_client.get(cache_key)
+            if cached:
+                logger.info(f"✅ 分析缓存命中: {cache_key}")
+                return cached
+
+        # 获取报告的全部可见数据项
+        data_items = await self.data_item_repo.find_for_generation(report_id)
 
         # 转换为AI分析输入格式
         analysis_items = [
@@ -934,17 +1087,96 @@ class SummaryReportService:
                 "title": item.title,
                 "content": item.content,
                 "metadata": item.metadata,
-                "tags": item.tags
+                "tags": item.tags,
+                "added_at": item.added_at
             }
             for item in data_items
         ]
 
         # 调用AI分析服务
-        return await self.ai_service.analyze_data(
+        result = await self.ai_service.analyze_data(
             report_id,
             analysis_items,
-            analysis_type
+            analysis_type,
+            progress_callback=progress_callback
+        )
+
+        if result["success"] and cache_key:
+            await redis_client.set(cache_key, result, ttl=settings.REPORT_ANALYSIS_CACHE_TTL)
+        return result
+
+    async def _analysis_cache_key(self, report_id: str, analysis_type: str) -> Optional[str]:
+        """分析结果缓存键（嵌入报告数据代数；Redis 不可用时为 None）"""
+        if not REDIS_AVAILABLE:
+            return None
+        generation = await redis_client.get_generation(cache_key_gen.report_data_generation(report_id))
+        return cache_key_gen.report_analysis(
+            report_id, analysis_type, settings.REPORT_ANALYSIS_TOP_KEYWORDS, generation
+        )
+
+    async def get_cached_analysis(self, report_id: str, analysis_type: str) -> Optional[Dict[str, Any]]:
+        """读取当前数据代数下已缓存的分析结果"""
+        cache_key = await self._analysis_cache_key(report_id, analysis_type)
+        if cache_key is None:
+            return None
+        cached = await redis_client.get(cache_key)
+        if cached:
+            logger.info(f"✅ 分析缓存命中: {cache_key}")
+        return cached or None
+
+    async def _invalidate_data_cache(self, report_id: str) -> None:
+        """使报告基于数据项的缓存（分析结果）失效（递增数据代数）"""
+        if not REDIS_AVAILABLE:
+            return
+
+        await redis_client.bump_generation(
+            cache_key_gen.report_data_generation(report_id),
+            ttl=settings.REPORT_CACHE_GENERATION_TTL
+        )
+
+    async def get_report_trend(
+        self,
+        report_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        granularity: str = "day"
+    ) -> Dict[str, Any]:
+        """
+        获取报告关联任务的结果趋势（按天趋势桶汇总）
+
+        结果数、新结果/共享结果数、主要域名和关键词在结果入库时按任务按天预聚合，
+        这里只对报告活跃任务在日期范围内的日桶做一次聚合，不扫描结果集合
+
+        Args:
+            report_id: 报告ID
+            start_date / end_date: 日期范围（含两端，UTC；默认最近 REPORT_TREND_DEFAULT_DAYS 天）
+            granularity: 时间线粒度 day / week / month
+
+        Raises:
+            ValueError: 粒度不支持或日期范围无效
+        """
+        await self._init_repos()
+
+        report_tasks = await self.task_repo.find_by_report(report_id, is_active=True)
+        scopes = {
+            SOURCE_SCHEDULED: [t.task_id for t in report_tasks if t.task_type == "scheduled"],
+            SOURCE_INSTANT: [t.task_id for t in report_tasks if t.task_type == "instant"]
+        }
+
+        trend = await report_trend_service.get_trend(
+            scopes,
+            start_date=start_date,
+            end_date=end_date,
+            granularity=granularity,
+            top_k=settings.REPORT_ANALYSIS_TOP_KEYWORDS
         )
+        trend["report_id"] = report_id
+        trend["task_stats"] = {
+            "scheduled_count": len(scopes[SOURCE_SCHEDULED]),
+            "instant_count": len(scopes[SOURCE_INSTANT]),
+            "total_count": len(report_tasks)
+        }
+        return trend
 
     # ==========================================
     # 任务结果获取（新增功能）
@@ -962,10 +1194,14 @@ class SummaryReportService:
 
         改进功能：用于前端初始化数据列表，减少API调用
 
+        两个来源各自按 (created_at, _id) 复合键游标读取 limit+1 条后 k 路归并，
+        任意深度的分页代价均为 O(limit)；开启 UNIFIED_RESULTS_READ_ENABLED 时
+        改为对 unified_results 单集合索引查询
+
         Args:
             report_id: 报告ID
             task_ids: 指定任务ID列表（可选，为None时返回所有关联任务的结果）
-            cursor: 分页游标（格式: "task_type:task_id:created_at"）
+            cursor: 分页游标（上一页的 next_cursor，编码各来源的 (created_at, _id) 位置）
             limit: 分页大小
 
         Returns:
@@ -1015,70 +1251,21 @@ class SummaryReportService:
             t.task_id for t in report_tasks if t.task_type == "instant"
         ]
 
-        # 并行查询两种任务的结果
-        scheduled_results, instant_results = await asyncio.gather(
-            self._get_all_scheduled_results(scheduled_task_ids, limit),
-            self._get_all_instant_results(instant_task_ids, limit),
-            return_exceptions=True
-        )
-
-        # 处理异常
-        if isinstance(scheduled_results, Exception):
-            logger.error(f"❌ 获取定时任务结果失败: {scheduled_results}")
-            scheduled_results = []
-        if isinstance(instant_results, Exception):
-            logger.error(f"❌ 获取即时任务结果失败: {instant_results}")
-            instant_results = []
-
-        # 合并结果并添加source_type标记
-        all_results = []
-        for result in scheduled_results:
-            result["source_type"] = "scheduled"
-            all_results.append(result)
-        for result in instant_results:
-            result["source_type"] = "instant"
-            all_results.append(result)
-
-        # 按创建时间排序（最新的在前）
-        all_results.sort(
-            key=lambda x: x.get("created_at", datetime.min),
-            reverse=True
-        )
+        # 解析合并游标（各来源的 (created_at, _id) 位置）
+        positions = cursor_paginator.decode_merged_cursor(cursor) if cursor else {}
+        for position in positions.values():
+            if position is not None and (position.field != "created_at" or position.direction != -1):
+                raise ValueError("游标与报告结果排序不匹配")
+        sources = {
+            SOURCE_SCHEDULED: scheduled_task_ids,
+            SOURCE_INSTANT: instant_task_ids
+        }
 
-        # 应用游标分页
-        if cursor:
-            # 解析游标: "source_type:created_at_timestamp"
-            try:
-                cursor_parts = cursor.split(":")
-                if len(cursor_parts) == 2:
-                    cursor_source_type, cursor_timestamp = cursor_parts
-                    cursor_dt = datetime.fromtimestamp(float(cursor_timestamp))
-
-                    # 过滤出游标之后的结果
-                    all_results = [
-                        r for r in all_results
-                        if r.get("created_at", datetime.max) < cursor_dt or
-                        (r.get("created_at") == cursor_dt and r.get("source_type") != cursor_source_type)
-                    ]
-            except Exception as e:
-                logger.warning(f"⚠️ 游标解析失败: {e}, 忽略游标")
-
-        # 限制结果数量（取limit+1用于判断是否有下一页）
-        has_next = len(all_results) > limit
-        if has_next:
-            items = all_results[:limit]
+        if settings.UNIFIED_RESULTS_READ_ENABLED:
+            items, next_cursor = await self._page_unified_results(sources, positions.get(UNIFIED_CURSOR_KEY), limit)
         else:
-            items = all_results
-
-        # 生成下一页游标
-        next_cursor = None
-        if has_next and items:
-            last_item = items[-1]
-            last_created_at = last_item.get("created_at")
-            if last_created_at:
-                timestamp = last_created_at.timestamp()
-                source_type = last_item.get("source_type", "scheduled")
-                next_cursor = f"{source_type}:{timestamp}"
+            items, next_cursor = await self._page_merged_results(sources, positions, limit)
+        has_next = next_cursor is not None
 
         return {
             "items": items,
@@ -1094,77 +1281,155 @@ class SummaryReportService:
             }
         }
 
-    async def _get_all_scheduled_results(
+    async def _page_merged_results(
         self,
+        sources: Dict[str, List[str]],
+        positions: Dict[str, Optional[KeysetCursorInfo]],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """分别读取两个源集合后 k 路归并出一页（内部方法），返回 (结果, 下一页游标)"""
+        # 每个来源从自己的位置起最多取 limit+1 条（定时结果走 (task_id, created_at, _id) 索引，即时结果走映射）
+        fetched = await asyncio.gather(*(
+            self._fetch_report_results(source, source_task_ids, positions.get(source), limit)
+            for source, source_task_ids in sources.items()
+        ))
+
+        # k 路归并：各来源已按 (created_at, _id) 降序，归并后取前 limit 条
+        merged = heapq.merge(
+            *(
+                ((doc, source) for doc in docs)
+                for source, docs in zip(sources, fetched)
+            ),
+            key=lambda item: (item[0].get("created_at") or datetime.min, item[0]["_id"]),
+            reverse=True
+        )
+        page = list(itertools.islice(merged, limit + 1))
+        has_next = len(page) > limit
+        page = page[:limit]
+
+        # 下一页游标：消费过的来源前进到本页最后一条，其余来源保持原位置
+        next_cursor = None
+        if has_next:
+            next_positions = {
+                source: cursor_paginator.encode_keyset_cursor(positions[source]) if positions.get(source) else None
+                for source in sources
+            }
+            for doc, source in page:
+                next_positions[source] = cursor_paginator.make_keyset_cursor(doc, "created_at", -1)
+            next_cursor = cursor_paginator.encode_merged_cursor(next_positions)
+
+        return [self._format_report_result(doc, source) for doc, source in page], next_cursor
+
+    async def _page_unified_results(
+        self,
+        sources: Dict[str, List[str]],
+        position: Optional[KeysetCursorInfo],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """从统一结果读模型单集合读取一页（内部方法），正文按指针从源集合加载"""
+        rows = await self.unified_repo.find_page(sources, position, limit)
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        contents = await self.unified_repo.load_content(rows, ("markdown_content", "metadata"))
+        items = []
+        for row in rows:
+            content = contents.get(row["_id"], {})
+            items.append({
+                "result_id": row["result_id"],
+                "task_id": row["task_id"],
+                "title": row.get("title"),
+                "url": row.get("url"),
+                "markdown_content": content.get("markdown_content"),
+                "created_at": row.get("created_at"),
+                "metadata": content.get("metadata") or {},
+                "source_type": row["source_type"]
+            })
+
+        next_cursor = None
+        if has_next:
+            next_cursor = cursor_paginator.encode_merged_cursor({
+                UNIFIED_CURSOR_KEY: cursor_paginator.make_keyset_cursor(rows[-1], "created_at", -1)
+            })
+        return items, next_cursor
+
+    async def _fetch_report_results(
+        self,
+        source: str,
         task_ids: List[str],
+        position: Optional[KeysetCursorInfo],
         limit: int
     ) -> List[Dict[str, Any]]:
-        """获取所有定时任务的结果（内部方法）"""
+        """从单个来源按 (created_at, _id) 降序读取游标之后的 limit+1 条结果（内部方法）"""
         if not task_ids:
             return []
 
         try:
-            # 查询所有结果（不需要全文搜索）
-            query = {"task_id": {"$in": task_ids}}
-
-            cursor = self.db.search_results.find(query).sort("created_at", -1).limit(limit * 2)
-            results = await cursor.to_list(length=limit * 2)
-
-            # 转换为统一格式
-            formatted_results = []
-            for result in results:
-                formatted_results.append({
-                    "result_id": result.get("result_id") or str(result.get("_id")),
-                    "task_id": result.get("task_id"),
-                    "title": result.get("title"),
-                    "url": result.get("url"),
-                    "markdown_content": result.get("markdown_content"),
-                    "created_at": result.get("created_at"),
-                    "metadata": result.get("metadata", {})
-                })
-
-            logger.debug(f"📊 获取定时任务结果: {len(formatted_results)} 条")
-            return formatted_results
+            if source == SOURCE_INSTANT:
+                results = await self._fetch_instant_report_results(task_ids, position, limit)
+            else:
+                query: Dict[str, Any] = {"task_id": {"$in": task_ids}}
+                if position is not None:
+                    query = {"$and": [query, cursor_paginator.build_keyset_filter(position)]}
+                cursor = self.db.search_results.find(query, REPORT_RESULT_PROJECTION).sort(
+                    [("created_at", -1), ("_id", -1)]
+                ).limit(limit + 1)
+                results = await cursor.to_list(length=limit + 1)
+            logger.debug(f"📊 获取{source}任务结果: {len(results)} 条")
+            return results
 
         except Exception as e:
-            logger.error(f"❌ 获取定时任务结果失败: {e}")
-            return []
+            logger.error(f"❌ 获取{source}任务结果失败: {e}")
+            raise
 
-    async def _get_all_instant_results(
+    async def _fetch_instant_report_results(
         self,
         task_ids: List[str],
+        position: Optional[KeysetCursorInfo],
         limit: int
     ) -> List[Dict[str, Any]]:
-        """获取所有即时任务的结果（内部方法）"""
-        if not task_ids:
-            return []
-
-        try:
-            # 查询所有结果（不需要全文搜索）
-            query = {"task_id": {"$in": task_ids}}
-
-            cursor = self.db.instant_search_results.find(query).sort("created_at", -1).limit(limit * 2)
-            results = await cursor.to_list(length=limit * 2)
-
-            # 转换为统一格式
-            formatted_results = []
-            for result in results:
-                formatted_results.append({
-                    "result_id": result.get("result_id") or str(result.get("_id")),
-                    "task_id": result.get("task_id") or result.get("execution_id"),
-                    "title": result.get("title"),
-                    "url": result.get("url"),
-                    "markdown_content": result.get("markdown_content"),
-                    "created_at": result.get("created_at"),
-                    "metadata": result.get("metadata", {})
-                })
+        """
+        通过 instant_search_result_mappings 读取即时任务结果（内部方法）
 
-            logger.debug(f"📊 获取即时任务结果: {len(formatted_results)} 条")
-            return formatted_results
+        即时结果在任务间共享，归属以映射为准：每个 (任务, 结果) 一条，时间取该任务首次发现时间，
+        按 (found_at, result_id) 降序分页，与统一结果读模型的即时结果行一致
+        """
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {"task_id": {"$in": task_ids}}},
+            {"$group": {
+                "_id": {"task_id": "$task_id", "result_id": "$result_id"},
+                "found_at": {"$min": "$found_at"}
+            }},
+            {"$project": {"_id": "$_id.result_id", "task_id": "$_id.task_id", "created_at": "$found_at"}}
+        ]
+        if position is not None:
+            pipeline.append({"$match": cursor_paginator.build_keyset_filter(position)})
+        pipeline += [{"$sort": {"created_at": -1, "_id": -1}}, {"$limit": limit + 1}]
+        mappings = await self.db.instant_search_result_mappings.aggregate(pipeline).to_list(length=limit + 1)
+
+        contents = {
+            doc["_id"]: doc
+            async for doc in self.db.instant_search_results.find(
+                {"_id": {"$in": list({mapping["_id"] for mapping in mappings})}},
+                REPORT_RESULT_PROJECTION
+            )
+        }
+        # 结果正文缺失（已删除）时保留映射行，与统一结果读模型一致，也不影响是否有下一页的判断
+        return [{**contents.get(mapping["_id"], {}), **mapping} for mapping in mappings]
 
-        except Exception as e:
-            logger.error(f"❌ 获取即时任务结果失败: {e}")
-            return []
+    @staticmethod
+    def _format_report_result(doc: Dict[str, Any], source: str) -> Dict[str, Any]:
+        """转换为报告结果列表的统一格式"""
+        return {
+            "result_id": str(doc["_id"]),
+            "task_id": doc.get("task_id"),
+            "title": doc.get("title"),
+            "url": doc.get("url"),
+            "markdown_content": field_codec.decode_value(doc.get("markdown_content")),
+            "created_at": doc.get("created_at"),
+            "metadata": doc.get("metadata", {}),
+            "source_type": source
+        }
 
 
 # 全局服务实例
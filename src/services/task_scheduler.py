@@ -22,16 +22,19 @@ from apscheduler.jobstores.memory import MemoryJobStore
 from src.core.domain.entities.search_task import SearchTask, TaskStatus, ScheduleInterval
 from src.core.domain.entities.search_config import UserSearchConfig
 from src.core.domain.entities.search_result import SearchResult, SearchResultBatch, ResultStatus
-from src.infrastructure.database.repositories import SearchTaskRepository, SearchResultRepository
+from src.infrastructure.database.repositories import SearchTaskRepository, SearchResultRepository, TaskTrendBucketRepository
 from src.infrastructure.database.memory_repositories import InMemorySearchTaskRepository
 from src.infrastructure.database.connection import get_mongodb_database
 from src.infrastructure.search.firecrawl_search_adapter import FirecrawlSearchAdapter
 from src.infrastructure.crawlers.firecrawl_adapter import FirecrawlAdapter
+from src.services.result_retention_service import result_retention_service
+from src.services.summary_report_service import summary_report_service
 from src.services.interfaces.task_scheduler_interface import (
     ITaskScheduler, SchedulerStartError, SchedulerStopError,
     TaskScheduleError, TaskRemoveError, TaskUpdateError,
     TaskNotFoundError, TaskExecutionError
 )
+from src.config import settings
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -121,6 +124,39 @@ class TaskSchedulerService(ITaskScheduler):
                 name='主任务检查器',
                 replace_existing=True
             )
+
+            # 每日结果归档（超过热数据保留期的结果移入冷存储）
+            if settings.RESULT_RETENTION_ENABLED:
+                self.scheduler.add_job(
+                    self._run_result_retention,
+                    trigger=CronTrigger.from_crontab(settings.RESULT_RETENTION_CRON),
+                    id='result_retention',
+                    name='搜索结果归档',
+                    max_instances=1,
+                    replace_existing=True
+                )
+
+            # 每日报告计数对账（修复 $inc 增量维护产生的漂移）
+            if settings.REPORT_COUNT_RECONCILE_ENABLED:
+                self.scheduler.add_job(
+                    self._run_report_count_reconcile,
+                    trigger=CronTrigger.from_crontab(settings.REPORT_COUNT_RECONCILE_CRON),
+                    id='report_count_reconcile',
+                    name='报告计数对账',
+                    max_instances=1,
+                    replace_existing=True
+                )
+            
+            # 每日压缩已结束的任务趋势桶（关键词/域名分布只保留前 N 个）
+            if settings.TREND_BUCKETS_ENABLED:
+                self.scheduler.add_job(
+                    self._run_trend_bucket_compaction,
+                    trigger=CronTrigger.from_crontab(settings.TREND_BUCKET_COMPACT_CRON),
+                    id='trend_bucket_compaction',
+                    name='趋势桶压缩',
+                    max_instances=1,
+                    replace_existing=True
+                )
             
             # 加载现有活跃任务
             await self._load_active_tasks()
@@ -173,6 +209,28 @@ class TaskSchedulerService(ITaskScheduler):
         except Exception as e:
             logger.error(f"停止调度器失败: {e}")
     
+    async def _run_result_retention(self):
+        """执行每日结果归档"""
+        try:
+            await result_retention_service.run()
+        except Exception as e:
+            logger.error(f"结果归档作业失败: {e}")
+
+    async def _run_report_count_reconcile(self):
+        """执行每日报告计数对账"""
+        try:
+            await summary_report_service.reconcile_report_counts()
+        except Exception as e:
+            logger.error(f"报告计数对账作业失败: {e}")
+
+    async def _run_trend_bucket_compaction(self):
+        """执行每日趋势桶压缩（当天的日桶仍在累加，不压缩）"""
+        try:
+            now = datetime.utcnow()
+            await TaskTrendBucketRepository().compact(datetime(now.year, now.month, now.day))
+        except Exception as e:
+            logger.error(f"趋势桶压缩作业失败: {e}")
+
     async def _load_active_tasks(self):
         """加载所有活跃的搜索任务到调度器"""
         try:
@@ -298,9 +356,6 @@ class TaskSchedulerService(ITaskScheduler):
                 logger.info(f"任务已禁用，跳过执行: {task.name}")
                 return
 
-            # 更新任务状态
-            task.last_executed_at = start_time
-
             # ========================================
             # 优先级逻辑：crawl_url 优先于 query
             # ========================================
@@ -323,30 +378,31 @@ class TaskSchedulerService(ITaskScheduler):
                 try:
                     result_repo = await self._get_result_repository()
                     if result_repo:
-                        await result_repo.save_results(result_batch.results)
-                        logger.info(f"✅ 搜索结果已保存到数据库: {len(result_batch.results)}条")
+                        saved = await result_repo.save_execution(result_batch)
+                        logger.info(
+                            f"✅ 搜索结果已保存到数据库: 新增 {saved['new_count']} 条, "
+                            f"重复 {saved['duplicate_count']} 条"
+                        )
                     else:
                         logger.warning("⚠️ MongoDB不可用，搜索结果未保存")
                 except Exception as e:
                     logger.error(f"❌ 保存搜索结果到数据库失败: {e}")
                     # 失败不影响任务继续执行
             
-            # 更新任务统计
-            task.record_execution(
-                success=result_batch.success,
-                results_count=result_batch.returned_count,
-                credits_used=result_batch.credits_used
-            )
-            
             # 计算下次执行时间
             interval = ScheduleInterval.from_value(task.schedule_interval)
             trigger = CronTrigger.from_crontab(interval.cron_expression)
             next_run = trigger.get_next_fire_time(None, datetime.now())
-            if next_run:
-                task.next_run_time = next_run
-            
-            # 保存任务更新
-            await repo.update(task)
+
+            # 原子更新任务统计（$inc 计数 + $set 时间字段）
+            await repo.record_execution_stats(
+                task_id=task_id,
+                success=result_batch.success,
+                results_count=result_batch.returned_count,
+                credits_used=result_batch.credits_used,
+                executed_at=start_time,
+                next_run_time=next_run
+            )
             
             execution_time = (datetime.utcnow() - start_time).total_seconds()
             
@@ -363,10 +419,7 @@ class TaskSchedulerService(ITaskScheduler):
             # 记录失败
             try:
                 repo = await self._get_task_repository()
-                task = await repo.get_by_id(task_id)
-                if task:
-                    task.record_execution(success=False)
-                    await repo.update(task)
+                await repo.record_execution_stats(task_id=task_id, success=False, executed_at=start_time)
             except Exception as update_error:
                 logger.error(f"更新失败统计时出错: {update_error}")
 
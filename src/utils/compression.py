@@ -0,0 +1,85 @@
+"""文本压缩工具
+
+为大文本字段（HTML、完整Markdown）提供统一的压缩/解压接口
+
+编码:
+- zstd: 优先使用（需要 zstandard 包），压缩率和速度都优于 zlib
+- zlib: 标准库兜底，zstandard 未安装时使用
+
+压缩结果带有编码名称，解压时按编码名称选择算法，
+因此两种编码的数据可以在同一存储中共存
+"""
+
+import zlib
+from typing import Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+    logger.warning("⚠️ zstandard 未安装，文本压缩将使用 zlib")
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+
+def default_codec() -> str:
+    """当前环境的默认压缩编码"""
+    return CODEC_ZSTD if ZSTD_AVAILABLE else CODEC_ZLIB
+
+
+def compress_text(text: str, codec: str = None) -> Tuple[str, bytes]:
+    """
+    压缩文本
+
+    Args:
+        text: 原始文本
+        codec: 压缩编码（默认按环境选择）
+
+    Returns:
+        (codec, data): 实际使用的编码和压缩后的字节
+    """
+    codec = codec or default_codec()
+    raw = text.encode("utf-8")
+
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstandard 未安装，无法使用 zstd 编码")
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+
+    if codec == CODEC_ZLIB:
+        return codec, zlib.compress(raw, ZLIB_LEVEL)
+
+    raise ValueError(f"不支持的压缩编码: {codec}")
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """
+    解压文本
+
+    Args:
+        codec: 压缩编码
+        data: 压缩后的字节
+
+    Returns:
+        str: 原始文本
+    """
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstandard 未安装，无法解压 zstd 数据")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == CODEC_ZLIB:
+        raw = zlib.decompress(data)
+    else:
+        raise ValueError(f"不支持的压缩编码: {codec}")
+
+    return raw.decode("utf-8")
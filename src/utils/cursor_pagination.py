@@ -26,6 +26,15 @@ class CursorInfo(BaseModel):
     direction: int = -1           # 排序方向（1: 升序, -1: 降序）
 
 
+class KeysetCursorInfo(BaseModel):
+    """复合键游标信息（排序字段 + _id 决胜，排序字段可重复或为空）"""
+    field: str                    # 排序字段
+    value: Any                    # 最后一条记录的排序字段值（可能为 None）
+    last_id: Any                  # 最后一条记录的 _id
+    direction: int = -1           # 排序方向（1: 升序, -1: 降序）
+    is_datetime: bool = False     # value 是否为 datetime（编码时转为ISO字符串）
+
+
 class PaginationMeta(BaseModel):
     """分页元数据"""
     has_next: bool                # 是否有下一页
@@ -115,6 +124,130 @@ class CursorPaginator:
 
         return query
 
+    @staticmethod
+    def encode_keyset_cursor(cursor_info: KeysetCursorInfo) -> str:
+        """
+        编码复合键游标为Base64字符串
+
+        Args:
+            cursor_info: 复合键游标信息
+
+        Returns:
+            str: Base64编码的游标字符串
+        """
+        cursor_dict = cursor_info.model_dump()
+        if isinstance(cursor_dict['value'], datetime):
+            cursor_dict['value'] = cursor_dict['value'].isoformat()
+            cursor_dict['is_datetime'] = True
+
+        cursor_json = json.dumps(cursor_dict, ensure_ascii=False)
+        return base64.urlsafe_b64encode(cursor_json.encode('utf-8')).decode('utf-8')
+
+    @staticmethod
+    def decode_keyset_cursor(cursor_str: str) -> KeysetCursorInfo:
+        """
+        解码复合键游标
+
+        Args:
+            cursor_str: Base64编码的游标字符串
+
+        Returns:
+            KeysetCursorInfo: 复合键游标信息
+        """
+        try:
+            cursor_bytes = base64.urlsafe_b64decode(cursor_str.encode('utf-8'))
+            cursor_dict = json.loads(cursor_bytes.decode('utf-8'))
+
+            if cursor_dict.get('is_datetime') and cursor_dict.get('value') is not None:
+                cursor_dict['value'] = datetime.fromisoformat(cursor_dict['value'])
+
+            return KeysetCursorInfo(**cursor_dict)
+        except Exception as e:
+            raise ValueError(f"无效的游标: {e}")
+
+    @staticmethod
+    def build_keyset_filter(cursor_info: KeysetCursorInfo) -> Dict[str, Any]:
+        """
+        构建复合键游标的MongoDB过滤条件
+
+        排序为 (field, _id) 同向。MongoDB 中 null/缺失值排在最小端：
+        - 降序时 null 排在最后，非 null 游标之后仍需包含 null 分支
+        - 升序时 null 排在最前，null 游标之后需包含全部非 null 记录
+
+        Args:
+            cursor_info: 复合键游标信息
+
+        Returns:
+            dict: 可与基础过滤条件用 $and 组合的条件
+        """
+        field = cursor_info.field
+        value = cursor_info.value
+        last_id = cursor_info.last_id
+        op = "$lt" if cursor_info.direction == -1 else "$gt"
+
+        if value is None:
+            same_value_branch = {field: None, "_id": {op: last_id}}
+            if cursor_info.direction == -1:
+                return same_value_branch
+            return {"$or": [same_value_branch, {field: {"$ne": None}}]}
+
+        branches = [
+            {field: {op: value}},
+            {field: value, "_id": {op: last_id}}
+        ]
+        if cursor_info.direction == -1:
+            branches.append({field: None})
+
+        return {"$or": branches}
+
+    @staticmethod
+    def make_keyset_cursor(item: Dict[str, Any], sort_field: str, direction: int) -> str:
+        """根据当前页最后一条记录生成复合键游标"""
+        return CursorPaginator.encode_keyset_cursor(
+            KeysetCursorInfo(
+                field=sort_field,
+                value=item.get(sort_field),
+                last_id=item["_id"],
+                direction=direction
+            )
+        )
+
+    @staticmethod
+    def encode_merged_cursor(positions: Dict[str, Optional[str]]) -> str:
+        """
+        编码多来源合并游标
+
+        Args:
+            positions: 来源 -> 该来源的复合键游标（None 表示该来源从头开始）
+
+        Returns:
+            str: Base64编码的游标字符串
+        """
+        cursor_json = json.dumps({"positions": positions}, ensure_ascii=False, sort_keys=True)
+        return base64.urlsafe_b64encode(cursor_json.encode('utf-8')).decode('utf-8')
+
+    @staticmethod
+    def decode_merged_cursor(cursor_str: str) -> Dict[str, Optional[KeysetCursorInfo]]:
+        """
+        解码多来源合并游标
+
+        Returns:
+            dict: 来源 -> 复合键游标信息（None 表示该来源从头开始）
+        """
+        try:
+            cursor_bytes = base64.urlsafe_b64decode(cursor_str.encode('utf-8'))
+            positions = json.loads(cursor_bytes.decode('utf-8'))["positions"]
+        except Exception as e:
+            raise ValueError(f"无效的游标: {e}")
+
+        if not isinstance(positions, dict):
+            raise ValueError("无效的游标: positions 格式错误")
+
+        return {
+            source: CursorPaginator.decode_keyset_cursor(position) if position else None
+            for source, position in positions.items()
+        }
+
     @staticmethod
     async def paginate(
         collection,
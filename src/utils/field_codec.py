@@ -0,0 +1,151 @@
+"""文本字段静态压缩编解码层
+
+仓储在写入时把大文本字段（markdown_content、content、snippet 等）编码为压缩二进制，
+读取时只解码实际返回（被投影选中）的字段。默认关闭，通过 FIELD_COMPRESSION_ENABLED 开启。
+
+存储格式:
+- BSON Binary，子类型 0x80（用户自定义），作为"已压缩"格式标记
+- 第 1 字节为编码标记（b"Z" = zstd，b"L" = zlib），其后为压缩数据
+- 未压缩的历史数据仍是普通字符串，读取时原样返回，新旧数据可共存
+
+注意:
+- 压缩后的字段无法被 $text / $regex 等字符串查询匹配，只应用于不参与查询的正文字段
+- 短文本或压缩收益不足的文本保持原样
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from bson import Binary
+
+from src.config import settings
+from src.utils.compression import CODEC_ZLIB, CODEC_ZSTD, compress_text, decompress_text
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# BSON Binary 用户自定义子类型，用作压缩格式标记
+COMPRESSED_SUBTYPE = 0x80
+
+_CODEC_MARKERS = {CODEC_ZSTD: b"Z", CODEC_ZLIB: b"L"}
+_MARKER_CODECS = {marker: codec for codec, marker in _CODEC_MARKERS.items()}
+
+
+class FieldCodec:
+    """文本字段压缩编解码器（带压缩率和CPU耗时指标）"""
+
+    def __init__(self, enabled: bool, min_bytes: int):
+        self.enabled = enabled
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        self._metrics = {
+            "encoded_fields": 0,
+            "skipped_fields": 0,
+            "decoded_fields": 0,
+            "raw_bytes": 0,
+            "stored_bytes": 0,
+            "encode_seconds": 0.0,
+            "decode_seconds": 0.0
+        }
+
+    @staticmethod
+    def is_encoded(value: Any) -> bool:
+        """判断值是否为压缩格式"""
+        return isinstance(value, Binary) and value.subtype == COMPRESSED_SUBTYPE
+
+    def _record(self, **deltas: float) -> None:
+        """累加指标"""
+        with self._lock:
+            for key, delta in deltas.items():
+                self._metrics[key] += delta
+
+    def encode_value(self, value: Any) -> Any:
+        """
+        编码单个值
+
+        非字符串、长度不足或压缩无收益时原样返回
+        """
+        if not self.enabled or not isinstance(value, str):
+            return value
+
+        raw = value.encode("utf-8")
+        if len(raw) < self.min_bytes:
+            return value
+
+        start = time.perf_counter()
+        codec, data = compress_text(value)
+        elapsed = time.perf_counter() - start
+
+        if len(data) + 1 >= len(raw):
+            self._record(skipped_fields=1, encode_seconds=elapsed)
+            return value
+
+        self._record(
+            encoded_fields=1,
+            raw_bytes=len(raw),
+            stored_bytes=len(data) + 1,
+            encode_seconds=elapsed
+        )
+        return Binary(_CODEC_MARKERS[codec] + data, COMPRESSED_SUBTYPE)
+
+    def decode_value(self, value: Any) -> Any:
+        """解码单个值（非压缩格式原样返回，与是否开启无关）"""
+        if not self.is_encoded(value):
+            return value
+
+        payload = bytes(value)
+        codec = _MARKER_CODECS.get(payload[:1])
+        if codec is None:
+            raise ValueError(f"未知的压缩格式标记: {payload[:1]!r}")
+
+        start = time.perf_counter()
+        text = decompress_text(codec, payload[1:])
+        self._record(decoded_fields=1, decode_seconds=time.perf_counter() - start)
+        return text
+
+    def encode_document(self, doc: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+        """就地编码文档中的指定字段"""
+        if not self.enabled:
+            return doc
+
+        for field_name in fields:
+            if field_name in doc:
+                doc[field_name] = self.encode_value(doc[field_name])
+        return doc
+
+    def decode_document(self, doc: Optional[Dict[str, Any]], fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """就地解码文档中存在的指定字段（未被投影选中的字段不会出现在文档中，也就不会解码）"""
+        if not doc:
+            return doc
+
+        for field_name in fields:
+            if field_name in doc:
+                doc[field_name] = self.decode_value(doc[field_name])
+        return doc
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取压缩指标"""
+        with self._lock:
+            metrics = dict(self._metrics)
+
+        metrics["enabled"] = self.enabled
+        metrics["min_bytes"] = self.min_bytes
+        metrics["compression_ratio"] = (
+            metrics["stored_bytes"] / metrics["raw_bytes"] if metrics["raw_bytes"] else None
+        )
+        metrics["saved_bytes"] = metrics["raw_bytes"] - metrics["stored_bytes"]
+        metrics["avg_encode_ms"] = (
+            metrics["encode_seconds"] * 1000 / metrics["encoded_fields"] if metrics["encoded_fields"] else 0.0
+        )
+        metrics["avg_decode_ms"] = (
+            metrics["decode_seconds"] * 1000 / metrics["decoded_fields"] if metrics["decoded_fields"] else 0.0
+        )
+        return metrics
+
+
+# 全局实例
+field_codec = FieldCodec(
+    enabled=settings.FIELD_COMPRESSION_ENABLED,
+    min_bytes=settings.FIELD_COMPRESSION_MIN_BYTES
+)
@@ -0,0 +1,63 @@
+"""文本增量编码（行级）
+
+基于 difflib.SequenceMatcher 的行级差异，增量为 JSON 友好的操作列表：
+
+- ["=", n]: 保留基准文本接下来的 n 行
+- ["-", n]: 跳过（删除）基准文本接下来的 n 行
+- ["+", text]: 插入文本
+
+只保存插入的新文本，未修改的行以行数表示，适合 Markdown 报告的局部编辑。
+"""
+
+import difflib
+import json
+from typing import Any, List
+
+Delta = List[List[Any]]
+
+
+def make_delta(old_text: str, new_text: str) -> Delta:
+    """计算从 old_text 到 new_text 的增量"""
+    old_lines = old_text.splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
+
+    delta: Delta = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(["=", i2 - i1])
+            continue
+        if i2 > i1:
+            delta.append(["-", i2 - i1])
+        if j2 > j1:
+            delta.append(["+", "".join(new_lines[j1:j2])])
+    return delta
+
+
+def apply_delta(old_text: str, delta: Delta) -> str:
+    """在 old_text 上应用增量，基准文本与增量不匹配时抛出 ValueError"""
+    old_lines = old_text.splitlines(keepends=True)
+    parts: List[str] = []
+    position = 0
+
+    for op, value in delta:
+        if op == "=":
+            if position + value > len(old_lines):
+                raise ValueError("增量与基准文本不匹配")
+            parts.extend(old_lines[position:position + value])
+            position += value
+        elif op == "-":
+            position += value
+        elif op == "+":
+            parts.append(value)
+        else:
+            raise ValueError(f"未知的增量操作: {op}")
+
+    if position != len(old_lines):
+        raise ValueError("增量与基准文本不匹配")
+    return "".join(parts)
+
+
+def delta_size(delta: Delta) -> int:
+    """增量序列化后的字节数"""
+    return len(json.dumps(delta, ensure_ascii=False).encode("utf-8"))
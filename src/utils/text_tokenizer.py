@@ -0,0 +1,147 @@
+"""搜索分词工具
+
+为任务列表关键词搜索生成可索引的词元，写入时维护、查询时按词元精确匹配（可走多键索引）：
+
+- 中日韩文字: 单字 + 相邻二元组（bigram）；查询多于一个字时使用二元组，单字查询使用单字
+- 其他文字（拉丁字母、数字、缅甸文等）: 按词切分并转小写，索引时写入词的前缀（edge n-gram），
+  查询时使用完整词，从而支持前缀匹配（输入 "fire" 可匹配 "firecrawl"）
+- 前缀最长 MAX_PREFIX_LENGTH 个字符，更长的查询词截断后匹配
+
+查询命中条件：查询的全部词元都出现在文档词元中。
+
+全文检索（报告跨任务搜索）使用 analyze_terms()：中日韩文字切分为二元组（单字片段保留单字），
+其他文字按完整词切分，不生成前缀，保留重复以计算词频。
+关键词统计（报告分析、任务趋势桶）在此基础上用 is_keyword_term() 过滤停用词、纯数字和单字。
+"""
+
+import operator
+import re
+from typing import Iterable, List, Optional, Set
+
+# 单个词索引的最长前缀（限制每个词产生的词元数量）
+MAX_PREFIX_LENGTH = 16
+
+# 全文检索中单个词的最长长度（超出部分截断）
+MAX_TERM_LENGTH = 32
+
+# 名称中的词元命中权重（其他字段为 1）
+NAME_TOKEN_WEIGHT = 3
+
+# 停用词（常见虚词构成的二元组和英文停用词）
+STOP_TERMS = frozenset({
+    "的是", "是的", "了一", "一个", "我们", "他们", "你们", "这个", "那个", "以及", "已经", "没有",
+    "可以", "因为", "所以", "但是", "如果", "就是", "还是", "或者", "而且", "其中", "之一", "表示",
+    "进行", "通过", "对于", "关于", "目前", "此外", "同时", "不过", "这些", "那些", "什么", "如何",
+    "the", "and", "for", "that", "with", "this", "from", "are", "was", "were", "has", "have", "had",
+    "not", "but", "its", "they", "their", "will", "would", "can", "could", "been", "into", "about",
+    "more", "than", "also", "which", "who", "what", "when", "where", "how", "all", "any", "our",
+    "you", "your", "his", "her", "she", "him", "them", "there", "these", "those", "said", "after",
+    "http", "https", "www", "com"
+})
+
+# 中日韩文字范围：平假名/片假名、CJK 扩展A、CJK 统一表意文字、兼容表意文字、韩文音节
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+
+# 缅甸文的元音符号属于组合字符，不在 \w 中，需要显式包含
+_SEGMENT_PATTERN = re.compile(
+    rf"(?P<cjk>[{_CJK_RANGES}]+)|(?P<word>(?:[\u1000-\u109f]|(?![{_CJK_RANGES}])[^\W_])+)"
+)
+
+
+def _segments(text: Optional[str]):
+    """切分文本为 (类型, 片段)，类型为 cjk 或 word"""
+    if not text:
+        return
+    for match in _SEGMENT_PATTERN.finditer(text.lower()):
+        yield match.lastgroup, match.group()
+
+
+def index_tokens(*texts: Optional[str]) -> List[str]:
+    """
+    生成文档的索引词元（去重、排序）
+
+    Args:
+        texts: 需要索引的文本字段
+
+    Returns:
+        List[str]: 词元列表
+    """
+    tokens: Set[str] = set()
+    for text in texts:
+        for kind, segment in _segments(text):
+            if kind == "cjk":
+                tokens.update(segment)
+                tokens.update(segment[i:i + 2] for i in range(len(segment) - 1))
+            else:
+                word = segment[:MAX_PREFIX_LENGTH]
+                tokens.update(word[:length] for length in range(1, len(word) + 1))
+    return sorted(tokens)
+
+
+def query_tokens(text: Optional[str]) -> List[str]:
+    """
+    生成查询词元（去重，保持出现顺序）
+
+    Returns:
+        List[str]: 词元列表（查询中没有可索引字符时为空）
+    """
+    tokens: List[str] = []
+    for kind, segment in _segments(text):
+        if kind == "cjk":
+            if len(segment) == 1:
+                candidates = [segment]
+            else:
+                candidates = [segment[i:i + 2] for i in range(len(segment) - 1)]
+        else:
+            candidates = [segment[:MAX_PREFIX_LENGTH]]
+
+        for token in candidates:
+            if token not in tokens:
+                tokens.append(token)
+    return tokens
+
+
+def analyze_terms(text: Optional[str]) -> List[str]:
+    """
+    全文检索分词（保留重复，用于计算词频）
+
+    - 中日韩文字: 相邻二元组；单字片段保留单字
+    - 其他文字: 完整词（小写，最长 MAX_TERM_LENGTH 个字符）
+
+    文档与查询使用同一分词，查询时对结果去重即可
+    """
+    terms: List[str] = []
+    if not text:
+        return terms
+    # findall 返回 (cjk, word) 元组，未匹配的分组为空串；报告分析会对上万条数据项分词，避免逐片段的生成器开销
+    for cjk, word in _SEGMENT_PATTERN.findall(text.lower()):
+        if cjk:
+            if len(cjk) == 1:
+                terms.append(cjk)
+            else:
+                terms.extend(map(operator.add, cjk, cjk[1:]))
+        else:
+            terms.append(word[:MAX_TERM_LENGTH])
+    return terms
+
+
+def is_keyword_term(term: str) -> bool:
+    """是否作为关键词统计（过滤停用词、纯数字和单字）"""
+    return len(term) > 1 and not term.isdigit() and term not in STOP_TERMS
+
+
+def match_score(
+    tokens: Iterable[str],
+    name_tokens: Iterable[str],
+    all_tokens: Iterable[str]
+) -> int:
+    """
+    计算相关度得分：名称命中的词元按 NAME_TOKEN_WEIGHT 计分，所有字段命中的词元各计 1 分
+
+    与 MongoDB 聚合中的得分表达式保持一致
+    """
+    query_set = set(tokens)
+    return (
+        NAME_TOKEN_WEIGHT * len(query_set.intersection(name_tokens))
+        + len(query_set.intersection(all_tokens))
+    )
@@ -0,0 +1,73 @@
+"""即时搜索 single-flight 单元测试
+
+测试内容：
+- 搜索指纹的规范化（空白、大小写）
+- crawl_url 优先于 query
+- 有效配置参与指纹计算
+- 跟随者等待领导者超时
+"""
+
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.services.instant_search_service import InstantSearchService, build_search_fingerprint
+
+
+class TestSearchFingerprint:
+    """测试 build_search_fingerprint"""
+
+    def test_query_normalization(self):
+        """测试query首尾空白、连续空白和大小写不影响指纹"""
+        fp1 = build_search_fingerprint("Myanmar  Economy ", None, {})
+        fp2 = build_search_fingerprint("myanmar economy", None, None)
+
+        assert fp1 == fp2
+
+    def test_different_query(self):
+        """测试不同query生成不同指纹"""
+        fp1 = build_search_fingerprint("Myanmar economy", None, {})
+        fp2 = build_search_fingerprint("Myanmar politics", None, {})
+
+        assert fp1 != fp2
+
+    def test_crawl_url_takes_precedence(self):
+        """测试提供crawl_url时忽略query"""
+        fp1 = build_search_fingerprint("anything", "https://example.com/page", {})
+        fp2 = build_search_fingerprint(None, " https://example.com/page", {})
+
+        assert fp1 == fp2
+
+    def test_config_affects_fingerprint(self):
+        """测试有效配置不同时指纹不同"""
+        fp1 = build_search_fingerprint("Myanmar economy", None, {"language": "en"})
+        fp2 = build_search_fingerprint("Myanmar economy", None, {"language": "zh"})
+
+        assert fp1 != fp2
+
+    def test_config_key_order_irrelevant(self):
+        """测试配置键顺序不影响指纹"""
+        fp1 = build_search_fingerprint("q", None, {"limit": 10, "language": "en"})
+        fp2 = build_search_fingerprint("q", None, {"language": "en", "limit": 10})
+
+        assert fp1 == fp2
+
+
+class TestWaitForLeader:
+    """测试跟随者等待领导者"""
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self, monkeypatch):
+        """测试领导者超过等待时间未完成时返回 None（跟随者自行执行）"""
+        monkeypatch.setattr(settings, "INSTANT_SEARCH_LEADER_WAIT_TIMEOUT", 0.05)
+        fingerprint = build_search_fingerprint("Myanmar economy", None, {})
+        never_done = asyncio.get_running_loop().create_future()
+        monkeypatch.setitem(InstantSearchService._local_flights, fingerprint, ("leader-task", never_done))
+
+        leader_task = await asyncio.wait_for(
+            InstantSearchService()._wait_for_leader(fingerprint, "leader-task"),
+            timeout=1
+        )
+
+        assert leader_task is None
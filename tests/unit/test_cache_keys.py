@@ -0,0 +1,35 @@
+"""
+缓存键生成单元测试
+"""
+import hashlib
+
+from src.infrastructure.cache.redis_client import CacheKeyGenerator
+
+
+class TestCacheKeyGenerator:
+    """缓存键生成测试"""
+
+    def test_search_key_is_deterministic(self):
+        """测试搜索缓存键使用稳定摘要（不依赖进程随机化的 hash()）"""
+        key = CacheKeyGenerator.search_result("report-1", "缅甸 新闻", 50, generation=3)
+        expected_digest = hashlib.sha1("缅甸 新闻\x1f50".encode("utf-8")).hexdigest()[:20]
+
+        assert key == f"guanshan:search:report-1:g3:{expected_digest}"
+
+    def test_query_whitespace_normalized(self):
+        """测试查询文本的空白差异不产生不同的键"""
+        assert (
+            CacheKeyGenerator.search_result("r", "  缅甸   新闻 ", 50)
+            == CacheKeyGenerator.search_result("r", "缅甸 新闻", 50)
+        )
+
+    def test_generation_changes_key(self):
+        """测试递增代数后得到新的键（旧键不再命中）"""
+        assert (
+            CacheKeyGenerator.search_result("r", "新闻", 50, generation=1)
+            != CacheKeyGenerator.search_result("r", "新闻", 50, generation=2)
+        )
+
+    def test_limit_changes_key(self):
+        """测试不同结果数量使用不同的键"""
+        assert CacheKeyGenerator.search_result("r", "新闻", 20) != CacheKeyGenerator.search_result("r", "新闻", 50)
@@ -0,0 +1,40 @@
+"""
+文本压缩工具单元测试
+"""
+import pytest
+
+from src.utils.compression import (
+    CODEC_ZLIB,
+    compress_text,
+    decompress_text,
+    default_codec
+)
+
+
+class TestCompression:
+    """压缩/解压测试"""
+
+    def test_round_trip_default_codec(self):
+        """测试默认编码往返"""
+        text = "<html><body>" + "缅甸经济新闻 Myanmar economy " * 200 + "</body></html>"
+
+        codec, data = compress_text(text)
+
+        assert codec == default_codec()
+        assert len(data) < len(text.encode("utf-8"))
+        assert decompress_text(codec, data) == text
+
+    def test_round_trip_zlib(self):
+        """测试zlib编码往返（未安装zstandard时的兜底编码）"""
+        codec, data = compress_text("hello 世界", codec=CODEC_ZLIB)
+
+        assert codec == CODEC_ZLIB
+        assert decompress_text(codec, data) == "hello 世界"
+
+    def test_unknown_codec(self):
+        """测试不支持的编码"""
+        with pytest.raises(ValueError):
+            compress_text("text", codec="lz4")
+
+        with pytest.raises(ValueError):
+            decompress_text("lz4", b"data")
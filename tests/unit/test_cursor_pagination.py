@@ -0,0 +1,103 @@
+"""
+游标分页工具单元测试
+"""
+from datetime import datetime
+
+import pytest
+
+from src.utils.cursor_pagination import CursorPaginator, KeysetCursorInfo
+
+
+class TestKeysetCursor:
+    """复合键游标测试"""
+
+    def test_encode_decode_datetime(self):
+        """测试datetime值往返编码"""
+        info = KeysetCursorInfo(
+            field="created_at",
+            value=datetime(2025, 10, 1, 12, 30),
+            last_id="1849365782347890688",
+            direction=-1
+        )
+
+        decoded = CursorPaginator.decode_keyset_cursor(CursorPaginator.encode_keyset_cursor(info))
+
+        assert decoded.value == datetime(2025, 10, 1, 12, 30)
+        assert decoded.last_id == "1849365782347890688"
+        assert decoded.direction == -1
+
+    def test_encode_decode_none_value(self):
+        """测试空排序值（如published_date缺失）往返编码"""
+        info = KeysetCursorInfo(field="published_date", value=None, last_id="42", direction=1)
+
+        decoded = CursorPaginator.decode_keyset_cursor(CursorPaginator.encode_keyset_cursor(info))
+
+        assert decoded.value is None
+        assert decoded.field == "published_date"
+
+    def test_invalid_cursor(self):
+        """测试无效游标"""
+        with pytest.raises(ValueError):
+            CursorPaginator.decode_keyset_cursor("not-a-cursor")
+
+    def test_filter_descending(self):
+        """测试降序过滤条件包含null分支"""
+        info = KeysetCursorInfo(field="relevance_score", value=0.8, last_id="10", direction=-1)
+
+        query = CursorPaginator.build_keyset_filter(info)
+
+        assert query == {"$or": [
+            {"relevance_score": {"$lt": 0.8}},
+            {"relevance_score": 0.8, "_id": {"$lt": "10"}},
+            {"relevance_score": None}
+        ]}
+
+    def test_filter_ascending(self):
+        """测试升序过滤条件"""
+        info = KeysetCursorInfo(field="quality_score", value=0.5, last_id="10", direction=1)
+
+        query = CursorPaginator.build_keyset_filter(info)
+
+        assert query == {"$or": [
+            {"quality_score": {"$gt": 0.5}},
+            {"quality_score": 0.5, "_id": {"$gt": "10"}}
+        ]}
+
+    def test_filter_ascending_from_null(self):
+        """测试升序时从null值继续，包含全部非null记录"""
+        info = KeysetCursorInfo(field="published_date", value=None, last_id="10", direction=1)
+
+        query = CursorPaginator.build_keyset_filter(info)
+
+        assert query == {"$or": [
+            {"published_date": None, "_id": {"$gt": "10"}},
+            {"published_date": {"$ne": None}}
+        ]}
+
+
+class TestMergedCursor:
+    """多来源合并游标测试"""
+
+    def test_encode_decode_positions(self):
+        """测试各来源位置往返编码，未消费的来源保持None"""
+        info = KeysetCursorInfo(
+            field="created_at",
+            value=datetime(2025, 10, 1, 12, 30),
+            last_id="1849365782347890688",
+            direction=-1
+        )
+
+        cursor = CursorPaginator.encode_merged_cursor({
+            "scheduled": CursorPaginator.encode_keyset_cursor(info),
+            "instant": None
+        })
+        positions = CursorPaginator.decode_merged_cursor(cursor)
+
+        assert positions["instant"] is None
+        assert positions["scheduled"].value == datetime(2025, 10, 1, 12, 30)
+        assert positions["scheduled"].last_id == "1849365782347890688"
+
+    def test_invalid_merged_cursor(self):
+        """测试无效合并游标（包括旧格式游标）"""
+        with pytest.raises(ValueError):
+            CursorPaginator.decode_merged_cursor("scheduled:1849365782347890688:2025-10-01")
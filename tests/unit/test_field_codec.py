@@ -0,0 +1,65 @@
+"""
+文本字段压缩编解码单元测试
+"""
+from bson import Binary
+
+from src.utils.field_codec import FieldCodec, COMPRESSED_SUBTYPE
+
+
+class TestFieldCodec:
+    """FieldCodec测试"""
+
+    def test_round_trip(self):
+        """测试大文本压缩往返"""
+        codec = FieldCodec(enabled=True, min_bytes=64)
+        text = "缅甸经济发展报告，" * 200
+
+        encoded = codec.encode_value(text)
+
+        assert isinstance(encoded, Binary)
+        assert encoded.subtype == COMPRESSED_SUBTYPE
+        assert codec.decode_value(encoded) == text
+
+    def test_disabled_passthrough(self):
+        """测试未开启时原样存储"""
+        codec = FieldCodec(enabled=False, min_bytes=64)
+        text = "缅甸经济发展报告，" * 200
+
+        assert codec.encode_value(text) == text
+
+    def test_small_text_not_encoded(self):
+        """测试短文本不压缩"""
+        codec = FieldCodec(enabled=True, min_bytes=512)
+
+        assert codec.encode_value("short text") == "short text"
+
+    def test_legacy_string_decoded_as_is(self):
+        """测试历史未压缩数据原样读取"""
+        codec = FieldCodec(enabled=True, min_bytes=64)
+
+        assert codec.decode_value("plain legacy text") == "plain legacy text"
+        assert codec.decode_value(None) is None
+
+    def test_document_only_present_fields(self):
+        """测试只处理文档中存在的字段"""
+        codec = FieldCodec(enabled=True, min_bytes=64)
+        doc = {"content": "内容" * 200, "title": "标题"}
+
+        codec.encode_document(doc, ("content", "snippet"))
+        assert "snippet" not in doc
+        assert codec.is_encoded(doc["content"])
+
+        codec.decode_document(doc, ("content", "snippet"))
+        assert doc["content"] == "内容" * 200
+
+    def test_metrics(self):
+        """测试压缩指标"""
+        codec = FieldCodec(enabled=True, min_bytes=64)
+        codec.decode_value(codec.encode_value("重复内容" * 500))
+
+        metrics = codec.get_metrics()
+
+        assert metrics["encoded_fields"] == 1
+        assert metrics["decoded_fields"] == 1
+        assert metrics["compression_ratio"] < 1
+        assert metrics["saved_bytes"] > 0
@@ -0,0 +1,111 @@
+"""
+报告本地分析引擎单元测试
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.services.report_analysis_engine import (
+    analyze_items,
+    build_term_matrix,
+    document_terms,
+    tfidf_keywords
+)
+from src.services.report_generation_engine import GenerationCancelled
+from src.services.summary_report_service import AIAnalysisService
+
+
+def make_item(title, content, day=0, tags=()):
+    return {
+        "title": title,
+        "content": content,
+        "tags": list(tags),
+        "added_at": datetime(2024, 1, 1) + timedelta(days=day)
+    }
+
+
+class TestDocumentTerms:
+    """分词测试"""
+
+    def test_title_weighted_and_stop_terms_removed(self):
+        """测试标题词频加权，停用词、数字和单字被过滤"""
+        counts = document_terms("缅甸选举", "the election 2024 缅甸 a")
+
+        assert counts["缅甸"] == 4
+        assert counts["election"] == 1
+        assert "the" not in counts
+        assert "2024" not in counts
+        assert "a" not in counts
+
+    def test_tags_are_whole_terms(self):
+        """测试标签作为完整词项"""
+        counts = document_terms("", "", tags=["Firecrawl "])
+        assert counts["firecrawl"] > 0
+
+
+class TestKeywords:
+    """TF-IDF 关键词测试"""
+
+    def test_matrix_is_csr(self):
+        """测试矩阵行指针与词项数一致"""
+        matrix = build_term_matrix([document_terms("缅甸新闻", ""), document_terms("", "")])
+
+        assert matrix.document_count == 2
+        assert matrix.indptr[-1] == len(matrix.indices) == len(matrix.counts)
+        assert matrix.indptr[1] == matrix.indptr[2]
+
+    def test_shared_topic_ranks_first(self):
+        """测试多数文档共有的主题词排在前面"""
+        items = [make_item("仰光 地震", f"地震 救援 第{i}批 物资 抵达") for i in range(30)]
+        items += [make_item("其他", f"随机内容 word{i}") for i in range(5)]
+
+        keywords = [keyword["keyword"] for keyword in analyze_items(items, "keyword")["analysis_results"]["keywords"]]
+        assert keywords[0] in ("地震", "仰光")
+        # 文档较多时只出现一次的词项不参与排名
+        assert "word1" not in keywords
+
+    def test_deterministic_order(self):
+        """测试相同输入得到相同排序"""
+        matrix = build_term_matrix(document_terms(f"标题{i}", "共同 内容") for i in range(25))
+        assert tfidf_keywords(matrix) == tfidf_keywords(matrix)
+
+
+class TestTrend:
+    """趋势分析测试"""
+
+    def test_emerging_keyword_detected(self):
+        """测试近期集中出现的词项被识别为新兴关键词"""
+        items = [make_item("经济 新闻", "市场 平稳", day=i) for i in range(20)]
+        items += [make_item("经济 新闻", "洪水 灾情 扩大", day=20 + i) for i in range(10)]
+
+        results = analyze_items(items, "trend")["analysis_results"]
+
+        assert results["timeline"][0] == {"date": "2024-01-01", "count": 1}
+        assert len(results["timeline"]) == 30
+        assert results["emerging_keywords"][0]["keyword"] in ("洪水", "灾情", "情扩", "扩大")
+
+    def test_unknown_type_rejected(self):
+        """测试不支持的分析类型"""
+        with pytest.raises(ValueError):
+            analyze_items([], "sentiment")
+
+
+class TestAnalysisProgress:
+    """分析进度回调测试"""
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_analysis_discards_result(self):
+        """测试分析期间请求取消时，完成后的进度回调中止分析"""
+        stages = []
+
+        async def on_progress(progress):
+            stages.append(progress["stage"])
+            if progress["stage"] == "completed":
+                raise GenerationCancelled()
+
+        with pytest.raises(GenerationCancelled):
+            await AIAnalysisService().analyze_data(
+                "report-1", [make_item("经济 新闻", "市场 平稳")], "keyword", progress_callback=on_progress
+            )
+
+        assert stages == ["analyze", "completed"]
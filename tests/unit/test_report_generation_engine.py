@@ -0,0 +1,175 @@
+"""
+报告 map-reduce 生成引擎单元测试
+"""
+import asyncio
+
+import pytest
+
+from src.services.report_generation_engine import (
+    GenerationCancelled,
+    GenerationItem,
+    MapReduceGenerator,
+    StubLLMClient,
+    count_tokens,
+    pack_chunks,
+    truncate_to_tokens
+)
+
+
+class MemoryCache:
+    """内存调用缓存"""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get(self, cache_key):
+        return self.entries.get(cache_key)
+
+    async def put(self, cache_key, entry):
+        self.entries[cache_key] = dict(entry)
+
+
+class CountingClient(StubLLMClient):
+    """记录调用次数的本地 LLM（每次调用让出事件循环）"""
+
+    def __init__(self, fail_on_call=None):
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    async def complete(self, system, prompt, max_tokens):
+        self.calls += 1
+        call_number = self.calls
+        await asyncio.sleep(0.001)
+        if call_number == self.fail_on_call:
+            raise RuntimeError("LLM 调用失败")
+        return await super().complete(system, prompt, max_tokens)
+
+
+def make_items(count, start=0):
+    """构造数据项"""
+    return [
+        GenerationItem.from_content(
+            f"新闻{index}",
+            f"第{index}条新闻的正文内容。后续细节不进入摘要。" * 3,
+            f"https://example.com/{index}",
+            max_tokens=200
+        )
+        for index in range(start, start + count)
+    ]
+
+
+class TestChunking:
+    """token 计数与分块测试"""
+
+    def test_truncate_within_budget(self):
+        """测试截断后不超过预算"""
+        text = "缅甸新闻 " * 500
+        assert count_tokens(truncate_to_tokens(text, 50)) <= 50
+        assert truncate_to_tokens("短文本", 50) == "短文本"
+
+    def test_chunks_respect_budget_and_order(self):
+        """测试分块保持顺序且每块不超过预算"""
+        items = make_items(60)
+        chunks = pack_chunks(items, budget=300)
+
+        assert [item for chunk in chunks for item in chunk] == items
+        assert all(sum(item.tokens for item in chunk) <= 300 for chunk in chunks)
+        assert len(chunks) > 1
+
+    def test_appended_items_keep_earlier_chunks(self):
+        """测试追加数据项不改变前面的分块"""
+        items = make_items(60)
+        before = pack_chunks(items, budget=300)
+        after = pack_chunks(items + make_items(5, start=60), budget=300)
+
+        assert after[:len(before) - 1] == before[:-1]
+
+
+class TestMapReduceGenerator:
+    """map-reduce 生成测试"""
+
+    @pytest.mark.asyncio
+    async def test_stub_generation_is_deterministic(self):
+        """测试本地确定性 LLM 相同输入得到相同报告"""
+        items = make_items(40)
+        first = await MapReduceGenerator(StubLLMClient(), chunk_tokens=300, summary_tokens=100).generate(items)
+        second = await MapReduceGenerator(StubLLMClient(), chunk_tokens=300, summary_tokens=100).generate(items)
+
+        assert first.content == second.content
+        assert "新闻0" in first.content
+        assert first.usage["stage"] == "completed"
+        assert first.usage["prompt_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_regeneration_reuses_cached_chunks(self):
+        """测试追加数据项后只重新生成受影响的块"""
+        cache = MemoryCache()
+        items = make_items(60)
+        first = await MapReduceGenerator(
+            StubLLMClient(), cache_repo=cache, chunk_tokens=300, summary_tokens=100
+        ).generate(items)
+
+        second = await MapReduceGenerator(
+            StubLLMClient(), cache_repo=cache, chunk_tokens=300, summary_tokens=100
+        ).generate(items + make_items(5, start=60))
+
+        assert second.usage["cache_hits"] >= first.usage["total_chunks"] - 1
+        assert second.usage["llm_calls"] < first.usage["llm_calls"]
+
+    @pytest.mark.asyncio
+    async def test_progress_reported(self):
+        """测试进度回调收到块完成数"""
+        updates = []
+
+        async def record(progress):
+            updates.append(progress)
+
+        await MapReduceGenerator(
+            StubLLMClient(), progress_callback=record, chunk_tokens=300, summary_tokens=100
+        ).generate(make_items(20))
+
+        assert updates[0]["stage"] == "map"
+        assert updates[-1]["stage"] == "completed"
+        assert updates[-1]["completed_chunks"] == updates[-1]["total_chunks"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode_rejected(self):
+        """测试不支持的生成模式"""
+        with pytest.raises(ValueError):
+            await MapReduceGenerator(StubLLMClient()).generate(make_items(1), mode="poem")
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_remaining_chunks(self):
+        """测试进度回调取消后其余块不再调用 LLM，也不再回调进度"""
+        client = CountingClient()
+        updates = []
+
+        async def cancel_after_first_chunk(progress):
+            updates.append(progress)
+            if progress["completed_chunks"] >= 1:
+                raise GenerationCancelled()
+
+        generator = MapReduceGenerator(
+            client, progress_callback=cancel_after_first_chunk, chunk_tokens=300, summary_tokens=100, concurrency=2
+        )
+        with pytest.raises(GenerationCancelled):
+            await generator.generate(make_items(60))
+        calls, update_count = client.calls, len(updates)
+        await asyncio.sleep(0.05)
+
+        assert calls <= 3 < generator.progress["total_chunks"]
+        assert (client.calls, len(updates)) == (calls, update_count)
+
+    @pytest.mark.asyncio
+    async def test_chunk_failure_cancels_other_chunks(self):
+        """测试单个块失败时取消其余块"""
+        client = CountingClient(fail_on_call=1)
+        generator = MapReduceGenerator(client, chunk_tokens=300, summary_tokens=100, concurrency=2)
+
+        with pytest.raises(RuntimeError):
+            await generator.generate(make_items(60))
+        calls = client.calls
+        await asyncio.sleep(0.05)
+
+        assert calls <= 2
+        assert client.calls == calls
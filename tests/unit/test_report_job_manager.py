@@ -0,0 +1,250 @@
+"""
+报告后台作业管理单元测试
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from src.core.domain.entities.summary_report import SummaryReportJob
+from src.services.report_job_manager import ReportJobManager
+
+
+class MemoryJobRepository:
+    """内存作业仓储（与 SummaryReportJobRepository 接口一致）"""
+
+    def __init__(self):
+        self.jobs = {}
+
+    def _claimable(self, job, stale_before):
+        return job.active and (job.owner is None or job.heartbeat_at < stale_before)
+
+    async def create(self, job):
+        if await self.find_active(job.report_id, job.job_type, job.job_key):
+            raise DuplicateKeyError("duplicate active job")
+        self.jobs[job.job_id] = job.model_copy()
+        return job
+
+    async def find_by_id(self, job_id):
+        job = self.jobs.get(job_id)
+        return job.model_copy() if job else None
+
+    async def find_active(self, report_id, job_type, job_key=None):
+        for job in self.jobs.values():
+            if (job.report_id, job.job_type, job.job_key) == (report_id, job_type, job_key) and job.active:
+                return job.model_copy()
+        return None
+
+    async def find_by_report(self, report_id, limit=20):
+        return [job.model_copy() for job in self.jobs.values() if job.report_id == report_id][:limit]
+
+    async def find_claimable(self, stale_before, limit=100):
+        return [job.job_id for job in self.jobs.values() if self._claimable(job, stale_before)][:limit]
+
+    async def claim(self, job_id, owner, stale_before):
+        job = self.jobs.get(job_id)
+        if job is None or not self._claimable(job, stale_before):
+            return None
+        job.owner, job.status, job.heartbeat_at = owner, "running", datetime.utcnow()
+        job.attempts += 1
+        return job.model_copy()
+
+    async def update_progress(self, job_id, progress):
+        job = self.jobs[job_id]
+        job.progress, job.heartbeat_at = progress, datetime.utcnow()
+        return job.cancel_requested
+
+    async def heartbeat(self, job_ids, owner):
+        for job_id in job_ids:
+            self.jobs[job_id].heartbeat_at = datetime.utcnow()
+
+    async def request_cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or not job.active:
+            return False
+        job.cancel_requested = True
+        return True
+
+    async def cancel_unclaimed(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or not job.active or job.owner is not None:
+            return False
+        job.status, job.active, job.cancel_requested = "cancelled", None, True
+        return True
+
+    async def finish(self, job_id, status, result=None, error=None):
+        job = self.jobs[job_id]
+        job.status, job.active, job.owner, job.result, job.error = status, None, None, result, error
+
+    async def release(self, job_ids, owner):
+        for job_id in job_ids:
+            job = self.jobs[job_id]
+            job.status, job.owner, job.heartbeat_at = "queued", None, None
+        return len(job_ids)
+
+
+class SteppedRunner:
+    """每次放行一步进度的作业执行函数"""
+
+    def __init__(self, steps=3):
+        self.steps = steps
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def __call__(self, job, on_progress):
+        self.calls += 1
+        for step in range(self.steps):
+            await self.release.wait()
+            await on_progress({"completed_chunks": step + 1, "total_chunks": self.steps})
+        return {"steps": self.steps}
+
+
+async def wait_for_status(repo, job_id, status):
+    """等待作业进入指定状态"""
+    for _ in range(200):
+        if repo.jobs[job_id].status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"作业未进入 {status} 状态: {repo.jobs[job_id].status}")
+
+
+def make_manager(repo, runner, max_workers=1):
+    return ReportJobManager(
+        max_workers=max_workers,
+        heartbeat_interval=60,
+        event_poll_interval=0.05,
+        job_repo=repo,
+        runners={"generate": runner, "analysis": runner}
+    )
+
+
+class TestReportJobManager:
+    """报告作业管理测试"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_submit_attaches_to_active_job(self):
+        """测试同一报告重复提交复用活跃作业"""
+        repo = MemoryJobRepository()
+        runner = SteppedRunner()
+        manager = make_manager(repo, runner)
+
+        first, created = await manager.submit("r1", "generate")
+        second, attached_created = await manager.submit("r1", "generate")
+        assert created and not attached_created
+        assert second.job_id == first.job_id
+
+        runner.release.set()
+        await wait_for_status(repo, first.job_id, "completed")
+        assert runner.calls == 1
+        assert repo.jobs[first.job_id].result == {"steps": 3}
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_analysis_jobs_deduped_by_analysis_type(self):
+        """测试不同分析类型的作业不互相复用，同一分析类型复用活跃作业"""
+        repo = MemoryJobRepository()
+        runner = SteppedRunner()
+        manager = make_manager(repo, runner)
+
+        trend, _ = await manager.submit("r1", "analysis", {"analysis_type": "trend"})
+        keyword, keyword_created = await manager.submit("r1", "analysis", {"analysis_type": "keyword"})
+        again, again_created = await manager.submit("r1", "analysis", {"analysis_type": "keyword"})
+
+        assert keyword_created and keyword.job_id != trend.job_id
+        assert not again_created and again.job_id == keyword.job_id
+        assert repo.jobs[keyword.job_id].params == {"analysis_type": "keyword"}
+
+        runner.release.set()
+        await wait_for_status(repo, keyword.job_id, "completed")
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_job_at_next_progress(self):
+        """测试执行中的作业在下一次进度回调时取消"""
+        repo = MemoryJobRepository()
+        runner = SteppedRunner()
+        manager = make_manager(repo, runner)
+
+        job, _ = await manager.submit("r1", "generate")
+        await wait_for_status(repo, job.job_id, "running")
+        await manager.cancel(job.job_id)
+        runner.release.set()
+
+        await wait_for_status(repo, job.job_id, "cancelled")
+        assert repo.jobs[job.job_id].active is None
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job(self):
+        """测试排队中的作业立即取消，不再执行"""
+        repo = MemoryJobRepository()
+        runner = SteppedRunner()
+        manager = make_manager(repo, runner)
+
+        running, _ = await manager.submit("r1", "generate")
+        queued, _ = await manager.submit("r2", "generate")
+        await wait_for_status(repo, running.job_id, "running")
+
+        cancelled = await manager.cancel(queued.job_id)
+        assert cancelled.status == "cancelled"
+
+        runner.release.set()
+        await wait_for_status(repo, running.job_id, "completed")
+        assert runner.calls == 1
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_released_job_resumed_by_new_manager(self):
+        """测试关闭时释放的作业由重启后的管理器继续执行"""
+        repo = MemoryJobRepository()
+        runner = SteppedRunner()
+        manager = make_manager(repo, runner)
+
+        job, _ = await manager.submit("r1", "generate")
+        await wait_for_status(repo, job.job_id, "running")
+        await manager.shutdown()
+        assert repo.jobs[job.job_id].status == "queued"
+
+        restarted = make_manager(repo, runner)
+        runner.release.set()
+        await restarted.start()
+        await wait_for_status(repo, job.job_id, "completed")
+        assert repo.jobs[job.job_id].attempts == 2
+        await restarted.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_events_stream_until_finished(self):
+        """测试事件订阅推送进度并在作业结束后停止"""
+        repo = MemoryJobRepository()
+        runner = SteppedRunner(steps=2)
+        manager = make_manager(repo, runner)
+
+        job, _ = await manager.submit("r1", "generate")
+        await wait_for_status(repo, job.job_id, "running")
+
+        async def collect():
+            return [event["event"] async for event in manager.events(job.job_id)]
+
+        collector = asyncio.create_task(collect())
+        await asyncio.sleep(0.01)
+        runner.release.set()
+        events = await asyncio.wait_for(collector, timeout=2)
+
+        assert events[0] == "status"
+        assert events.count("progress") == 2
+        assert events[-1] == "completed"
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_type_rejected(self):
+        """测试不支持的作业类型"""
+        manager = make_manager(MemoryJobRepository(), SteppedRunner())
+        with pytest.raises(ValueError):
+            await manager.submit("r1", "translate")
+
+    def test_job_defaults(self):
+        """测试新作业默认处于排队且活跃状态"""
+        job = SummaryReportJob(report_id="r1")
+        assert job.status == "queued"
+        assert job.active is True
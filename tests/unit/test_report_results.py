@@ -0,0 +1,79 @@
+"""
+报告结果列表（即时结果按映射读取）单元测试
+"""
+from datetime import datetime
+
+import pytest
+
+from src.infrastructure.database.report_search_index_repository import SOURCE_INSTANT
+from src.services.summary_report_service import SummaryReportService
+
+
+class FakeCursor:
+    """异步游标"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeMappings:
+    """返回预设聚合结果并记录管道的映射集合"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.rows)
+
+
+class FakeResults:
+    """按 _id 查询的结果集合"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        return FakeCursor([doc for doc in self.docs if doc["_id"] in query["_id"]["$in"]])
+
+
+class FakeDatabase:
+    def __init__(self, mappings, results):
+        self.instant_search_result_mappings = mappings
+        self.instant_search_results = results
+
+
+class TestInstantReportResults:
+    """即时结果按映射分页测试"""
+
+    @pytest.mark.asyncio
+    async def test_rows_follow_mappings(self):
+        """测试结果归属映射的任务、时间取首次发现时间，结果已删除时仍保留映射行"""
+        found_at = datetime(2025, 1, 2)
+        mappings = FakeMappings([
+            {"_id": "r1", "task_id": "t2", "created_at": found_at},
+            {"_id": "r2", "task_id": "t2", "created_at": datetime(2025, 1, 1)}
+        ])
+        results = FakeResults([{"_id": "r1", "task_id": "t1", "title": "标题", "created_at": datetime(2024, 12, 1)}])
+        service = SummaryReportService()
+        service.db = FakeDatabase(mappings, results)
+
+        rows = await service._fetch_report_results(SOURCE_INSTANT, ["t2"], None, 10)
+
+        assert [(row["_id"], row["task_id"], row["created_at"]) for row in rows] == [
+            ("r1", "t2", found_at), ("r2", "t2", datetime(2025, 1, 1))
+        ]
+        assert rows[0]["title"] == "标题"
+        assert mappings.pipelines[0][0] == {"$match": {"task_id": {"$in": ["t2"]}}}
+        assert mappings.pipelines[0][-2:] == [{"$sort": {"created_at": -1, "_id": -1}}, {"$limit": 11}]
@@ -0,0 +1,105 @@
+"""
+报告跨任务全文搜索（分词 + BM25）单元测试
+"""
+import pytest
+
+from src.infrastructure.database.report_search_index_repository import (
+    SOURCE_SCHEDULED, IndexDocument, ReportSearchIndexRepository
+)
+from src.services.report_search_service import bm25_idf, bm25_term_score
+from src.utils.text_tokenizer import analyze_terms
+
+
+class TestAnalyzeTerms:
+    """全文检索分词测试"""
+
+    def test_chinese_bigrams(self):
+        """测试中文切分为二元组，单字片段保留单字"""
+        assert analyze_terms("缅甸新闻") == ["缅甸", "甸新", "新闻"]
+        assert analyze_terms("新 闻") == ["新", "闻"]
+
+    def test_words_keep_duplicates(self):
+        """测试拉丁词转小写、保留重复以计算词频"""
+        assert analyze_terms("Myanmar news, myanmar") == ["myanmar", "news", "myanmar"]
+
+    def test_mixed_text(self):
+        """测试中英文混合文本"""
+        assert analyze_terms("Firecrawl抓取") == ["firecrawl", "抓取"]
+
+
+class TestBM25:
+    """BM25 计分测试"""
+
+    def test_rare_term_has_higher_idf(self):
+        """测试少见词的逆文档频率更高且非负"""
+        assert bm25_idf(1000, 5) > bm25_idf(1000, 500)
+        assert bm25_idf(1000, 1000) >= 0
+
+    def test_term_frequency_saturates(self):
+        """测试词频增长带来的得分增量递减"""
+        idf = bm25_idf(1000, 10)
+        one = bm25_term_score(idf, 1, 100, 100.0)
+        two = bm25_term_score(idf, 2, 100, 100.0)
+        ten = bm25_term_score(idf, 10, 100, 100.0)
+        assert one < two < ten
+        assert two - one > (ten - two) / 8
+
+    def test_longer_document_scores_lower(self):
+        """测试相同词频时长文档得分更低"""
+        idf = bm25_idf(1000, 10)
+        assert bm25_term_score(idf, 3, 50, 100.0) > bm25_term_score(idf, 3, 500, 100.0)
+
+
+class FakeDocsCollection:
+    """已索引文档集合"""
+
+    def __init__(self):
+        self.ids = set()
+
+    async def insert_many(self, records, ordered=True):
+        self.ids.update(record["_id"] for record in records)
+
+    async def delete_many(self, query):
+        self.ids.difference_update(query["_id"]["$in"])
+
+
+class FailingCollection:
+    """写入总是失败的集合（记录失败后清理倒排的调用）"""
+
+    def __init__(self):
+        self.removed = []
+
+    async def bulk_write(self, operations, ordered=True):
+        raise RuntimeError("写入倒排失败")
+
+    async def update_many(self, query, pipeline):
+        self.removed.append((query, pipeline))
+
+
+class TestIndexDocuments:
+    """增量索引测试"""
+
+    @pytest.mark.asyncio
+    async def test_postings_failure_unregisters_documents(self):
+        """测试写倒排失败时撤销文档登记，之后可以重新索引"""
+        docs = FakeDocsCollection()
+        postings = FailingCollection()
+        repo = ReportSearchIndexRepository()
+
+        async def get_collections():
+            return docs, postings, FailingCollection()
+
+        repo._get_collections = get_collections
+
+        with pytest.raises(RuntimeError):
+            await repo.index_documents(SOURCE_SCHEDULED, [
+                IndexDocument("t1", "d1", "缅甸地震", "救援进展"),
+                IndexDocument("t2", "d2", "缅甸地震", "救援进展")
+            ])
+
+        # 部分写入的倒排按任务删除后才撤销登记，重新索引时不会重复
+        assert [query for query, _ in postings.removed] == [
+            {"source": SOURCE_SCHEDULED, "task_id": "t1", "doc_ids": {"$in": ["d1"]}},
+            {"source": SOURCE_SCHEDULED, "task_id": "t2", "doc_ids": {"$in": ["d2"]}}
+        ]
+        assert docs.ids == set()
@@ -0,0 +1,53 @@
+"""
+定时搜索结果跨执行去重单元测试
+"""
+import pytest
+
+from src.core.domain.entities.search_result import SearchResult
+from src.infrastructure.database.memory_repositories import InMemorySearchResultRepository
+
+
+def make_result(url: str, content: str = "内容") -> SearchResult:
+    """创建测试结果"""
+    return SearchResult(task_id="task-1", title="标题", url=url, content=content)
+
+
+class TestContentHash:
+    """内容哈希测试"""
+
+    def test_same_content_same_hash(self):
+        """测试相同内容生成相同哈希（与结果ID无关）"""
+        assert make_result("https://a.com").compute_content_hash() == \
+            make_result("https://a.com").compute_content_hash()
+
+    def test_different_content_different_hash(self):
+        """测试内容变化生成不同哈希"""
+        assert make_result("https://a.com", "v1").compute_content_hash() != \
+            make_result("https://a.com", "v2").compute_content_hash()
+
+
+class TestCrossRunDedup:
+    """跨执行去重测试（内存仓储）"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_run_only_updates_seen_info(self):
+        """测试重复执行不新增结果，只更新发现信息"""
+        repo = InMemorySearchResultRepository()
+
+        first = await repo.save_results([make_result("https://a.com"), make_result("https://b.com")], "exec-1")
+        second_batch = [make_result("https://a.com"), make_result("https://c.com")]
+        second = await repo.save_results(second_batch, "exec-2")
+
+        assert first["new_count"] == 2
+        assert second["new_count"] == 1
+        assert second["duplicate_count"] == 1
+
+        results, total = await repo.get_results_by_task("task-1")
+        assert total == 3
+
+        repeated = next(r for r in results if r.url == "https://a.com")
+        assert repeated.seen_count == 2
+        assert repeated.first_execution_id == "exec-1"
+        assert repeated.last_execution_id == "exec-2"
+        # 重复结果的实体ID替换为已存在结果的ID
+        assert second_batch[0].id == repeated.id
@@ -0,0 +1,111 @@
+"""
+即时搜索结果页缓存单元测试
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.infrastructure.cache import result_page_cache as module
+from src.infrastructure.cache.result_page_cache import ResultPageCache
+
+
+class FakeRedis:
+    """内存中的 Redis 哈希（模拟多个进程共享的 L2）"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hget_raw(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hset_raw(self, key, field, value, ttl=None):
+        self.hashes.setdefault(key, {})[field] = value
+        return True
+
+    async def delete(self, key):
+        return self.hashes.pop(key, None) is not None
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """替换模块使用的 Redis 客户端"""
+    redis = FakeRedis()
+    monkeypatch.setattr(module, "redis_client", redis)
+    return redis
+
+
+def make_page():
+    """创建测试结果页"""
+    return {"results": [{"result": {"title": "标题"}, "found_at": datetime(2025, 1, 1)}], "total": 1}
+
+
+class TestResultPageCache:
+    """结果页缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_local_and_redis_hits_return_same_types(self, fake_redis):
+        """测试 L1 与 Redis 命中都返回 JSON 反序列化后的值"""
+        writer = ResultPageCache(max_entries=10, ttl=60, local_ttl=60)
+        reader = ResultPageCache(max_entries=10, ttl=60, local_ttl=60)
+        await writer.set("exec-1", 1, 20, make_page())
+
+        local_page = await writer.get("exec-1", 1, 20)
+        redis_page = await reader.get("exec-1", 1, 20)
+
+        assert local_page == redis_page
+        assert local_page["results"][0]["found_at"] == "2025-01-01 00:00:00"
+        assert writer.get_stats()["local_hits"] == 1
+        assert reader.get_stats()["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hits_return_copies(self, fake_redis):
+        """测试修改返回值不影响缓存"""
+        cache = ResultPageCache(max_entries=10, ttl=60, local_ttl=60)
+        page = make_page()
+        await cache.set("exec-1", 1, 20, page)
+
+        page["total"] = 99
+        first = await cache.get("exec-1", 1, 20)
+        first["results"][0]["result"]["title"] = "已修改"
+        second = await cache.get("exec-1", 1, 20)
+
+        assert second["total"] == 1
+        assert second["results"][0]["result"]["title"] == "标题"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_local_and_redis(self, fake_redis):
+        """测试失效同时清理本进程 L1 和 Redis"""
+        cache = ResultPageCache(max_entries=10, ttl=60, local_ttl=60)
+        await cache.set("exec-1", 1, 20, make_page())
+        await cache.set("exec-1", 2, 20, make_page())
+
+        assert await cache.invalidate("exec-1") == 2
+        assert await cache.get("exec-1", 1, 20) is None
+        assert fake_redis.hashes == {}
+
+    @pytest.mark.asyncio
+    async def test_other_process_invalidation_after_local_ttl(self, fake_redis):
+        """测试其他进程失效后，本进程 L1 条目在 local_ttl 后过期"""
+        worker = ResultPageCache(max_entries=10, ttl=60, local_ttl=0.05)
+        other = ResultPageCache(max_entries=10, ttl=60, local_ttl=0.05)
+        await worker.set("exec-1", 1, 20, make_page())
+
+        await other.invalidate("exec-1")
+        assert await worker.get("exec-1", 1, 20) is not None
+
+        await asyncio.sleep(0.06)
+        assert await worker.get("exec-1", 1, 20) is None
+        assert worker.get_stats()["local_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, fake_redis):
+        """测试超过容量时淘汰最久未使用的条目"""
+        cache = ResultPageCache(max_entries=2, ttl=60, local_ttl=60)
+        await cache.set("exec-1", 1, 20, make_page())
+        await cache.set("exec-2", 1, 20, make_page())
+        await cache.get("exec-1", 1, 20)
+        await cache.set("exec-3", 1, 20, make_page())
+
+        assert set(cache._local) == {("exec-1", 1, 20), ("exec-3", 1, 20)}
+        assert "exec-2" not in cache._keys_by_execution
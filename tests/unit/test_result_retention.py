@@ -0,0 +1,65 @@
+"""
+搜索结果保留与归档单元测试
+"""
+from datetime import datetime
+
+from bson import Binary
+
+from src.core.domain.entities.result_retention import (
+    ArchiveTarget, ResultRetentionPolicy, archive_collection_name, archive_month
+)
+from src.infrastructure.database.result_archive_repositories import read_jsonl_gz, write_jsonl_gz
+
+
+class TestArchiveNaming:
+    """归档月份与集合命名测试"""
+
+    def test_archive_month(self):
+        """测试按创建时间计算归档月份"""
+        assert archive_month(datetime(2025, 3, 31, 23, 59)) == "202503"
+
+    def test_archive_collection_name(self):
+        """测试月度归档集合名称"""
+        assert archive_collection_name("202503") == "search_results_archive_202503"
+
+
+class TestResultRetentionPolicy:
+    """保留策略实体测试"""
+
+    def test_round_trip(self):
+        """测试策略存储往返"""
+        policy = ResultRetentionPolicy(task_id="123", hot_days=30, archive_target=ArchiveTarget.JSONL)
+
+        restored = ResultRetentionPolicy.from_dict(policy.to_dict())
+
+        assert restored.task_id == "123"
+        assert restored.hot_days == 30
+        assert restored.archive_target == ArchiveTarget.JSONL
+        assert restored.enabled is True
+
+
+class TestJsonlArchive:
+    """JSONL.gz 归档文件测试"""
+
+    def test_round_trip_preserves_types(self, tmp_path):
+        """测试 datetime 和压缩二进制字段往返后类型不变"""
+        docs = [
+            {
+                "_id": "1001",
+                "task_id": "123",
+                "created_at": datetime(2025, 1, 2, 3, 4, 5),
+                "content": Binary(b"Zcompressed", 0x80),
+                "relevance_score": 0.75
+            },
+            {"_id": "1002", "task_id": "123", "created_at": datetime(2025, 1, 3), "content": "正文"}
+        ]
+        path = tmp_path / "123" / "202501" / "seg.jsonl.gz"
+
+        size = write_jsonl_gz(path, docs)
+        restored = read_jsonl_gz(path)
+
+        assert size > 0
+        assert not path.with_name(path.name + ".tmp").exists()
+        assert restored[0]["created_at"] == datetime(2025, 1, 2, 3, 4, 5)
+        assert restored[0]["content"] == Binary(b"Zcompressed", 0x80)
+        assert restored[1]["content"] == "正文"
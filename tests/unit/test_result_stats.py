@@ -0,0 +1,72 @@
+"""
+搜索结果物化统计单元测试
+"""
+import pytest
+
+from src.infrastructure.database import repositories
+from src.infrastructure.database.repositories import SearchResultStatsRepository
+
+
+class FakeAggregation:
+    """聚合结果"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class FakeResults:
+    """没有任何结果的 search_results"""
+
+    def aggregate(self, pipeline):
+        return FakeAggregation([{"totals": [], "status_counts": [], "source_counts": [], "language_counts": []}])
+
+
+class FakeStats:
+    """记录替换写入的统计集合"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def replace_one(self, filter_dict, doc, upsert=False):
+        self.docs[filter_dict["_id"]] = doc
+
+    async def find_one(self, filter_dict):
+        return self.docs.get(filter_dict["_id"])
+
+
+class FakeDatabase:
+    """按名称返回集合的数据库"""
+
+    def __init__(self, stats: FakeStats):
+        self.search_results = FakeResults()
+        self.stats = stats
+
+    def __getitem__(self, name):
+        assert name == "search_result_stats"
+        return self.stats
+
+
+class TestRebuildTaskStats:
+    """统计重建测试"""
+
+    @pytest.mark.asyncio
+    async def test_empty_task_keeps_zeroed_document(self, monkeypatch):
+        """测试没有结果的任务保存全零统计，读取时不再重建"""
+        database = FakeDatabase(FakeStats())
+
+        async def get_database():
+            return database
+
+        monkeypatch.setattr(repositories, "get_mongodb_database", get_database)
+        repo = SearchResultStatsRepository()
+
+        doc = await repo.rebuild_task_stats("task-1")
+        stored = await repo.get_task_stats("task-1")
+
+        assert doc["total_results"] == 0
+        assert stored is not None
+        assert stored["status_counts"] == {}
+        assert stored["relevance_sum"] == 0.0
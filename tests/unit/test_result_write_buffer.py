@@ -0,0 +1,264 @@
+"""
+搜索结果写后缓冲单元测试
+"""
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from src.config import settings
+from src.core.domain.entities.search_result import SearchResult
+from src.infrastructure.database.repositories import SearchResultRepository
+from src.infrastructure.database.result_write_buffer import (
+    PartialResultWriteError, PendingResultWrite, ResultWriteBuffer
+)
+
+
+class RecordingFlush:
+    """记录每次刷新的写入函数"""
+
+    def __init__(self, fail_execution_ids=()):
+        self.calls = []
+        self.fail_execution_ids = set(fail_execution_ids)
+
+    async def __call__(self, writes):
+        self.calls.append([write.execution_id for write in writes])
+        if any(write.execution_id in self.fail_execution_ids for write in writes):
+            raise RuntimeError("写入失败")
+        return [{"new_count": len(write.results), "execution_id": write.execution_id} for write in writes]
+
+
+class FakeCursor:
+    """异步遍历的查询结果"""
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeResultCollection:
+    """只支持 persist_writes 所需操作的结果集合（bulk_write 可设置为抛出指定异常）"""
+
+    def __init__(self):
+        self.docs = {}
+        self.insert_error = None
+        self.bulk_write_error = None
+        self.insert_calls = 0
+        self.bulk_write_calls = 0
+
+    def find(self, query, projection=None):
+        hashes = set(query["content_hash"]["$in"])
+        return FakeCursor(
+            doc for doc in self.docs.values()
+            if doc["task_id"] == query["task_id"] and doc["content_hash"] in hashes
+        )
+
+    async def insert_many(self, docs, ordered=True):
+        self.insert_calls += 1
+        if self.insert_error is not None:
+            raise self.insert_error
+        for doc in docs:
+            self.docs[doc["_id"]] = dict(doc)
+
+    async def distinct(self, field, query):
+        return [doc_id for doc_id in query["_id"]["$in"] if doc_id in self.docs]
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_write_calls += 1
+        if self.bulk_write_error is not None:
+            raise self.bulk_write_error
+
+
+class RecordingStats:
+    """记录增量统计调用"""
+
+    def __init__(self):
+        self.applied = []
+
+    async def apply_results(self, result_dicts):
+        self.applied.extend(d["_id"] for d in result_dicts)
+
+
+class RecordingMappings:
+    """记录执行映射写入"""
+
+    build_mappings = staticmethod(lambda execution_id, results, new_ids, seen_at: [])
+
+    async def insert_many(self, mappings):
+        return None
+
+
+class RecordingBlobs:
+    """记录内容块引用的写入与释放"""
+
+    def __init__(self):
+        self.released = {}
+
+    async def put_many(self, texts):
+        return [f"blob-{index}" for index, _ in enumerate(texts)]
+
+    async def release(self, counts):
+        for ref, count in counts.items():
+            self.released[ref] = self.released.get(ref, 0) + count
+
+
+def make_repository(collection: FakeResultCollection) -> SearchResultRepository:
+    """创建使用假集合的结果仓储"""
+    repo = SearchResultRepository()
+
+    async def get_collection():
+        return collection
+
+    repo._get_collection = get_collection
+    repo.stats_repo = RecordingStats()
+    repo.execution_map_repo = RecordingMappings()
+    repo.blob_repo = RecordingBlobs()
+    return repo
+
+
+def make_result(url: str, html_content: str = None) -> SearchResult:
+    """创建测试结果"""
+    return SearchResult(task_id="task-1", title="标题", url=url, content="内容", html_content=html_content)
+
+
+def make_write(execution_id: str, count: int = 2) -> PendingResultWrite:
+    """创建测试提交"""
+    return PendingResultWrite(results=[object()] * count, execution_id=execution_id)
+
+
+class TestResultWriteBuffer:
+    """写后缓冲测试"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_coalesced(self):
+        """测试并发提交合并为一次刷新，各自拿到自己的摘要"""
+        flush = RecordingFlush()
+        buffer = ResultWriteBuffer(max_batch=100, max_delay=0.05, max_pending=1000, flush_function=flush)
+
+        summaries = await asyncio.gather(*(buffer.submit(make_write(f"exec-{i}")) for i in range(5)))
+
+        assert len(flush.calls) == 1
+        assert [s["execution_id"] for s in summaries] == [f"exec-{i}" for i in range(5)]
+        await buffer.drain()
+
+    @pytest.mark.asyncio
+    async def test_flush_on_size(self):
+        """测试达到批量大小时立即刷新，每批不超过 max_batch"""
+        flush = RecordingFlush()
+        buffer = ResultWriteBuffer(max_batch=4, max_delay=10, max_pending=100, flush_function=flush)
+
+        await asyncio.wait_for(
+            asyncio.gather(*(buffer.submit(make_write(f"exec-{i}")) for i in range(4))),
+            timeout=1
+        )
+
+        assert [len(call) for call in flush.calls] == [2, 2]
+        await buffer.drain()
+
+    @pytest.mark.asyncio
+    async def test_failure_isolated_to_failing_write(self):
+        """测试合并写入失败后逐个重试，只有出错的执行收到异常"""
+        flush = RecordingFlush(fail_execution_ids={"bad"})
+        buffer = ResultWriteBuffer(max_batch=100, max_delay=0.05, max_pending=1000, flush_function=flush)
+
+        good, bad = await asyncio.gather(
+            buffer.submit(make_write("good")),
+            buffer.submit(make_write("bad")),
+            return_exceptions=True
+        )
+
+        assert good["execution_id"] == "good"
+        assert isinstance(bad, RuntimeError)
+        assert buffer.get_metrics()["fallback_flushes"] == 1
+        await buffer.drain()
+
+    @pytest.mark.asyncio
+    async def test_submit_after_drain_writes_directly(self):
+        """测试关闭后的提交直接写入"""
+        flush = RecordingFlush()
+        buffer = ResultWriteBuffer(max_batch=100, max_delay=0.05, max_pending=1000, flush_function=flush)
+
+        await buffer.drain()
+        summary = await buffer.submit(make_write("late"))
+
+        assert summary["execution_id"] == "late"
+        assert flush.calls == [["late"]]
+
+
+class TestPartialWrite:
+    """部分写入失败测试"""
+
+    @pytest.fixture(autouse=True)
+    def disable_read_models(self, monkeypatch):
+        """只验证结果集合与统计，关闭其他读模型同步"""
+        monkeypatch.setattr(settings, "CONTENT_BLOB_OFFLOAD_ENABLED", False)
+        monkeypatch.setattr(settings, "REPORT_SEARCH_INDEX_ENABLED", False)
+        monkeypatch.setattr(settings, "UNIFIED_RESULTS_WRITE_ENABLED", False)
+        monkeypatch.setattr(settings, "TREND_BUCKETS_ENABLED", False)
+
+    @pytest.mark.asyncio
+    async def test_bulk_write_failure_after_insert_not_retried(self):
+        """测试新结果已插入后更新重复结果失败：抛出部分写入错误，不逐个重试，统计仍累加新结果"""
+        collection = FakeResultCollection()
+        repo = make_repository(collection)
+        await repo.persist_writes([PendingResultWrite(results=[make_result("https://a.com")], execution_id="exec-1")])
+
+        collection.bulk_write_error = RuntimeError("连接中断")
+        collection.insert_calls = 0
+        buffer = ResultWriteBuffer(
+            max_batch=100, max_delay=0.05, max_pending=1000, flush_function=repo.persist_writes
+        )
+        write = PendingResultWrite(
+            results=[make_result("https://a.com"), make_result("https://b.com")],
+            execution_id="exec-2"
+        )
+
+        with pytest.raises(PartialResultWriteError):
+            await buffer.submit(write)
+
+        assert collection.insert_calls == 1
+        assert collection.bulk_write_calls == 1
+        assert len(collection.docs) == 2
+        assert repo.stats_repo.applied[-1] == write.results[1].id
+        assert buffer.get_metrics()["partial_failures"] == 1
+        assert buffer.get_metrics()["fallback_flushes"] == 0
+        await buffer.drain()
+
+    @pytest.mark.asyncio
+    async def test_failure_before_any_write_is_retryable(self):
+        """测试没有新结果且没有更新任何重复结果时抛出原异常（可安全重试）"""
+        collection = FakeResultCollection()
+        repo = make_repository(collection)
+        await repo.persist_writes([PendingResultWrite(results=[make_result("https://a.com")], execution_id="exec-1")])
+
+        collection.bulk_write_error = BulkWriteError({
+            "writeErrors": [{"index": 0, "code": 2, "errmsg": "更新失败"}],
+            "nModified": 0
+        })
+        with pytest.raises(BulkWriteError):
+            await repo.persist_writes([
+                PendingResultWrite(results=[make_result("https://a.com")], execution_id="exec-2")
+            ])
+
+        assert collection.insert_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_releases_blob_refs(self, monkeypatch):
+        """测试插入失败（非重复键错误）时释放内容块引用，重试时重新写入内容块"""
+        monkeypatch.setattr(settings, "CONTENT_BLOB_OFFLOAD_ENABLED", True)
+        collection = FakeResultCollection()
+        collection.insert_error = RuntimeError("连接中断")
+        repo = make_repository(collection)
+        result = make_result("https://a.com", html_content="<p>正文</p>")
+
+        with pytest.raises(RuntimeError):
+            await repo.persist_writes([PendingResultWrite(results=[result], execution_id="exec-1")])
+
+        assert repo.blob_repo.released == {"blob-0": 1}
+        assert result.html_ref is None
@@ -0,0 +1,41 @@
+"""
+任务执行统计并发更新单元测试
+"""
+from datetime import datetime
+
+import pytest
+
+from src.core.domain.entities.search_task import EXECUTION_STATS_FIELDS, SearchTask
+from src.infrastructure.database.memory_repositories import InMemorySearchTaskRepository
+from src.infrastructure.database.repositories import SearchTaskRepository
+
+
+class TestExecutionStats:
+    """执行统计只由 record_execution_stats 写入"""
+
+    def test_update_dict_excludes_stats(self):
+        """测试更新文档不包含ID和执行统计字段"""
+        task_dict = SearchTaskRepository()._task_to_update_dict(
+            SearchTask(id="task-1", name="任务", query="测试", execution_count=3)
+        )
+
+        assert "_id" not in task_dict
+        assert not set(EXECUTION_STATS_FIELDS) & set(task_dict)
+        assert task_dict["name"] == "任务"
+
+    @pytest.mark.asyncio
+    async def test_stale_update_keeps_recorded_counts(self):
+        """测试用执行前读到的任务更新时不覆盖期间累加的计数"""
+        repo = InMemorySearchTaskRepository()
+        await repo.create(SearchTask(id="task-1", name="任务", query="测试"))
+
+        stale = SearchTask(id="task-1", name="任务", query="测试", is_active=False)
+        executed_at = datetime(2025, 1, 1, 9)
+        await repo.record_execution_stats("task-1", success=True, results_count=5, executed_at=executed_at)
+        await repo.update(stale)
+
+        task = await repo.get_by_id("task-1")
+        assert task.is_active is False
+        assert task.execution_count == 1
+        assert task.total_results == 5
+        assert task.last_executed_at == executed_at
@@ -0,0 +1,161 @@
+"""
+任务列表复合键游标分页与总数缓存单元测试
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.domain.entities.instant_search_task import InstantSearchTask
+from src.core.domain.entities.search_task import SearchTask
+from src.infrastructure.database.count_cache import CountCache, count_cache
+from src.infrastructure.database.instant_search_repositories import InstantSearchTaskRepository
+from src.infrastructure.database.memory_repositories import InMemorySearchTaskRepository
+from src.infrastructure.database.repositories import SearchTaskRepository
+
+
+class FakeCollection:
+    """记录计数调用次数的集合"""
+
+    def __init__(self, name: str = "search_tasks", total: int = 42):
+        self.name = name
+        self.total = total
+        self.count_calls = 0
+        self.estimated_calls = 0
+
+    async def count_documents(self, filter_dict):
+        self.count_calls += 1
+        return self.total
+
+    async def estimated_document_count(self):
+        self.estimated_calls += 1
+        return self.total
+
+    async def update_one(self, filter_dict, update):
+        return type("UpdateResult", (), {"matched_count": 1})()
+
+
+async def make_repository(count: int) -> InMemorySearchTaskRepository:
+    """创建包含若干任务的内存仓储（部分任务创建时间相同）"""
+    repo = InMemorySearchTaskRepository()
+    base = datetime(2025, 1, 1)
+    for i in range(count):
+        task = SearchTask(
+            id=f"task-{i:03d}",
+            name=f"任务{i}",
+            query="测试",
+            created_at=base + timedelta(minutes=i // 2)
+        )
+        await repo.create(task)
+    return repo
+
+
+class TestTaskKeysetPagination:
+    """任务列表游标分页测试"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_match_page_mode(self):
+        """测试游标逐页遍历与页码分页结果一致（创建时间相同时按ID决胜）"""
+        repo = await make_repository(25)
+
+        cursor_ids = []
+        cursor = None
+        while True:
+            data = await repo.query_tasks(page_size=10, cursor=cursor, include_total=False)
+            assert data["total"] is None
+            cursor_ids.extend(task.id for task in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        page_ids = []
+        for page in (1, 2, 3):
+            tasks, total = await repo.list_tasks(page=page, page_size=10)
+            assert total == 25
+            page_ids.extend(task.id for task in tasks)
+
+        assert cursor_ids == page_ids
+        assert len(set(cursor_ids)) == 25
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self):
+        """测试刚好取完时不返回下一页游标"""
+        repo = await make_repository(10)
+
+        data = await repo.query_tasks(page_size=10)
+        assert len(data["items"]) == 10
+        assert data["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self):
+        """测试无效游标抛出 ValueError"""
+        repo = await make_repository(3)
+
+        with pytest.raises(ValueError):
+            await repo.query_tasks(cursor="not-a-cursor")
+
+
+class TestCountCache:
+    """列表总数缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_empty_filter_uses_estimate(self):
+        """测试无过滤条件时使用估算总数"""
+        cache = CountCache(ttl=60)
+        collection = FakeCollection()
+
+        assert await cache.count(collection, {}) == 42
+        assert collection.estimated_calls == 1
+        assert collection.count_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_filtered_count_cached_and_invalidated(self):
+        """测试带过滤条件的总数被缓存，失效后重新计算"""
+        cache = CountCache(ttl=60)
+        collection = FakeCollection()
+
+        await cache.count(collection, {"status": "active"})
+        await cache.count(collection, {"status": "active"})
+        assert collection.count_calls == 1
+
+        await cache.count(collection, {"status": "paused"})
+        assert collection.count_calls == 2
+
+        cache.invalidate("search_tasks")
+        await cache.count(collection, {"status": "active"})
+        assert collection.count_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_task_update_invalidates_count(self):
+        """测试更新任务（如切换状态/启用）后带过滤条件的总数重新计算"""
+        collection = FakeCollection()
+        repo = SearchTaskRepository()
+
+        async def get_collection():
+            return collection
+
+        repo._get_collection = get_collection
+        count_cache.invalidate("search_tasks")
+
+        await count_cache.count(collection, {"is_active": True})
+        await repo.update(SearchTask(id="task-1", name="任务", query="测试", is_active=False))
+        await count_cache.count(collection, {"is_active": True})
+
+        assert collection.count_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_instant_task_update_invalidates_count(self):
+        """测试更新即时搜索任务（如状态变化）后带过滤条件的总数重新计算"""
+        collection = FakeCollection(name="instant_search_tasks")
+        repo = InstantSearchTaskRepository()
+
+        async def get_collection():
+            return collection
+
+        repo._get_collection = get_collection
+        count_cache.invalidate("instant_search_tasks")
+
+        await count_cache.count(collection, {"status": "completed"})
+        await repo.update(InstantSearchTask(id="task-1", name="任务", query="测试"))
+        await count_cache.count(collection, {"status": "completed"})
+
+        assert collection.count_calls == 2
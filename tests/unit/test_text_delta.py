@@ -0,0 +1,76 @@
+"""
+文本增量编码与报告版本存储单元测试
+"""
+import pytest
+
+from src.core.domain.entities.summary_report import SummaryReportVersion
+from src.services.report_version_store import encode_version_content
+from src.utils.text_delta import apply_delta, delta_size, make_delta
+
+
+BASE_TEXT = "".join(f"## 第{i}节\n缅甸局势观察内容，第{i}段。\n" for i in range(50))
+
+
+class TestTextDelta:
+    """行级增量测试"""
+
+    def test_round_trip(self):
+        """测试增量还原出新文本"""
+        new_text = BASE_TEXT.replace("第10段", "第10段（已修订）") + "## 结论\n新增结论\n"
+
+        delta = make_delta(BASE_TEXT, new_text)
+
+        assert apply_delta(BASE_TEXT, delta) == new_text
+
+    def test_small_edit_is_compact(self):
+        """测试局部修改的增量远小于全文"""
+        new_text = BASE_TEXT.replace("第10段", "第10段（已修订）")
+
+        assert delta_size(make_delta(BASE_TEXT, new_text)) * 10 < len(new_text.encode("utf-8"))
+
+    def test_mismatched_base_rejected(self):
+        """测试基准文本不匹配时报错"""
+        delta = make_delta(BASE_TEXT, BASE_TEXT + "追加\n")
+
+        with pytest.raises(ValueError):
+            apply_delta("其他文本\n", delta)
+
+
+class TestEncodeVersionContent:
+    """版本存储方式选择测试"""
+
+    def make_version(self, text: str) -> SummaryReportVersion:
+        """创建带完整内容的版本"""
+        return SummaryReportVersion(
+            report_id="r1",
+            version_number=2,
+            base_version=1,
+            content_snapshot={"format": "markdown", "text": text}
+        )
+
+    def test_small_edit_stored_as_delta(self):
+        """测试局部修改存为增量，快照中不保留正文"""
+        version = encode_version_content(self.make_version(BASE_TEXT + "追加\n"), BASE_TEXT, 0)
+
+        assert version.storage == "delta"
+        assert version.chain_length == 1
+        assert "text" not in version.content_snapshot
+        assert version.content_snapshot["format"] == "markdown"
+        assert version.stored_size < version.full_size
+
+    def test_first_version_and_rewrite_stored_as_snapshot(self):
+        """测试没有基准或整体改写时保存快照"""
+        first = encode_version_content(self.make_version(BASE_TEXT), None, 0)
+        rewrite = encode_version_content(self.make_version("完全不同的内容\n" * 10), BASE_TEXT, 0)
+
+        for version in (first, rewrite):
+            assert version.storage == "snapshot"
+            assert version.base_version is None
+            assert version.content_snapshot["text"]
+
+    def test_snapshot_after_interval(self):
+        """测试增量层数达到间隔后保存快照"""
+        version = encode_version_content(self.make_version(BASE_TEXT + "追加\n"), BASE_TEXT, 10 ** 6)
+
+        assert version.storage == "snapshot"
+        assert version.chain_length == 0
@@ -0,0 +1,77 @@
+"""
+搜索分词与任务关键词搜索单元测试
+"""
+import pytest
+
+from src.core.domain.entities.search_task import SearchTask
+from src.infrastructure.database.memory_repositories import InMemorySearchTaskRepository
+from src.utils.text_tokenizer import index_tokens, match_score, query_tokens
+
+
+class TestTextTokenizer:
+    """分词测试"""
+
+    def test_cjk_unigrams_and_bigrams(self):
+        """测试中文生成单字和二元组"""
+        tokens = index_tokens("新闻监控")
+        assert {"新", "闻", "监", "控", "新闻", "闻监", "监控"} == set(tokens)
+
+    def test_word_prefixes(self):
+        """测试拉丁词转小写并生成前缀"""
+        tokens = index_tokens("Firecrawl")
+        assert "f" in tokens
+        assert "fire" in tokens
+        assert "firecrawl" in tokens
+
+    def test_query_tokens(self):
+        """测试查询词元：完整词 + 中文二元组，单字查询使用单字"""
+        assert query_tokens("Fire 新闻监") == ["fire", "新闻", "闻监"]
+        assert query_tokens("新") == ["新"]
+        assert query_tokens("!!!") == []
+
+    def test_prefix_query_matches_index(self):
+        """测试前缀查询的词元都包含在索引词元中"""
+        tokens = set(index_tokens("缅甸新闻 Firecrawl monitor"))
+        for query in ("fire", "mon", "缅甸", "甸新闻"):
+            assert set(query_tokens(query)) <= tokens
+
+    def test_name_match_scores_higher(self):
+        """测试名称命中得分高于只在描述中命中"""
+        tokens = query_tokens("新闻")
+        in_name = match_score(tokens, index_tokens("新闻"), index_tokens("新闻", "其他"))
+        in_description = match_score(tokens, index_tokens("其他"), index_tokens("其他", "新闻"))
+        assert in_name > in_description
+
+
+class TestInMemoryTaskSearch:
+    """内存仓储关键词搜索测试"""
+
+    @pytest.mark.asyncio
+    async def test_search_by_prefix_and_relevance(self):
+        """测试前缀匹配，名称命中排在描述命中之前"""
+        repo = InMemorySearchTaskRepository()
+        await repo.create(SearchTask(id="t1", name="缅甸经济", description="新闻监控", query="economy"))
+        await repo.create(SearchTask(id="t2", name="新闻监控", query="news"))
+        await repo.create(SearchTask(id="t3", name="天气", query="weather"))
+
+        tasks, total = await repo.list_tasks(query="新闻")
+        assert [task.id for task in tasks] == ["t2", "t1"]
+        assert total == 2
+
+        tasks, _ = await repo.list_tasks(query="wea")
+        assert [task.id for task in tasks] == ["t3"]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_update_and_delete(self):
+        """测试更新和删除后索引同步"""
+        repo = InMemorySearchTaskRepository()
+        task = SearchTask(id="t1", name="旧名称", query="old")
+        await repo.create(task)
+
+        task.name = "新名称"
+        await repo.update(task)
+        assert (await repo.list_tasks(query="旧名"))[1] == 0
+        assert (await repo.list_tasks(query="新名"))[1] == 1
+
+        await repo.delete("t1")
+        assert (await repo.list_tasks(query="新名"))[1] == 0
@@ -0,0 +1,124 @@
+"""
+任务按天趋势桶与报告趋势单元测试
+"""
+from datetime import date, datetime
+
+import pytest
+
+from src.infrastructure.database.repositories import (
+    TaskTrendBucketRepository,
+    TrendObservation,
+    result_domain,
+    result_keywords
+)
+from src.services.report_trend_service import emerging_keywords, regroup_timeline, resolve_range
+
+
+class TestBucketUpdates:
+    """日桶增量更新构建测试"""
+
+    def test_counts_grouped_by_task_and_day(self):
+        """测试按任务和日期合并，新结果与重复结果分别计数"""
+        observations = [
+            TrendObservation("t1", datetime(2025, 3, 1, 8), True, url="https://www.example.com/a", title="缅甸地震"),
+            TrendObservation("t1", datetime(2025, 3, 1, 22), False, profiled=False),
+            TrendObservation("t1", datetime(2025, 3, 2, 1), True, url="https://news.example.org/b"),
+            TrendObservation("t2", datetime(2025, 3, 1, 9), True)
+        ]
+        updates = TaskTrendBucketRepository.build_updates("scheduled", observations)
+
+        assert set(updates) == {"scheduled:t1:20250301", "scheduled:t1:20250302", "scheduled:t2:20250301"}
+        first_day = updates["scheduled:t1:20250301"]
+        assert first_day["$inc"]["result_count"] == 2
+        assert first_day["$inc"]["new_count"] == 1
+        assert first_day["$inc"]["shared_count"] == 1
+        assert first_day["$inc"]["profiled_count"] == 1
+        assert first_day["$setOnInsert"]["day"] == datetime(2025, 3, 1)
+        assert first_day["$set"]["compacted"] is False
+
+    def test_domain_and_keyword_keys_escaped(self):
+        """测试域名中的 '.' 被转义为合法字段名，关键词按结果计一次"""
+        updates = TaskTrendBucketRepository.build_updates("instant", [
+            TrendObservation("t1", datetime(2025, 3, 1), True, url="https://www.example.com/a", title="地震 地震 救援")
+        ])
+        inc = updates["instant:t1:20250301"]["$inc"]
+
+        assert inc["domains.example．com"] == 1
+        assert inc["keywords.地震"] == 1
+        assert not any(key.count(".") > 1 for key in inc)
+
+    def test_unprofiled_observation_skips_distributions(self):
+        """测试重复出现只计数，不计入域名/关键词分布"""
+        updates = TaskTrendBucketRepository.build_updates("scheduled", [
+            TrendObservation("t1", datetime(2025, 3, 1), False, profiled=False, url="https://example.com", title="地震")
+        ])
+        inc = updates["scheduled:t1:20250301"]["$inc"]
+
+        assert inc["profiled_count"] == 0
+        assert not any(key.startswith(("domains.", "keywords.")) for key in inc)
+
+
+class TestResultProfile:
+    """结果域名与关键词提取测试"""
+
+    def test_domain(self):
+        """测试域名小写并去除 www. 前缀"""
+        assert result_domain("https://WWW.Example.com/path?q=1") == "example.com"
+        assert result_domain("https://news.example.com") == "news.example.com"
+        assert result_domain("") is None
+        assert result_domain("not a url") is None
+
+    def test_keywords_limited_and_filtered(self):
+        """测试关键词按词频取前N个，过滤停用词和数字"""
+        keywords = result_keywords("Myanmar election", "the election 2025 results election", limit=2)
+
+        assert keywords == ["election", "myanmar"]
+
+
+class TestReportTrend:
+    """报告趋势汇总测试"""
+
+    def test_regroup_fills_empty_days(self):
+        """测试按天补齐没有结果的日期"""
+        rows = [{"day": datetime(2025, 1, 2), "result_count": 5, "new_count": 3, "shared_count": 2}]
+        timeline = regroup_timeline(rows, date(2025, 1, 1), date(2025, 1, 3))
+
+        assert [point["date"] for point in timeline] == ["2025-01-01", "2025-01-02", "2025-01-03"]
+        assert timeline[0]["result_count"] == 0
+        assert timeline[1] == {"date": "2025-01-02", "result_count": 5, "new_count": 3, "shared_count": 2}
+
+    def test_regroup_by_month_across_year(self):
+        """测试一年范围按月分组"""
+        rows = [
+            {"day": datetime(2024, 12, 31), "result_count": 1, "new_count": 1, "shared_count": 0},
+            {"day": datetime(2025, 1, 15), "result_count": 2, "new_count": 1, "shared_count": 1},
+            {"day": datetime(2025, 1, 20), "result_count": 3, "new_count": 3, "shared_count": 0}
+        ]
+        timeline = regroup_timeline(rows, date(2024, 6, 1), date(2025, 5, 31), granularity="month")
+
+        assert len(timeline) == 12
+        assert timeline[0]["date"] == "2024-06-01"
+        assert timeline[7] == {"date": "2025-01-01", "result_count": 5, "new_count": 4, "shared_count": 1}
+
+    def test_emerging_keywords(self):
+        """测试最近集中出现的关键词被识别为新兴关键词"""
+        keywords = [
+            {"keyword": "洪水", "count": 12, "recent_count": 10},
+            {"keyword": "经济", "count": 60, "recent_count": 20},
+            {"keyword": "偶发", "count": 1, "recent_count": 1}
+        ]
+        emerging = emerging_keywords(keywords, recent_total=20, earlier_total=40)
+
+        assert [keyword["keyword"] for keyword in emerging] == ["洪水"]
+        assert emerging[0]["earlier_count"] == 2
+
+    def test_range_validation(self):
+        """测试默认范围和无效范围"""
+        start, end = resolve_range(None, None, today=date(2025, 3, 31))
+        assert end == date(2025, 3, 31)
+        assert (end - start).days + 1 == 30
+
+        with pytest.raises(ValueError):
+            resolve_range(date(2025, 3, 2), date(2025, 3, 1))
+        with pytest.raises(ValueError):
+            resolve_range(date(2020, 1, 1), date(2025, 1, 1))
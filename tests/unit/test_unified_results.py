@@ -0,0 +1,62 @@
+"""
+统一结果读模型单元测试
+"""
+from datetime import datetime
+
+from src.infrastructure.database.unified_results_repository import (
+    UnifiedResultRepository,
+    build_unified_row,
+    scheduled_row
+)
+
+
+class TestUnifiedRow:
+    """统一结果行构建测试"""
+
+    def test_scheduled_row(self):
+        """测试定时结果行使用统一结构并指向 search_results"""
+        created_at = datetime(2025, 10, 1, 12, 30)
+        row = scheduled_row({
+            "_id": "r1",
+            "task_id": "t1",
+            "title": "缅甸新闻",
+            "url": "https://example.com/a",
+            "created_at": created_at,
+            "relevance_score": 0.8,
+            "markdown_content": "正文不进入读模型"
+        })
+
+        assert row["_id"] == "scheduled:t1:r1"
+        assert row["source_type"] == "scheduled"
+        assert row["score"] == 0.8
+        assert row["created_at"] == created_at
+        assert row["content_ref"] == {"collection": "search_results", "id": "r1"}
+        assert "markdown_content" not in row
+
+    def test_shared_instant_result_rows_per_task(self):
+        """测试即时结果被多个任务共享时按任务各生成一行"""
+        row_a = build_unified_row("instant", "t1", "r1", "标题", "https://example.com", None, 0.5)
+        row_b = build_unified_row("instant", "t2", "r1", "标题", "https://example.com", None, 0.5)
+
+        assert row_a["_id"] != row_b["_id"]
+        assert row_a["content_ref"] == row_b["content_ref"] == {"collection": "instant_search_results", "id": "r1"}
+
+
+class TestScopeFilter:
+    """报告范围条件测试"""
+
+    def test_both_sources(self):
+        """测试两种来源组合为 $or 分支"""
+        query = UnifiedResultRepository._scope_filter({"scheduled": ["t1"], "instant": ["t2"]})
+
+        assert query == {"$or": [
+            {"source_type": "scheduled", "task_id": {"$in": ["t1"]}},
+            {"source_type": "instant", "task_id": {"$in": ["t2"]}}
+        ]}
+
+    def test_single_and_empty_scope(self):
+        """测试单一来源不使用 $or，无任务时返回None"""
+        assert UnifiedResultRepository._scope_filter({"scheduled": [], "instant": ["t2"]}) == {
+            "source_type": "instant", "task_id": {"$in": ["t2"]}
+        }
+        assert UnifiedResultRepository._scope_filter({"scheduled": [], "instant": []}) is None
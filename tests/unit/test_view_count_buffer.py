@@ -0,0 +1,63 @@
+"""
+报告查看次数缓冲单元测试
+"""
+import pytest
+
+from src.infrastructure.database.view_count_buffer import ViewCountBuffer
+
+
+class RecordingFlush:
+    """记录每次刷新的写入函数"""
+
+    def __init__(self, fail_times: int = 0):
+        self.calls = []
+        self.fail_times = fail_times
+
+    async def __call__(self, counts):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("写入失败")
+        self.calls.append(dict(counts))
+
+
+class TestViewCountBuffer:
+    """查看次数缓冲测试"""
+
+    @pytest.mark.asyncio
+    async def test_views_coalesced_per_report(self):
+        """测试多次查看合并为每个报告一次增量"""
+        flush = RecordingFlush()
+        buffer = ViewCountBuffer(flush_interval=60, flush_function=flush)
+
+        for _ in range(3):
+            await buffer.record("r1")
+        await buffer.record("r2")
+        assert buffer.pending("r1") == 3
+        assert flush.calls == []
+
+        await buffer.drain()
+        assert flush.calls == [{"r1": 3, "r2": 1}]
+        assert buffer.pending("r1") == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_retried(self):
+        """测试刷新失败时计数保留到下次刷新"""
+        flush = RecordingFlush(fail_times=1)
+        buffer = ViewCountBuffer(flush_interval=60, flush_function=flush)
+
+        await buffer.record("r1")
+        assert await buffer.flush() == 0
+        await buffer.record("r1")
+
+        await buffer.drain()
+        assert flush.calls == [{"r1": 2}]
+
+    @pytest.mark.asyncio
+    async def test_record_after_drain_writes_directly(self):
+        """测试关闭后的记录直接写入"""
+        flush = RecordingFlush()
+        buffer = ViewCountBuffer(flush_interval=60, flush_function=flush)
+        await buffer.drain()
+
+        await buffer.record("r1")
+        assert flush.calls == [{"r1": 1}]